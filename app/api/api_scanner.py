@@ -5,15 +5,20 @@ from datetime import datetime
 from pathlib import Path
 
 from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import BaseModel, Field
 from typing import Any, Dict, List, Optional
 
 from app.api.auth import get_token_claims
 from app.database.models import ApiScanReport, Scan
 from app.database.session import get_db, SessionLocal
+from app.scanners.api_scanner.engine.incremental import load_baseline_report
+from app.scanners.instrumentation import render_prometheus
+from app.worker.checkpoints import clear_checkpoint
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
+from app.worker.celery_app import PRIORITY_INTERACTIVE
+from app.worker.dispatch import use_celery
 
 logger = logging.getLogger(__name__)
 
@@ -43,18 +48,7 @@ class ApiScanRequest(BaseModel):
     auth_config: Optional[AuthConfig] = Field(default=None, description="Authentication configuration")
     secondary_auth_config: Optional[AuthConfig] = Field(default=None, description="Secondary auth for privilege escalation testing")
     scan_mode: str = Field(default="active", description="Scan mode: active | passive")
-
-
-def _celery_available() -> bool:
-    """Check if Celery + Redis broker is reachable."""
-    try:
-        from app.worker.celery_app import celery_app
-        conn = celery_app.connection()
-        conn.connect()
-        conn.close()
-        return True
-    except Exception:
-        return False
+    incremental: bool = Field(default=False, description="Only scan endpoints added or changed since the last report of this asset")
 
 
 @router.get("/api/{scan_id}/status")
@@ -81,6 +75,26 @@ async def get_api_scan_status(
     }
 
 
+@router.get("/api/{scan_id}/metrics", response_class=PlainTextResponse)
+async def get_api_scan_metrics(
+    scan_id: str,
+    db: Session = Depends(get_db),
+    claims: Dict[str, Any] = Depends(get_token_claims),
+):
+    """Per-phase and per-check scan instrumentation, in Prometheus text format."""
+    report = db.query(ApiScanReport).filter(ApiScanReport.scan_id == scan_id).first()
+    if not report:
+        raise HTTPException(status_code=404, detail="Scan report not found")
+    try:
+        diagnostics = json.loads(report.report_json or "{}").get("diagnostics") or {}
+    except ValueError:
+        diagnostics = {}
+    return PlainTextResponse(
+        render_prometheus(diagnostics, {"scanner": "api", "scan_id": scan_id}),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
 @router.post("/api/{scan_id}/cancel")
 async def cancel_api_scan(
     scan_id: str,
@@ -106,8 +120,9 @@ async def start_api_scan(
 ):
     """
     Run the API APT scanner against provided endpoints.
-    If Celery + Redis are available, the scan runs in a background worker (returns 202).
-    Otherwise, falls back to synchronous execution.
+    With SCAN_EXECUTION_MODE=celery and a reachable broker, the scan is queued on
+    the scans.api Celery queue; otherwise it runs in a background thread.
+    Either way the endpoint returns 202 immediately.
     """
     if not body.postman_collection and not body.endpoints and not body.openapi_spec:
         raise HTTPException(status_code=400, detail="Provide postman_collection, openapi_spec, or endpoints")
@@ -136,7 +151,37 @@ async def start_api_scan(
     secondary_auth_dict = body.secondary_auth_config.model_dump() if body.secondary_auth_config else None
     scan_id = str(scan.id)
 
-    # ── Run scan in background thread ──────────────────────────────
+    # ── Run scan on the Celery scans.api queue ─────────────────────
+    if use_celery():
+        from app.worker.tasks import run_api_scan_task
+
+        run_api_scan_task.apply_async(
+            kwargs={
+                "scan_id": scan_id,
+                "scan_name": body.scan_name,
+                "asset_url": body.asset_url,
+                "endpoints": body.endpoints,
+                "openapi_spec": body.openapi_spec,
+                "postman_collection": body.postman_collection,
+                "auth_config": auth_dict,
+                "secondary_auth_config": secondary_auth_dict,
+                "scan_mode": body.scan_mode,
+                "incremental": body.incremental,
+            },
+            priority=PRIORITY_INTERACTIVE,
+        )
+        logger.info("API scan '%s' queued on scans.api", body.scan_name)
+        return JSONResponse(
+            status_code=202,
+            content={
+                "scan_id": scan_id,
+                "scan_name": body.scan_name,
+                "status": "IN_PROGRESS",
+                "message": "Scan queued. Poll /scanner/api/{scan_id}/status for progress.",
+            },
+        )
+
+    # ── Fallback: run scan in background thread ────────────────────
     def _run_scan_bg():
         import asyncio
         from app.scanners.api_scanner.main import run_api_scan
@@ -145,6 +190,7 @@ async def start_api_scan(
 
         bg_db = SessionLocal()
         try:
+            baseline = load_baseline_report(bg_db, body.asset_url, body.scan_mode) if body.incremental else None
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
             report = loop.run_until_complete(run_api_scan(
@@ -158,6 +204,7 @@ async def start_api_scan(
                 scan_mode=body.scan_mode,
                 db=bg_db,
                 scan_id=scan_id,
+                baseline_report=baseline,
             ))
             loop.close()
 
@@ -212,6 +259,8 @@ async def start_api_scan(
             except Exception:
                 bg_db.rollback()
         finally:
+            # No redelivery in thread mode — nothing will resume this scan
+            clear_checkpoint(scan_id)
             bg_db.close()
 
     thread = threading.Thread(target=_run_scan_bg, daemon=True)
@@ -8,6 +8,7 @@ import logging
 import os
 import threading
 import uuid as uuid_lib
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 from urllib.parse import urlparse
@@ -25,6 +26,9 @@ from app.database.session import SessionLocal, get_db
 from app.services.email import send_email
 from app.scanners.pentest_scanner import PentestScanner
 from app.utils.crypto import decrypt_field, encrypt_field
+from app.worker.celery_app import PRIORITY_INTERACTIVE
+from app.worker.checkpoints import clear_checkpoint, load_checkpoint, save_checkpoint
+from app.worker.dispatch import dispatch_pentest
 
 logger = logging.getLogger(__name__)
 
@@ -478,6 +482,12 @@ def sync_pentest_schedules_from_config(db: Session, pentest: Pentest, username:
         _enqueue_deferred_onetime_pentest(db, pentest, username, start_at)
     elif run_type in ("daily", "weekly"):
         _enqueue_recurring_pentest_schedule(db, pentest, username, run_type, start_at)
+    else:
+        return
+
+    from app.api.scans import wake_schedule_worker
+
+    wake_schedule_worker()
 
 
 def _pentest_max_targets() -> int:
@@ -699,8 +709,24 @@ def _max_concurrent_scans() -> int:
         return 3
 
 
-def _start_pentest_scan_job(db: Session, pentest: Pentest, username: str) -> None:
-    """Commit scan row, move pentest to SCANNING, spawn background worker."""
+def _pentest_target_concurrency() -> int:
+    """Targets scanned in parallel within one pentest run (PENTEST_TARGET_CONCURRENCY).
+
+    Per user, at most PENTEST_MAX_CONCURRENT_SCANS x this many targets are in flight.
+    """
+    try:
+        return max(1, min(16, int(os.getenv("PENTEST_TARGET_CONCURRENCY", "4"))))
+    except ValueError:
+        return 4
+
+
+def _start_pentest_scan_job(
+    db: Session,
+    pentest: Pentest,
+    username: str,
+    priority: int = PRIORITY_INTERACTIVE,
+) -> None:
+    """Commit scan row, move pentest to SCANNING, hand the run to the scan dispatcher."""
     if pentest.status == "SCANNING":
         raise HTTPException(status_code=409, detail="A scan is already running for this pentest")
 
@@ -756,12 +782,14 @@ def _start_pentest_scan_job(db: Session, pentest: Pentest, username: str) -> Non
         status=scan.status,
     )
 
-    thread = threading.Thread(
-        target=_run_pentest_background,
-        args=(str(pentest.id), str(scan.id), assets_payload, notifications_cfg, flow_cfg),
-        daemon=True,
+    dispatch_pentest(
+        str(pentest.id),
+        str(scan.id),
+        assets_payload,
+        notifications_cfg,
+        flow_cfg,
+        priority=priority,
     )
-    thread.start()
 
 
 @router.post("/", response_model=PentestRow, status_code=201)
@@ -1479,6 +1507,86 @@ def export_pentest_csv(
     )
 
 
+def _scan_pentest_target(
+    target_type: str,
+    target_value: str,
+    scan_id: str,
+    scan_name: str,
+    scan_types: List[str],
+    auth_cfg: Dict[str, Any],
+    exclusions_cfg: Dict[str, Any],
+    timeout_s: float,
+) -> tuple[bool, List[Dict[str, Any]]]:
+    """
+    Scan one pentest target (light scan + optional API layer) without touching
+    the DB. Returns (reachable, findings deduplicated by title).
+    """
+    findings_batch: List[Dict[str, Any]] = []
+    target_reachable = False
+
+    light = _run_light_scan_with_timeout(
+        PentestScanner(),
+        {
+            "target_type": target_type,
+            "target_value": target_value,
+            "exclusions": exclusions_cfg,
+        },
+        timeout_s,
+    )
+    if light.get("preflight_checks", {}).get("reachable"):
+        target_reachable = True
+    findings_batch.extend(light.get("findings") or [])
+
+    base_url = _asset_base_url(target_type, target_value)
+    if (
+        base_url
+        and _should_run_api_layer(scan_types, target_type)
+    ):
+        api_checkpoint_key = f"{scan_id}:api:{target_type}:{target_value}"
+        try:
+            from app.scanners.api_scanner.main import run_api_scan
+
+            # No db handle: concurrent targets would overwrite each other's
+            # progress on the shared pentest Scan row.
+            report = asyncio.run(
+                run_api_scan(
+                    scan_name=scan_name,
+                    asset_url=base_url,
+                    endpoints=[
+                        {
+                            "method": "GET",
+                            "path": "/",
+                            "body": {},
+                            "auth_required": False,
+                        }
+                    ],
+                    auth_config=_normalize_auth_for_api(auth_cfg),
+                    scan_id=scan_id,
+                    # One API scan per target under the shared pentest scan_id
+                    checkpoint_key=api_checkpoint_key,
+                )
+            )
+            clear_checkpoint(api_checkpoint_key)
+            findings_batch.extend(report.get("findings") or [])
+            target_reachable = True
+        except Exception:
+            logger.exception(
+                "Pentest API-layer scan failed for target=%s scan=%s",
+                target_value,
+                scan_id,
+            )
+
+    # Deduplicate by title within this batch before persisting
+    seen_titles: set = set()
+    deduped: List[Dict[str, Any]] = []
+    for f in findings_batch:
+        key = str(f.get("title") or "").strip().lower()
+        if key not in seen_titles:
+            seen_titles.add(key)
+            deduped.append(f)
+    return target_reachable, deduped
+
+
 def _run_pentest_background(
     pentest_id: str,
     scan_id: str,
@@ -1489,6 +1597,9 @@ def _run_pentest_background(
     """
     Background worker: lightweight PentestScanner per target, optional full API scanner layer
     (WEB/API scan types), persist findings, finalize pentest + scan status.
+
+    Targets run concurrently (PENTEST_TARGET_CONCURRENCY); each target's findings are
+    committed as soon as it finishes.
     """
     db = SessionLocal()
     cfg = dict(flow_cfg or {})
@@ -1508,11 +1619,15 @@ def _run_pentest_background(
             )
             return
 
-        scanner = PentestScanner()
         created_by = scan.created_by or "pentest"
+        scan_name = scan.scan_name or f"pentest-{scan_id}"
         any_reachable = False
         total_findings = 0
 
+        # Targets finished by an earlier attempt of this run (worker restart /
+        # Celery redelivery): their findings are already committed.
+        checkpoint = load_checkpoint(scan_id)
+
         if not assets:
             scan.status = "FAILED"
             scan.findings_count = 0
@@ -1531,6 +1646,7 @@ def _run_pentest_background(
             )
             return
 
+        pending: List[tuple[str, str]] = []
         for asset in assets:
             target_type = str(asset.get("type") or "").upper()
             target_value = str(asset.get("value") or "").strip()
@@ -1541,74 +1657,75 @@ def _run_pentest_background(
                 logger.info("Skipping pentest target excluded by scope rules: %s", target_value)
                 continue
 
-            findings_batch: List[Dict[str, Any]] = []
+            done = checkpoint.get(f"target:{target_type}:{target_value}")
+            if done is not None:
+                logger.info("Pentest %s: target %s already scanned, resuming past it", pentest_id, target_value)
+                any_reachable = any_reachable or bool(done.get("reachable"))
+                total_findings += int(done.get("findings") or 0)
+                continue
 
-            light = _run_light_scan_with_timeout(
-                scanner,
-                {
-                    "target_type": target_type,
-                    "target_value": target_value,
-                    "exclusions": exclusions_cfg,
-                },
-                timeout_s,
+            pending.append((target_type, target_value))
+
+        # Fan targets out over a bounded pool; findings are persisted from this
+        # thread (the only one touching `db`) as each target finishes.
+        completed = len(assets) - len(pending)
+        if pending:
+            workers = min(_pentest_target_concurrency(), len(pending))
+            logger.info(
+                "Pentest %s: scanning %d target(s) with concurrency %d",
+                pentest_id,
+                len(pending),
+                workers,
             )
-            if light.get("preflight_checks", {}).get("reachable"):
-                any_reachable = True
-            findings_batch.extend(light.get("findings") or [])
-
-            base_url = _asset_base_url(target_type, target_value)
-            if (
-                base_url
-                and _should_run_api_layer(scan_types, target_type)
-            ):
-                try:
-                    from app.scanners.api_scanner.main import run_api_scan
-
-                    report = asyncio.run(
-                        run_api_scan(
-                            scan_name=scan.scan_name or f"pentest-{scan_id}",
-                            asset_url=base_url,
-                            endpoints=[
-                                {
-                                    "method": "GET",
-                                    "path": "/",
-                                    "body": {},
-                                    "auth_required": False,
-                                }
-                            ],
-                            auth_config=_normalize_auth_for_api(auth_cfg),
-                            db=db,
-                            scan_id=str(scan.id),
-                        )
-                    )
-                    findings_batch.extend(report.get("findings") or [])
-                    any_reachable = True
-                except Exception:
-                    logger.exception(
-                        "Pentest API-layer scan failed for target=%s scan=%s",
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pentest-target") as pool:
+                futures = {
+                    pool.submit(
+                        _scan_pentest_target,
+                        target_type,
                         target_value,
                         scan_id,
+                        scan_name,
+                        scan_types,
+                        auth_cfg,
+                        exclusions_cfg,
+                        timeout_s,
+                    ): (target_type, target_value)
+                    for target_type, target_value in pending
+                }
+                for future in as_completed(futures):
+                    target_type, target_value = futures[future]
+                    try:
+                        target_reachable, deduped = future.result()
+                    except Exception:
+                        logger.exception(
+                            "Pentest target failed: target=%s scan=%s",
+                            target_value,
+                            scan_id,
+                        )
+                        target_reachable, deduped = False, []
+
+                    if deduped:
+                        _persist_structured_findings(
+                            db,
+                            scan,
+                            deduped,
+                            target_value,
+                            created_by,
+                        )
+                        total_findings += len(deduped)
+
+                    # Commit per target so the checkpoint never points at unsaved findings.
+                    completed += 1
+                    scan.findings_count = total_findings
+                    scan.progress = int(100 * completed / len(assets))
+                    db.commit()
+                    any_reachable = any_reachable or target_reachable
+                    save_checkpoint(
+                        scan_id,
+                        f"target:{target_type}:{target_value}",
+                        {"findings": len(deduped), "reachable": target_reachable},
                     )
 
-            # Deduplicate by title within this batch before persisting
-            seen_titles: set = set()
-            deduped: List[Dict[str, Any]] = []
-            for f in findings_batch:
-                key = str(f.get("title") or "").strip().lower()
-                if key not in seen_titles:
-                    seen_titles.add(key)
-                    deduped.append(f)
-
-            if deduped:
-                _persist_structured_findings(
-                    db,
-                    scan,
-                    deduped,
-                    target_value,
-                    created_by,
-                )
-                total_findings += len(deduped)
-
         scan.findings_count = total_findings
         scan_finished_ok = any_reachable or total_findings > 0
         scan.status = "COMPLETED" if scan_finished_ok else "FAILED"
@@ -1626,6 +1743,7 @@ def _run_pentest_background(
             status=scan.status,
             findings_count=total_findings,
         )
+        clear_checkpoint(scan_id)
 
     except Exception:
         logger.exception("Pentest background failed for scan %s", scan_id)
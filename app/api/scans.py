@@ -11,6 +11,7 @@ from app.scanners.registry import SCANNERS
 from app.storage.file_storage import save_scan_result, _safe_name
 from app.storage.minio_client import upload_file_to_minio
 from app.database.session import SessionLocal
+from app.database.bulk import bulk_insert_scan_results, bulk_upsert_subdomains
 import json
 import asyncio
 from pydantic import BaseModel, Field
@@ -30,15 +31,18 @@ from app.database.models import (
     Pentest,
 )
 from app.storage.minio_client import download_json, object_exists
-from sqlalchemy import Select, select
+from sqlalchemy import Select, and_, func, or_, select
 from app.api.auth import get_token_claims, get_tenant_usernames
 from app.scanners.api_scanner.main import run_api_scan
 from app.storage.minio_client import MINIO_BUCKET
 from app.database.session import get_db
 from sqlalchemy.orm import Session, selectinload
-from app.scanners.subdomain_scanner.discovery.bruteforce import bruteforce_subdomains
+from app.scanners.subdomain_scanner.discovery.candidates import stream_candidates
 from app.scanners.subdomain_scanner.discovery.passive import fetch_all_passive
-from app.scanners.subdomain_scanner.validation.dns_check import validate_dns
+from app.scanners.subdomain_scanner.validation.dns_check import iter_resolved
+from app.worker.celery_app import PRIORITY_INTERACTIVE, PRIORITY_SCHEDULED
+from app.worker.checkpoints import clear_checkpoint, load_checkpoint, save_checkpoint
+from app.worker.dispatch import dispatch_scan, dispatch_screenshots, use_celery
 
 router = APIRouter(
     prefix="/scans",
@@ -71,10 +75,12 @@ def _create_scan_record_and_start_thread(
     payload_dict: dict,
     created_by: str,
     tenant_users: Optional[List[str]] = None,
+    priority: int = PRIORITY_INTERACTIVE,
 ):
     """
     Shared helper used by both the HTTP endpoint and the scheduler worker.
-    Creates Scan row and starts background processing for dd/subdomain scans.
+    Creates Scan row and starts background processing for dd/subdomain scans
+    (Celery queue or in-process thread, see app.worker.dispatch).
 
     tenant_users: list of usernames belonging to the current tenant.
                   Duplicate-name check is scoped to this list so two tenants
@@ -106,20 +112,12 @@ def _create_scan_record_and_start_thread(
     db.commit()
     db.refresh(scan)
 
-    thread = threading.Thread(
-        target=process_scan_background,
-        args=(str(scan.id), scan_name, scan_type, payload_dict, created_by),
-        daemon=True,
-    )
-    thread.start()
+    dispatch_scan(str(scan.id), scan_name, scan_type, payload_dict, created_by, priority=priority)
     return scan, scan_name
 
 
-def _run_api_scan_and_persist(db: Session, scan_name: str, asset_url: str, endpoints: Optional[List[Dict[str, Any]]], created_by: str):
-    """
-    Run API scan synchronously (same behavior as /scanner/api) and persist to Scan + ApiScanReport.
-    Returns scan_id (uuid string).
-    """
+def _create_api_scan_record(db: Session, scan_name: str, created_by: str) -> Scan:
+    """Create the IN_PROGRESS Scan row for a scheduled API scan (timestamped name on clash)."""
     scan = Scan(
         scan_name=scan_name,
         scan_type="api",
@@ -143,7 +141,14 @@ def _run_api_scan_and_persist(db: Session, scan_name: str, asset_url: str, endpo
             db.refresh(scan)
         else:
             raise
+    return scan
+
 
+def _run_api_scan_and_persist(db: Session, scan: Scan, asset_url: str, endpoints: Optional[List[Dict[str, Any]]]):
+    """
+    Run API scan synchronously (same behavior as /scanner/api) and persist to Scan + ApiScanReport.
+    Used when Celery is not in use; returns scan_id (uuid string).
+    """
     try:
         report = asyncio.run(
             run_api_scan(
@@ -151,6 +156,8 @@ def _run_api_scan_and_persist(db: Session, scan_name: str, asset_url: str, endpo
                 asset_url=asset_url,
                 postman_collection=None,
                 endpoints=endpoints,
+                db=db,
+                scan_id=str(scan.id),
             )
         )
 
@@ -195,11 +202,38 @@ def _run_api_scan_and_persist(db: Session, scan_name: str, asset_url: str, endpo
 
 _schedule_worker_started = False
 _schedule_worker_stop = threading.Event()
+_schedule_worker_wake = threading.Event()
 _schedule_worker_thread: Optional[threading.Thread] = None
 
+_SCHEDULE_INFLIGHT_STATUSES = ("TRIGGERING", "TRIGGERED", "IN_PROGRESS")
+
+
+def _schedule_env_float(name: str, default: float) -> float:
+    try:
+        return max(0.5, float(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+# Longest the dispatcher sleeps when nothing is due (bounds how late a schedule
+# created on another API replica can be picked up).
+SCHEDULE_MAX_IDLE_SECONDS = _schedule_env_float("SCHEDULE_MAX_IDLE_SECONDS", 30.0)
+# How often in-flight schedules are reconciled with their Scan rows.
+SCHEDULE_SYNC_INTERVAL_SECONDS = _schedule_env_float("SCHEDULE_SYNC_INTERVAL_SECONDS", 10.0)
+# Due rows claimed per pass; a full batch triggers an immediate next pass.
+SCHEDULE_DISPATCH_BATCH = int(os.getenv("SCHEDULE_DISPATCH_BATCH", "20"))
+
+
+def wake_schedule_worker() -> None:
+    """Re-plan the dispatcher's sleep now (a schedule was created or moved earlier)."""
+    _schedule_worker_wake.set()
+
 
 def _enqueue_next_recurring_pentest_schedule(db, completed_sched: ScheduledScan) -> None:
-    """After a scheduled pentest run completes, queue the next daily/weekly occurrence (PTaaS-style cadence)."""
+    """After a scheduled pentest run completes, queue the next daily/weekly occurrence (PTaaS-style cadence).
+
+    Only adds the row; the caller commits it together with the status change.
+    """
     if str(completed_sched.scan_type or "") != "pentest":
         return
     try:
@@ -229,13 +263,197 @@ def _enqueue_next_recurring_pentest_schedule(db, completed_sched: ScheduledScan)
         created_at=datetime.utcnow(),
     )
     db.add(new_row)
+
+
+def _sync_triggered_schedules(db: Session) -> int:
+    """
+    Reconcile in-flight schedules with their Scan rows in one joined query.
+
+    Only rows whose status actually needs to change are returned, and they are
+    locked with SKIP LOCKED so concurrent API replicas never process the same
+    row (and never enqueue the same recurring pentest twice).
+    """
+    scan_status = func.upper(Scan.status)
+    rows = (
+        db.query(ScheduledScan, scan_status)
+        .join(Scan, Scan.id == ScheduledScan.triggered_scan_id)
+        .filter(
+            ScheduledScan.status.in_(_SCHEDULE_INFLIGHT_STATUSES),
+            or_(
+                scan_status.in_(["COMPLETED", "FAILED", "TERMINATED"]),
+                and_(
+                    scan_status.in_(["IN_PROGRESS", "PAUSED"]),
+                    ScheduledScan.status != "IN_PROGRESS",
+                ),
+            ),
+        )
+        .order_by(ScheduledScan.scheduled_for.asc())
+        .limit(SCHEDULE_DISPATCH_BATCH * 5)
+        .with_for_update(of=ScheduledScan, skip_locked=True)
+        .all()
+    )
+    for sched, st in rows:
+        if st == "COMPLETED":
+            sched.status = "COMPLETED"
+            try:
+                _enqueue_next_recurring_pentest_schedule(db, sched)
+            except Exception:
+                logger.warning(
+                    "enqueue_next_recurring_pentest_schedule failed",
+                    exc_info=True,
+                )
+        elif st in {"FAILED", "TERMINATED"}:
+            sched.status = "FAILED"
+        else:
+            # Normalize legacy TRIGGERED/TRIGGERING to IN_PROGRESS while running.
+            sched.status = "IN_PROGRESS"
+    db.commit()
+    return len(rows)
+
+
+def _claim_due_schedules(db: Session, now: datetime) -> List[ScheduledScan]:
+    """
+    Atomically claim due PENDING rows (PENDING -> TRIGGERING).
+
+    SELECT ... FOR UPDATE SKIP LOCKED lets every API replica run the dispatcher:
+    each due row is claimed by exactly one of them.
+    """
+    rows = (
+        db.query(ScheduledScan)
+        .filter(ScheduledScan.status == "PENDING", ScheduledScan.scheduled_for <= now)
+        .order_by(ScheduledScan.scheduled_for.asc())
+        .limit(SCHEDULE_DISPATCH_BATCH)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    for sched in rows:
+        sched.status = "TRIGGERING"
     db.commit()
+    return rows
+
+
+def _trigger_schedule(db: Session, sched: ScheduledScan) -> None:
+    """Start the scan for a claimed (TRIGGERING) schedule row and record the outcome."""
+    try:
+        payload = {}
+        try:
+            payload = json.loads(sched.payload_json or "{}")
+        except Exception:
+            payload = {}
+
+        created_by = sched.created_by or "scheduler"
+
+        if sched.scan_type == "pentest":
+            from app.api.pentests import _start_pentest_scan_job
+
+            pentest_id_run = payload.get("pentest_id")
+            if not pentest_id_run:
+                raise ValueError("pentest_id is required for pentest scheduled scan")
+            pentest_run = (
+                db.query(Pentest)
+                .filter(Pentest.id == UUID(str(pentest_id_run)))
+                .first()
+            )
+            if not pentest_run:
+                raise ValueError("pentest not found")
+            if str(pentest_run.status or "").upper() == "SCANNING":
+                # Previous run still going: release the claim and retry later.
+                sched.status = "PENDING"
+                sched.scheduled_for = datetime.utcnow() + timedelta(minutes=30)
+                db.commit()
+                return
+            _start_pentest_scan_job(db, pentest_run, created_by, priority=PRIORITY_SCHEDULED)
+            db.refresh(pentest_run)
+            if not pentest_run.last_scan_id:
+                raise ValueError("pentest scan did not acquire last_scan_id")
+            scan_id = str(pentest_run.last_scan_id)
+            sched.status = "IN_PROGRESS"
+        elif sched.scan_type == "api":
+            asset_url = payload.get("asset_url") or payload.get("assetUrl")
+            endpoints = payload.get("endpoints")
+            if not asset_url:
+                raise ValueError("asset_url is required for api scheduled scan")
+            if not isinstance(endpoints, list) or not endpoints:
+                raise ValueError("endpoints list is required for api scheduled scan")
+            scan = _create_api_scan_record(db, sched.scan_name, created_by)
+            scan_id = str(scan.id)
+            if use_celery():
+                from app.worker.tasks import run_api_scan_task
+
+                run_api_scan_task.apply_async(
+                    kwargs={
+                        "scan_id": scan_id,
+                        "scan_name": scan.scan_name,
+                        "asset_url": asset_url,
+                        "endpoints": endpoints,
+                    },
+                    priority=PRIORITY_SCHEDULED,
+                )
+                # Runs on the scans.api queue; the sync pass tracks its outcome.
+                sched.status = "IN_PROGRESS"
+            else:
+                _run_api_scan_and_persist(db, scan, asset_url, endpoints)
+                # API scan is run synchronously here, so mark schedule as COMPLETED.
+                sched.status = "COMPLETED"
+        else:
+            scan, _final_name = _create_scan_record_and_start_thread(
+                db, sched.scan_name, sched.scan_type, payload, created_by,
+                priority=PRIORITY_SCHEDULED,
+            )
+            scan_id = str(scan.id)
+            # DD/Subdomain scans run async; reflect that in schedule history.
+            sched.status = "IN_PROGRESS"
+        try:
+            sched.triggered_scan_id = UUID(scan_id)
+        except Exception:
+            sched.triggered_scan_id = None
+        sched.triggered_at = datetime.utcnow()
+        sched.error = None
+        db.commit()
+    except Exception as e:
+        try:
+            db.rollback()
+        except Exception:
+            pass
+        try:
+            sched.status = "FAILED"
+            sched.error = str(e)
+            db.commit()
+        except Exception:
+            pass
+
+
+def _next_schedule_wake_delay(db: Session, now: datetime) -> float:
+    """Seconds until the earliest PENDING schedule is due (bounded by the idle/sync caps)."""
+    delay = SCHEDULE_MAX_IDLE_SECONDS
+    next_due = (
+        db.query(func.min(ScheduledScan.scheduled_for))
+        .filter(ScheduledScan.status == "PENDING")
+        .scalar()
+    )
+    if next_due is not None:
+        delay = min(delay, (next_due - now).total_seconds())
+    has_inflight = (
+        db.query(ScheduledScan.id)
+        .filter(ScheduledScan.status.in_(_SCHEDULE_INFLIGHT_STATUSES))
+        .limit(1)
+        .first()
+    )
+    if has_inflight:
+        delay = min(delay, SCHEDULE_SYNC_INTERVAL_SECONDS)
+    return max(0.5, delay)
 
 
 def start_schedule_worker():
     """
-    Start a lightweight background worker that polls `scheduled_scans` and triggers due scans.
+    Start the scheduled-scan dispatcher thread.
     Safe to call multiple times (starts only once).
+
+    Instead of polling on a fixed tick, the dispatcher sleeps until the earliest
+    PENDING `scheduled_for` (capped by SCHEDULE_MAX_IDLE_SECONDS, and by
+    SCHEDULE_SYNC_INTERVAL_SECONDS while scans are in flight) or until
+    wake_schedule_worker() is called. Rows are claimed with SKIP LOCKED, so it
+    is safe to run in every API replica.
     """
     global _schedule_worker_started, _schedule_worker_thread
     if _schedule_worker_started:
@@ -245,152 +463,36 @@ def start_schedule_worker():
     def _loop():
         logger.info("🕒 Scheduled scan worker started")
         while not _schedule_worker_stop.is_set():
+            delay = SCHEDULE_MAX_IDLE_SECONDS
             db = SessionLocal()
             try:
                 # 1) Update status of already-triggered schedules based on the underlying Scan status
-                in_progress = (
-                    db.query(ScheduledScan)
-                    .filter(
-                        ScheduledScan.triggered_scan_id.isnot(None),
-                        ScheduledScan.status.in_(["TRIGGERING", "TRIGGERED", "IN_PROGRESS"]),
-                    )
-                    .order_by(ScheduledScan.scheduled_for.asc())
-                    .limit(50)
-                    .all()
-                )
-                for sched in in_progress:
-                    try:
-                        scan = None
-                        try:
-                            scan = db.query(Scan).filter(Scan.id == sched.triggered_scan_id).first()
-                        except Exception:
-                            scan = None
-                        if not scan:
-                            continue
-                        st = str(getattr(scan, "status", "") or "").upper()
-                        if st == "COMPLETED":
-                            sched.status = "COMPLETED"
-                            db.commit()
-                            try:
-                                _enqueue_next_recurring_pentest_schedule(db, sched)
-                            except Exception:
-                                logger.warning(
-                                    "enqueue_next_recurring_pentest_schedule failed",
-                                    exc_info=True,
-                                )
-                        elif st in {"FAILED", "TERMINATED"}:
-                            sched.status = "FAILED"
-                            db.commit()
-                        elif st in {"IN_PROGRESS", "PAUSED"}:
-                            # Normalize legacy TRIGGERED/TRIGGERING to IN_PROGRESS while running.
-                            if sched.status != "IN_PROGRESS":
-                                sched.status = "IN_PROGRESS"
-                                db.commit()
-                    except Exception:
-                        try:
-                            db.rollback()
-                        except Exception:
-                            pass
+                _sync_triggered_schedules(db)
 
+                # 2) Claim and trigger due schedules
                 now = datetime.utcnow()
-                due = (
-                    db.query(ScheduledScan)
-                    .filter(ScheduledScan.status == "PENDING", ScheduledScan.scheduled_for <= now)
-                    .order_by(ScheduledScan.scheduled_for.asc())
-                    .limit(20)
-                    .all()
-                )
-                for sched in due:
-                    try:
-                        payload = {}
-                        try:
-                            payload = json.loads(sched.payload_json or "{}")
-                        except Exception:
-                            payload = {}
-
-                        created_by = sched.created_by or "scheduler"
-
-                        if sched.scan_type == "pentest":
-                            pentest_id_pre = payload.get("pentest_id")
-                            if not pentest_id_pre:
-                                raise ValueError("pentest_id is required for pentest scheduled scan")
-                            pentest_waiting = (
-                                db.query(Pentest)
-                                .filter(Pentest.id == UUID(str(pentest_id_pre)))
-                                .first()
-                            )
-                            if not pentest_waiting:
-                                raise ValueError("pentest not found")
-                            if str(pentest_waiting.status or "").upper() == "SCANNING":
-                                sched.scheduled_for = datetime.utcnow() + timedelta(minutes=30)
-                                db.commit()
-                                continue
-
-                        sched.status = "TRIGGERING"
-                        db.commit()
+                claimed = _claim_due_schedules(db, now)
+                for sched in claimed:
+                    _trigger_schedule(db, sched)
 
-                        if sched.scan_type == "api":
-                            asset_url = payload.get("asset_url") or payload.get("assetUrl")
-                            endpoints = payload.get("endpoints")
-                            if not asset_url:
-                                raise ValueError("asset_url is required for api scheduled scan")
-                            if not isinstance(endpoints, list) or not endpoints:
-                                raise ValueError("endpoints list is required for api scheduled scan")
-                            scan_id = _run_api_scan_and_persist(db, sched.scan_name, asset_url, endpoints, created_by)
-                            # API scan is run synchronously here, so mark schedule as COMPLETED.
-                            sched.status = "COMPLETED"
-                        elif sched.scan_type == "pentest":
-                            from app.api.pentests import _start_pentest_scan_job
-
-                            pentest_id_run = payload.get("pentest_id")
-                            pentest_run = (
-                                db.query(Pentest)
-                                .filter(Pentest.id == UUID(str(pentest_id_run)))
-                                .first()
-                            )
-                            if not pentest_run:
-                                raise ValueError("pentest not found")
-                            _start_pentest_scan_job(db, pentest_run, created_by)
-                            db.refresh(pentest_run)
-                            if not pentest_run.last_scan_id:
-                                raise ValueError("pentest scan did not acquire last_scan_id")
-                            scan_id = str(pentest_run.last_scan_id)
-                            sched.status = "IN_PROGRESS"
-                        else:
-                            scan, _final_name = _create_scan_record_and_start_thread(
-                                db, sched.scan_name, sched.scan_type, payload, created_by
-                            )
-                            scan_id = str(scan.id)
-                            # DD/Subdomain scans run async; reflect that in schedule history.
-                            sched.status = "IN_PROGRESS"
-                        try:
-                            sched.triggered_scan_id = UUID(scan_id)
-                        except Exception:
-                            sched.triggered_scan_id = None
-                        sched.triggered_at = datetime.utcnow()
-                        sched.error = None
-                        db.commit()
-                    except Exception as e:
-                        try:
-                            db.rollback()
-                        except Exception:
-                            pass
-                        try:
-                            sched.status = "FAILED"
-                            sched.error = str(e)
-                            db.commit()
-                        except Exception:
-                            pass
+                # 3) Plan the next wake-up; a full batch means more rows may be due.
+                if len(claimed) >= SCHEDULE_DISPATCH_BATCH:
+                    delay = 0.0
+                else:
+                    delay = _next_schedule_wake_delay(db, datetime.utcnow())
             except Exception as e:
                 logger.error(f"Scheduled scan worker error: {e}", exc_info=True)
                 try:
                     db.rollback()
                 except Exception:
                     pass
+                delay = 2.0
             finally:
                 db.close()
 
-            _schedule_worker_stop.wait(2.0)
+            if delay > 0:
+                _schedule_worker_wake.wait(delay)
+            _schedule_worker_wake.clear()
 
         logger.info("🕒 Scheduled scan worker stopped")
 
@@ -400,10 +502,21 @@ def start_schedule_worker():
 
 def stop_schedule_worker():
     _schedule_worker_stop.set()
+    _schedule_worker_wake.set()
 
 
 def run_scan_with_control(scan_id: str, scan_type: str, payload_dict: dict, pause_event: threading.Event):
-    """Run scan with process control (pause/terminate support)"""
+    """
+    Run scan with process control (pause/terminate support).
+
+    Stage results are checkpointed (app.worker.checkpoints) so a scan whose
+    worker died is resumed from the last completed stage on redelivery.
+    """
+    checkpoint = load_checkpoint(scan_id)
+    if "output" in checkpoint:
+        logger.info(f"Resuming scan {scan_id} from checkpoint: scanner output already available")
+        return checkpoint["output"]
+
     if scan_type != "dd":
         # For other scan types, use the regular scanner
         scanner = SCANNERS.get(scan_type)
@@ -412,6 +525,7 @@ def run_scan_with_control(scan_id: str, scan_type: str, payload_dict: dict, paus
         logger.info(f"[DEBUG] Running scanner '{scan_type}' with payload: {payload_dict}")
         result = scanner.run(payload_dict)
         logger.info(f"[DEBUG] Scanner '{scan_type}' returned: reachable={result.get('preflight_checks', {}).get('reachable')}, findings={len(result.get('findings', {}))}, errors={result.get('messages', {}).get('errors', [])}")
+        save_checkpoint(scan_id, "output", result)
         return result
     
     # For dd scanner, use Popen for control
@@ -433,16 +547,25 @@ def run_scan_with_control(scan_id: str, scan_type: str, payload_dict: dict, paus
 
     _check_terminated()
     _wait_if_paused()
-    passive = fetch_all_passive(domain)
-
-    _check_terminated()
-    _wait_if_paused()
-    brute = bruteforce_subdomains(domain)
-    discovered = list(set(passive).union(brute))
+    passive = checkpoint.get("passive")
+    if passive is None:
+        passive = fetch_all_passive(domain)
+        save_checkpoint(scan_id, "passive", list(passive))
 
     _check_terminated()
     _wait_if_paused()
-    resolved = validate_dns(discovered)
+    resolved = checkpoint.get("resolved")
+    if resolved is None:
+        # Candidates (passive hits, permutations, wordlists) are generated lazily
+        # and resolved concurrently; validated names arrive as lookups finish.
+        resolved = []
+        for name in iter_resolved(stream_candidates(domain, passive), domain=domain):
+            resolved.append(name)
+            if len(resolved) % 500 == 0:
+                logger.info(f"Scan {scan_id}: {len(resolved)} subdomains resolved so far")
+            _check_terminated()
+            _wait_if_paused()
+        save_checkpoint(scan_id, "resolved", list(resolved))
     all_subdomains = list(set(resolved))
 
     # Filter wildcards (simplified - using scanner's filter if available)
@@ -452,13 +575,15 @@ def run_scan_with_control(scan_id: str, scan_type: str, payload_dict: dict, paus
     else:
         valid_subdomains = [s for s in all_subdomains if s.strip()]
 
-    return {
+    result = {
         "scan_type": scan_type,
         "domain": domain,
         "subdomains": valid_subdomains,
         "total_found": len(valid_subdomains),
         "total_before_filtering": len(all_subdomains)
     }
+    save_checkpoint(scan_id, "output", result)
+    return result
 
 
 def process_scan_background(scan_id: str, scan_name: str, scan_type: str, payload_dict: dict, created_by: str):
@@ -515,6 +640,14 @@ def process_scan_background(scan_id: str, scan_name: str, scan_type: str, payloa
             scan_output = run_scan_with_control(scan_id, scan_type, payload_dict, pause_event)
             logger.info(f"Scan completed. Found {len(scan_output.get('subdomains', []))} subdomains")
             
+            # Terminate requests for scans running in a Celery worker only reach
+            # the DB row (running_scans is per-process), so re-read it first.
+            db.refresh(scan)
+            if str(scan.status or "").upper() == "TERMINATED":
+                with scan_lock:
+                    if scan_id in running_scans:
+                        running_scans[scan_id]["terminated"] = True
+
             # Check if terminated after scan
             with scan_lock:
                 if running_scans.get(scan_id, {}).get("terminated"):
@@ -658,78 +791,36 @@ def process_scan_background(scan_id: str, scan_name: str, scan_type: str, payloa
                 if not domain or not domain.id:
                     raise ValueError(f"Failed to get or create domain: {domain_name}")
                 
-                # 3b. Get existing subdomains for this domain in one query (more efficient)
-                existing_subdomain_stmt = Select(Subdomain.subdomain_name).filter(
-                    Subdomain.domain_id == domain.id
-                )
-                existing_subdomains_set = set(
-                    db.execute(existing_subdomain_stmt).scalars().all()
-                )
-                logger.info(f"Found {len(existing_subdomains_set)} existing subdomains for domain {domain_name}")
-                
-                # 3c. Save subdomains to both ScanResult (for scan history) and Subdomain (for UI)
-                new_subdomains_to_add = []
-                
-                for subdomain_name in subdomains:
-                    if not subdomain_name or not subdomain_name.strip():
-                        continue
-                    
-                    subdomain_name = subdomain_name.strip()
-                    
-                    try:
-                        # Save to ScanResult table (for scan history)
-                        result = ScanResult(
-                            scan_id=scan.id,
-                            domain=domain_name,
-                            subdomain=subdomain_name,
-                        )
-                        db.add(result)
-                        saved_count += 1
-                        
-                        # Check if subdomain already exists (using in-memory set for efficiency)
-                        if subdomain_name not in existing_subdomains_set:
-                            # Mark as existing to avoid duplicates in this batch
-                            existing_subdomains_set.add(subdomain_name)
-                            new_subdomains_to_add.append(subdomain_name)
-                        
-                    except Exception as e:
-                        logger.error(f"Error adding subdomain {subdomain_name} to ScanResult: {e}")
-                        continue
-                
-                # 3d. Batch insert new subdomains
-                if new_subdomains_to_add:
-                    logger.info(f"Adding {len(new_subdomains_to_add)} new subdomains to Subdomain table")
-                    for subdomain_name in new_subdomains_to_add:
-                        try:
-                            subdomain = Subdomain(
-                                domain_id=domain.id,
-                                subdomain_name=subdomain_name,
-                                discovery_source="auto_discovered",
-                                created_by=created_by,
-                                updated_by=created_by
-                            )
-                            db.add(subdomain)
-                            subdomain_saved_count += 1
-                        except Exception as e:
-                            logger.error(f"Error adding subdomain {subdomain_name} to Subdomain table: {e}")
-                            # Continue with other subdomains even if one fails
-                            continue
-                
-                # 3e. Commit all changes
+                # 3b. Bulk-insert ScanResult rows (scan history) and new Subdomain rows (UI)
+                try:
+                    saved_count, _dup_results = bulk_insert_scan_results(
+                        db, scan.id, domain_name, subdomains
+                    )
+                    subdomain_saved_count, existing_count = bulk_upsert_subdomains(
+                        db, domain.id, subdomains, created_by
+                    )
+                    db.commit()
+                except Exception as e:
+                    logger.error(f"❌ Error committing subdomains to database: {e}")
+                    db.rollback()
+                    raise
+
                 if saved_count > 0 or subdomain_saved_count > 0:
-                    try:
-                        db.commit()
-                        logger.info(
-                            f"✅ Successfully saved {saved_count} scan results and "
-                            f"{subdomain_saved_count} new subdomains to database for domain {domain_name}"
-                        )
-                    except Exception as e:
-                        logger.error(f"❌ Error committing subdomains to database: {e}")
-                        db.rollback()
-                        raise
+                    logger.info(
+                        f"✅ Successfully saved {saved_count} scan results and "
+                        f"{subdomain_saved_count} new subdomains to database for domain {domain_name} "
+                        f"({existing_count} already known)"
+                    )
                 else:
                     logger.warning(f"No new subdomains to save for domain {domain_name} (all may already exist)")
 
+                # Opt-in screenshots run on their own queue, never on the scan path
+                if payload_dict.get("screenshots"):
+                    try:
+                        dispatch_screenshots(str(scan.id), list(subdomains))
+                    except Exception as e:
+                        logger.warning(f"Could not queue screenshots for scan {scan.id}: {e}")
+
                 # 3f. Persist vulnerabilities for Subdomain scans (so they show in Vulnerability page)
                 if scan_type == "subdomain":
                     try:
@@ -1165,6 +1256,8 @@ def process_scan_background(scan_id: str, scan_name: str, scan_type: str, payloa
                 logger.error(f"❌ Failed to upload {object_name} to MinIO: {upload_error}")
                 # Don't roll back the database transaction for upload failures
 
+            clear_checkpoint(scan_id)
+
         except InterruptedError as exc:
             # Scan was terminated - check if it's still marked as terminated
             with scan_lock:
@@ -1295,7 +1388,7 @@ def create_scan(
         scan, final_scan_name = _create_scan_record_and_start_thread(
             db, scan_name, scan_type, payload_dict, created_by, tenant_users=tenant_users
         )
-        logger.info(f"Started background thread for scan {scan.id}")
+        logger.info(f"Started background processing for scan {scan.id}")
 
         # 3️⃣ Return immediately with scan info
         return {
@@ -1344,6 +1437,7 @@ def create_scheduled_scan(
     db.add(sched)
     db.commit()
     db.refresh(sched)
+    wake_schedule_worker()
     return {
         "id": str(sched.id),
         "scan_name": sched.scan_name,
@@ -1451,6 +1545,7 @@ def update_scheduled_scan(
 
     sched.scheduled_for = scheduled_for
     db.commit()
+    wake_schedule_worker()
     return {
         "message": "Updated",
         "id": schedule_id,
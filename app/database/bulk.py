@@ -0,0 +1,108 @@
+"""
+Bulk persistence helpers for large discovery results.
+
+A DD scan can return tens of thousands of subdomains; adding one ORM object per
+row (and catching IntegrityError row by row on races) made persistence take
+minutes after discovery had already finished. These helpers issue multi-row
+``INSERT ... ON CONFLICT DO NOTHING`` statements in fixed-size chunks instead.
+"""
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Tuple
+
+from sqlalchemy import Select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.database.models import ScanResult, Subdomain
+
+logger = logging.getLogger(__name__)
+
+BULK_CHUNK_SIZE = 2000
+
+
+def _clean_names(names: Iterable[str]) -> List[str]:
+    """Strip, drop empties and de-duplicate while keeping first-seen order."""
+    seen = set()
+    cleaned: List[str] = []
+    for name in names or []:
+        if not isinstance(name, str):
+            continue
+        name = name.strip()
+        if not name or name in seen:
+            continue
+        seen.add(name)
+        cleaned.append(name)
+    return cleaned
+
+
+def _chunks(rows: List[Dict[str, Any]], size: int = BULK_CHUNK_SIZE):
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+def bulk_insert_scan_results(db: Session, scan_id, domain: str, subdomains: Iterable[str]) -> Tuple[int, int]:
+    """
+    Insert one ScanResult per unique subdomain for ``scan_id``.
+
+    Returns ``(inserted, existing)``. Does not commit.
+    """
+    names = _clean_names(subdomains)
+    if not names:
+        return 0, 0
+
+    inserted = 0
+    rows = [{"scan_id": scan_id, "domain": domain, "subdomain": name} for name in names]
+    for chunk in _chunks(rows):
+        stmt = pg_insert(ScanResult).values(chunk).on_conflict_do_nothing()
+        result = db.execute(stmt.returning(ScanResult.id))
+        inserted += len(result.fetchall())
+    return inserted, len(names) - inserted
+
+
+def bulk_upsert_subdomains(
+    db: Session,
+    domain_id,
+    subdomains: Iterable[str],
+    created_by: str,
+    discovery_source: str = "auto_discovered",
+) -> Tuple[int, int]:
+    """
+    Insert subdomains that are not yet recorded for ``domain_id``.
+
+    Existing names are filtered with a single lookup; ON CONFLICT DO NOTHING
+    covers rows inserted concurrently by another writer (scan pipeline vs MinIO
+    ingestion). Returns ``(inserted, existing)``. Does not commit.
+    """
+    names = _clean_names(subdomains)
+    if not names:
+        return 0, 0
+
+    existing = set(
+        db.execute(
+            Select(Subdomain.subdomain_name).filter(Subdomain.domain_id == domain_id)
+        ).scalars().all()
+    )
+    now = datetime.utcnow()
+    rows = [
+        {
+            "domain_id": domain_id,
+            "subdomain_name": name,
+            "discovery_source": discovery_source,
+            "created_by": created_by,
+            "updated_by": created_by,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for name in names
+        if name not in existing
+    ]
+
+    inserted = 0
+    for chunk in _chunks(rows):
+        stmt = pg_insert(Subdomain).values(chunk).on_conflict_do_nothing()
+        result = db.execute(stmt.returning(Subdomain.id))
+        inserted += len(result.fetchall())
+    return inserted, len(names) - inserted
@@ -1,9 +1,22 @@
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+from uuid import uuid4
+
+from fastapi import APIRouter, Depends, HTTPException
 
 from app.api.auth import get_token_claims
 from app.endpoints.request_body import SubdomainScanRequest
 from app.scanners.subdomain_scanner.scan import run_subdomain_scan
 from app.scanners.subdomain_scanner.reporter.exporter import export_json, export_pdf
+from app.storage.minio_client import upload_bytes_to_minio
+
+logger = logging.getLogger(__name__)
 
 scan_router = APIRouter(
     prefix="/scan/subdomain",
@@ -12,27 +25,140 @@ scan_router = APIRouter(
 )
 
 
-@scan_router.post("/run")
-async def run_scan(
-    payload: SubdomainScanRequest,
-    background_tasks: BackgroundTasks,
-):
+def _env_int(name: str, default: int, upper: int) -> int:
+    try:
+        return max(1, min(upper, int(os.getenv(name, str(default)))))
+    except ValueError:
+        return default
+
+
+SUBDOMAIN_SCAN_WORKERS = _env_int("SUBDOMAIN_SCAN_WORKERS", 2, 16)
+# Finished jobs are kept this long for polling, then pruned.
+SUBDOMAIN_JOB_TTL_SECONDS = _env_int("SUBDOMAIN_JOB_TTL_SECONDS", 3600, 7 * 86400)
+
+# Scans run off the event loop; the pool bounds how many run at once per API worker.
+_executor = ThreadPoolExecutor(max_workers=SUBDOMAIN_SCAN_WORKERS, thread_name_prefix="subdomain-scan")
+_jobs: Dict[str, Dict[str, Any]] = {}
+_jobs_lock = threading.Lock()
+
+
+def _owner(claims: dict) -> str:
+    return str(claims.get("sub") or claims.get("username") or "").strip()
+
+
+def _update_job(job_id: str, **fields) -> None:
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        if job is not None:
+            job.update(fields)
+
+
+def _prune_jobs() -> None:
+    cutoff = time.time() - SUBDOMAIN_JOB_TTL_SECONDS
+    with _jobs_lock:
+        evicted = [
+            _jobs.pop(jid) for jid in [
+                jid for jid, job in _jobs.items()
+                if job.get("finished_at") and job["finished_at"] < cutoff
+            ]
+        ]
+    for job in evicted:
+        if job.get("workdir"):
+            shutil.rmtree(job["workdir"], ignore_errors=True)
+
+
+def _store_export(job_id: str, path: str, content_type: str) -> Dict[str, Any]:
+    """
+    Upload an exported file to object storage and delete the local copy. Without
+    storage the file stays in the job's temp dir until the job is pruned.
+    """
+    object_name: Optional[str] = f"subdomain_scans/{job_id}/{os.path.basename(path)}"
+    try:
+        with open(path, "rb") as fh:
+            _, object_name = upload_bytes_to_minio(fh.read(), object_name, content_type=content_type)
+    except Exception as ex:
+        logger.warning("Subdomain scan job %s: upload of %s failed: %s", job_id, path, ex)
+        object_name = None
+    if not object_name:
+        return {"path": path}
+    os.remove(path)
+    return {"object_name": object_name}
+
+
+def _run_job(job_id: str, payload: SubdomainScanRequest) -> None:
+    """Scan stage, then the requested export stages (export failures don't fail the scan)."""
+    _update_job(job_id, status="running", stage="scan", started_at=time.time())
     try:
         report = run_subdomain_scan(payload.domain, payload.subdomains)
+    except Exception as ex:
+        logger.error("Subdomain scan job %s failed: %s", job_id, ex, exc_info=True)
+        _update_job(job_id, status="failed", stage=None, error=f"Scan failed: {ex}", finished_at=time.time())
+        return
+    _update_job(job_id, data=report)
+
+    exports: Dict[str, Any] = {}
+    stages = []
+    if payload.export_json:
+        stages.append(("json", export_json, "application/json"))
+    if payload.export_pdf:
+        stages.append(("pdf", export_pdf, "application/pdf"))
+    # Exports are written to a per-job temp dir, never the server's CWD
+    workdir = tempfile.mkdtemp(prefix="subdomain_scan_") if stages else None
+    for kind, exporter, content_type in stages:
+        _update_job(job_id, stage=f"export_{kind}")
+        try:
+            path = exporter(report, path=os.path.join(workdir, f"subdomain_scan_{job_id}.{kind}"))
+            exports[kind] = _store_export(job_id, path, content_type)
+        except Exception as ex:
+            logger.warning("Subdomain scan job %s: %s export failed: %s", job_id, kind, ex)
+            exports[kind] = {"error": str(ex)}
+        _update_job(job_id, exports=dict(exports))
 
-        if payload.export_json:
-            background_tasks.add_task(export_json, report)
+    if any("path" in export for export in exports.values()):
+        _update_job(job_id, workdir=workdir)  # removed when the job is pruned
+    elif workdir:
+        shutil.rmtree(workdir, ignore_errors=True)
+    _update_job(job_id, status="completed", stage=None, finished_at=time.time())
 
-        if payload.export_pdf:
-            background_tasks.add_task(export_pdf, report)
 
-        return {
-            "status": "completed",
-            "data": report
+@scan_router.post("/run", status_code=202)
+async def run_scan(
+    payload: SubdomainScanRequest,
+    claims: dict = Depends(get_token_claims),
+):
+    """Submit a subdomain scan; poll GET /scan/subdomain/jobs/{job_id} for the result."""
+    _prune_jobs()
+    job_id = str(uuid4())
+    with _jobs_lock:
+        _jobs[job_id] = {
+            "job_id": job_id,
+            "owner": _owner(claims),
+            "domain": payload.domain,
+            "status": "queued",
+            "stage": None,
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "data": None,
+            "exports": {},
+            "error": None,
         }
+    try:
+        _executor.submit(_run_job, job_id, payload)
+    except RuntimeError as ex:
+        with _jobs_lock:
+            _jobs.pop(job_id, None)
+        raise HTTPException(status_code=503, detail=f"Scan queue unavailable: {ex}")
 
-    except Exception as ex:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Scan failed: {str(ex)}"
-        )
+    return {"status": "queued", "job_id": job_id}
+
+
+@scan_router.get("/jobs/{job_id}")
+async def get_scan_job(job_id: str, claims: dict = Depends(get_token_claims)):
+    with _jobs_lock:
+        job = dict(_jobs.get(job_id) or {})
+    if not job or job.get("owner") != _owner(claims):
+        raise HTTPException(status_code=404, detail="Scan job not found")
+    job.pop("owner", None)
+    job.pop("workdir", None)
+    return job
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict, Optional
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -57,7 +58,66 @@ def build_evidence(
             evidence["response"]["status_code"] = response.status_code
             evidence["response"]["headers"] = dict(response.headers)
             evidence["response"]["body_snippet"] = _truncate(response.text)
+            if getattr(response, "truncated", False) is True:
+                evidence["response"]["body_capped"] = True
         except Exception as exc:
             logger.warning("Failed to capture response evidence: %s", exc)
 
     return evidence
+
+
+class LazyEvidence(Mapping):
+    """
+    Evidence handle returned by execute_request.
+
+    Keeps plain references to the request inputs and the response; the
+    sanitized, truncated evidence dict is only built on first read. Most probe
+    responses never become findings, so they never pay for it. make_finding
+    materializes the handle when a finding is emitted. Request headers/body
+    must not be mutated after the request is sent.
+    """
+
+    __slots__ = ("_inputs", "_built")
+
+    def __init__(
+        self,
+        method: str,
+        url: str,
+        request_headers: Optional[Dict[str, str]] = None,
+        request_body: Any = None,
+        response=None,
+    ):
+        self._inputs = (method, url, request_headers, request_body, response)
+        self._built: Optional[Dict[str, Any]] = None
+
+    def materialize(self) -> Dict[str, Any]:
+        if self._built is None:
+            self._built = build_evidence(*self._inputs)
+            self._inputs = None
+        return self._built
+
+    def __getitem__(self, key: str) -> Any:
+        return self.materialize()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.materialize())
+
+    def __len__(self) -> int:
+        return len(self.materialize())
+
+    def __repr__(self) -> str:
+        if self._built is not None:
+            return f"LazyEvidence({self._built!r})"
+        method, url = self._inputs[0], self._inputs[1]
+        return f"LazyEvidence({method} {url}, pending)"
+
+
+def materialize_evidence(evidence: Any) -> Any:
+    """Resolve LazyEvidence handles, including ones nested in dicts and lists."""
+    if isinstance(evidence, LazyEvidence):
+        return evidence.materialize()
+    if isinstance(evidence, dict):
+        return {k: materialize_evidence(v) for k, v in evidence.items()}
+    if isinstance(evidence, list):
+        return [materialize_evidence(v) for v in evidence]
+    return evidence
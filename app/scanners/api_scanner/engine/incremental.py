@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bump when the fingerprint inputs change, so old baselines trigger a full scan
+FINGERPRINT_VERSION = 1
+
+
+def endpoint_label(endpoint: Dict[str, Any]) -> str:
+    """``METHOD /path`` — the label per-endpoint checks put on their findings."""
+    return f"{endpoint.get('method', 'GET').upper()} {endpoint.get('path', '/')}"
+
+
+def _shape(value: Any) -> Any:
+    """Type skeleton of a sample body: keys and value types, not values."""
+    if isinstance(value, dict):
+        return {key: _shape(value[key]) for key in sorted(value)}
+    if isinstance(value, list):
+        return [_shape(value[0])] if value else []
+    return type(value).__name__
+
+
+def endpoint_fingerprint(endpoint: Dict[str, Any]) -> str:
+    """
+    Hash of everything the per-endpoint checks depend on: method, path,
+    parameters (name, location, type, required), body schema and whether
+    auth is required.
+    """
+    parameters = sorted(
+        (str(p.get("in", "")), str(p.get("name", "")), str(p.get("type", "")), bool(p.get("required", False)))
+        for p in endpoint.get("parameters") or []
+    )
+    canonical = {
+        "v": FINGERPRINT_VERSION,
+        "method": endpoint.get("method", "GET").upper(),
+        "path": endpoint.get("path", "/"),
+        "parameters": parameters,
+        "body": _shape(endpoint.get("body") or {}),
+        "auth_required": bool(endpoint.get("auth_required", True)),
+    }
+    return hashlib.sha256(json.dumps(canonical, sort_keys=True).encode()).hexdigest()[:32]
+
+
+@dataclass
+class IncrementalPlan:
+    to_scan: List[Dict[str, Any]]
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    carried_findings: List[Dict[str, Any]] = field(default_factory=list)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "added": len(self.added),
+            "changed": len(self.changed),
+            "unchanged": len(self.unchanged),
+            "removed": len(self.removed),
+            "carried_findings": len(self.carried_findings),
+        }
+
+
+def plan_incremental(
+    endpoints: List[Dict[str, Any]],
+    baseline_report: Optional[Dict[str, Any]],
+    base_url: str,
+    scan_mode: str,
+) -> Optional[IncrementalPlan]:
+    """
+    Compare ``endpoints`` with the ``incremental`` block of a previous report
+    of the same target. Returns which endpoints need scanning (added or
+    changed) and the earlier per-endpoint findings of the unchanged ones, or
+    None when the baseline can't be used (missing, other target or mode).
+    """
+    state = (baseline_report or {}).get("incremental") or {}
+    previous = state.get("fingerprints")
+    if not isinstance(previous, dict) or state.get("fingerprint_version") != FINGERPRINT_VERSION:
+        return None
+    if state.get("mode") == "partial":
+        logger.info("Incremental baseline is a cancelled scan — running a full scan")
+        return None
+    if state.get("base_url") != base_url or state.get("scan_mode") != scan_mode:
+        logger.info("Incremental baseline is for %s (%s) — running a full scan",
+                    state.get("base_url"), state.get("scan_mode"))
+        return None
+
+    plan = IncrementalPlan(to_scan=[])
+    current: Dict[str, str] = {}
+    for endpoint in endpoints:
+        label = endpoint_label(endpoint)
+        fingerprint = endpoint_fingerprint(endpoint)
+        current[label] = fingerprint
+        if label not in previous:
+            plan.added.append(label)
+            plan.to_scan.append(endpoint)
+        elif previous[label] != fingerprint:
+            plan.changed.append(label)
+            plan.to_scan.append(endpoint)
+        else:
+            plan.unchanged.append(label)
+    plan.removed = [label for label in previous if label not in current]
+
+    # Only findings that per-endpoint checks raised on a still-unchanged
+    # endpoint; scan-wide (global) checks run again every time.
+    unchanged = set(plan.unchanged)
+    endpoint_findings = {tuple(key) for key in state.get("endpoint_findings") or []}
+    for finding in baseline_report.get("findings") or []:
+        key = (finding.get("title", ""), finding.get("endpoint", ""))
+        if key[1] in unchanged and key in endpoint_findings:
+            plan.carried_findings.append({**finding, "carried_forward": True})
+    return plan
+
+
+def incremental_state(
+    endpoints: List[Dict[str, Any]],
+    endpoint_findings: List[Dict[str, Any]],
+    base_url: str,
+    scan_mode: str,
+    plan: Optional[IncrementalPlan] = None,
+    partial: bool = False,
+) -> Dict[str, Any]:
+    """
+    The ``incremental`` report block a later scan diffs against. A ``partial``
+    (cancelled) scan didn't check every fingerprinted endpoint, so it is
+    marked as such and never used as a baseline.
+    """
+    state: Dict[str, Any] = {
+        "fingerprint_version": FINGERPRINT_VERSION,
+        "base_url": base_url,
+        "scan_mode": scan_mode,
+        "mode": "partial" if partial else "incremental" if plan is not None else "full",
+        "fingerprints": {endpoint_label(ep): endpoint_fingerprint(ep) for ep in endpoints},
+        "endpoint_findings": sorted({(f.get("title", ""), f.get("endpoint", "")) for f in endpoint_findings}),
+    }
+    if plan is not None:
+        state.update(plan.summary())
+    return state
+
+
+def load_baseline_report(db, asset_url: str, scan_mode: str) -> Optional[Dict[str, Any]]:
+    """Most recent stored ``ApiScanReport`` of ``asset_url`` usable as an incremental baseline (not a cancelled one)."""
+    from app.database.models import ApiScanReport
+
+    rows = (
+        db.query(ApiScanReport.report_json)
+        .filter(ApiScanReport.asset_url == asset_url, ApiScanReport.report_json.isnot(None))
+        .order_by(ApiScanReport.created_at.desc())
+        .limit(10)
+        .all()
+    )
+    for (report_json,) in rows:
+        try:
+            report = json.loads(report_json)
+        except ValueError:
+            continue
+        state = report.get("incremental") or {}
+        if state.get("fingerprints") and state.get("scan_mode") == scan_mode and state.get("mode") != "partial":
+            return report
+    return None
@@ -3,10 +3,15 @@ from __future__ import annotations
 import asyncio
 import logging
 import os
+import re
+import threading
+import time
 import uuid
+import weakref
+from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +23,17 @@ DEFAULT_OOB_HOST = os.getenv("OOB_HOST", "0.0.0.0")
 DEFAULT_OOB_BASE = os.getenv("OOB_BASE_URL", "")
 
 
+def _grace_seconds() -> float:
+    try:
+        return max(0.0, min(60.0, float(os.getenv("OOB_GRACE_SECONDS", "5"))))
+    except ValueError:
+        return 5.0
+
+
+# How long after the last OOB token was sent a scan keeps waiting for callbacks
+OOB_GRACE_SECONDS = _grace_seconds()
+
+
 @dataclass
 class OOBInteraction:
     token: str
@@ -32,13 +48,43 @@ class OOBInteraction:
     path: Optional[str] = None
 
 
+def _token_prefix(token: str) -> str:
+    """Scan part of a token (<scan prefix>-<type>-<random>)."""
+    return token.split("-", 1)[0]
+
+
+def _scan_prefix(scan_id: Optional[str]) -> str:
+    """
+    Hyphen-free token prefix for a scan: the first 8 alphanumerics of its id,
+    or a random one for scans without an id (CLI, scheduled runs), so concurrent
+    id-less scans never share a prefix.
+    """
+    prefix = re.sub(r"[^0-9A-Za-z]", "", scan_id or "")[:8]
+    return prefix or uuid.uuid4().hex[:8]
+
+
 class OOBCallbackServer:
-    """Lightweight async HTTP server that records OOB interactions."""
+    """
+    Lightweight async HTTP server that records OOB interactions.
+
+    Interactions are indexed by scan prefix and token, and pushed to the queues
+    of trackers subscribed to their prefix as they arrive, so lookups cost the
+    same however many callbacks a long-running listener has seen.
+    """
 
     def __init__(self, host: str = DEFAULT_OOB_HOST, port: int = DEFAULT_OOB_PORT):
         self.host = host
         self.port = port
-        self._interactions: List[OOBInteraction] = []
+        # prefix -> token -> interactions, in arrival order
+        self._index: Dict[str, Dict[str, List[OOBInteraction]]] = defaultdict(lambda: defaultdict(list))
+        # prefix -> queue of each subscribed tracker -> the event loop it is read on
+        # (dropped with their tracker). The listener runs on the loop of whichever
+        # scan started it, so other scans' queues are fed through their own loop.
+        self._subscribers: Dict[str, "weakref.WeakKeyDictionary[asyncio.Queue, asyncio.AbstractEventLoop]"] = (
+            defaultdict(weakref.WeakKeyDictionary)
+        )
+        # Guards _index and _subscribers: scans on other threads read and subscribe
+        self._lock = threading.Lock()
         self._server: Optional[asyncio.AbstractServer] = None
         self._running = False
 
@@ -86,7 +132,10 @@ class OOBCallbackServer:
             # Extract token from path: /oob/<token> or /oob/xxe-dtd/<token>
             token = ""
             if "/oob/" in req_path:
-                token = req_path.split("/oob/")[-1].split("?")[0].split("/")[0]
+                token = req_path.split("/oob/")[-1].split("?")[0]
+                if token.startswith("xxe-dtd/"):
+                    token = token[len("xxe-dtd/"):]
+                token = token.split("/")[0]
 
             # Get source IP
             peername = writer.get_extra_info("peername")
@@ -104,7 +153,7 @@ class OOBCallbackServer:
                 headers=headers_raw,
                 path=req_path,
             )
-            self._interactions.append(interaction)
+            self.record(interaction)
             logger.info("OOB callback received: %s %s from %s (token=%s)", http_method, req_path, source_ip, token)
 
             # Send minimal HTTP response
@@ -123,15 +172,62 @@ class OOBCallbackServer:
         finally:
             writer.close()
 
+    def record(self, interaction: OOBInteraction):
+        """Index an interaction and push it to the trackers watching its scan."""
+        prefix = _token_prefix(interaction.token)
+        with self._lock:
+            self._index[prefix][interaction.token].append(interaction)
+            subscribers = list(self._subscribers.get(prefix, {}).items())
+        try:
+            current = asyncio.get_running_loop()
+        except RuntimeError:
+            current = None
+        for queue, loop in subscribers:
+            if loop is current:
+                queue.put_nowait(interaction)
+                continue
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, interaction)
+            except RuntimeError:  # that scan's loop is already closed
+                pass
+
+    def subscribe(self, prefix: str) -> asyncio.Queue:
+        """
+        Queue receiving every interaction recorded from now on under ``prefix``.
+        Must be called on the event loop the queue will be read on.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        with self._lock:
+            self._subscribers[prefix][queue] = asyncio.get_running_loop()
+        return queue
+
+    def unsubscribe(self, prefix: str, queue: asyncio.Queue):
+        with self._lock:
+            subscribers = self._subscribers.get(prefix)
+            if subscribers is not None:
+                subscribers.pop(queue, None)
+                if not subscribers:
+                    del self._subscribers[prefix]
+
     def get_interactions(self, token: Optional[str] = None) -> List[OOBInteraction]:
         """Get recorded interactions, optionally filtered by token prefix."""
-        if token is None:
-            return list(self._interactions)
-        return [i for i in self._interactions if i.token.startswith(token)]
-
-    def clear(self):
-        """Clear all recorded interactions."""
-        self._interactions.clear()
+        with self._lock:
+            if token is None:
+                return [i for tokens in self._index.values() for bucket in tokens.values() for i in bucket]
+            tokens = self._index.get(_token_prefix(token))
+            if not tokens:
+                return []
+            if token in tokens:
+                return list(tokens[token])
+            return [i for t, bucket in tokens.items() if t.startswith(token) for i in bucket]
+
+    def clear(self, prefix: Optional[str] = None):
+        """Clear recorded interactions (all, or those of one scan prefix)."""
+        with self._lock:
+            if prefix is None:
+                self._index.clear()
+            else:
+                self._index.pop(prefix, None)
 
 
 def _extract_test_type(token: str) -> str:
@@ -160,15 +256,21 @@ class OOBTracker:
 
     def __init__(
         self,
-        scan_id: str,
+        scan_id: Optional[str] = None,
         oob_base_url: str = DEFAULT_OOB_BASE,
         callback_server: Optional[OOBCallbackServer] = None,
     ):
-        self.scan_id = scan_id
+        self.scan_id = scan_id or "no-id"
         self.oob_base_url = oob_base_url.rstrip("/") if oob_base_url else ""
         self._tokens: Dict[str, Dict[str, Any]] = {}  # token -> metadata
         self._callback_server = callback_server
         self._enabled = bool(self.oob_base_url)
+        self._prefix = _scan_prefix(scan_id)
+        self._last_token_at: Optional[float] = None  # monotonic time of the last token handed out
+        self._received: Dict[int, OOBInteraction] = {}  # id(interaction) -> matched interaction
+        self._queue: Optional[asyncio.Queue] = None
+        if self._enabled and callback_server is not None:
+            self._queue = callback_server.subscribe(self._prefix)
 
         if not self._enabled:
             logger.info(
@@ -182,14 +284,14 @@ class OOBTracker:
 
     def generate_token(self, test_type: str, endpoint: str, payload_desc: str) -> str:
         """Generate a unique OOB token and register its metadata."""
-        short_id = self.scan_id[:8] if len(self.scan_id) > 8 else self.scan_id
         random_suffix = uuid.uuid4().hex[:6]
-        token = f"{short_id}-{test_type}-{random_suffix}"
+        token = f"{self._prefix}-{test_type}-{random_suffix}"
         self._tokens[token] = {
             "test_type": test_type,
             "endpoint": endpoint,
             "payload_desc": payload_desc,
         }
+        self._last_token_at = time.monotonic()
         return token
 
     def get_callback_url(self, token: str) -> str:
@@ -212,6 +314,68 @@ class OOBTracker:
         """Get total number of generated tokens."""
         return len(self._tokens)
 
+    def _accept(self, interaction: OOBInteraction) -> bool:
+        """Enrich an interaction with its token metadata; False if the token isn't ours."""
+        meta = self._tokens.get(interaction.token)
+        if meta is None:
+            return False
+        interaction.scan_id = self.scan_id
+        interaction.endpoint = meta.get("endpoint", "")
+        interaction.test_type = meta.get("test_type", interaction.test_type)
+        self._received.setdefault(id(interaction), interaction)
+        return True
+
+    def _drain_queue(self) -> None:
+        if self._queue is None:
+            return
+        while not self._queue.empty():
+            self._accept(self._queue.get_nowait())
+
+    def _all_tokens_answered(self) -> bool:
+        answered = {i.token for i in self._received.values()}
+        return bool(self._tokens) and answered >= self._tokens.keys()
+
+    async def stream_interactions(self) -> AsyncIterator[OOBInteraction]:
+        """Yield callbacks for this scan's tokens as they are pushed; runs until cancelled."""
+        if not self._enabled or self._queue is None:
+            return
+        while True:
+            interaction = await self._queue.get()
+            if self._accept(interaction):
+                yield interaction
+
+    async def wait_for_interactions(self, grace: Optional[float] = None) -> List[OOBInteraction]:
+        """
+        Collect callbacks pushed for this scan's tokens, waiting until ``grace``
+        seconds (default OOB_GRACE_SECONDS) after the last token was handed out.
+        Returns at once when that moment has already passed (or no token was
+        sent), and early when every token has called back.
+        """
+        if not self._enabled:
+            return []
+        if self._queue is None:
+            return await self.check_for_interactions()
+
+        self._drain_queue()
+        if self._last_token_at is not None:
+            deadline = self._last_token_at + (OOB_GRACE_SECONDS if grace is None else grace)
+            while not self._all_tokens_answered():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    interaction = await asyncio.wait_for(self._queue.get(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+                self._accept(interaction)
+
+        interactions = list(self._received.values())
+        logger.debug(
+            "OOB wait: %d interactions found for scan %s (%d tokens registered)",
+            len(interactions), self._prefix, len(self._tokens),
+        )
+        return interactions
+
     async def check_for_interactions(self) -> List[OOBInteraction]:
         """
         Check for OOB interactions by querying the callback server.
@@ -224,26 +388,27 @@ class OOBTracker:
 
         # Check local callback server
         if self._callback_server:
-            short_id = self.scan_id[:8] if len(self.scan_id) > 8 else self.scan_id
-            raw = self._callback_server.get_interactions(short_id)
-            for interaction in raw:
-                # Enrich with metadata from registered tokens
-                if interaction.token in self._tokens:
-                    meta = self._tokens[interaction.token]
-                    interaction.scan_id = self.scan_id
-                    interaction.endpoint = meta.get("endpoint", "")
-                    interaction.test_type = meta.get("test_type", interaction.test_type)
-                    interactions.append(interaction)
+            for token in self._tokens:
+                for interaction in self._callback_server.get_interactions(token):
+                    if self._accept(interaction):
+                        interactions.append(interaction)
 
         logger.debug(
             "OOB check: %d interactions found for scan %s (%d tokens registered)",
-            len(interactions), self.scan_id[:8], len(self._tokens),
+            len(interactions), self._prefix, len(self._tokens),
         )
         return interactions
 
     def has_interactions(self) -> bool:
         """Quick check if any OOB interactions were recorded."""
         if self._callback_server:
-            short_id = self.scan_id[:8] if len(self.scan_id) > 8 else self.scan_id
-            return len(self._callback_server.get_interactions(short_id)) > 0
+            return len(self._callback_server.get_interactions(self._prefix)) > 0
         return False
+
+    def close(self) -> None:
+        """Stop receiving pushed interactions and drop this scan's from the listener."""
+        if self._callback_server is not None:
+            if self._queue is not None:
+                self._callback_server.unsubscribe(self._prefix, self._queue)
+                self._queue = None
+            self._callback_server.clear(self._prefix)
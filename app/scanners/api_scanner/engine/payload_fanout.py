@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import os
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Dict, Iterable, Iterator, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def _probe_concurrency() -> int:
+    try:
+        return max(1, min(32, int(os.getenv("API_PROBE_CONCURRENCY", "6"))))
+    except ValueError:
+        return 6
+
+
+PROBE_CONCURRENCY = _probe_concurrency()
+
+_endpoint_probes: ContextVar[Optional[asyncio.Semaphore]] = ContextVar("api_scan_endpoint_probes", default=None)
+
+
+@contextlib.contextmanager
+def endpoint_probe_limit(limit: Optional[int] = None) -> Iterator[asyncio.Semaphore]:
+    """
+    Share one budget of ``limit`` (default API_PROBE_CONCURRENCY) in-flight
+    probes between every `first_confirmed` fan-out run in this context (and
+    tasks spawned from it), e.g. all the checks of one endpoint.
+    """
+    semaphore = asyncio.Semaphore(max(1, limit or PROBE_CONCURRENCY))
+    token = _endpoint_probes.set(semaphore)
+    try:
+        yield semaphore
+    finally:
+        _endpoint_probes.reset(token)
+
+
+async def first_confirmed(
+    probes: Iterable[T],
+    attempt: Callable[[T], Awaitable[Optional[R]]],
+    limit: Optional[int] = None,
+) -> Optional[R]:
+    """
+    Run ``attempt(probe)`` for each probe with at most ``limit`` in flight and
+    return the first non-None result, cancelling the probes still outstanding.
+    Inside `endpoint_probe_limit` the probes also take a slot of that shared
+    budget, so concurrent fan-outs of one endpoint stay within it together.
+
+    Probes are pulled from the iterable lazily, so a long payload × encoding ×
+    target product is never materialised up front. When several probes confirm
+    in the same wake-up, the one earliest in ``probes`` order wins. Returns None
+    when every probe comes back unconfirmed.
+
+    Cancelled probes stop waiting immediately; a request already handed to the
+    executor thread still runs to completion, but its result is discarded.
+    """
+    limit = max(1, limit or PROBE_CONCURRENCY)
+    shared = _endpoint_probes.get()
+    run = attempt
+    if shared is not None:
+        async def run(probe: T) -> Optional[R]:
+            async with shared:
+                return await attempt(probe)
+
+    source = iter(probes)
+    in_flight: Dict[asyncio.Future, int] = {}
+    next_index = 0
+
+    def _fill() -> None:
+        nonlocal next_index
+        while len(in_flight) < limit:
+            try:
+                probe = next(source)
+            except StopIteration:
+                return
+            in_flight[asyncio.ensure_future(run(probe))] = next_index
+            next_index += 1
+
+    try:
+        _fill()
+        while in_flight:
+            done, _ = await asyncio.wait(in_flight.keys(), return_when=asyncio.FIRST_COMPLETED)
+            confirmed = None
+            for task in sorted(done, key=in_flight.__getitem__):
+                del in_flight[task]
+                result = task.result()
+                if result is not None and confirmed is None:
+                    confirmed = result
+            if confirmed is not None:
+                return confirmed
+            _fill()
+        return None
+    finally:
+        for task in in_flight:
+            task.cancel()
+        if in_flight:
+            await asyncio.gather(*in_flight, return_exceptions=True)
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import hashlib
+import json
 import logging
+import os
 import time
-from typing import Any, Dict, Optional, Tuple, Union
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
 
 import requests as req_lib
 
-from app.scanners.api_scanner.engine.evidence_collector import build_evidence
+from app.scanners.api_scanner.engine.evidence_collector import LazyEvidence
+from app.scanners.instrumentation import record_request
 
 logger = logging.getLogger(__name__)
 
@@ -15,30 +21,101 @@ DEFAULT_TIMEOUT = 5
 MAX_RETRIES = 2
 RETRY_BACKOFF = 0.5  # seconds, doubles each retry
 
+# Methods whose identical in-flight requests may share one network call
+COALESCE_METHODS = {"GET", "HEAD", "OPTIONS"}
 
-async def execute_request(
-    method: str,
-    url: str,
-    headers: Optional[Dict[str, str]] = None,
-    body: Optional[Dict[str, Any]] = None,
-    raw_body: Optional[str] = None,
-    timeout: int = DEFAULT_TIMEOUT,
-) -> Tuple[Optional[req_lib.Response], Dict[str, Any]]:
+_READ_CHUNK = 64 * 1024
+
+
+def _max_body_bytes() -> int:
+    try:
+        return max(64 * 1024, min(64 * 1024 * 1024, int(os.getenv("API_MAX_RESPONSE_BYTES", "2097152"))))
+    except ValueError:
+        return 2 * 1024 * 1024
+
+
+MAX_BODY_BYTES = _max_body_bytes()
+
+
+def _read_bounded(response: req_lib.Response, limit: int) -> None:
     """
-    Execute an HTTP request and return (response, evidence).
+    Stream at most ``limit`` (decoded) body bytes into the response, close the
+    connection, and set ``response.truncated``. Afterwards ``.content`` and
+    ``.text`` behave as usual over the capped body.
+    """
+    chunks = []
+    size = 0
+    truncated = False
+    try:
+        for chunk in response.iter_content(chunk_size=_READ_CHUNK):
+            if size + len(chunk) > limit:
+                chunks.append(chunk[:limit - size])
+                truncated = True
+                break
+            chunks.append(chunk)
+            size += len(chunk)
+    finally:
+        response.close()
+    response._content = b"".join(chunks)
+    response._content_consumed = True
+    response.truncated = truncated
+    if response.encoding is None:
+        # Skip charset sniffing over the body on every .text access
+        response.encoding = "utf-8"
 
-    Args:
-        method: HTTP method (GET, POST, etc.)
-        url: Target URL
-        headers: Request headers
-        body: JSON body (sent as json=)
-        raw_body: Raw string body (sent as data=) — use for XML, form data, etc.
-        timeout: Request timeout in seconds
 
-    Uses run_in_executor for Celery compatibility.
-    Retries up to MAX_RETRIES times on transient errors (timeout, connection reset).
+class RequestCoalescer:
+    """Scan-scoped single-flight table: identical in-flight requests share one call."""
+
+    def __init__(self):
+        self.inflight: Dict[Tuple, asyncio.Future] = {}
+        self.sent = 0
+        self.merged = 0
+
+
+_coalescer: ContextVar[Optional[RequestCoalescer]] = ContextVar("api_scan_coalescer", default=None)
+
+
+@contextlib.contextmanager
+def request_coalescing() -> Iterator[RequestCoalescer]:
     """
+    Enable single-flight coalescing for execute_request calls made in this
+    context (and tasks spawned from it), e.g. for the duration of one scan.
+    """
+    coalescer = RequestCoalescer()
+    token = _coalescer.set(coalescer)
+    try:
+        yield coalescer
+    finally:
+        _coalescer.reset(token)
+
 
+def _coalesce_key(
+    method: str,
+    url: str,
+    headers: Optional[Dict[str, str]],
+    body: Optional[Dict[str, Any]],
+    raw_body: Optional[str],
+    timeout: int,
+) -> Tuple:
+    header_items = tuple(sorted((str(k).lower(), str(v)) for k, v in (headers or {}).items()))
+    if raw_body is not None:
+        digest = hashlib.sha256(raw_body.encode("utf-8", errors="replace")).hexdigest()
+    elif body is not None:
+        digest = hashlib.sha256(json.dumps(body, sort_keys=True, default=str).encode()).hexdigest()
+    else:
+        digest = ""
+    return method.upper(), url, header_items, digest, timeout
+
+
+async def _send(
+    method: str,
+    url: str,
+    headers: Optional[Dict[str, str]],
+    body: Optional[Dict[str, Any]],
+    raw_body: Optional[str],
+    timeout: int,
+) -> Optional[req_lib.Response]:
     def _do():
         kwargs = {
             "method": method,
@@ -47,24 +124,31 @@ async def execute_request(
             "timeout": timeout,
             "allow_redirects": True,
             "verify": False,
+            "stream": True,
         }
         if raw_body is not None:
             kwargs["data"] = raw_body
         elif body is not None:
             kwargs["json"] = body
-        return req_lib.request(**kwargs)
+        started = time.monotonic()
+        response = req_lib.request(**kwargs)
+        _read_bounded(response, MAX_BODY_BYTES)
+        return response, time.monotonic() - started
 
     response = None
-    last_error = None
+    latency = None
+    retries = 0
+    timeouts = 0
 
     for attempt in range(MAX_RETRIES + 1):
         try:
             loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(None, _do)
+            response, latency = await loop.run_in_executor(None, _do)
             break  # success
         except req_lib.exceptions.Timeout:
-            last_error = "timeout"
+            timeouts += 1
             if attempt < MAX_RETRIES:
+                retries += 1
                 await asyncio.sleep(RETRY_BACKOFF * (2 ** attempt))
                 continue
             logger.warning("Request timed out after %d attempts: %s %s", attempt + 1, method, url)
@@ -73,7 +157,7 @@ async def execute_request(
             # Retry on transient connection errors (reset, refused), not DNS failures
             is_transient = any(kw in error_str for kw in ["reset", "broken pipe", "connection refused"])
             if is_transient and attempt < MAX_RETRIES:
-                last_error = "connection_reset"
+                retries += 1
                 await asyncio.sleep(RETRY_BACKOFF * (2 ** attempt))
                 continue
             logger.warning("Connection error: %s %s", method, url)
@@ -82,5 +166,66 @@ async def execute_request(
             logger.warning("Request failed: %s %s — %s", method, url, exc)
             break
 
-    evidence = build_evidence(method, url, headers, body or raw_body, response)
-    return response, evidence
+    record_request(
+        latency,
+        bytes_received=len(response.content) if response is not None else 0,
+        retries=retries,
+        timeouts=timeouts,
+        failed=response is None,
+    )
+    return response
+
+
+async def execute_request(
+    method: str,
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+    body: Optional[Dict[str, Any]] = None,
+    raw_body: Optional[str] = None,
+    timeout: int = DEFAULT_TIMEOUT,
+    coalesce: bool = True,
+) -> Tuple[Optional[req_lib.Response], LazyEvidence]:
+    """
+    Execute an HTTP request and return (response, evidence).
+
+    ``evidence`` is a LazyEvidence handle: it reads like the evidence dict but
+    is only built if accessed or turned into a finding.
+
+    Args:
+        method: HTTP method (GET, POST, etc.)
+        url: Target URL
+        headers: Request headers
+        body: JSON body (sent as json=)
+        raw_body: Raw string body (sent as data=) — use for XML, form data, etc.
+        timeout: Request timeout in seconds
+        coalesce: Share identical in-flight requests (see below); False for
+            checks that need every request to reach the target, e.g. bursts
+
+    Uses run_in_executor for Celery compatibility.
+    Retries up to MAX_RETRIES times on transient errors (timeout, connection reset).
+
+    The body is streamed and capped at API_MAX_RESPONSE_BYTES (default 2 MiB);
+    ``response.truncated`` tells whether the cap was hit.
+
+    Inside request_coalescing(), identical in-flight GET/HEAD/OPTIONS requests
+    (same URL, headers, body digest and timeout) share one network call and
+    its response object. The shared call is shielded, so a caller being
+    cancelled never cancels it for the others.
+    """
+    coalescer = _coalescer.get()
+    if coalescer is None or not coalesce or method.upper() not in COALESCE_METHODS:
+        response = await _send(method, url, headers, body, raw_body, timeout)
+        return response, LazyEvidence(method, url, headers, body or raw_body, response)
+
+    key = _coalesce_key(method, url, headers, body, raw_body, timeout)
+    shared = coalescer.inflight.get(key)
+    if shared is None:
+        shared = asyncio.ensure_future(_send(method, url, headers, body, raw_body, timeout))
+        coalescer.inflight[key] = shared
+        coalescer.sent += 1
+        shared.add_done_callback(lambda _f: coalescer.inflight.pop(key, None))
+    else:
+        coalescer.merged += 1
+
+    response = await asyncio.shield(shared)
+    return response, LazyEvidence(method, url, headers, body or raw_body, response)
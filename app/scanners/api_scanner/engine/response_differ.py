@@ -3,22 +3,27 @@ from __future__ import annotations
 import hashlib
 import json
 import re
+import weakref
 from dataclasses import dataclass, field
-from typing import List, Optional
+from functools import lru_cache
+from typing import FrozenSet, Iterable, List, Optional, Pattern, Tuple
 
 from requests import Response
 
 
 # --- Normalization patterns for stripping dynamic content -------------------
 
-_UUID_RE = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.IGNORECASE)
-_ISO_TS_RE = re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}[.\dZ+\-]*")
-_UNIX_TS_RE = re.compile(r"\b1[6-9]\d{8}\b")
-_HEX_TOKEN_RE = re.compile(r"\b[0-9a-f]{20,}\b", re.IGNORECASE)
-_DYNAMIC_FIELD_RE = re.compile(
-    r'"(id|token|session|nonce|csrf|request_id|trace_id|correlation_id)"\s*:\s*"[^"]{8,}"'
+# One alternation so a body is scanned once: dynamic JSON fields (replaced as
+# a whole, whatever token they hold), UUIDs, ISO and unix timestamps, and long
+# hex tokens. Whitespace is collapsed afterwards with str.split().
+_DYNAMIC_CONTENT_RE = re.compile(
+    r'"(?P<field>(?-i:id|token|session|nonce|csrf|request_id|trace_id|correlation_id))"\s*:\s*"[^"]{8,}"'
+    r"|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"
+    r"|\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}[.\dZ+\-]*"
+    r"|\b1[6-9]\d{8}\b"
+    r"|\b[0-9a-f]{20,}\b",
+    re.IGNORECASE,
 )
-_MULTI_WS_RE = re.compile(r"\s+")
 
 
 @dataclass
@@ -40,15 +45,14 @@ def _body_text(resp: Optional[Response]) -> str:
         return ""
 
 
+def _replace_dynamic(match: re.Match) -> str:
+    field_name = match.group("field")
+    return f'"{field_name}": "<DYNAMIC>"' if field_name else ""
+
+
 def _normalize_body(text: str) -> str:
     """Strip dynamic content (UUIDs, timestamps, tokens, etc.) before comparison."""
-    text = _UUID_RE.sub("", text)
-    text = _ISO_TS_RE.sub("", text)
-    text = _UNIX_TS_RE.sub("", text)
-    text = _HEX_TOKEN_RE.sub("", text)
-    text = _DYNAMIC_FIELD_RE.sub(lambda m: f'"{m.group(1)}": "<DYNAMIC>"', text)
-    text = _MULTI_WS_RE.sub(" ", text)
-    return text.strip()
+    return " ".join(_DYNAMIC_CONTENT_RE.sub(_replace_dynamic, text).split())
 
 
 def _body_hash(text: str, normalize: bool = True) -> str:
@@ -70,6 +74,53 @@ def _json_keys(resp: Optional[Response]) -> Optional[set]:
     return None
 
 
+@dataclass(frozen=True)
+class ResponseFingerprint:
+    """What comparisons need from a response, computed once per response."""
+    status: Optional[int]
+    length: int
+    body_hash: str  # md5 of the normalized body
+    json_keys: Optional[FrozenSet[str]]  # top-level keys of a JSON object body
+
+    @property
+    def signature(self) -> str:
+        return f"{self.status}:{self.body_hash}"
+
+
+_NO_RESPONSE = ResponseFingerprint(None, 0, _body_hash(""), None)
+
+_fingerprints: "weakref.WeakKeyDictionary[Response, ResponseFingerprint]" = weakref.WeakKeyDictionary()
+
+
+def fingerprint(resp: Optional[Response]) -> ResponseFingerprint:
+    """Fingerprint of *resp*, cached for the lifetime of the response object.
+
+    Responses are not modified once read, and a coalesced response is shared
+    by every check that asked for it, so each body is normalized, hashed and
+    JSON-parsed at most once per scan.
+    """
+    if resp is None:
+        return _NO_RESPONSE
+    try:
+        return _fingerprints[resp]
+    except (KeyError, TypeError):
+        pass
+
+    text = _body_text(resp)
+    keys = _json_keys(resp) if text.lstrip().startswith("{") else None
+    fp = ResponseFingerprint(
+        status=resp.status_code,
+        length=len(text),
+        body_hash=_body_hash(text),
+        json_keys=frozenset(keys) if keys is not None else None,
+    )
+    try:
+        _fingerprints[resp] = fp
+    except TypeError:
+        pass  # not weak-referenceable: just don't cache
+    return fp
+
+
 def _compute_body_length_ratio(baseline_len: int, test_len: int) -> float:
     if baseline_len == 0:
         return float(test_len) if test_len > 0 else 1.0
@@ -147,22 +198,19 @@ def compare_responses(
             verdict="DIFFERENT",
         )
 
+    baseline_fp = fingerprint(baseline_resp)
+    test_fp = fingerprint(test_resp)
+
     # --- Status code ----------------------------------------------------------
-    status_same = baseline_resp.status_code == test_resp.status_code
+    status_same = baseline_fp.status == test_fp.status
 
     # --- Body -----------------------------------------------------------------
-    baseline_text = _body_text(baseline_resp)
-    test_text = _body_text(test_resp)
-
-    hash_same = _body_hash(baseline_text) == _body_hash(test_text)
-
-    baseline_len = len(baseline_text)
-    test_len = len(test_text)
-    length_ratio = _compute_body_length_ratio(baseline_len, test_len)
+    hash_same = baseline_fp.body_hash == test_fp.body_hash
+    length_ratio = _compute_body_length_ratio(baseline_fp.length, test_fp.length)
 
     # --- JSON structure -------------------------------------------------------
-    baseline_keys = _json_keys(baseline_resp)
-    test_keys = _json_keys(test_resp)
+    baseline_keys = baseline_fp.json_keys
+    test_keys = test_fp.json_keys
 
     json_key_overlap: Optional[float] = None
     if baseline_keys is not None and test_keys is not None:
@@ -198,10 +246,36 @@ def responses_are_same(
     if baseline_resp is None or test_resp is None:
         return False
 
-    if baseline_resp.status_code != test_resp.status_code:
-        return False
+    baseline_fp = fingerprint(baseline_resp)
+    test_fp = fingerprint(test_resp)
+    return baseline_fp.status == test_fp.status and baseline_fp.body_hash == test_fp.body_hash
+
+
+def response_signature(resp: Optional[Response]) -> str:
+    """Equivalence-class key for a response: status code plus normalized body hash."""
+    if resp is None:
+        return "none"
+    return fingerprint(resp).signature
 
-    return _body_hash(_body_text(baseline_resp)) == _body_hash(_body_text(test_resp))
+
+@lru_cache(maxsize=512)
+def _keyword_pattern(keywords: Tuple[str, ...]) -> Pattern[str]:
+    # Longest first so an alternation never stops at a shorter prefix
+    ordered = sorted(set(keywords), key=len, reverse=True)
+    return re.compile("|".join(re.escape(k) for k in ordered), re.IGNORECASE)
+
+
+def find_keyword(text: Optional[str], keywords: Iterable[str]) -> Optional[str]:
+    """Earliest keyword occurring in *text* (case-insensitive, no lowered copy), lowercased.
+
+    Pass a tuple for keyword lists that are checked often; the compiled
+    pattern is cached per tuple.
+    """
+    keywords = tuple(k for k in keywords if k)
+    if not text or not keywords:
+        return None
+    match = _keyword_pattern(keywords).search(text)
+    return match.group(0).lower() if match else None
 
 
 def has_new_content(
@@ -218,13 +292,12 @@ def has_new_content(
     if not keywords:
         return []
 
-    baseline_lower = _body_text(baseline_resp).lower()
-    test_lower = _body_text(test_resp).lower()
+    baseline_text = _body_text(baseline_resp)
+    test_text = _body_text(test_resp)
 
     new: List[str] = []
     for kw in keywords:
-        kw_lower = kw.lower()
-        if kw_lower in test_lower and kw_lower not in baseline_lower:
+        if find_keyword(test_text, (kw,)) and not find_keyword(baseline_text, (kw,)):
             new.append(kw)
 
     return new
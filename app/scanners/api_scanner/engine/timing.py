@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import os
+import statistics
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from requests import Response
+
+from app.scanners.instrumentation import SCAN_ABORTS, check_scope
+
+logger = logging.getLogger(__name__)
+
+
+def _env_int(name: str, default: int, lower: int, upper: int) -> int:
+    try:
+        return max(lower, min(upper, int(os.getenv(name, str(default)))))
+    except ValueError:
+        return default
+
+
+# Timing checks of different endpoints that may run at once (the timing lane)
+TIMING_CONCURRENCY = _env_int("API_TIMING_CONCURRENCY", 2, 1, 8)
+# Baseline latency samples taken per endpoint
+BASELINE_SAMPLES = _env_int("API_TIMING_BASELINE_SAMPLES", 5, 3, 20)
+# Delays (seconds) used to screen and then confirm a payload
+SHORT_DELAY = 2
+LONG_DELAY = 5
+
+# Two-sided 95% Student t quantiles by degrees of freedom
+_T95 = {1: 12.71, 2: 4.30, 3: 3.18, 4: 2.78, 5: 2.57, 6: 2.45, 7: 2.36, 8: 2.31, 9: 2.26,
+        10: 2.23, 12: 2.18, 15: 2.13, 20: 2.09}
+
+ResponsePair = Tuple[Optional[Response], Dict[str, Any]]
+
+
+def _t95(df: int) -> float:
+    if df <= 0:
+        return _T95[1]
+    for key in sorted(_T95):
+        if df <= key:
+            return _T95[key]
+    return 1.96
+
+
+def response_latency(resp: Optional[Response]) -> Optional[float]:
+    """
+    Server latency in seconds (request sent → response headers parsed), or None
+    when there is no response. Uses ``Response.elapsed`` so executor queueing
+    under a busy scan does not count as delay.
+    """
+    if resp is None:
+        return None
+    try:
+        return resp.elapsed.total_seconds()
+    except Exception:
+        return None
+
+
+@dataclass
+class LatencyBaseline:
+    samples: List[float]
+
+    @property
+    def mean(self) -> float:
+        return statistics.fmean(self.samples) if self.samples else 0.0
+
+    @property
+    def stdev(self) -> float:
+        return statistics.stdev(self.samples) if len(self.samples) > 1 else 0.0
+
+    @property
+    def margin(self) -> float:
+        """Half-width of the 95% prediction interval for one more benign request."""
+        n = len(self.samples)
+        if n < 2:
+            return 0.0
+        return _t95(n - 1) * self.stdev * math.sqrt(1 + 1 / n)
+
+
+@dataclass
+class TimingResult:
+    payload: str  # template with a {delay} placeholder
+    short_delay: int
+    long_delay: int
+    baseline: LatencyBaseline
+    short_latency: float
+    long_latency: float
+    evidence: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def induced_delay(self) -> float:
+        return self.long_latency - self.baseline.mean
+
+    @property
+    def confidence_interval(self) -> Tuple[float, float]:
+        """95% interval for the delay induced by the long payload."""
+        return self.induced_delay - self.baseline.margin, self.induced_delay + self.baseline.margin
+
+    @property
+    def confidence(self) -> str:
+        low, _ = self.confidence_interval
+        return "HIGH" if low >= 0.8 * self.long_delay else "MEDIUM"
+
+    def summary(self) -> str:
+        low, high = self.confidence_interval
+        return (
+            f"A {self.short_delay}s delay payload took {self.short_latency:.2f}s and a {self.long_delay}s one "
+            f"took {self.long_latency:.2f}s, against a baseline of {self.baseline.mean:.2f}s "
+            f"± {self.baseline.stdev:.2f}s over {len(self.baseline.samples)} samples "
+            f"(induced delay 95% CI {low:.2f}–{high:.2f}s)."
+        )
+
+    def timing_evidence(self) -> Dict[str, Any]:
+        low, high = self.confidence_interval
+        return {
+            "baseline_samples": [round(s, 3) for s in self.baseline.samples],
+            "baseline_mean": round(self.baseline.mean, 3),
+            "baseline_stdev": round(self.baseline.stdev, 3),
+            "short_delay": self.short_delay,
+            "short_latency": round(self.short_latency, 3),
+            "long_delay": self.long_delay,
+            "long_latency": round(self.long_latency, 3),
+            "induced_delay_ci95": [round(low, 3), round(high, 3)],
+        }
+
+
+async def measure_baseline(
+    send: Callable[[], Awaitable[ResponsePair]],
+    samples: int = 0,
+) -> LatencyBaseline:
+    """Sample benign latency ``samples`` times, sequentially so samples don't contend."""
+    latencies: List[float] = []
+    for _ in range(samples or BASELINE_SAMPLES):
+        resp, _ = await send()
+        latency = response_latency(resp)
+        if latency is not None:
+            latencies.append(latency)
+    return LatencyBaseline(latencies)
+
+
+def probe_timeout(baseline: LatencyBaseline, delay: int) -> int:
+    """Request timeout that leaves room for ``delay`` on top of normal latency."""
+    return int(math.ceil(baseline.mean + baseline.margin + delay + 5))
+
+
+async def confirm_delay(
+    send: Callable[[str, int], Awaitable[ResponsePair]],
+    payload: str,
+    baseline: LatencyBaseline,
+    short_delay: int = SHORT_DELAY,
+    long_delay: int = LONG_DELAY,
+) -> Optional[TimingResult]:
+    """
+    Screen ``payload`` (a template with ``{delay}``) with a short delay and, if
+    the response is slower than the baseline can explain, confirm with a long
+    one. Confirmed only when the induced delay tracks the requested delay:
+    jitter or a slow endpoint will not scale with it.
+    """
+    if len(baseline.samples) < 2:
+        return None
+
+    resp, _ = await send(payload.format(delay=short_delay), probe_timeout(baseline, short_delay))
+    short_latency = response_latency(resp)
+    if short_latency is None:
+        return None
+    if short_latency - baseline.mean < max(0.8 * short_delay, baseline.margin):
+        return None
+
+    resp, evidence = await send(payload.format(delay=long_delay), probe_timeout(baseline, long_delay))
+    long_latency = response_latency(resp)
+    if long_latency is None:
+        return None
+
+    induced = long_latency - baseline.mean
+    scales = long_latency - short_latency >= 0.5 * (long_delay - short_delay)
+    if induced - baseline.margin < 0.8 * long_delay or not scales:
+        logger.debug(
+            "Timing suspicion not confirmed for %r: short=%.2fs long=%.2fs baseline=%.2fs",
+            payload, short_latency, long_latency, baseline.mean,
+        )
+        return None
+
+    result = TimingResult(payload, short_delay, long_delay, baseline, short_latency, long_latency)
+    result.evidence = {**evidence, "timing": result.timing_evidence()}
+    return result
+
+
+class TimingLane:
+    """
+    Low-concurrency lane for time-based checks. Submitted checks run alongside
+    the rest of the scan, at most ``concurrency`` at a time, so slow delay
+    payloads never hold an endpoint's other checks. ``drain`` collects findings.
+    """
+
+    def __init__(self, concurrency: int = 0):
+        self._semaphore = asyncio.Semaphore(concurrency or TIMING_CONCURRENCY)
+        self._tasks: List[asyncio.Future] = []
+
+    def submit(self, name: str, ep_label: str, check: Callable[[], Awaitable[List[Dict[str, Any]]]]) -> None:
+        async def _run() -> List[Dict[str, Any]]:
+            async with self._semaphore:
+                try:
+                    with check_scope(name, ep_label):
+                        result = await check()
+                    if result:
+                        logger.info("  [%s] %d findings on %s", name, len(result), ep_label)
+                    return result
+                except SCAN_ABORTS:
+                    raise
+                except Exception as exc:
+                    logger.warning("  [%s] failed on %s: %s", name, ep_label, exc)
+                    return []
+
+        self._tasks.append(asyncio.ensure_future(_run()))
+
+    async def drain(self) -> List[Dict[str, Any]]:
+        findings: List[Dict[str, Any]] = []
+        for result in await asyncio.gather(*self._tasks):
+            findings.extend(result)
+        self._tasks.clear()
+        return findings
+
+    def cancel(self) -> None:
+        """Drop queued and running timing checks (e.g. the scan was cancelled)."""
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from requests import Response
+
+from app.scanners.api_scanner.engine.payload_encoder import encode_for_context
+from app.scanners.api_scanner.engine.response_differ import response_signature
+
+logger = logging.getLogger(__name__)
+
+# An encoding family is dropped for a parameter after this many responses that
+# fell into an already-known equivalence class without ever producing a new one.
+FAMILY_PRUNE_AFTER = 2
+
+SendFn = Callable[[str], Awaitable[Tuple[Optional[Response], Dict[str, Any]]]]
+ConfirmFn = Callable[[Response], Any]
+
+
+@dataclass
+class VariantHit:
+    encoded: str
+    enc_desc: str
+    detail: Any
+    evidence: Dict[str, Any]
+
+
+class VariantScheduler:
+    """
+    Adaptive sender for the encoded variants of payloads injected into one parameter.
+
+    Responses are bucketed into equivalence classes (status + normalized body
+    hash). The raw payload always goes out first; if it lands in the same class
+    as a benign value, the parameter is ignoring or sanitizing it and the
+    remaining encodings are skipped. Otherwise encodings are escalated, except
+    families that have repeatedly reproduced an already-seen class for this
+    parameter — those cannot change the outcome and are pruned.
+
+    ``send(value)`` performs the request with ``value`` injected; ``confirm(resp)``
+    returns a truthy detection detail or None. Safe to share between concurrent
+    probes of the same parameter.
+    """
+
+    def __init__(self, send: SendFn, context: str = "query", max_variants: int = 3):
+        self._send = send
+        self.context = context
+        self.max_variants = max_variants
+        self.benign_class: Optional[str] = None
+        self._redundant: Dict[str, int] = defaultdict(int)
+        self._productive: Set[str] = set()
+        self.sent = 0
+        self.pruned = 0
+
+    def set_benign(self, resp: Optional[Response]) -> None:
+        self.benign_class = response_signature(resp)
+
+    async def observe_benign(self, value: str) -> None:
+        """Send a harmless value and record its response class as the reference."""
+        resp, _ = await self._send(value)
+        self.sent += 1
+        self.set_benign(resp)
+
+    def _family_pruned(self, enc_desc: str) -> bool:
+        return enc_desc not in self._productive and self._redundant[enc_desc] >= FAMILY_PRUNE_AFTER
+
+    async def probe(self, payload: str, confirm: ConfirmFn) -> Optional[VariantHit]:
+        variants = encode_for_context(payload, self.context, max_variants=self.max_variants)
+        raw_class: Optional[str] = None
+
+        for index, (encoded, enc_desc) in enumerate(variants):
+            if index and self._family_pruned(enc_desc):
+                self.pruned += 1
+                continue
+
+            resp, evidence = await self._send(encoded)
+            self.sent += 1
+            if resp is not None:
+                detail = confirm(resp)
+                if detail:
+                    return VariantHit(encoded, enc_desc, detail, evidence)
+
+            signature = response_signature(resp)
+            if index == 0:
+                raw_class = signature
+                if self.benign_class is not None and raw_class == self.benign_class:
+                    self.pruned += len(variants) - 1
+                    return None
+            elif signature in (raw_class, self.benign_class):
+                self._redundant[enc_desc] += 1
+            else:
+                self._productive.add(enc_desc)
+
+        return None
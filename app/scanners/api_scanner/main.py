@@ -3,25 +3,35 @@ from __future__ import annotations
 import asyncio
 import logging
 from datetime import datetime
-from typing import Any, Dict, List, Optional, TYPE_CHECKING
+from functools import partial
+from typing import Any, Dict, List, Optional, Set, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from sqlalchemy.orm import Session
 
 from app.scanners.api_scanner.engine.auth_handler import build_auth_headers
-from app.scanners.api_scanner.engine.oob_server import OOBTracker, get_callback_server, DEFAULT_OOB_BASE
+from app.scanners.api_scanner.engine.incremental import incremental_state, plan_incremental
+from app.scanners.api_scanner.engine.oob_server import OOBInteraction, OOBTracker, get_callback_server, DEFAULT_OOB_BASE
+from app.scanners.api_scanner.engine.payload_fanout import endpoint_probe_limit
 from app.scanners.api_scanner.engine.rate_limiter import throttle
+from app.scanners.api_scanner.engine.request_executor import request_coalescing
+from app.scanners.api_scanner.engine.timing import TimingLane
 from app.scanners.api_scanner.parser.postman_parser import parse_postman
 from app.scanners.api_scanner.parser.openapi_parser import parse_openapi
 from app.scanners.api_scanner.reporter.report_generator import generate_report
-from app.scanners.api_scanner.tests import reset_finding_counters, make_finding
+from app.scanners.api_scanner.tests import reset_finding_counters, make_finding, seed_finding_counters
+from app.scanners.instrumentation import SCAN_ABORTS, check_scope, collect_metrics, enter_phase
+from app.worker.checkpoints import load_checkpoint, save_checkpoint
 
 # ── Per-endpoint test modules ─────────────────────────────────────────
 from app.scanners.api_scanner.tests.auth_tests import run_auth_tests
 from app.scanners.api_scanner.tests.bola_tests import run_bola_tests
 from app.scanners.api_scanner.tests.injection_tests import run_nosql_injection_tests
-from app.scanners.api_scanner.tests.sqli_tests import run_sqli_tests
-from app.scanners.api_scanner.tests.command_injection_tests import run_command_injection_tests
+from app.scanners.api_scanner.tests.sqli_tests import run_sqli_tests, run_sqli_time_tests
+from app.scanners.api_scanner.tests.command_injection_tests import (
+    run_command_injection_tests,
+    run_command_injection_time_tests,
+)
 from app.scanners.api_scanner.tests.ssrf_tests import run_ssrf_tests
 from app.scanners.api_scanner.tests.ssti_tests import run_ssti_tests
 from app.scanners.api_scanner.tests.xxe_tests import run_xxe_tests
@@ -103,10 +113,64 @@ TWOTOKEN_CHECKS = {"Authentication", "BOLA", "BFLA / Method Tampering"}
 # Checks that accept oob_tracker parameter
 OOB_CHECKS = {"SQL Injection", "Command Injection", "SSRF", "XXE"}
 
+# Time-based follow-ups, queued on the timing lane when the parent check found nothing
+TIMING_CHECKS = {
+    "SQL Injection": ("SQL Injection (Time-based)", run_sqli_time_tests),
+    "Command Injection": ("Command Injection (Time-based)", run_command_injection_time_tests),
+}
+
+# Time-based check name → check, to re-queue follow-ups a checkpoint left unfinished
+_TIMING_CHECK_FNS = dict(TIMING_CHECKS.values())
+
 # Max endpoints to scan concurrently
 MAX_CONCURRENT_ENDPOINTS = 5
 
 
+class _ScanCheckpoint:
+    """
+    Per-stage results of an API scan in the scan checkpoint store, so a retried
+    or redelivered scan skips the work an earlier attempt finished: global
+    checks, each endpoint's checks, and each time-based follow-up.
+    Everything is a no-op without a key.
+    """
+
+    def __init__(self, key: Optional[str]):
+        self.key = key
+        self.restored: Dict[str, Any] = load_checkpoint(key) if key else {}
+
+    def _save(self, stage: str, value: Any) -> None:
+        if self.key:
+            save_checkpoint(self.key, stage, value)
+
+    def global_findings(self) -> Optional[List[Dict[str, Any]]]:
+        return self.restored.get("api:global")
+
+    def save_global(self, findings: List[Dict[str, Any]]) -> None:
+        self._save("api:global", findings)
+
+    def endpoint(self, ep_label: str) -> Optional[Dict[str, Any]]:
+        """``{"findings": [...], "timing": [queued time-based check names]}`` of a scanned endpoint."""
+        return self.restored.get(f"api:endpoint:{ep_label}")
+
+    def save_endpoint(self, ep_label: str, findings: List[Dict[str, Any]], timing: List[str]) -> None:
+        self._save(f"api:endpoint:{ep_label}", {"findings": findings, "timing": timing})
+
+    def timing(self, name: str, ep_label: str) -> Optional[List[Dict[str, Any]]]:
+        return self.restored.get(f"api:timing:{name}:{ep_label}")
+
+    def timing_check(self, name: str, ep_label: str, check):
+        """Wrap a timing-lane check so its findings are checkpointed once it finishes."""
+        if not self.key:
+            return check
+
+        async def _run():
+            result = await check()
+            self._save(f"api:timing:{name}:{ep_label}", result)
+            return result
+
+        return _run
+
+
 def _deduplicate(findings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Remove duplicate findings (same title + same endpoint)."""
     seen: set = set()
@@ -122,14 +186,80 @@ def _deduplicate(findings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
 async def _run_global_check(name: str, coro):
     """Run a single global check and return (name, findings)."""
     try:
-        result = await coro
+        with check_scope(name):
+            result = await coro
         logger.info("%s check: %d findings", name, len(result))
         return result
+    except SCAN_ABORTS:
+        raise
     except Exception as exc:
         logger.warning("%s check failed: %s", name, exc)
         return []
 
 
+async def _run_global_checks(
+    asset_url: str,
+    endpoints: List[Dict[str, Any]],
+    auth_config: Optional[Dict[str, Any]],
+    auth_headers: Dict[str, str],
+    query_params: Dict[str, str],
+    semaphore: asyncio.Semaphore,
+    checkpoint: _ScanCheckpoint,
+) -> List[Dict[str, Any]]:
+    """
+    Global checks for a scan, run alongside endpoint scanning. They hold one
+    of the endpoint slots of ``semaphore`` so the scan's overall concurrency
+    is unchanged; the result is checkpointed.
+    """
+    async with semaphore:
+        findings = await _global_checks(asset_url, endpoints, auth_config, auth_headers, query_params)
+    checkpoint.save_global(findings)
+    return findings
+
+
+async def _global_checks(
+    asset_url: str,
+    endpoints: List[Dict[str, Any]],
+    auth_config: Optional[Dict[str, Any]],
+    auth_headers: Dict[str, str],
+    query_params: Dict[str, str],
+) -> List[Dict[str, Any]]:
+    """Scan-wide checks in parallel, then JWT analysis if a Bearer token was provided."""
+    logger.info("Running global checks on %s", asset_url)
+
+    findings: List[Dict[str, Any]] = []
+    global_tasks = [
+        _run_global_check("Headers", run_headers_tests(asset_url, auth_headers, query_params)),
+        _run_global_check("CORS", run_cors_tests(asset_url, auth_headers, query_params)),
+        _run_global_check("Rate limit", run_rate_limit_tests(asset_url, auth_headers, query_params, endpoints)),
+        _run_global_check("Admin/debug path", run_admin_path_tests(asset_url, auth_headers, query_params)),
+        _run_global_check("Version discovery", run_version_discovery_tests(endpoints, asset_url, auth_headers, query_params)),
+    ]
+    global_results = await asyncio.gather(*global_tasks)
+    for result in global_results:
+        findings.extend(result)
+
+    if auth_config and auth_config.get("type") == "bearer" and auth_config.get("token"):
+        token = auth_config["token"]
+        test_url = asset_url
+        for ep in endpoints:
+            if ep.get("auth_required", True):
+                from app.scanners.api_scanner.tests import build_url
+                test_url = build_url(asset_url, ep.get("path", "/"), query_params)
+                break
+        try:
+            with check_scope("JWT"):
+                jwt_findings = await run_jwt_tests(token, test_url, auth_headers)
+            findings.extend(jwt_findings)
+            logger.info("JWT analysis: %d findings", len(jwt_findings))
+        except SCAN_ABORTS:
+            raise
+        except Exception as exc:
+            logger.warning("JWT analysis failed: %s", exc)
+
+    return findings
+
+
 async def _scan_single_endpoint(
     endpoint: Dict[str, Any],
     idx: int,
@@ -141,8 +271,18 @@ async def _scan_single_endpoint(
     secondary_headers: Optional[Dict[str, str]] = None,
     secondary_qp: Optional[Dict[str, str]] = None,
     oob_tracker: Optional[OOBTracker] = None,
+    timing_lane: Optional[TimingLane] = None,
+    checkpoint: Optional[_ScanCheckpoint] = None,
 ) -> List[Dict[str, Any]]:
-    """Run all checks against a single endpoint (with concurrency limit)."""
+    """
+    Run all checks against a single endpoint (with concurrency limit).
+
+    Time-based follow-ups go to ``timing_lane`` and are collected by whoever
+    drains it; without a lane they run here before returning. With a
+    ``checkpoint`` the endpoint's findings (and which follow-ups it queued)
+    are recorded once its checks finish.
+    """
+    checkpoint = checkpoint or _ScanCheckpoint(None)
     async with semaphore:
         ep_label = f"{endpoint.get('method', '?')} {endpoint.get('path', '?')}"
         logger.info("Scanning endpoint %d/%d: %s", idx, total, ep_label)
@@ -152,32 +292,101 @@ async def _scan_single_endpoint(
         # Run all checks for this endpoint in parallel
         async def _run_check(check_name, check_fn):
             try:
-                if check_name in TWOTOKEN_CHECKS and secondary_headers:
-                    result = await check_fn(
-                        endpoint, base_url, auth_headers, query_params,
-                        secondary_headers, secondary_qp,
-                    )
-                elif check_name in OOB_CHECKS and oob_tracker:
-                    result = await check_fn(
-                        endpoint, base_url, auth_headers, query_params,
-                        oob_tracker,
-                    )
-                else:
-                    result = await check_fn(endpoint, base_url, auth_headers, query_params)
+                with check_scope(check_name, ep_label):
+                    if check_name in TWOTOKEN_CHECKS and secondary_headers:
+                        result = await check_fn(
+                            endpoint, base_url, auth_headers, query_params,
+                            secondary_headers, secondary_qp,
+                        )
+                    elif check_name in OOB_CHECKS and oob_tracker:
+                        result = await check_fn(
+                            endpoint, base_url, auth_headers, query_params,
+                            oob_tracker,
+                        )
+                    else:
+                        result = await check_fn(endpoint, base_url, auth_headers, query_params)
                 if result:
                     logger.info("  [%s] %d findings on %s", check_name, len(result), ep_label)
                 return result
+            except SCAN_ABORTS:
+                raise
             except Exception as exc:
                 logger.warning("  [%s] failed on %s: %s", check_name, ep_label, exc)
                 return []
 
-        check_tasks = [_run_check(name, fn) for name, fn in PER_ENDPOINT_CHECKS]
-        check_results = await asyncio.gather(*check_tasks)
+        # Injection fan-outs of all checks share one in-flight probe budget
+        with endpoint_probe_limit():
+            check_tasks = [_run_check(name, fn) for name, fn in PER_ENDPOINT_CHECKS]
+            check_results = await asyncio.gather(*check_tasks)
 
+        lane = timing_lane or TimingLane()
         findings = []
-        for result in check_results:
+        queued = []
+        for (check_name, _), result in zip(PER_ENDPOINT_CHECKS, check_results):
             findings.extend(result)
-        return findings
+            if not result and check_name in TIMING_CHECKS:
+                timing_name, timing_fn = TIMING_CHECKS[check_name]
+                check = partial(timing_fn, endpoint, base_url, auth_headers, query_params)
+                lane.submit(timing_name, ep_label, checkpoint.timing_check(timing_name, ep_label, check))
+                queued.append(timing_name)
+
+    if timing_lane is None:
+        findings.extend(await lane.drain())
+        queued = []
+    checkpoint.save_endpoint(ep_label, findings, queued)
+    return findings
+
+
+def _oob_finding(interaction: OOBInteraction) -> Dict[str, Any]:
+    """Finding for a confirmed blind vulnerability (an OOB callback for one of our tokens)."""
+    _owasp = {
+        "ssrf": "API7:2023",
+        "xxe": "Injection",
+        "cmdi": "Injection",
+        "sqli": "Injection",
+    }.get(interaction.test_type, "Injection")
+    _cvss = {
+        "ssrf": "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:C/C:H/I:N/A:N",
+        "xxe": "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:N/A:N",
+        "cmdi": "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H",
+        "sqli": "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H",
+    }.get(interaction.test_type, "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H")
+    _title = {
+        "ssrf": "Blind SSRF (OOB Callback)",
+        "xxe": "Blind XXE (OOB Callback)",
+        "cmdi": "Blind OS Command Injection (OOB Callback)",
+        "sqli": "Blind SQL Injection (OOB Callback)",
+    }.get(interaction.test_type, f"Blind {interaction.test_type} (OOB Callback)")
+    return make_finding(
+        owasp_category=_owasp,
+        title=_title,
+        cvss_vector=_cvss,
+        endpoint=interaction.endpoint or "unknown",
+        description=(
+            f"The target made an outbound HTTP request to the OOB callback server, "
+            f"confirming a blind {interaction.test_type.upper()} vulnerability. "
+            f"Callback from {interaction.source_ip} at {interaction.timestamp}."
+        ),
+        evidence={
+            "oob_callback": {
+                "token": interaction.token,
+                "source_ip": interaction.source_ip,
+                "timestamp": interaction.timestamp,
+                "method": interaction.method,
+                "path": interaction.path,
+            },
+        },
+        impact="Confirmed blind vulnerability — the server can be forced to make outbound requests or execute commands.",
+        remediation="Validate and sanitize all user input. Block outbound network connections from the application server where not required.",
+    )
+
+
+async def _watch_oob(oob_tracker: OOBTracker, findings: List[Dict[str, Any]], reported: Set[int]):
+    """Attach blind-vulnerability findings while the scan runs, as callbacks arrive."""
+    async for interaction in oob_tracker.stream_interactions():
+        logger.info("OOB: callback for %s (%s) received", interaction.endpoint, interaction.test_type)
+        reported.add(id(interaction))
+        findings.append(_oob_finding(interaction))
 
 
 async def run_api_scan(
@@ -192,14 +401,28 @@ async def run_api_scan(
     scan_mode: str = "active",
     db: Optional[Session] = None,
     scan_id: Optional[str] = None,
+    baseline_report: Optional[Dict[str, Any]] = None,
+    checkpoint_key: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Run the full API APT scan.
 
     Accepts endpoints from: Postman collection, OpenAPI spec, or raw endpoint list.
+
+    With ``baseline_report`` (an earlier report of the same target and mode),
+    per-endpoint checks only run on endpoints that were added or changed
+    since; findings of unchanged endpoints are carried forward from it.
+
+    With a ``scan_id``, progress is checkpointed (app.worker.checkpoints):
+    running the same scan again resumes after the global checks and the
+    endpoints an earlier attempt completed, reusing their findings. The
+    checkpoint is stored under ``checkpoint_key`` (default: the scan_id); a
+    caller running several API scans under one scan_id must pass a distinct
+    key per run.
     """
     started_at = datetime.utcnow()
     reset_finding_counters()
+    checkpoint = _ScanCheckpoint((checkpoint_key or scan_id) if scan_id else None)
 
     # ── 1. Parse endpoints ────────────────────────────────────────────
     if endpoints is None:
@@ -217,6 +440,17 @@ async def run_api_scan(
 
     logger.info("API APT scan '%s' starting — %d endpoints, mode=%s", scan_name, len(endpoints), scan_mode)
 
+    # ── 1b. Diff against the baseline (incremental scan) ───────────────
+    plan = plan_incremental(endpoints, baseline_report, asset_url, scan_mode) if baseline_report else None
+    scan_endpoints = endpoints
+    if plan is not None:
+        scan_endpoints = plan.to_scan
+        logger.info(
+            "Incremental scan: %d added, %d changed, %d unchanged, %d removed — %d findings carried forward",
+            len(plan.added), len(plan.changed), len(plan.unchanged), len(plan.removed), len(plan.carried_findings),
+        )
+        seed_finding_counters(plan.carried_findings)
+
     # ── 2. Build auth context ─────────────────────────────────────────
     auth_headers, query_params = build_auth_headers(auth_config)
     secondary_headers, secondary_qp = build_auth_headers(secondary_auth_config)
@@ -227,7 +461,7 @@ async def run_api_scan(
         try:
             callback_server = await get_callback_server()
             oob_tracker = OOBTracker(
-                scan_id=scan_id or "no-id",
+                scan_id=scan_id,
                 oob_base_url=DEFAULT_OOB_BASE,
                 callback_server=callback_server,
             )
@@ -235,129 +469,144 @@ async def run_api_scan(
         except Exception as exc:
             logger.warning("Failed to start OOB server: %s — blind tests disabled", exc)
     else:
-        oob_tracker = OOBTracker(scan_id=scan_id or "no-id")
+        oob_tracker = OOBTracker(scan_id=scan_id)
 
+    # Per-endpoint findings (incl. time-based and OOB); global ones are kept apart
     findings: List[Dict[str, Any]] = []
 
-    # ── 3. Global checks (run in parallel) ─────────────────────────────
-    logger.info("Running global checks on %s", asset_url)
-
-    global_tasks = [
-        _run_global_check("Headers", run_headers_tests(asset_url, auth_headers, query_params)),
-        _run_global_check("CORS", run_cors_tests(asset_url, auth_headers, query_params)),
-        _run_global_check("Rate limit", run_rate_limit_tests(asset_url, auth_headers, query_params, endpoints)),
-        _run_global_check("Admin/debug path", run_admin_path_tests(asset_url, auth_headers, query_params)),
-        _run_global_check("Version discovery", run_version_discovery_tests(endpoints, asset_url, auth_headers, query_params)),
-    ]
-    global_results = await asyncio.gather(*global_tasks)
-    for result in global_results:
-        findings.extend(result)
-
-    _update_progress(db, scan_id, 20, "GLOBAL_CHECKS", len(findings), 0, len(endpoints))
-
-    # ── 4. JWT analysis (if Bearer token provided) ────────────────────
-    if auth_config and auth_config.get("type") == "bearer" and auth_config.get("token"):
-        token = auth_config["token"]
-        test_url = asset_url
-        for ep in endpoints:
-            if ep.get("auth_required", True):
-                from app.scanners.api_scanner.tests import build_url
-                test_url = build_url(asset_url, ep.get("path", "/"), query_params)
-                break
+    # Identical in-flight GET/HEAD/OPTIONS requests from concurrently running
+    # checks share one network call for the rest of the scan. Per-phase and
+    # per-check timings and request stats end up in the report's diagnostics.
+    with request_coalescing() as coalescer, collect_metrics() as metrics:
+        total_endpoints = len(scan_endpoints)
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_ENDPOINTS)
+        timing_lane = TimingLane()
+
+        # ── 3. Global checks and JWT analysis (background) ─────────────────
+        # Started first and run alongside endpoint scanning; collected after it
+        global_findings = checkpoint.global_findings()
+        global_task: Optional[asyncio.Future] = None
+        if global_findings is None:
+            global_task = asyncio.ensure_future(_run_global_checks(
+                asset_url, endpoints, auth_config, auth_headers, query_params, semaphore, checkpoint,
+            ))
+        else:
+            logger.info("Resuming scan '%s' from checkpoint: global checks already done", scan_name)
+            seed_finding_counters(global_findings)
+
+        # Blind findings are attached as their callbacks arrive during endpoint
+        # scanning; the OOB correlation step only picks up the late ones
+        oob_reported: Set[int] = set()
+        oob_watcher: Optional[asyncio.Future] = None
+        if oob_tracker and oob_tracker.enabled:
+            oob_watcher = asyncio.ensure_future(_watch_oob(oob_tracker, findings, oob_reported))
+
+        # ── 4. Per-endpoint checks (concurrent with semaphore) ─────────────
+        # Endpoints an earlier attempt of this scan completed: reuse their
+        # findings, and re-queue only the time-based follow-ups that never finished
+        pending: List[Dict[str, Any]] = []
+        for ep in scan_endpoints:
+            ep_label = f"{ep.get('method', '?')} {ep.get('path', '?')}"
+            done = checkpoint.endpoint(ep_label)
+            if done is None:
+                pending.append(ep)
+                continue
+            seed_finding_counters(done["findings"])
+            findings.extend(done["findings"])
+            for timing_name in done["timing"]:
+                timing_findings = checkpoint.timing(timing_name, ep_label)
+                if timing_findings is not None:
+                    seed_finding_counters(timing_findings)
+                    findings.extend(timing_findings)
+                    continue
+                check = partial(_TIMING_CHECK_FNS[timing_name], ep, asset_url, auth_headers, query_params)
+                timing_lane.submit(timing_name, ep_label, checkpoint.timing_check(timing_name, ep_label, check))
+        resumed = total_endpoints - len(pending)
+        if resumed:
+            logger.info("Resuming scan '%s' from checkpoint: %d/%d endpoints already scanned", scan_name, resumed, total_endpoints)
+
+        enter_phase("ENDPOINT_SCANNING")
+        _update_progress(db, scan_id, 20, "ENDPOINT_SCANNING", len(findings), resumed, total_endpoints)
+
+        # Process endpoints in batches for progress reporting & cancellation
+        scanned_count = resumed
+        cancelled = False
         try:
-            jwt_findings = await run_jwt_tests(token, test_url, auth_headers)
-            findings.extend(jwt_findings)
-            logger.info("JWT analysis: %d findings", len(jwt_findings))
-        except Exception as exc:
-            logger.warning("JWT analysis failed: %s", exc)
-
-    # ── 5. Per-endpoint checks (concurrent with semaphore) ─────────────
-    total_endpoints = len(endpoints)
-    semaphore = asyncio.Semaphore(MAX_CONCURRENT_ENDPOINTS)
-
-    _update_progress(db, scan_id, 20, "ENDPOINT_SCANNING", len(findings), 0, total_endpoints)
-
-    # Process endpoints in batches for progress reporting & cancellation
-    scanned_count = 0
-    for batch_start in range(0, total_endpoints, MAX_CONCURRENT_ENDPOINTS):
-        # Check for cancellation before each batch
-        if _is_cancelled(db, scan_id):
-            logger.info("Scan '%s' cancelled by user at endpoint %d/%d", scan_name, scanned_count, total_endpoints)
-            break
-
-        batch_end = min(batch_start + MAX_CONCURRENT_ENDPOINTS, total_endpoints)
-        batch = endpoints[batch_start:batch_end]
+            for batch_start in range(0, len(pending), MAX_CONCURRENT_ENDPOINTS):
+                # Check for cancellation before each batch
+                if _is_cancelled(db, scan_id):
+                    logger.info("Scan '%s' cancelled by user at endpoint %d/%d", scan_name, scanned_count, total_endpoints)
+                    timing_lane.cancel()
+                    cancelled = True
+                    break
+
+                batch = pending[batch_start:batch_start + MAX_CONCURRENT_ENDPOINTS]
+
+                endpoint_tasks = [
+                    _scan_single_endpoint(
+                        ep, resumed + batch_start + i + 1, total_endpoints, asset_url,
+                        auth_headers, query_params, semaphore,
+                        secondary_headers, secondary_qp, oob_tracker, timing_lane, checkpoint,
+                    )
+                    for i, ep in enumerate(batch)
+                ]
+                batch_results = await asyncio.gather(*endpoint_tasks)
+                for result in batch_results:
+                    findings.extend(result)
+
+                scanned_count += len(batch)
+                # Progress: 20% to 90% proportional to endpoints scanned
+                progress_pct = 20 + int(70 * scanned_count / total_endpoints)
+                _update_progress(db, scan_id, progress_pct, "ENDPOINT_SCANNING", len(findings), scanned_count, total_endpoints)
+
+            # ── 4b. Global checks still running once endpoints are done ─────
+            if global_task is not None:
+                enter_phase("GLOBAL_CHECKS")
+                global_findings = await global_task
+        finally:
+            if global_task is not None and not global_task.done():
+                global_task.cancel()
+            if oob_watcher is not None:
+                oob_watcher.cancel()
+
+        # ── 5. Collect time-based checks still running in the timing lane ──
+        enter_phase("TIMING_CHECKS")
+        _update_progress(db, scan_id, 90, "TIMING_CHECKS", len(findings), scanned_count, total_endpoints)
+        findings.extend(await timing_lane.drain())
+
+        # ── 6. Check OOB interactions (blind vulnerability results) ────────
+        if oob_tracker and oob_tracker.enabled:
+            enter_phase("OOB_CORRELATION")
+            # Callbacks are pushed as they arrive; only wait out the grace
+            # period after the last OOB token sent, if it hasn't passed yet
+            try:
+                oob_interactions = await oob_tracker.wait_for_interactions()
+                if oob_interactions:
+                    logger.info("OOB: %d blind vulnerability callbacks received!", len(oob_interactions))
+                    for interaction in oob_interactions:
+                        if id(interaction) not in oob_reported:
+                            findings.append(_oob_finding(interaction))
+                else:
+                    logger.info("OOB: no blind vulnerability callbacks received (%d tokens sent)", oob_tracker.get_token_count())
+            except Exception as exc:
+                logger.warning("OOB interaction check failed: %s", exc)
+            finally:
+                oob_tracker.close()
 
-        endpoint_tasks = [
-            _scan_single_endpoint(
-                ep, batch_start + i + 1, total_endpoints, asset_url,
-                auth_headers, query_params, semaphore,
-                secondary_headers, secondary_qp, oob_tracker,
-            )
-            for i, ep in enumerate(batch)
-        ]
-        batch_results = await asyncio.gather(*endpoint_tasks)
-        for result in batch_results:
-            findings.extend(result)
+        diagnostics = metrics.summary()
 
-        scanned_count += len(batch)
-        # Progress: 20% to 90% proportional to endpoints scanned
-        progress_pct = 20 + int(70 * scanned_count / total_endpoints)
-        _update_progress(db, scan_id, progress_pct, "ENDPOINT_SCANNING", len(findings), scanned_count, total_endpoints)
+    if plan is not None:
+        findings.extend(plan.carried_findings)
+    # Recorded in the report so a later incremental scan knows which findings it may carry forward
+    endpoint_findings = findings
+    findings = global_findings + endpoint_findings
 
-    # ── 6. Check OOB interactions (blind vulnerability results) ────────
-    if oob_tracker and oob_tracker.enabled:
-        # Wait briefly for any delayed callbacks
-        await asyncio.sleep(3)
-        try:
-            oob_interactions = await oob_tracker.check_for_interactions()
-            if oob_interactions:
-                logger.info("OOB: %d blind vulnerability callbacks received!", len(oob_interactions))
-                for interaction in oob_interactions:
-                    _owasp = {
-                        "ssrf": "API7:2023",
-                        "xxe": "Injection",
-                        "cmdi": "Injection",
-                        "sqli": "Injection",
-                    }.get(interaction.test_type, "Injection")
-                    _cvss = {
-                        "ssrf": "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:C/C:H/I:N/A:N",
-                        "xxe": "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:N/A:N",
-                        "cmdi": "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H",
-                        "sqli": "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H",
-                    }.get(interaction.test_type, "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H")
-                    _title = {
-                        "ssrf": "Blind SSRF (OOB Callback)",
-                        "xxe": "Blind XXE (OOB Callback)",
-                        "cmdi": "Blind OS Command Injection (OOB Callback)",
-                        "sqli": "Blind SQL Injection (OOB Callback)",
-                    }.get(interaction.test_type, f"Blind {interaction.test_type} (OOB Callback)")
-                    findings.append(make_finding(
-                        owasp_category=_owasp,
-                        title=_title,
-                        cvss_vector=_cvss,
-                        endpoint=interaction.endpoint or "unknown",
-                        description=(
-                            f"The target made an outbound HTTP request to the OOB callback server, "
-                            f"confirming a blind {interaction.test_type.upper()} vulnerability. "
-                            f"Callback from {interaction.source_ip} at {interaction.timestamp}."
-                        ),
-                        evidence={
-                            "oob_callback": {
-                                "token": interaction.token,
-                                "source_ip": interaction.source_ip,
-                                "timestamp": interaction.timestamp,
-                                "method": interaction.method,
-                                "path": interaction.path,
-                            },
-                        },
-                        impact="Confirmed blind vulnerability — the server can be forced to make outbound requests or execute commands.",
-                        remediation="Validate and sanitize all user input. Block outbound network connections from the application server where not required.",
-                    ))
-            else:
-                logger.info("OOB: no blind vulnerability callbacks received (%d tokens sent)", oob_tracker.get_token_count())
-        except Exception as exc:
-            logger.warning("OOB interaction check failed: %s", exc)
+    logger.info("Requests: %d sent, %d coalesced into in-flight duplicates", coalescer.sent, coalescer.merged)
+    for check_name, stats in list(diagnostics["checks"].items())[:5]:
+        logger.info(
+            "  %s: %.1fs over %d runs, %d requests, p95 %s ms",
+            check_name, stats["duration_seconds"], stats["runs"], stats["requests"], stats["latency_p95_ms"],
+        )
 
     # ── 7. Deduplicate ────────────────────────────────────────────────
     findings = _deduplicate(findings)
@@ -382,4 +631,6 @@ async def run_api_scan(
         findings=findings,
         started_at=started_at,
         completed_at=completed_at,
+        diagnostics=diagnostics,
+        incremental=incremental_state(endpoints, endpoint_findings, asset_url, scan_mode, plan, partial=cancelled),
     )
@@ -1,53 +1,217 @@
 from __future__ import annotations
 
+import copy
+import hashlib
+import json
 import logging
-from typing import Any, Dict, List, Optional
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set
+from urllib.parse import unquote
 
 logger = logging.getLogger(__name__)
 
+# Nesting depth down to which sample request bodies are filled in
+MAX_SAMPLE_DEPTH = 4
+# Parsed specs kept, keyed by content hash (scheduled rescans / CI re-parse the same spec)
+PARSE_CACHE_SIZE = 32
+
 try:
     import yaml  # type: ignore
 except ImportError:
     yaml = None
 
 
-def _resolve_ref(spec: Dict, ref: str) -> Dict:
-    """Resolve a $ref pointer like '#/components/schemas/User'."""
-    parts = ref.lstrip("#/").split("/")
-    node = spec
-    for p in parts:
-        node = node.get(p, {})
-    return node
+class _RefResolver:
+    """
+    Resolves local ``$ref`` pointers of one spec, memoizing every pointer.
+
+    Chains of refs are followed to the final node; a ref cycle resolves to an
+    empty schema instead of looping. Unknown and external refs resolve to {}.
+    Merged properties, types and sample values are memoized per schema node,
+    so components shared by many operations are expanded once.
+    """
+
+    def __init__(self, spec: Dict):
+        self.spec = spec
+        self._memo: Dict[str, Dict] = {}
+        # Keyed by id() of schema nodes, which the spec keeps alive
+        self._properties: Dict[int, Dict[str, Any]] = {}
+        self._types: Dict[int, str] = {}
+        self._samples: Dict[int, Any] = {}
+
+    def _lookup(self, ref: str) -> Any:
+        if not ref.startswith("#"):
+            return {}
+        node: Any = self.spec
+        for part in ref[1:].lstrip("/").split("/"):
+            if not part:
+                continue
+            part = unquote(part).replace("~1", "/").replace("~0", "~")
+            if isinstance(node, dict):
+                node = node.get(part, {})
+            elif isinstance(node, list) and part.isdigit() and int(part) < len(node):
+                node = node[int(part)]
+            else:
+                return {}
+        return node
+
+    def resolve(self, node: Any) -> Dict:
+        """``node`` with any chain of ``$ref`` pointers followed."""
+        if not isinstance(node, dict):
+            return {}
+        if "$ref" not in node:
+            return node
+        ref = node["$ref"]
+        if not isinstance(ref, str):
+            return node
+        if ref in self._memo:
+            return self._memo[ref]
+
+        chain = []
+        while isinstance(node, dict) and isinstance(node.get("$ref"), str):
+            ref = node["$ref"]
+            if ref in self._memo:
+                node = self._memo[ref]
+                break
+            if ref in chain:
+                logger.debug("Cyclic $ref chain in OpenAPI spec: %s", " -> ".join(chain + [ref]))
+                node = {}
+                break
+            chain.append(ref)
+            node = self._lookup(ref)
+        if not isinstance(node, dict):
+            node = {}
+        for ref in chain:
+            self._memo[ref] = node
+        return node
+
+    def properties(self, schema: Any, _seen: Optional[Set[int]] = None) -> Dict[str, Any]:
+        """
+        Object properties of a schema, merging ``allOf`` members and taking
+        the first ``oneOf``/``anyOf`` variant that has any.
+        """
+        schema = self.resolve(schema)
+        if _seen is None and id(schema) in self._properties:
+            return self._properties[id(schema)]
+        seen = _seen if _seen is not None else set()
+        if id(schema) in seen:
+            return {}
+        seen = seen | {id(schema)}
+
+        props: Dict[str, Any] = {}
+        for member in schema.get("allOf") or []:
+            props.update(self.properties(member, seen))
+        if not props:
+            for key in ("oneOf", "anyOf"):
+                for variant in schema.get(key) or []:
+                    variant_props = self.properties(variant, seen)
+                    if variant_props:
+                        props.update(variant_props)
+                        break
+                if props:
+                    break
+        if isinstance(schema.get("properties"), dict):
+            props.update(schema["properties"])
+        if _seen is None:
+            self._properties[id(schema)] = props
+        return props
+
+    def _declared_type(self, schema: Any, seen: Set[int]) -> Optional[str]:
+        schema = self.resolve(schema)
+        if id(schema) in seen:
+            return None
+        seen = seen | {id(schema)}
+
+        if isinstance(schema.get("type"), str):
+            return schema["type"]
+        for key in ("allOf", "oneOf", "anyOf"):
+            for member in schema.get(key) or []:
+                member_type = self._declared_type(member, seen)
+                if member_type:
+                    return member_type
+        if schema.get("properties"):
+            return "object"
+        return None
+
+    def schema_type(self, schema: Any) -> str:
+        schema = self.resolve(schema)
+        key = id(schema)
+        if key not in self._types:
+            self._types[key] = self._declared_type(schema, set()) or "string"
+        return self._types[key]
+
+    def sample(self, schema: Any) -> Any:
+        """Sample value for a schema; nested objects are filled down to MAX_SAMPLE_DEPTH or a cycle."""
+        schema = self.resolve(schema)
+        key = id(schema)
+        if key not in self._samples:
+            self._samples[key] = self._sample(schema, set())
+        value = self._samples[key]
+        # Every endpoint gets its own copy of a shared nested sample
+        return copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+
+    def _sample(self, schema: Any, _seen: Optional[Set[int]] = None) -> Any:
+        schema = self.resolve(schema)
+        field_type = self.schema_type(schema)
+        if field_type == "integer":
+            return 1
+        if field_type == "number":
+            return 1.0
+        if field_type == "boolean":
+            return True
+        if field_type == "array":
+            return []
+        if field_type == "object":
+            seen = _seen if _seen is not None else set()
+            if id(schema) in seen or len(seen) >= MAX_SAMPLE_DEPTH:
+                return {}
+            seen = seen | {id(schema)}
+            return {name: self._sample(sub, seen) for name, sub in self.properties(schema).items()}
+        return "test"
 
 
-def _extract_body_fields(spec: Dict, operation: Dict) -> Optional[Dict]:
+def _extract_body_fields(resolver: _RefResolver, operation: Dict) -> Optional[Dict]:
     """Extract request body JSON schema fields from an operation."""
-    request_body = operation.get("requestBody", {})
+    request_body = resolver.resolve(operation.get("requestBody", {}))
     content = request_body.get("content", {})
 
     json_content = content.get("application/json", {})
-    schema = json_content.get("schema", {})
+    return resolver.properties(json_content.get("schema", {})) or None
 
-    if "$ref" in schema:
-        schema = _resolve_ref(spec, schema["$ref"])
 
-    if schema.get("properties"):
-        return schema["properties"]
-    return None
-
-
-def _extract_body_fields_swagger(spec: Dict, parameters: List[Dict]) -> Optional[Dict]:
+def _extract_body_fields_swagger(resolver: _RefResolver, parameters: List[Dict]) -> Optional[Dict]:
     """Extract body fields from Swagger 2.0 parameters."""
     for param in parameters:
         if param.get("in") == "body":
-            schema = param.get("schema", {})
-            if "$ref" in schema:
-                schema = _resolve_ref(spec, schema["$ref"])
-            if schema.get("properties"):
-                return schema["properties"]
+            properties = resolver.properties(param.get("schema", {}))
+            if properties:
+                return properties
     return None
 
 
+# digest -> endpoints as compact JSON: json.loads hands every caller its own copy, cheaply
+_parse_cache: "OrderedDict[str, str]" = OrderedDict()
+_parse_cache_lock = threading.Lock()
+
+
+def _spec_digest(spec: Any) -> Optional[str]:
+    """Content hash of a raw (str) or loaded (dict) spec; None if it can't be hashed."""
+    if isinstance(spec, str):
+        raw = spec
+    else:
+        try:
+            raw = json.dumps(spec, default=str)
+        except (TypeError, ValueError):
+            return None
+    return f"{type(spec).__name__}:{hashlib.sha256(raw.encode('utf-8', errors='replace')).hexdigest()}"
+
+
+def clear_parse_cache() -> None:
+    with _parse_cache_lock:
+        _parse_cache.clear()
+
+
 def parse_openapi(spec: Any) -> List[Dict]:
     """
     Parse an OpenAPI 3.x or Swagger 2.0 spec into normalized endpoint list.
@@ -57,10 +221,34 @@ def parse_openapi(spec: Any) -> List[Dict]:
       - str  (raw JSON or YAML string)
 
     Returns same format as postman_parser: [{name, method, path, headers, body, parameters}]
+
+    Results are cached in-process by a content hash of the spec, so an
+    unchanged spec (scheduled rescans, CI runs) is not loaded or parsed again.
     """
+    digest = _spec_digest(spec)
+    if digest is not None:
+        with _parse_cache_lock:
+            cached = _parse_cache.get(digest)
+            if cached is not None:
+                _parse_cache.move_to_end(digest)
+        if cached is not None:
+            endpoints = json.loads(cached)
+            logger.info("Parsed %d endpoints from OpenAPI spec (cached)", len(endpoints))
+            return endpoints
+
+    endpoints = _parse_openapi(spec)
+
+    if digest is not None and endpoints:
+        with _parse_cache_lock:
+            _parse_cache[digest] = json.dumps(endpoints, separators=(",", ":"), default=str)
+            while len(_parse_cache) > PARSE_CACHE_SIZE:
+                _parse_cache.popitem(last=False)
+    return endpoints
+
+
+def _parse_openapi(spec: Any) -> List[Dict]:
     if isinstance(spec, str):
         # Try JSON first, then YAML
-        import json
         try:
             spec = json.loads(spec)
         except (json.JSONDecodeError, ValueError):
@@ -74,12 +262,14 @@ def parse_openapi(spec: Any) -> List[Dict]:
         logger.error("Invalid OpenAPI spec — expected dict, got %s", type(spec))
         return []
 
-    is_swagger_2 = spec.get("swagger", "").startswith("2")
+    is_swagger_2 = str(spec.get("swagger", "")).startswith("2")
+    resolver = _RefResolver(spec)
     endpoints: List[Dict] = []
 
     paths = spec.get("paths", {})
     for path, path_item in paths.items():
-        if not isinstance(path_item, dict):
+        path_item = resolver.resolve(path_item)
+        if not path_item:
             continue
 
         for method in ("get", "post", "put", "patch", "delete", "options", "head"):
@@ -88,45 +278,30 @@ def parse_openapi(spec: Any) -> List[Dict]:
                 continue
 
             # Extract parameters
-            params = operation.get("parameters", []) + path_item.get("parameters", [])
+            params = [
+                resolver.resolve(p)
+                for p in (operation.get("parameters") or []) + (path_item.get("parameters") or [])
+            ]
             parameters = []
             for p in params:
-                if "$ref" in p:
-                    p = _resolve_ref(spec, p["$ref"])
                 parameters.append({
                     "name": p.get("name", ""),
                     "in": p.get("in", ""),
-                    "type": p.get("schema", {}).get("type", p.get("type", "string")),
+                    "type": resolver.schema_type(p["schema"]) if "schema" in p else p.get("type", "string"),
                     "required": p.get("required", False),
                 })
 
             # Extract body fields
             if is_swagger_2:
-                body_fields = _extract_body_fields_swagger(spec, params)
+                body_fields = _extract_body_fields_swagger(resolver, params)
             else:
-                body_fields = _extract_body_fields(spec, operation)
+                body_fields = _extract_body_fields(resolver, operation)
 
             # Build sample body from schema
             body = {}
             if body_fields:
                 for field_name, field_schema in body_fields.items():
-                    if "$ref" in field_schema:
-                        field_schema = _resolve_ref(spec, field_schema["$ref"])
-                    field_type = field_schema.get("type", "string")
-                    if field_type == "string":
-                        body[field_name] = "test"
-                    elif field_type == "integer":
-                        body[field_name] = 1
-                    elif field_type == "number":
-                        body[field_name] = 1.0
-                    elif field_type == "boolean":
-                        body[field_name] = True
-                    elif field_type == "array":
-                        body[field_name] = []
-                    elif field_type == "object":
-                        body[field_name] = {}
-                    else:
-                        body[field_name] = "test"
+                    body[field_name] = resolver.sample(field_schema)
 
             # Check if auth is required
             security = operation.get("security", spec.get("security", []))
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from collections import Counter
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 OWASP_CATEGORIES = [
     "API1:2023", "API2:2023", "API3:2023", "API4:2023", "API5:2023",
@@ -19,6 +19,8 @@ def generate_report(
     findings: List[Dict[str, Any]],
     started_at: datetime,
     completed_at: datetime,
+    diagnostics: Optional[Dict[str, Any]] = None,
+    incremental: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     """Generate the full scan report with summary stats."""
 
@@ -62,4 +64,9 @@ def generate_report(
         "findings": sorted_findings,
         # Keep legacy field for backward compatibility
         "generated_at": completed_at.isoformat(),
+        # Per-phase / per-check timings and request stats (app.scanners.instrumentation)
+        "diagnostics": diagnostics or {},
+        # Endpoint fingerprints the next incremental scan diffs against
+        # (app.scanners.api_scanner.engine.incremental)
+        "incremental": incremental or {},
     }
@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import Any, Dict, List, Optional
 from urllib.parse import urljoin, urlencode
 
+from app.scanners.api_scanner.engine.evidence_collector import materialize_evidence
 from app.scanners.api_scanner.reporter.cvss_calculator import calculate_cvss, severity_from_score
 
 # Finding ID counter (per-scan, resets each scan)
@@ -19,6 +20,14 @@ def reset_finding_counters():
     _finding_counter.clear()
 
 
+def seed_finding_counters(findings: List[Dict[str, Any]]) -> None:
+    """Number new findings after these (restored from a checkpoint or carried forward)."""
+    for finding in findings:
+        prefix, _, number = str(finding.get("finding_id", "")).rpartition("-")
+        if prefix and number.isdigit():
+            _finding_counter[prefix] = max(_finding_counter.get(prefix, 0), int(number))
+
+
 def make_finding(
     owasp_category: str,
     title: str,
@@ -44,7 +53,7 @@ def make_finding(
         "confidence": confidence,
         "endpoint": endpoint,
         "description": description,
-        "evidence": evidence,
+        "evidence": materialize_evidence(evidence),
         "impact": impact,
         "remediation": remediation,
         "references": references or [],
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-import time
+from functools import partial
 from typing import Any, Dict, List, Optional
 
 from app.scanners.api_scanner.engine.oob_server import OOBTracker
 from app.scanners.api_scanner.engine.oob_tokens import cmdi_oob_payloads
-from app.scanners.api_scanner.engine.payload_encoder import encode_for_context
+from app.scanners.api_scanner.engine.payload_fanout import first_confirmed
 from app.scanners.api_scanner.engine.request_executor import execute_request
+from app.scanners.api_scanner.engine.response_differ import find_keyword
+from app.scanners.api_scanner.engine.timing import confirm_delay, measure_baseline
+from app.scanners.api_scanner.engine.variant_scheduler import VariantScheduler
 from app.scanners.api_scanner.tests import build_url, make_finding
 
 logger = logging.getLogger(__name__)
@@ -33,14 +37,24 @@ def _command_payloads(marker: str):
         (f"| whoami", ""),  # any non-empty response different from baseline
     ]
 
-# Time-based payloads
+# Time-based payload templates ({delay} seconds)
 TIME_PAYLOADS = [
-    "; sleep 3",
-    "| sleep 3",
-    "& timeout 3",
+    "; sleep {delay}",
+    "| sleep {delay}",
+    "& timeout {delay}",
 ]
 
-TIME_THRESHOLD = 2.5
+
+def _injection_targets(endpoint: Dict[str, Any]) -> List[Dict[str, str]]:
+    """String query params and body fields, limited to the first three."""
+    targets: List[Dict[str, str]] = []
+    for p in endpoint.get("parameters", []):
+        if p.get("in") == "query" and p.get("type", "string") == "string":
+            targets.append({"location": "query", "name": p.get("name", "")})
+    if endpoint.get("method", "GET") in ("POST", "PUT", "PATCH"):
+        for field in (endpoint.get("body") or {}):
+            targets.append({"location": "body", "name": field})
+    return targets[:3]
 
 
 async def run_command_injection_tests(
@@ -58,17 +72,7 @@ async def run_command_injection_tests(
     url = build_url(base_url, path, query_params)
     merged_headers = {**auth_headers, "Content-Type": "application/json"}
 
-    # Collect injectable targets: query params + body fields
-    targets: List[Dict[str, str]] = []
-
-    for p in endpoint.get("parameters", []):
-        if p.get("in") == "query" and p.get("type", "string") == "string":
-            targets.append({"location": "query", "name": p.get("name", "")})
-
-    if method in ("POST", "PUT", "PATCH"):
-        for field in (endpoint.get("body") or {}):
-            targets.append({"location": "body", "name": field})
-
+    targets = _injection_targets(endpoint)
     if not targets:
         return findings
 
@@ -76,75 +80,65 @@ async def run_command_injection_tests(
     ctx = ScanContext()
     payloads = _command_payloads(ctx.cmd_marker)
 
-    # Get baseline timing
-    baseline_start = time.time()
-    await execute_request(method, url, headers=merged_headers,
-                          body=endpoint.get("body") if method in ("POST", "PUT", "PATCH") else None)
-    baseline_time = time.time() - baseline_start
-
-    for target in targets[:3]:  # Limit to first 3 targets
-        # ── Output-based detection ────────────────────────────────────
-        for payload, signature in payloads:
-            ctx_type = "query" if target["location"] == "query" else "body"
-            for encoded_payload, enc_desc in encode_for_context(payload, ctx_type, max_variants=3):
-                if target["location"] == "query":
-                    test_params = {**query_params, target["name"]: encoded_payload}
-                    test_url = build_url(base_url, path, test_params)
-                    resp, evidence = await execute_request(method, test_url, headers=merged_headers)
-                else:
-                    test_body = dict(endpoint.get("body") or {})
-                    test_body[target["name"]] = encoded_payload
-                    resp, evidence = await execute_request(method, url, headers=merged_headers, body=test_body)
-
-                if resp is None:
-                    continue
-
-                if signature and signature in (resp.text or "").lower():
-                    findings.append(make_finding(
-                        owasp_category=OWASP,
-                        title=f"OS Command Injection — {target['location']}: {target['name']}",
-                        cvss_vector=CVSS_VEC,
-                        endpoint=ep_label,
-                        description=f"Command injection confirmed. The payload '{payload}' ({enc_desc}) was executed and the command output '{signature}' appeared in the response.",
-                        evidence=evidence,
-                        impact="Full server compromise. Attacker can execute arbitrary OS commands, read files, install backdoors, and pivot to internal network.",
-                        remediation="Never pass user input to OS commands. Use language-native libraries instead of shell execution. If shell commands are unavoidable, use strict allowlists.",
-                        references=[REF],
-                    ))
-                    return findings  # Critical — one proof is enough
-
-        # ── Time-based detection ──────────────────────────────────────
-        for payload in TIME_PAYLOADS:
-            if target["location"] == "query":
-                test_params = {**query_params, target["name"]: payload}
-                test_url = build_url(base_url, path, test_params)
-                start = time.time()
-                resp, evidence = await execute_request(method, test_url, headers=merged_headers, timeout=15)
-            else:
-                test_body = dict(endpoint.get("body") or {})
-                test_body[target["name"]] = payload
-                start = time.time()
-                resp, evidence = await execute_request(method, url, headers=merged_headers, body=test_body, timeout=15)
-
-            elapsed = time.time() - start
-            if elapsed - baseline_time > TIME_THRESHOLD:
-                findings.append(make_finding(
-                    owasp_category=OWASP,
-                    title=f"OS Command Injection (Time-based) — {target['location']}: {target['name']}",
-                    cvss_vector=CVSS_VEC,
-                    endpoint=ep_label,
-                    description=f"Time-based command injection detected. Payload '{payload}' caused {elapsed:.1f}s delay (baseline: {baseline_time:.1f}s).",
-                    evidence=evidence,
-                    impact="Blind command injection. Attacker can execute OS commands even though output is not directly visible.",
-                    remediation="Never pass user input to OS commands. Use language-native libraries for file operations, network calls, etc.",
-                    confidence="MEDIUM",
-                    references=[REF],
-                ))
-                return findings
+    # Get baseline response
+    baseline_resp, _ = await execute_request(method, url, headers=merged_headers,
+                                              body=endpoint.get("body") if method in ("POST", "PUT", "PATCH") else None)
+
+    async def _send(target, value):
+        if target["location"] == "query":
+            test_params = {**query_params, target["name"]: value}
+            test_url = build_url(base_url, path, test_params)
+            return await execute_request(method, test_url, headers=merged_headers)
+        test_body = dict(endpoint.get("body") or {})
+        test_body[target["name"]] = value
+        return await execute_request(method, url, headers=merged_headers, body=test_body)
+
+    # ── Output-based detection ────────────────────────────────────────
+    # Encoded variants are only escalated where the raw payload changed the
+    # target's response. The baseline already carries the benign value for
+    # body fields and for query params present in query_params.
+    schedulers: List[VariantScheduler] = []
+    benign = []
+    for target in targets:
+        sched = VariantScheduler(partial(_send, target), "query" if target["location"] == "query" else "body")
+        if target["location"] == "body" or target["name"] in query_params:
+            sched.set_benign(baseline_resp)
+        else:
+            benign.append(sched.observe_benign("test"))
+        schedulers.append(sched)
+    await asyncio.gather(*benign)
+
+    def _output_probes():
+        for index in range(len(targets)):
+            for payload, signature in payloads:
+                if signature:
+                    yield index, payload, signature
+
+    async def _output_probe(probe):
+        index, payload, signature = probe
+        variant = await schedulers[index].probe(payload, lambda resp: find_keyword(resp.text, (signature,)))
+        return (probe, variant) if variant is not None else None
+
+    hit = await first_confirmed(_output_probes(), _output_probe)
+    if hit is not None:
+        (index, payload, signature), variant = hit
+        target, enc_desc, evidence = targets[index], variant.enc_desc, variant.evidence
+        findings.append(make_finding(
+            owasp_category=OWASP,
+            title=f"OS Command Injection — {target['location']}: {target['name']}",
+            cvss_vector=CVSS_VEC,
+            endpoint=ep_label,
+            description=f"Command injection confirmed. The payload '{payload}' ({enc_desc}) was executed and the command output '{signature}' appeared in the response.",
+            evidence=evidence,
+            impact="Full server compromise. Attacker can execute arbitrary OS commands, read files, install backdoors, and pivot to internal network.",
+            remediation="Never pass user input to OS commands. Use language-native libraries instead of shell execution. If shell commands are unavoidable, use strict allowlists.",
+            references=[REF],
+        ))
+        return findings  # Critical — one proof is enough
 
     # ── OOB Command Injection probes ─────────────────────────────────
     if oob_tracker and oob_tracker.enabled:
-        for target in targets[:3]:
+        for target in targets:
             callback_url = oob_tracker.generate_payload_url(
                 "cmdi", ep_label, f"CmdI OOB via {target['name']}"
             )
@@ -161,3 +155,60 @@ async def run_command_injection_tests(
                 logger.debug("OOB CmdI probe sent: %s — %s", target["name"], desc)
 
     return findings
+
+
+async def run_command_injection_time_tests(
+    endpoint: Dict[str, Any],
+    base_url: str,
+    auth_headers: Dict[str, str],
+    query_params: Dict[str, str],
+) -> List[Dict[str, Any]]:
+    """
+    Time-based (blind) command injection. Runs in the scan's timing lane:
+    sampled baseline latency, then a short and a long delay per payload.
+    """
+    findings: List[Dict[str, Any]] = []
+    method = endpoint.get("method", "GET")
+    path = endpoint.get("path", "")
+    ep_label = f"{method} {path}"
+    url = build_url(base_url, path, query_params)
+    merged_headers = {**auth_headers, "Content-Type": "application/json"}
+
+    targets = _injection_targets(endpoint)
+    if not targets:
+        return findings
+
+    baseline = await measure_baseline(lambda: execute_request(
+        method, url, headers=merged_headers,
+        body=endpoint.get("body") if method in ("POST", "PUT", "PATCH") else None,
+    ))
+
+    for target in targets:
+        async def _send(value, timeout):
+            if target["location"] == "query":
+                test_params = {**query_params, target["name"]: value}
+                test_url = build_url(base_url, path, test_params)
+                return await execute_request(method, test_url, headers=merged_headers, timeout=timeout)
+            test_body = dict(endpoint.get("body") or {})
+            test_body[target["name"]] = value
+            return await execute_request(method, url, headers=merged_headers, body=test_body, timeout=timeout)
+
+        for payload in TIME_PAYLOADS:
+            result = await confirm_delay(_send, payload, baseline)
+            if result is None:
+                continue
+            findings.append(make_finding(
+                owasp_category=OWASP,
+                title=f"OS Command Injection (Time-based) — {target['location']}: {target['name']}",
+                cvss_vector=CVSS_VEC,
+                endpoint=ep_label,
+                description=f"Time-based command injection confirmed with payload '{payload}'. {result.summary()}",
+                evidence=result.evidence,
+                impact="Blind command injection. Attacker can execute OS commands even though output is not directly visible.",
+                remediation="Never pass user input to OS commands. Use language-native libraries for file operations, network calls, etc.",
+                confidence=result.confidence,
+                references=[REF],
+            ))
+            return findings
+
+    return findings
@@ -3,7 +3,9 @@ from __future__ import annotations
 import logging
 from typing import Any, Dict, List
 
+from app.scanners.api_scanner.engine.payload_fanout import first_confirmed
 from app.scanners.api_scanner.engine.request_executor import execute_request
+from app.scanners.api_scanner.engine.response_differ import find_keyword
 from app.scanners.api_scanner.tests import build_url, make_finding
 
 logger = logging.getLogger(__name__)
@@ -20,10 +22,10 @@ NOSQL_PAYLOADS = [
     {"$exists": True},
 ]
 
-NOSQL_ERROR_PATTERNS = [
+NOSQL_ERROR_PATTERNS = (
     "mongoerror", "mongod", "bson", "operator", "$where",
     "cast to objectid failed", "e11000", "writeresult",
-]
+)
 
 
 async def run_nosql_injection_tests(
@@ -55,47 +57,50 @@ async def run_nosql_injection_tests(
     if not body_fields:
         body_fields = ["username", "email", "name", "query", "search", "filter", "id"]
 
+    async def _field_probe(probe):
+        field, payload = probe
+        test_body = dict(normal_body)
+        test_body[field] = payload
+
+        resp, evidence = await execute_request(method, url, headers=merged_headers, body=test_body)
+        if resp is None:
+            return None
+
+        # Detection: response returns more data, or error messages with NoSQL keywords
+        is_error_based = find_keyword(resp.text, NOSQL_ERROR_PATTERNS) is not None
+        is_data_leak = (
+            resp.status_code == 200
+            and baseline_len > 0
+            and len(resp.text or "") > baseline_len * 1.5
+        )
+        if is_error_based or is_data_leak:
+            return field, is_error_based, evidence
+        return None
+
     for payload in NOSQL_PAYLOADS:
-        # Strategy 1: Inject into each field individually
-        for field in body_fields:
-            test_body = dict(normal_body)
-            test_body[field] = payload
-
-            resp, evidence = await execute_request(method, url, headers=merged_headers, body=test_body)
-            if resp is None:
-                continue
-
-            # Detection: response returns more data, or error messages with NoSQL keywords
-            resp_text = (resp.text or "").lower()
-            is_error_based = any(p in resp_text for p in NOSQL_ERROR_PATTERNS)
-            is_data_leak = (
-                resp.status_code == 200
-                and baseline_len > 0
-                and len(resp.text or "") > baseline_len * 1.5
-            )
-
-            if is_error_based or is_data_leak:
-                reason = "error message containing NoSQL keywords" if is_error_based else "response returned significantly more data than baseline"
-                findings.append(make_finding(
-                    owasp_category=OWASP,
-                    title=f"NoSQL Injection — {field}",
-                    cvss_vector=CVSS_VEC,
-                    endpoint=ep_label,
-                    description=f"The field '{field}' appears vulnerable to NoSQL injection. Detection: {reason}. Payload: {payload}",
-                    evidence=evidence,
-                    impact="Attacker can bypass authentication, extract data, or modify queries by injecting NoSQL operators.",
-                    remediation="Sanitize all user inputs. Use parameterized queries. Reject objects with MongoDB operators ($ne, $gt, $where, etc.) in user-supplied data.",
-                    confidence="HIGH" if is_error_based else "MEDIUM",
-                    references=[REF],
-                ))
-                # One proof per payload type is enough
-                break
+        # Strategy 1: Inject into each field individually (fields probed concurrently;
+        # one proof per payload type is enough)
+        hit = await first_confirmed(((field, payload) for field in body_fields), _field_probe)
+        if hit is not None:
+            field, is_error_based, evidence = hit
+            reason = "error message containing NoSQL keywords" if is_error_based else "response returned significantly more data than baseline"
+            findings.append(make_finding(
+                owasp_category=OWASP,
+                title=f"NoSQL Injection — {field}",
+                cvss_vector=CVSS_VEC,
+                endpoint=ep_label,
+                description=f"The field '{field}' appears vulnerable to NoSQL injection. Detection: {reason}. Payload: {payload}",
+                evidence=evidence,
+                impact="Attacker can bypass authentication, extract data, or modify queries by injecting NoSQL operators.",
+                remediation="Sanitize all user inputs. Use parameterized queries. Reject objects with MongoDB operators ($ne, $gt, $where, etc.) in user-supplied data.",
+                confidence="HIGH" if is_error_based else "MEDIUM",
+                references=[REF],
+            ))
 
         # Strategy 2: Inject as entire body (catches weak parsers)
         resp, evidence = await execute_request(method, url, headers=merged_headers, body=payload)
         if resp is not None and resp.status_code == 200:
-            resp_text = (resp.text or "").lower()
-            if any(p in resp_text for p in NOSQL_ERROR_PATTERNS) or (baseline_len > 0 and len(resp.text or "") > baseline_len * 1.5):
+            if find_keyword(resp.text, NOSQL_ERROR_PATTERNS) or (baseline_len > 0 and len(resp.text or "") > baseline_len * 1.5):
                 findings.append(make_finding(
                     owasp_category=OWASP,
                     title="NoSQL Injection — Full Body Replacement",
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
 from app.scanners.api_scanner.engine.request_executor import execute_request
 from app.scanners.api_scanner.tests import build_url, make_finding
@@ -20,6 +21,21 @@ RATE_LIMIT_HEADERS = [
 RAPID_REQUEST_COUNT = 15  # Send 15 rapid requests to detect rate limiting
 
 
+async def _burst(
+    method: str,
+    url: str,
+    headers: Dict[str, str],
+    bodies: List[Optional[Dict[str, Any]]],
+) -> List[Tuple[Any, Any]]:
+    """
+    Send one request per body all at once — a burst is what rate limiters are
+    meant to stop. Not coalesced, so every request reaches the target.
+    """
+    return await asyncio.gather(*(
+        execute_request(method, url, headers=headers, body=body, coalesce=False) for body in bodies
+    ))
+
+
 async def run_rate_limit_tests(
     base_url: str,
     auth_headers: Dict[str, str],
@@ -28,7 +44,7 @@ async def run_rate_limit_tests(
 ) -> List[Dict[str, Any]]:
     """
     Test for missing rate limiting. GLOBAL check — picks a representative
-    endpoint and sends rapid requests.
+    endpoint and sends a burst of concurrent requests.
     """
     findings: List[Dict[str, Any]] = []
 
@@ -47,8 +63,7 @@ async def run_rate_limit_tests(
     has_rate_headers = False
     last_evidence = None
 
-    for i in range(RAPID_REQUEST_COUNT):
-        resp, evidence = await execute_request("GET", url, headers=merged_headers)
+    for resp, evidence in await _burst("GET", url, merged_headers, [None] * RAPID_REQUEST_COUNT):
         last_evidence = evidence
         if resp is None:
             continue
@@ -56,7 +71,7 @@ async def run_rate_limit_tests(
         # Check for rate limit response
         if resp.status_code == 429:
             got_429 = True
-            break
+            continue
 
         # Check for rate limit headers
         resp_headers_lower = {k.lower(): v for k, v in resp.headers.items()}
@@ -100,15 +115,12 @@ async def run_rate_limit_tests(
             continue
 
         # Found an auth endpoint — test brute force protection
-        got_lockout = False
-        for i in range(15):
-            resp, evidence = await execute_request(
-                "POST", auth_url, headers={"Content-Type": "application/json"},
-                body={"username": "admin", "password": f"wrong_password_{i}"},
-            )
-            if resp and resp.status_code == 429:
-                got_lockout = True
-                break
+        attempts = await _burst(
+            "POST", auth_url, {"Content-Type": "application/json"},
+            [{"username": "admin", "password": f"wrong_password_{i}"} for i in range(15)],
+        )
+        got_lockout = any(resp is not None and resp.status_code == 429 for resp, _ in attempts)
+        evidence = attempts[-1][1]
 
         if not got_lockout:
             findings.append(make_finding(
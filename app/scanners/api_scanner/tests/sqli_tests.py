@@ -1,13 +1,16 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from app.scanners.api_scanner.engine.oob_server import OOBTracker
 from app.scanners.api_scanner.engine.oob_tokens import sqli_oob_payloads
-from app.scanners.api_scanner.engine.payload_encoder import encode_for_context
+from app.scanners.api_scanner.engine.payload_fanout import first_confirmed
 from app.scanners.api_scanner.engine.request_executor import execute_request
+from app.scanners.api_scanner.engine.response_differ import find_keyword
+from app.scanners.api_scanner.engine.timing import confirm_delay, measure_baseline
+from app.scanners.api_scanner.engine.variant_scheduler import VariantScheduler
 from app.scanners.api_scanner.tests import build_url, make_finding
 
 logger = logging.getLogger(__name__)
@@ -17,7 +20,7 @@ REF = "https://owasp.org/www-project-web-security-testing-guide/latest/4-Web_App
 CVSS_VEC = "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H"
 
 # Error-based detection keywords (covers MySQL, PostgreSQL, MSSQL, Oracle, SQLite)
-SQL_ERROR_PATTERNS = [
+SQL_ERROR_PATTERNS = (
     "sql syntax", "mysql", "mariadb", "sqlite", "postgresql", "pg::",
     "ora-", "mssql", "sqlstate", "unclosed quotation", "syntax error",
     "you have an error in your sql", "warning: mysql", "quoted string not properly terminated",
@@ -26,7 +29,7 @@ SQL_ERROR_PATTERNS = [
     "sqlexception", "hibernate", "org.postgresql", "com.mysql",
     "division by zero", "invalid column", "operand type clash",
     "subquery returns more than", "conversion failed",
-]
+)
 
 # Error-based payloads — covers multiple DB vendors and injection contexts
 ERROR_PAYLOADS = [
@@ -70,21 +73,19 @@ ERROR_PAYLOADS = [
     "%27%20OR%20%271%27%3D%271",
 ]
 
-# Time-based payloads (3-second delay, covers MySQL, MSSQL, PostgreSQL, SQLite, Oracle)
+# Time-based payload templates ({delay} seconds; MySQL, MSSQL, PostgreSQL, SQLite, Oracle)
 TIME_PAYLOADS = [
-    "' OR SLEEP(3)--",
-    "' AND SLEEP(3)--",
-    "1' AND SLEEP(3)--",
-    "'; WAITFOR DELAY '0:0:3'--",
-    "' OR pg_sleep(3)--",
-    "' AND 1=(SELECT 1 FROM PG_SLEEP(3))--",
-    "1 OR SLEEP(3)",
-    "' AND RANDOMBLOB(300000000)--",  # SQLite CPU burn
-    "' OR 1=DBMS_PIPE.RECEIVE_MESSAGE('a',3)--",  # Oracle
+    "' OR SLEEP({delay})--",
+    "' AND SLEEP({delay})--",
+    "1' AND SLEEP({delay})--",
+    "'; WAITFOR DELAY '0:0:{delay}'--",
+    "' OR pg_sleep({delay})--",
+    "' AND 1=(SELECT 1 FROM PG_SLEEP({delay}))--",
+    "1 OR SLEEP({delay})",
+    "' AND RANDOMBLOB({delay}00000000)--",  # SQLite CPU burn, roughly proportional
+    "' OR 1=DBMS_PIPE.RECEIVE_MESSAGE('a',{delay})--",  # Oracle
 ]
 
-TIME_THRESHOLD = 2.5  # seconds — flag if response takes >2.5s longer than baseline
-
 
 async def run_sqli_tests(
     endpoint: Dict[str, Any],
@@ -101,101 +102,88 @@ async def run_sqli_tests(
     url = build_url(base_url, path, query_params)
     merged_headers = {**auth_headers, "Content-Type": "application/json"}
 
-    # Get baseline response + timing
-    baseline_start = time.time()
+    # Get baseline response
     baseline_resp, _ = await execute_request(method, url, headers=merged_headers,
                                               body=endpoint.get("body") if method in ("POST", "PUT", "PATCH") else None)
-    baseline_time = time.time() - baseline_start
-    baseline_status = baseline_resp.status_code if baseline_resp else 0
 
     # ── 1. Error-based SQL injection ──────────────────────────────────
-
-    # Test query parameters
+    # Every (target, payload) probe is independent: fan them out and stop at
+    # the first SQL error. Encoded variants are only escalated where the raw
+    # payload changed the parameter's response.
     params = [p for p in endpoint.get("parameters", []) if p.get("in") == "query"]
+    body_fields = list((endpoint.get("body") or {}).keys()) if method in ("POST", "PUT", "PATCH") else []
+
+    def _query_sender(name):
+        async def _send(value):
+            test_params = {**query_params, name: value}
+            return await execute_request(method, build_url(base_url, path, test_params), headers=merged_headers)
+        return _send
+
+    def _body_sender(name):
+        async def _send(value):
+            test_body = dict(endpoint.get("body") or {})
+            test_body[name] = value
+            return await execute_request(method, url, headers=merged_headers, body=test_body)
+        return _send
+
+    # The endpoint baseline already carries the benign value for body fields and
+    # for query params present in query_params; others get one benign request.
+    schedulers: Dict[Tuple[str, str], VariantScheduler] = {}
+    benign: List[Any] = []
     for param in params:
-        param_name = param.get("name", "")
-        for payload in ERROR_PAYLOADS:
-            for encoded_payload, enc_desc in encode_for_context(payload, "query", max_variants=3):
-                test_params = {**query_params, param_name: encoded_payload}
-                test_url = build_url(base_url, path, test_params)
-                resp, evidence = await execute_request(method, test_url, headers=merged_headers)
-                if resp is None:
-                    continue
-                body_lower = (resp.text or "").lower()
-                if any(p in body_lower for p in SQL_ERROR_PATTERNS):
-                    findings.append(make_finding(
-                        owasp_category=OWASP,
-                        title=f"SQL Injection (Error-based) — param: {param_name}",
-                        cvss_vector=CVSS_VEC,
-                        endpoint=ep_label,
-                        description=f"SQL error detected when injecting '{payload}' ({enc_desc}) into query parameter '{param_name}'. The error message reveals database details.",
-                        evidence=evidence,
-                        impact="Full database compromise. Attacker can read, modify, or delete data. Potential remote code execution via SQL features.",
-                        remediation="Use parameterized queries / prepared statements. Never concatenate user input into SQL strings.",
-                        references=[REF],
-                    ))
-                    return findings  # Critical — one proof is enough
-
-    # Test body fields
-    if method in ("POST", "PUT", "PATCH"):
-        body_fields = list((endpoint.get("body") or {}).keys())
-        for field in body_fields:
-            for payload in ERROR_PAYLOADS:
-                for encoded_payload, enc_desc in encode_for_context(payload, "body", max_variants=3):
-                    test_body = dict(endpoint.get("body") or {})
-                    test_body[field] = encoded_payload
-                    resp, evidence = await execute_request(method, url, headers=merged_headers, body=test_body)
-                    if resp is None:
-                        continue
-                    body_lower = (resp.text or "").lower()
-                    if any(p in body_lower for p in SQL_ERROR_PATTERNS):
-                        findings.append(make_finding(
-                            owasp_category=OWASP,
-                            title=f"SQL Injection (Error-based) — field: {field}",
-                            cvss_vector=CVSS_VEC,
-                            endpoint=ep_label,
-                            description=f"SQL error detected when injecting '{payload}' ({enc_desc}) into body field '{field}'.",
-                            evidence=evidence,
-                            impact="Full database compromise. Attacker can extract all data, modify records, or execute system commands.",
-                            remediation="Use parameterized queries / prepared statements. Never concatenate user input into SQL strings.",
-                            references=[REF],
-                        ))
-                        return findings
-
-    # ── 2. Time-based SQL injection ───────────────────────────────────
-    for payload in TIME_PAYLOADS:
-        # Test on first query param or first body field
-        if params:
-            param_name = params[0].get("name", "test")
-            test_params = {**query_params, param_name: payload}
-            test_url = build_url(base_url, path, test_params)
-            start = time.time()
-            resp, evidence = await execute_request(method, test_url, headers=merged_headers, timeout=15)
-            elapsed = time.time() - start
-        elif method in ("POST", "PUT", "PATCH") and (endpoint.get("body") or {}):
-            field = list(endpoint["body"].keys())[0]
-            test_body = dict(endpoint["body"])
-            test_body[field] = payload
-            start = time.time()
-            resp, evidence = await execute_request(method, url, headers=merged_headers, body=test_body, timeout=15)
-            elapsed = time.time() - start
+        name = param.get("name", "")
+        sched = schedulers[("query", name)] = VariantScheduler(_query_sender(name), "query")
+        if name in query_params:
+            sched.set_benign(baseline_resp)
         else:
-            break
+            benign.append(sched.observe_benign("1"))
+    for field in body_fields:
+        sched = schedulers[("body", field)] = VariantScheduler(_body_sender(field), "body")
+        sched.set_benign(baseline_resp)
+    await asyncio.gather(*benign)
+
+    def _error_probes():
+        for (location, name) in schedulers:
+            for payload in ERROR_PAYLOADS:
+                yield location, name, payload
+
+    def _has_sql_error(resp):
+        return find_keyword(resp.text, SQL_ERROR_PATTERNS) is not None
+
+    async def _error_probe(probe):
+        location, name, payload = probe
+        variant = await schedulers[(location, name)].probe(payload, _has_sql_error)
+        return (probe, variant) if variant is not None else None
 
-        if elapsed - baseline_time > TIME_THRESHOLD:
+    hit = await first_confirmed(_error_probes(), _error_probe)
+    if hit is not None:
+        (location, name, payload), variant = hit
+        enc_desc, evidence = variant.enc_desc, variant.evidence
+        if location == "query":
+            findings.append(make_finding(
+                owasp_category=OWASP,
+                title=f"SQL Injection (Error-based) — param: {name}",
+                cvss_vector=CVSS_VEC,
+                endpoint=ep_label,
+                description=f"SQL error detected when injecting '{payload}' ({enc_desc}) into query parameter '{name}'. The error message reveals database details.",
+                evidence=evidence,
+                impact="Full database compromise. Attacker can read, modify, or delete data. Potential remote code execution via SQL features.",
+                remediation="Use parameterized queries / prepared statements. Never concatenate user input into SQL strings.",
+                references=[REF],
+            ))
+        else:
             findings.append(make_finding(
                 owasp_category=OWASP,
-                title="SQL Injection (Time-based Blind)",
+                title=f"SQL Injection (Error-based) — field: {name}",
                 cvss_vector=CVSS_VEC,
                 endpoint=ep_label,
-                description=f"Time-based SQL injection detected. Payload '{payload}' caused a {elapsed:.1f}s response (baseline: {baseline_time:.1f}s).",
+                description=f"SQL error detected when injecting '{payload}' ({enc_desc}) into body field '{name}'.",
                 evidence=evidence,
-                impact="Blind SQL injection confirmed. Attacker can extract data one bit at a time using timing side-channels.",
+                impact="Full database compromise. Attacker can extract all data, modify records, or execute system commands.",
                 remediation="Use parameterized queries / prepared statements. Never concatenate user input into SQL strings.",
-                confidence="MEDIUM",
                 references=[REF],
             ))
-            return findings
+        return findings  # Critical — one proof is enough
 
     # ── OOB SQL Injection probes ─────────────────────────────────────
     if oob_tracker and oob_tracker.enabled:
@@ -226,3 +214,63 @@ async def run_sqli_tests(
                 logger.debug("OOB SQLi probe sent: %s — %s", oob_target_name, desc)
 
     return findings
+
+
+async def run_sqli_time_tests(
+    endpoint: Dict[str, Any],
+    base_url: str,
+    auth_headers: Dict[str, str],
+    query_params: Dict[str, str],
+) -> List[Dict[str, Any]]:
+    """
+    Time-based blind SQL injection on the first query param or body field.
+
+    Runs in the scan's timing lane: sampled baseline latency, then a short and
+    a long delay per payload (see engine.timing.confirm_delay).
+    """
+    findings: List[Dict[str, Any]] = []
+    method = endpoint.get("method", "GET")
+    path = endpoint.get("path", "")
+    ep_label = f"{method} {path}"
+    url = build_url(base_url, path, query_params)
+    merged_headers = {**auth_headers, "Content-Type": "application/json"}
+    body = endpoint.get("body") or {}
+
+    params = [p for p in endpoint.get("parameters", []) if p.get("in") == "query"]
+    if params:
+        param_name = params[0].get("name", "test")
+
+        async def _send(value, timeout):
+            test_url = build_url(base_url, path, {**query_params, param_name: value})
+            return await execute_request(method, test_url, headers=merged_headers, timeout=timeout)
+    elif method in ("POST", "PUT", "PATCH") and body:
+        field = list(body.keys())[0]
+
+        async def _send(value, timeout):
+            return await execute_request(method, url, headers=merged_headers, body={**body, field: value}, timeout=timeout)
+    else:
+        return findings
+
+    baseline = await measure_baseline(lambda: execute_request(
+        method, url, headers=merged_headers, body=body if method in ("POST", "PUT", "PATCH") else None,
+    ))
+
+    for payload in TIME_PAYLOADS:
+        result = await confirm_delay(_send, payload, baseline)
+        if result is None:
+            continue
+        findings.append(make_finding(
+            owasp_category=OWASP,
+            title="SQL Injection (Time-based Blind)",
+            cvss_vector=CVSS_VEC,
+            endpoint=ep_label,
+            description=f"Time-based SQL injection confirmed with payload '{payload}'. {result.summary()}",
+            evidence=result.evidence,
+            impact="Blind SQL injection confirmed. Attacker can extract data one bit at a time using timing side-channels.",
+            remediation="Use parameterized queries / prepared statements. Never concatenate user input into SQL strings.",
+            confidence=result.confidence,
+            references=[REF],
+        ))
+        return findings
+
+    return findings
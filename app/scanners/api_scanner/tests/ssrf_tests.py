@@ -5,9 +5,11 @@ from typing import Any, Dict, List, Optional
 
 from app.scanners.api_scanner.engine.oob_server import OOBTracker
 from app.scanners.api_scanner.engine.oob_tokens import ssrf_oob_payloads
-from app.scanners.api_scanner.engine.payload_encoder import encode_for_context
+from app.scanners.api_scanner.engine.payload_fanout import first_confirmed
 from app.scanners.api_scanner.engine.request_executor import execute_request
+from app.scanners.api_scanner.engine.response_differ import find_keyword
 from app.scanners.api_scanner.engine.scan_context import ScanContext
+from app.scanners.api_scanner.engine.variant_scheduler import VariantScheduler
 from app.scanners.api_scanner.tests import build_url, make_finding
 
 logger = logging.getLogger(__name__)
@@ -105,6 +107,12 @@ SSRF_PROBES = [
     },
 ]
 
+# Response content that proves an internal resource was fetched
+METADATA_KEYWORDS = (
+    "ami-id", "instance-id", "iam", "security-credentials",
+    "root:x:0:0", "daemon:x:", "computemetadata",
+)
+
 # Baseline URL is now generated dynamically per-scan via ScanContext
 
 
@@ -155,46 +163,53 @@ async def run_ssrf_tests(
         baseline_len = len(baseline_resp.text) if baseline_resp and baseline_resp.text else 0
         baseline_status = baseline_resp.status_code if baseline_resp else 0
 
-        # Test each SSRF probe (with encoded variants for WAF bypass)
-        for probe in SSRF_PROBES:
-            ctx_type = "query" if target["location"] in ("query", "path") else "body"
-            for encoded_payload, enc_desc in encode_for_context(probe["payload"], ctx_type, max_variants=2):
-                if target["location"] in ("query", "path"):
-                    test_params = {**query_params, target["name"]: encoded_payload}
-                    test_url = build_url(base_url, path, test_params)
-                    resp, evidence = await execute_request(method, test_url, headers=merged_headers)
-                else:
-                    test_body = dict(endpoint.get("body") or {})
-                    test_body[target["name"]] = encoded_payload
-                    resp, evidence = await execute_request(method, url, headers=merged_headers, body=test_body)
-
-                if resp is None:
-                    continue
-
-                # Detection: response differs significantly from baseline (different status or much more content)
-                resp_len = len(resp.text) if resp.text else 0
-                is_different_status = resp.status_code != baseline_status and resp.status_code == 200
-                is_more_content = baseline_len > 0 and resp_len > baseline_len * 2
-                has_metadata = any(kw in (resp.text or "").lower() for kw in [
-                    "ami-id", "instance-id", "iam", "security-credentials",
-                    "root:x:0:0", "daemon:x:", "computemetadata",
-                ])
-
-                if has_metadata or is_different_status or is_more_content:
-                    confidence = "HIGH" if has_metadata else "MEDIUM"
-                    findings.append(make_finding(
-                        owasp_category=OWASP,
-                        title=f"{probe['title']} — {target['location']}: {target['name']}",
-                        cvss_vector=probe["cvss"],
-                        endpoint=ep_label,
-                        description=probe["description"],
-                        evidence=evidence,
-                        impact="Server-side request forgery allows attackers to access internal services, cloud metadata, and local files from the server.",
-                        remediation="Validate and sanitize all user-supplied URLs. Block internal IPs (127.0.0.1, 169.254.x.x, 10.x.x.x, etc.), private ranges, and non-HTTP protocols (file://, gopher://). Use an allowlist of permitted domains.",
-                        confidence=confidence,
-                        references=[REF],
-                    ))
-                    break  # One SSRF proof per target is enough
+        # Test each SSRF probe concurrently; encoded variants (WAF bypass) are only
+        # escalated where the raw payload moved the response off the baseline.
+        # One SSRF proof per target is enough.
+        ctx_type = "query" if target["location"] in ("query", "path") else "body"
+
+        async def _send(value):
+            if ctx_type == "query":
+                test_params = {**query_params, target["name"]: value}
+                test_url = build_url(base_url, path, test_params)
+                return await execute_request(method, test_url, headers=merged_headers)
+            test_body = dict(endpoint.get("body") or {})
+            test_body[target["name"]] = value
+            return await execute_request(method, url, headers=merged_headers, body=test_body)
+
+        scheduler = VariantScheduler(_send, ctx_type, max_variants=2)
+        scheduler.set_benign(baseline_resp)
+
+        def _detect(resp):
+            # Detection: response differs significantly from baseline (different status or much more content)
+            resp_len = len(resp.text) if resp.text else 0
+            is_different_status = resp.status_code != baseline_status and resp.status_code == 200
+            is_more_content = baseline_len > 0 and resp_len > baseline_len * 2
+            has_metadata = find_keyword(resp.text, METADATA_KEYWORDS) is not None
+            if has_metadata or is_different_status or is_more_content:
+                return "HIGH" if has_metadata else "MEDIUM"
+            return None
+
+        async def _attempt(probe):
+            variant = await scheduler.probe(probe["payload"], _detect)
+            return (probe, variant) if variant is not None else None
+
+        hit = await first_confirmed(SSRF_PROBES, _attempt)
+        if hit is not None:
+            probe, variant = hit
+            confidence, evidence = variant.detail, variant.evidence
+            findings.append(make_finding(
+                owasp_category=OWASP,
+                title=f"{probe['title']} — {target['location']}: {target['name']}",
+                cvss_vector=probe["cvss"],
+                endpoint=ep_label,
+                description=probe["description"],
+                evidence=evidence,
+                impact="Server-side request forgery allows attackers to access internal services, cloud metadata, and local files from the server.",
+                remediation="Validate and sanitize all user-supplied URLs. Block internal IPs (127.0.0.1, 169.254.x.x, 10.x.x.x, etc.), private ranges, and non-HTTP protocols (file://, gopher://). Use an allowlist of permitted domains.",
+                confidence=confidence,
+                references=[REF],
+            ))
 
     # ── OOB SSRF probes ──────────────────────────────────────────────
     if oob_tracker and oob_tracker.enabled:
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+from functools import partial
 from typing import Any, Dict, List
 
-from app.scanners.api_scanner.engine.payload_encoder import encode_for_context
+from app.scanners.api_scanner.engine.payload_fanout import first_confirmed
 from app.scanners.api_scanner.engine.request_executor import execute_request
+from app.scanners.api_scanner.engine.response_differ import find_keyword
+from app.scanners.api_scanner.engine.variant_scheduler import VariantScheduler
 from app.scanners.api_scanner.tests import build_url, make_finding
 
 logger = logging.getLogger(__name__)
@@ -26,11 +30,11 @@ SSTI_PROBES = [
 POLYGLOT = "${{<%[%'\"}}%\\"
 
 # Template engine error signatures
-ENGINE_SIGNATURES = [
+ENGINE_SIGNATURES = (
     "jinja2", "twig", "freemarker", "velocity", "thymeleaf",
     "mako", "django.template", "nunjucks", "handlebars",
     "templateerror", "templatesyntaxerror", "undefined variable",
-]
+)
 
 
 async def run_ssti_tests(
@@ -61,63 +65,82 @@ async def run_ssti_tests(
     if not targets:
         return findings
 
-    for target in targets[:3]:  # Limit scope
-        # ── Math-based detection ──────────────────────────────────────
-        for probe, expected in SSTI_PROBES:
-            ctx_type = "query" if target["location"] == "query" else "body"
-            for encoded_probe, enc_desc in encode_for_context(probe, ctx_type, max_variants=3):
-                if target["location"] == "query":
-                    test_params = {**query_params, target["name"]: encoded_probe}
-                    test_url = build_url(base_url, path, test_params)
-                    resp, evidence = await execute_request(method, test_url, headers=merged_headers)
-                else:
-                    test_body = dict(endpoint.get("body") or {})
-                    test_body[target["name"]] = encoded_probe
-                    resp, evidence = await execute_request(method, url, headers=merged_headers, body=test_body)
-
-                if resp is None:
-                    continue
-
-                if expected in (resp.text or ""):
-                    findings.append(make_finding(
-                        owasp_category=OWASP,
-                        title=f"Server-Side Template Injection — {target['location']}: {target['name']}",
-                        cvss_vector=CVSS_VEC,
-                        endpoint=ep_label,
-                        description=f"Template expression '{probe}' ({enc_desc}) was evaluated to '{expected}', confirming server-side template injection.",
-                        evidence=evidence,
-                        impact="Full remote code execution. Attacker can read files, execute commands, and take complete control of the server.",
-                        remediation="Never pass user input directly into template rendering. Use parameterized templates. Sandbox template engines if dynamic rendering is required.",
-                        references=[REF],
-                    ))
-                    return findings  # Critical — one proof is enough
-
-        # ── Polyglot error detection ──────────────────────────────────
+    targets = targets[:3]  # Limit scope
+
+    async def _send(target, value):
         if target["location"] == "query":
-            test_params = {**query_params, target["name"]: POLYGLOT}
+            test_params = {**query_params, target["name"]: value}
             test_url = build_url(base_url, path, test_params)
-            resp, evidence = await execute_request(method, test_url, headers=merged_headers)
-        else:
-            test_body = dict(endpoint.get("body") or {})
-            test_body[target["name"]] = POLYGLOT
-            resp, evidence = await execute_request(method, url, headers=merged_headers, body=test_body)
-
-        if resp is not None:
-            body_lower = (resp.text or "").lower()
-            for sig in ENGINE_SIGNATURES:
-                if sig in body_lower:
-                    findings.append(make_finding(
-                        owasp_category=OWASP,
-                        title=f"Template Engine Detected — {target['location']}: {target['name']}",
-                        cvss_vector="CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:N",
-                        endpoint=ep_label,
-                        description=f"Polyglot template probe triggered an error revealing template engine '{sig}'. This strongly suggests the parameter is rendered in a template context.",
-                        evidence=evidence,
-                        impact="Potential remote code execution via server-side template injection.",
-                        remediation="Never pass raw user input into template engines. Use proper escaping and parameterization.",
-                        confidence="MEDIUM",
-                        references=[REF],
-                    ))
-                    return findings
+            return await execute_request(method, test_url, headers=merged_headers)
+        test_body = dict(endpoint.get("body") or {})
+        test_body[target["name"]] = value
+        return await execute_request(method, url, headers=merged_headers, body=test_body)
+
+    def _benign_value(target):
+        if target["location"] == "query":
+            return str(query_params.get(target["name"], "test"))
+        return str((endpoint.get("body") or {}).get(target["name"], "test"))
+
+    # ── Math-based detection ──────────────────────────────────────────
+    # Encoded variants are only escalated where the raw probe changed the
+    # target's response compared with a benign value.
+    schedulers = [
+        VariantScheduler(partial(_send, target), "query" if target["location"] == "query" else "body")
+        for target in targets
+    ]
+    await asyncio.gather(*(
+        sched.observe_benign(_benign_value(target)) for sched, target in zip(schedulers, targets)
+    ))
+
+    def _math_probes():
+        for index in range(len(targets)):
+            for probe, expected in SSTI_PROBES:
+                yield index, probe, expected
+
+    async def _math_probe(item):
+        index, probe, expected = item
+        variant = await schedulers[index].probe(probe, lambda resp: expected in (resp.text or ""))
+        return (item, variant) if variant is not None else None
+
+    hit = await first_confirmed(_math_probes(), _math_probe)
+    if hit is not None:
+        (index, probe, expected), variant = hit
+        target, enc_desc, evidence = targets[index], variant.enc_desc, variant.evidence
+        findings.append(make_finding(
+            owasp_category=OWASP,
+            title=f"Server-Side Template Injection — {target['location']}: {target['name']}",
+            cvss_vector=CVSS_VEC,
+            endpoint=ep_label,
+            description=f"Template expression '{probe}' ({enc_desc}) was evaluated to '{expected}', confirming server-side template injection.",
+            evidence=evidence,
+            impact="Full remote code execution. Attacker can read files, execute commands, and take complete control of the server.",
+            remediation="Never pass user input directly into template rendering. Use parameterized templates. Sandbox template engines if dynamic rendering is required.",
+            references=[REF],
+        ))
+        return findings  # Critical — one proof is enough
+
+    # ── Polyglot error detection ──────────────────────────────────────
+    async def _polyglot_probe(target):
+        resp, evidence = await _send(target, POLYGLOT)
+        if resp is None:
+            return None
+        sig = find_keyword(resp.text, ENGINE_SIGNATURES)
+        return (target, sig, evidence) if sig else None
+
+    hit = await first_confirmed(targets, _polyglot_probe)
+    if hit is not None:
+        target, sig, evidence = hit
+        findings.append(make_finding(
+            owasp_category=OWASP,
+            title=f"Template Engine Detected — {target['location']}: {target['name']}",
+            cvss_vector="CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:N",
+            endpoint=ep_label,
+            description=f"Polyglot template probe triggered an error revealing template engine '{sig}'. This strongly suggests the parameter is rendered in a template context.",
+            evidence=evidence,
+            impact="Potential remote code execution via server-side template injection.",
+            remediation="Never pass raw user input into template engines. Use proper escaping and parameterization.",
+            confidence="MEDIUM",
+            references=[REF],
+        ))
 
     return findings
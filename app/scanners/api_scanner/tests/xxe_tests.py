@@ -5,7 +5,9 @@ from typing import Any, Dict, List, Optional
 
 from app.scanners.api_scanner.engine.oob_server import OOBTracker
 from app.scanners.api_scanner.engine.oob_tokens import xxe_oob_payloads
+from app.scanners.api_scanner.engine.payload_fanout import first_confirmed
 from app.scanners.api_scanner.engine.request_executor import execute_request
+from app.scanners.api_scanner.engine.response_differ import find_keyword
 from app.scanners.api_scanner.tests import build_url, make_finding
 
 logger = logging.getLogger(__name__)
@@ -26,12 +28,15 @@ XXE_PAYLOAD_WINDOWS = """<?xml version="1.0" encoding="UTF-8"?>
 <root><data>&xxe;</data></root>"""
 
 # Signatures that indicate file content was returned
-FILE_SIGNATURES = [
+FILE_SIGNATURES = (
     "root:x:0:0",        # /etc/passwd
     "daemon:x:",          # /etc/passwd
     "[extensions]",       # win.ini
     "for 16-bit app",     # win.ini
-]
+)
+
+# Parser error vocabulary (XML is processed but the entity was blocked)
+XML_ERROR_PATTERNS = ("xml", "parser", "entity", "dtd", "doctype")
 
 
 async def run_xxe_tests(
@@ -52,51 +57,61 @@ async def run_xxe_tests(
 
     url = build_url(base_url, path, query_params)
 
-    for payload in (XXE_PAYLOAD, XXE_PAYLOAD_WINDOWS):
+    payloads = (XXE_PAYLOAD, XXE_PAYLOAD_WINDOWS)
+    # XML parsing errors (XML is processed but XXE blocked) only matter when no
+    # payload discloses a file, so they are collected rather than ending the fan-out.
+    parse_errors: Dict[int, Dict[str, Any]] = {}
+
+    async def _attempt(index):
+        payload = payloads[index]
         # Send XML with XXE payload
         xml_headers = {**auth_headers, "Content-Type": "application/xml"}
         resp, evidence = await execute_request(method, url, headers=xml_headers, raw_body=payload)
         # Also try text/xml
         if resp is None or resp.status_code in (404, 405, 415):
-            xml_headers["Content-Type"] = "text/xml"
+            xml_headers = {**xml_headers, "Content-Type": "text/xml"}
             resp, evidence = await execute_request(method, url, headers=xml_headers, raw_body=payload)
 
         if resp is None:
-            continue
-
-        body = (resp.text or "").lower()
+            return None
 
         # Check for file content in response
-        if any(sig in body for sig in FILE_SIGNATURES):
-            findings.append(make_finding(
-                owasp_category=OWASP,
-                title="XML External Entity (XXE) — Local File Disclosure",
-                cvss_vector="CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:N/A:N",
-                endpoint=ep_label,
-                description="The endpoint processes XML with external entity declarations and returns local file contents.",
-                evidence=evidence,
-                impact="Attacker can read any file on the server accessible to the application process. This includes configuration files, credentials, and source code.",
-                remediation="Disable external entity processing in your XML parser. In Python: use defusedxml. In Java: set XMLConstants.FEATURE_SECURE_PROCESSING. In .NET: set XmlReaderSettings.DtdProcessing = DtdProcessing.Prohibit.",
-                references=[REF],
-            ))
-            return findings
-
-        # Check for XML parsing errors (indicates XML is processed but XXE blocked)
-        xml_error_patterns = ["xml", "parser", "entity", "dtd", "doctype"]
-        if resp.status_code in (400, 500) and any(p in body for p in xml_error_patterns):
-            findings.append(make_finding(
-                owasp_category=OWASP,
-                title="XML Processing Detected (XXE Partially Mitigated)",
-                cvss_vector="CVSS:3.1/AV:N/AC:H/PR:N/UI:N/S:U/C:L/I:N/A:N",
-                endpoint=ep_label,
-                description="The endpoint processes XML input but rejected the XXE payload. The XML parser may still be vulnerable to other XML-based attacks (billion laughs DoS, SSRF via DTD).",
-                evidence=evidence,
-                impact="While direct file reading is blocked, the XML parser may be vulnerable to DoS or SSRF via DTD fetching.",
-                remediation="Completely disable DTD processing in the XML parser, not just external entities.",
-                confidence="LOW",
-                references=[REF],
-            ))
-            return findings
+        if find_keyword(resp.text, FILE_SIGNATURES):
+            return evidence
+
+        if resp.status_code in (400, 500) and find_keyword(resp.text, XML_ERROR_PATTERNS):
+            parse_errors[index] = evidence
+        return None
+
+    evidence = await first_confirmed(range(len(payloads)), _attempt)
+    if evidence is not None:
+        findings.append(make_finding(
+            owasp_category=OWASP,
+            title="XML External Entity (XXE) — Local File Disclosure",
+            cvss_vector="CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:N/A:N",
+            endpoint=ep_label,
+            description="The endpoint processes XML with external entity declarations and returns local file contents.",
+            evidence=evidence,
+            impact="Attacker can read any file on the server accessible to the application process. This includes configuration files, credentials, and source code.",
+            remediation="Disable external entity processing in your XML parser. In Python: use defusedxml. In Java: set XMLConstants.FEATURE_SECURE_PROCESSING. In .NET: set XmlReaderSettings.DtdProcessing = DtdProcessing.Prohibit.",
+            references=[REF],
+        ))
+        return findings
+
+    if parse_errors:
+        findings.append(make_finding(
+            owasp_category=OWASP,
+            title="XML Processing Detected (XXE Partially Mitigated)",
+            cvss_vector="CVSS:3.1/AV:N/AC:H/PR:N/UI:N/S:U/C:L/I:N/A:N",
+            endpoint=ep_label,
+            description="The endpoint processes XML input but rejected the XXE payload. The XML parser may still be vulnerable to other XML-based attacks (billion laughs DoS, SSRF via DTD).",
+            evidence=parse_errors[min(parse_errors)],
+            impact="While direct file reading is blocked, the XML parser may be vulnerable to DoS or SSRF via DTD fetching.",
+            remediation="Completely disable DTD processing in the XML parser, not just external entities.",
+            confidence="LOW",
+            references=[REF],
+        ))
+        return findings
 
     # ── OOB XXE probes ───────────────────────────────────────────────
     if oob_tracker and oob_tracker.enabled:
@@ -5,9 +5,9 @@ import random
 import socket
 
 from app.scanners.base import BaseScanner
-from app.scanners.subdomain_scanner.discovery.bruteforce import bruteforce_subdomains
+from app.scanners.subdomain_scanner.discovery.candidates import stream_candidates
 from app.scanners.subdomain_scanner.discovery.passive import fetch_all_passive
-from app.scanners.subdomain_scanner.validation.dns_check import validate_dns
+from app.scanners.subdomain_scanner.validation.dns_check import iter_resolved
 
 logger = logging.getLogger(__name__)
 
@@ -80,25 +80,17 @@ class DomainDiscoveryScanner(BaseScanner):
         passive = fetch_all_passive(domain)
         logger.info("Passive discovery found %d subdomains for %s", len(passive), domain)
 
-        # 2. Bruteforce discovery (~500 common words)
-        brute = set(bruteforce_subdomains(domain))
-        logger.info("Bruteforce generated %d candidates for %s", len(brute), domain)
-
-        # 3. Merge and deduplicate
-        discovered = list(passive.union(brute))
-        logger.info("Total unique candidates: %d for %s", len(discovered), domain)
-
-        # 4. DNS validation (A, AAAA, CNAME)
-        resolved = validate_dns(discovered)
-        all_subdomains = list(set(resolved))
+        # 2-4. Stream candidates (passive hits, permutations, wordlists) straight
+        #      into the concurrent resolver (A, AAAA, CNAME)
+        all_subdomains = list(iter_resolved(stream_candidates(domain, passive), domain=domain))
         logger.info("DNS-resolved subdomains: %d for %s", len(all_subdomains), domain)
 
         # 5. Filter wildcards
         valid_subdomains = self._filter_wildcards(all_subdomains, domain)
 
         logger.info(
-            "DD scan complete for %s: %d valid subdomains (from %d discovered)",
-            domain, len(valid_subdomains), len(discovered),
+            "DD scan complete for %s: %d valid subdomains (from %d resolved)",
+            domain, len(valid_subdomains), len(all_subdomains),
         )
 
         return {
@@ -0,0 +1,248 @@
+"""
+Scan instrumentation shared by scanner families.
+
+A ScanMetrics collector is activated for the duration of a scan with
+``collect_metrics()``. Inside it:
+
+  - ``enter_phase(name)`` ends the current scan phase and starts the next;
+  - ``check_scope(check, endpoint)`` times a check run and labels every
+    request made from inside it (including tasks it spawns);
+  - ``record_request(...)`` is called by the HTTP layer for each request
+    that actually went out.
+
+Check wrappers that turn a check's exception into "no findings" must let
+``SCAN_ABORTS`` through first.
+
+``ScanMetrics.summary()`` is the ``diagnostics`` block stored with a report
+(per-phase durations; per-check runs, duration, requests, bytes, p50/p95
+latency, retries, timeouts and failures; per-endpoint request counts), and
+``render_prometheus`` turns such a block into Prometheus text exposition
+format. Outside ``collect_metrics()`` every hook is a no-op.
+"""
+from __future__ import annotations
+
+import contextlib
+import math
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+try:
+    from celery.exceptions import SoftTimeLimitExceeded
+except Exception:  # pragma: no cover - the CLI image ships without celery
+    SoftTimeLimitExceeded = None
+
+# Raised into a running check to stop the whole scan (Celery's soft time
+# limit); check wrappers re-raise these instead of logging a failed check.
+SCAN_ABORTS: Tuple[type, ...] = (SoftTimeLimitExceeded,) if SoftTimeLimitExceeded is not None else ()
+
+
+@dataclass
+class CheckStats:
+    runs: int = 0
+    duration_seconds: float = 0.0
+    requests: int = 0
+    bytes_received: int = 0
+    retries: int = 0
+    timeouts: int = 0
+    failed_requests: int = 0
+    latencies: List[float] = field(default_factory=list)
+
+
+def _percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile, or None for no values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(pct / 100 * len(ordered))) - 1]
+
+
+class ScanMetrics:
+    """Per-scan collector of phase timings and per-check/per-endpoint request stats."""
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self.checks: Dict[str, CheckStats] = {}
+        self.endpoint_requests: Counter = Counter()
+        self._started = time.monotonic()
+        self._phase: Optional[Tuple[str, float]] = None  # (name, started) of the open phase
+
+    def _check(self, name: str) -> CheckStats:
+        stats = self.checks.get(name)
+        if stats is None:
+            stats = self.checks[name] = CheckStats()
+        return stats
+
+    def enter_phase(self, name: Optional[str]) -> None:
+        """Close the open phase and open ``name`` (None just closes)."""
+        now = time.monotonic()
+        if self._phase is not None:
+            previous, started = self._phase
+            self.phases[previous] = self.phases.get(previous, 0.0) + now - started
+        self._phase = (name, now) if name else None
+
+    def add_check_run(self, check: str, duration: float) -> None:
+        stats = self._check(check)
+        stats.runs += 1
+        stats.duration_seconds += duration
+
+    def add_request(
+        self,
+        check: str,
+        endpoint: Optional[str],
+        latency: Optional[float],
+        bytes_received: int = 0,
+        retries: int = 0,
+        timeouts: int = 0,
+        failed: bool = False,
+    ) -> None:
+        stats = self._check(check)
+        stats.requests += 1
+        stats.bytes_received += bytes_received
+        stats.retries += retries
+        stats.timeouts += timeouts
+        if failed:
+            stats.failed_requests += 1
+        if latency is not None:
+            stats.latencies.append(latency)
+        if endpoint:
+            self.endpoint_requests[endpoint] += 1
+
+    def summary(self) -> Dict[str, Any]:
+        self.enter_phase(None)
+        checks = {}
+        for name, stats in sorted(self.checks.items(), key=lambda item: -item[1].duration_seconds):
+            p50 = _percentile(stats.latencies, 50)
+            p95 = _percentile(stats.latencies, 95)
+            checks[name] = {
+                "runs": stats.runs,
+                "duration_seconds": round(stats.duration_seconds, 3),
+                "requests": stats.requests,
+                "bytes_received": stats.bytes_received,
+                "latency_p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+                "latency_p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+                "retries": stats.retries,
+                "timeouts": stats.timeouts,
+                "failed_requests": stats.failed_requests,
+            }
+        return {
+            "duration_seconds": round(time.monotonic() - self._started, 3),
+            "phases": {name: round(seconds, 3) for name, seconds in self.phases.items()},
+            "requests_total": sum(s.requests for s in self.checks.values()),
+            "bytes_received_total": sum(s.bytes_received for s in self.checks.values()),
+            "checks": checks,
+            "endpoint_requests": dict(self.endpoint_requests.most_common()),
+        }
+
+
+_metrics: ContextVar[Optional[ScanMetrics]] = ContextVar("scan_metrics", default=None)
+# (check, endpoint) labels of the code currently running
+_scope: ContextVar[Tuple[str, Optional[str]]] = ContextVar("scan_metrics_scope", default=("other", None))
+
+
+@contextlib.contextmanager
+def collect_metrics() -> Iterator[ScanMetrics]:
+    """Collect metrics for hooks run in this context (and tasks spawned from it)."""
+    metrics = ScanMetrics()
+    token = _metrics.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _metrics.reset(token)
+
+
+def enter_phase(name: str) -> None:
+    metrics = _metrics.get()
+    if metrics is not None:
+        metrics.enter_phase(name)
+
+
+@contextlib.contextmanager
+def check_scope(check: str, endpoint: Optional[str] = None) -> Iterator[None]:
+    """Time one run of ``check`` and attribute requests made inside it."""
+    metrics = _metrics.get()
+    if metrics is None:
+        yield
+        return
+    token = _scope.set((check, endpoint))
+    started = time.monotonic()
+    try:
+        yield
+    finally:
+        metrics.add_check_run(check, time.monotonic() - started)
+        _scope.reset(token)
+
+
+def record_request(
+    latency: Optional[float],
+    bytes_received: int = 0,
+    retries: int = 0,
+    timeouts: int = 0,
+    failed: bool = False,
+) -> None:
+    """Account one request that went out, against the current check scope."""
+    metrics = _metrics.get()
+    if metrics is None:
+        return
+    check, endpoint = _scope.get()
+    metrics.add_request(check, endpoint, latency, bytes_received, retries, timeouts, failed)
+
+
+# ── Prometheus export ────────────────────────────────────────────────────
+
+_PROM_PREFIX = "secoraa_scan"
+
+# (summary key, metric suffix, type, help)
+_CHECK_METRICS = (
+    ("runs", "check_runs_total", "counter", "Check runs."),
+    ("duration_seconds", "check_duration_seconds_total", "counter", "Time spent in a check, summed over its runs."),
+    ("requests", "check_requests_total", "counter", "HTTP requests sent by a check."),
+    ("bytes_received", "check_received_bytes_total", "counter", "Response body bytes received by a check."),
+    ("retries", "check_retries_total", "counter", "Request retries by a check."),
+    ("timeouts", "check_timeouts_total", "counter", "Request attempts of a check that timed out."),
+    ("failed_requests", "check_failed_requests_total", "counter", "Requests of a check that got no response."),
+)
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: Mapping[str, Any]) -> str:
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def render_prometheus(diagnostics: Mapping[str, Any], labels: Optional[Mapping[str, Any]] = None) -> str:
+    """Render a ``ScanMetrics.summary()`` block as Prometheus text exposition format."""
+    base = dict(labels or {})
+    lines: List[str] = []
+
+    def family(name: str, kind: str, help_text: str, samples: List[Tuple[Dict[str, Any], Any]]) -> None:
+        samples = [(extra, value) for extra, value in samples if value is not None]
+        if not samples:
+            return
+        metric = f"{_PROM_PREFIX}_{name}"
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {kind}")
+        for extra, value in samples:
+            lines.append(f"{metric}{_labels({**base, **extra})} {value}")
+
+    family("duration_seconds", "gauge", "Scan wall time.", [({}, diagnostics.get("duration_seconds"))])
+    family("phase_duration_seconds", "gauge", "Wall time of a scan phase.",
+           [({"phase": name}, seconds) for name, seconds in diagnostics.get("phases", {}).items()])
+
+    checks = diagnostics.get("checks", {})
+    for key, name, kind, help_text in _CHECK_METRICS:
+        family(name, kind, help_text, [({"check": check}, stats.get(key)) for check, stats in checks.items()])
+    family("check_latency_seconds", "summary", "Request latency of a check.", [
+        ({"check": check, "quantile": quantile}, round(stats[key] / 1000, 4) if stats.get(key) is not None else None)
+        for check, stats in checks.items()
+        for quantile, key in (("0.5", "latency_p50_ms"), ("0.95", "latency_p95_ms"))
+    ])
+
+    family("endpoint_requests_total", "counter", "HTTP requests sent to an endpoint.",
+           [({"endpoint": endpoint}, count) for endpoint, count in diagnostics.get("endpoint_requests", {}).items()])
+
+    return "\n".join(lines) + "\n" if lines else ""
@@ -18,6 +18,7 @@ from datetime import datetime, timezone
 from typing import Any, Dict, List
 
 from app.scanners.base import BaseScanner
+from app.scanners.instrumentation import check_scope, collect_metrics, enter_phase
 from app.scanners.network_scanner.plugins import ALL_PLUGINS, Finding
 
 logger = logging.getLogger(__name__)
@@ -116,11 +117,59 @@ def run_network_scan(target_ip: str, timeout: float = 1.0) -> Dict[str, Any]:
     # Guardrail: prevent any plugin from blocking the entire scan indefinitely.
     plugin_timeout = max(5.0, float(timeout) * 6.0)
 
+    with collect_metrics() as metrics:
+        enter_phase("PLUGINS")
+        _run_plugins(target_ip, timeout, plugin_timeout, open_ports, findings, plugin_runs)
+
+        # ── CVE enrichment ────────────────────────────────────────────────
+        # Plugins that detect a versioned product (banner_grab, ssh_audit,
+        # http_service) attach a `software={"name", "version"}` hint to their
+        # findings. Take each unique (name, version) tuple, query OSV, and
+        # emit one synthetic finding per matched CVE so they show up in the
+        # platform alongside heuristic findings.
+        enter_phase("CVE_ENRICHMENT")
+        with check_scope("cve_lookup"):
+            cve_findings = _enrich_with_cves(findings)
+        findings.extend(cve_findings)
+        if cve_findings:
+            plugin_runs.append({"name": "cve_lookup", "count": len(cve_findings)})
+            logger.info("network_scan plugin=cve_lookup findings=%d", len(cve_findings))
+
+        diagnostics = metrics.summary()
+
+    severity_counts = {"CRITICAL": 0, "HIGH": 0, "MEDIUM": 0, "LOW": 0, "INFORMATIONAL": 0}
+    for f in findings:
+        severity_counts[f.severity.upper()] = severity_counts.get(f.severity.upper(), 0) + 1
+
+    return {
+        "scan_type": "network",
+        "target": target_ip,
+        "scan_time": datetime.now(timezone.utc).isoformat(),
+        "open_ports": open_ports,
+        "findings": [_finding_to_dict(f) for f in findings],
+        "total_findings": len(findings),
+        "severity_counts": severity_counts,
+        "plugin_runs": plugin_runs,
+        # Per-plugin wall time (app.scanners.instrumentation)
+        "diagnostics": diagnostics,
+    }
+
+
+def _run_plugins(
+    target_ip: str,
+    timeout: float,
+    plugin_timeout: float,
+    open_ports: List[Dict[str, Any]],
+    findings: List[Finding],
+    plugin_runs: List[Dict[str, Any]],
+) -> None:
+    """Run every registered plugin in order, one guarded thread each."""
     for plugin in ALL_PLUGINS:
         pool = ThreadPoolExecutor(max_workers=1)
         try:
             future = pool.submit(plugin.runner, target_ip, open_ports, timeout)
-            plugin_findings = future.result(timeout=plugin_timeout)
+            with check_scope(plugin.name):
+                plugin_findings = future.result(timeout=plugin_timeout)
             findings.extend(plugin_findings)
             plugin_runs.append({"name": plugin.name, "count": len(plugin_findings)})
             logger.info(
@@ -152,33 +201,6 @@ def run_network_scan(target_ip: str, timeout: float = 1.0) -> Dict[str, Any]:
             plugin_runs.append({"name": plugin.name, "error": str(exc)})
             pool.shutdown(wait=True)
 
-    # ── CVE enrichment ────────────────────────────────────────────────
-    # Plugins that detect a versioned product (banner_grab, ssh_audit,
-    # http_service) attach a `software={"name", "version"}` hint to their
-    # findings. Take each unique (name, version) tuple, query OSV, and
-    # emit one synthetic finding per matched CVE so they show up in the
-    # platform alongside heuristic findings.
-    cve_findings = _enrich_with_cves(findings)
-    findings.extend(cve_findings)
-    if cve_findings:
-        plugin_runs.append({"name": "cve_lookup", "count": len(cve_findings)})
-        logger.info("network_scan plugin=cve_lookup findings=%d", len(cve_findings))
-
-    severity_counts = {"CRITICAL": 0, "HIGH": 0, "MEDIUM": 0, "LOW": 0, "INFORMATIONAL": 0}
-    for f in findings:
-        severity_counts[f.severity.upper()] = severity_counts.get(f.severity.upper(), 0) + 1
-
-    return {
-        "scan_type": "network",
-        "target": target_ip,
-        "scan_time": datetime.now(timezone.utc).isoformat(),
-        "open_ports": open_ports,
-        "findings": [_finding_to_dict(f) for f in findings],
-        "total_findings": len(findings),
-        "severity_counts": severity_counts,
-        "plugin_runs": plugin_runs,
-    }
-
 
 class NetworkScanner(BaseScanner):
     name = "network"
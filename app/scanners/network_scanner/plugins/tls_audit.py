@@ -8,14 +8,23 @@ TLS audit — checks every TLS-bearing port for:
 
 Uses only the stdlib `ssl` module. A more thorough audit (cipher suites,
 Heartbleed, ROBOT) is parked for a future sslyze-based plugin.
+
+TLS ports are audited in parallel, and per port the certificate fetch and
+each protocol-version probe run concurrently; all handshakes to the host
+share a connection cap (TLS_AUDIT_MAX_CONNECTIONS, default 6).
 """
 from __future__ import annotations
 
+import os
 import socket
 import ssl
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import List, Optional
 
+from app.scanners import tls_cache
+
 from . import Finding, NetworkPlugin
 
 _TLS_PORTS = {443, 465, 563, 587, 636, 853, 989, 990, 992, 993,
@@ -28,6 +37,15 @@ _OLD_PROTOCOLS = [
     ("TLSv1_1", ssl.TLSVersion.TLSv1_1),
 ]
 
+_MAX_PORT_WORKERS = 8
+
+
+def _max_connections() -> int:
+    try:
+        return max(1, min(32, int(os.getenv("TLS_AUDIT_MAX_CONNECTIONS", "6"))))
+    except ValueError:
+        return 6
+
 
 def _connect_tls(target_ip: str, port: int, timeout: float, server_name: Optional[str] = None):
     ctx = ssl.create_default_context()
@@ -109,27 +127,64 @@ def _cert_findings(ssock, port: int) -> List[Finding]:
     return findings
 
 
-def _protocol_findings(target_ip: str, port: int, timeout: float) -> List[Finding]:
-    findings: List[Finding] = []
-    for label, version in _OLD_PROTOCOLS:
-        if version is None:
-            continue
-        ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
-        ctx.check_hostname = False
-        ctx.verify_mode = ssl.CERT_NONE
-        try:
-            ctx.minimum_version = version
-            ctx.maximum_version = version
-        except (ValueError, AttributeError):
-            continue
-
-        try:
-            sock = socket.create_connection((target_ip, port), timeout=timeout)
-            ssock = ctx.wrap_socket(sock, server_hostname=target_ip)
-            ssock.close()
-        except Exception:
-            continue
+def _accepts_protocol(target_ip: str, port: int, timeout: float, version) -> bool:
+    ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    ctx.check_hostname = False
+    ctx.verify_mode = ssl.CERT_NONE
+    try:
+        ctx.minimum_version = version
+        ctx.maximum_version = version
+    except (ValueError, AttributeError):
+        return False
 
+    try:
+        sock = socket.create_connection((target_ip, port), timeout=timeout)
+        ssock = ctx.wrap_socket(sock, server_hostname=target_ip)
+        ssock.close()
+    except Exception:
+        return False
+    return True
+
+
+def _accepted_old_protocols(
+    target_ip: str,
+    port: int,
+    timeout: float,
+    gate: Optional[threading.Semaphore] = None,
+) -> List[str]:
+    """Probe every legacy protocol version at once; labels keep _OLD_PROTOCOLS order."""
+    candidates = [(label, version) for label, version in _OLD_PROTOCOLS if version is not None]
+    if not candidates:
+        return []
+    gate = gate or threading.BoundedSemaphore(len(candidates))
+
+    def _probe(version) -> bool:
+        with gate:
+            return _accepts_protocol(target_ip, port, timeout, version)
+
+    with ThreadPoolExecutor(max_workers=len(candidates)) as pool:
+        results = list(pool.map(_probe, [version for _label, version in candidates]))
+    return [label for (label, _v), ok in zip(candidates, results) if ok]
+
+
+def _protocol_findings(
+    target_ip: str,
+    port: int,
+    timeout: float,
+    gate: Optional[threading.Semaphore] = None,
+) -> List[Finding]:
+    findings: List[Finding] = []
+    # Shared TLS cache: one enumeration per (IP, port, certificate) per TTL,
+    # reused across network scans of the same endpoint. The gate is only ever
+    # taken inside the cache's key lock (never held while calling in), so the
+    # two always nest the same way.
+    accepted = tls_cache.cached_assessment(
+        "legacy_protocols", target_ip, port,
+        lambda ip: _accepted_old_protocols(ip, port, timeout, gate),
+        timeout=timeout,
+        gate=gate,
+    )
+    for label in accepted or []:
         severity = "HIGH" if label in {"SSLv3", "TLSv1"} else "MEDIUM"
         findings.append(
             Finding(
@@ -153,21 +208,36 @@ def _protocol_findings(target_ip: str, port: int, timeout: float) -> List[Findin
     return findings
 
 
-def run(target_ip: str, open_ports: List[dict], timeout: float = 5.0) -> List[Finding]:
-    findings: List[Finding] = []
-    for entry in open_ports:
-        port = entry["port"]
-        if port not in _TLS_PORTS:
-            continue
+def _fetch_cert_findings(target_ip: str, port: int, timeout: float, gate: threading.Semaphore) -> List[Finding]:
+    with gate:
         try:
             ssock = _connect_tls(target_ip, port, timeout)
-            findings.extend(_cert_findings(ssock, port))
-            ssock.close()
         except Exception:
-            pass
+            return []
+    try:
+        return _cert_findings(ssock, port)
+    finally:
+        ssock.close()
+
+
+def _audit_port(target_ip: str, port: int, timeout: float, gate: threading.Semaphore) -> List[Finding]:
+    """Certificate fetch and protocol matrix for one port, run side by side."""
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        cert_future = pool.submit(_fetch_cert_findings, target_ip, port, timeout, gate)
+        protocol = _protocol_findings(target_ip, port, timeout, gate)
+        return cert_future.result() + protocol
 
-        findings.extend(_protocol_findings(target_ip, port, timeout))
 
+def run(target_ip: str, open_ports: List[dict], timeout: float = 5.0) -> List[Finding]:
+    ports = list(dict.fromkeys(e["port"] for e in open_ports if e["port"] in _TLS_PORTS))
+    if not ports:
+        return []
+
+    gate = threading.BoundedSemaphore(_max_connections())
+    findings: List[Finding] = []
+    with ThreadPoolExecutor(max_workers=min(len(ports), _MAX_PORT_WORKERS)) as pool:
+        for port_findings in pool.map(lambda p: _audit_port(target_ip, p, timeout, gate), ports):
+            findings.extend(port_findings)
     return findings
 
 
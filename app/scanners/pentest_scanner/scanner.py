@@ -1,12 +1,14 @@
 from __future__ import annotations
 
+import asyncio
 import ipaddress
 import logging
+import os
 import socket
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
 
-import requests
+import httpx
 import urllib3
 
 from app.scanners.base import BaseScanner
@@ -16,6 +18,10 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 logger = logging.getLogger(__name__)
 
 REQ_TIMEOUT = 5
+# Max simultaneous connections per target; all probe families share this pool.
+MAX_CONNECTIONS = int(os.getenv("PENTEST_PROBE_CONCURRENCY", "10"))
+
+_REQUEST_ERRORS = (httpx.HTTPError, httpx.InvalidURL)
 
 _BLOCKED_NETWORKS = [
     ipaddress.ip_network("10.0.0.0/8"),
@@ -68,27 +74,39 @@ _TRAVERSAL_PAYLOADS = [
 _TRAVERSAL_UNIX_SIG = "root:x:0:0"
 
 
-def _is_ssrf_target(hostname: str) -> bool:
+def _ssrf_blocked(hostname: str, addresses: List[str]) -> bool:
     if not hostname:
         return True
     lower = hostname.strip().lower().rstrip(".")
     if lower in ("localhost", "ip-ranges.amazonaws.com") or lower.endswith(".internal"):
         return True
-    try:
-        results = socket.getaddrinfo(lower, None)
-        for *_, addr in results:
-            try:
-                ip = ipaddress.ip_address(addr[0])
-                if any(ip in net for net in _BLOCKED_NETWORKS):
-                    return True
-            except ValueError:
-                continue
-    except socket.gaierror:
-        pass
+    for addr in addresses:
+        try:
+            ip = ipaddress.ip_address(addr)
+            if any(ip in net for net in _BLOCKED_NETWORKS):
+                return True
+        except ValueError:
+            continue
     return False
 
 
-def _resp_text(resp: requests.Response, limit: int = 50_000) -> str:
+async def _resolve_host(hostname: str) -> Tuple[List[str], Optional[str]]:
+    """Resolve once per target; returns (addresses, error). Shared by the SSRF guard and DNS info."""
+    if not hostname:
+        return [], "empty hostname"
+    loop = asyncio.get_running_loop()
+    try:
+        infos = await loop.getaddrinfo(hostname.strip().lower().rstrip("."), None)
+    except socket.gaierror as exc:
+        return [], str(exc)
+    addresses: List[str] = []
+    for *_, addr in infos:
+        if addr[0] not in addresses:
+            addresses.append(addr[0])
+    return addresses, None
+
+
+def _resp_text(resp: httpx.Response, limit: int = 50_000) -> str:
     """Read up to `limit` bytes of response text to avoid memory spikes."""
     return resp.content[:limit].decode("utf-8", errors="replace")
 
@@ -106,11 +124,23 @@ class PentestScanner(BaseScanner):
     Automated pentest scanner — passive + active checks.
     Passive: headers, cookies, HTTPS, CORS, sensitive paths, server disclosure.
     Active:  SQLi (error-based), reflected XSS, open redirect, path traversal.
+
+    Probes run on one pooled httpx.AsyncClient per target. After the baseline
+    GET, every probe family (and every request within a family) runs
+    concurrently, so a target costs roughly its slowest probe rather than the
+    sum of all timeouts.
     """
 
     name = "pentest"
 
     def run(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return asyncio.run(self.run_async(payload))
+
+    async def run_async(
+        self,
+        payload: Dict[str, Any],
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> Dict[str, Any]:
         target_type = str(payload.get("target_type") or "").upper()
         target_value = str(payload.get("target_value") or "").strip()
         exclusions = payload.get("exclusions") or {}
@@ -136,51 +166,58 @@ class PentestScanner(BaseScanner):
                     "preflight_checks": {"reachable": False}, "findings": [],
                     "messages": {"errors": [], "skipped": ["host_excluded_by_rules"]}}
 
-        if _is_ssrf_target(probe_host):
+        addresses, dns_error = await _resolve_host(probe_host)
+        if _ssrf_blocked(probe_host, addresses):
             logger.warning("SSRF block: %s resolves to private address", probe_host)
             return {"scan_type": self.name, "target": target_value,
                     "preflight_checks": {"reachable": False}, "findings": [],
                     "messages": {"errors": ["Target resolves to a private/internal address"]}}
 
-        session = requests.Session()
-        session.verify = False
-        session.headers.update({"User-Agent": "Secoraa-Pentest/1.0"})
-
-        # ── Passive checks ────────────────────────────────────────────────
-        try:
-            resp = session.get(url, timeout=REQ_TIMEOUT, allow_redirects=True)
-            reachable = True
-            findings.extend(self._check_security_headers(url, resp.headers))
-            findings.extend(self._check_server_disclosure(url, resp.headers))
-            findings.extend(self._check_cookie_flags(url, resp))
-            findings.extend(self._check_https_enforcement(url, session))
-        except requests.RequestException as exc:
-            errors.append(f"Target unreachable: {exc}")
-
-        if reachable:
-            try:
-                findings.extend(self._check_dangerous_methods(url, session))
-            except requests.RequestException:
-                pass
+        async with httpx.AsyncClient(
+            verify=False,
+            # No pool timeout: probes gathered beyond MAX_CONNECTIONS queue for a
+            # connection; REQ_TIMEOUT applies once a request has one
+            timeout=httpx.Timeout(REQ_TIMEOUT, pool=None),
+            headers={"User-Agent": "Secoraa-Pentest/1.0"},
+            limits=httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS),
+            transport=transport,
+        ) as client:
+            # ── Baseline (shared by the header/cookie checks) ─────────────
             try:
-                findings.extend(self._check_cors_misconfiguration(url, session))
-            except requests.RequestException:
-                pass
-            findings.extend(self._probe_sensitive_paths(url, session, exclusions))
-
-            # ── Active checks ─────────────────────────────────────────────
-            findings.extend(self._check_sqli(url, session))
-            findings.extend(self._check_xss(url, session))
-            findings.extend(self._check_open_redirect(url, session))
-            findings.extend(self._check_path_traversal(url, session))
-
-        try:
-            host = urlparse(url).hostname or target_value
-            ip = socket.gethostbyname(host)
+                baseline = await client.get(url, follow_redirects=True)
+                reachable = True
+                findings.extend(self._check_security_headers(url, baseline.headers))
+                findings.extend(self._check_server_disclosure(url, baseline.headers))
+                findings.extend(self._check_cookie_flags(url, baseline))
+            except _REQUEST_ERRORS as exc:
+                errors.append(f"Target unreachable: {exc}")
+
+            if reachable:
+                # ── Passive + active probe families, concurrently ─────────
+                families = await asyncio.gather(
+                    self._check_https_enforcement(url, client),
+                    self._check_dangerous_methods(url, client),
+                    self._check_cors_misconfiguration(url, client),
+                    self._probe_sensitive_paths(url, client, exclusions),
+                    self._check_sqli(url, client),
+                    self._check_xss(url, client),
+                    self._check_open_redirect(url, client),
+                    self._check_path_traversal(url, client),
+                    return_exceptions=True,
+                )
+                for result in families:
+                    if isinstance(result, BaseException):
+                        logger.warning("Pentest probe family failed on %s: %s", url, result)
+                        continue
+                    findings.extend(result)
+
+        host = urlparse(url).hostname or target_value
+        public_ips = [a for a in addresses if ":" not in a]
+        if public_ips:
             findings.append({"title": "Host resolves to public IP", "severity": "INFO",
-                              "description": f"{host} resolves to {ip}."})
-        except socket.gaierror as exc:
-            errors.append(f"DNS resolution failed: {exc}")
+                             "description": f"{host} resolves to {public_ips[0]}."})
+        else:
+            errors.append(f"DNS resolution failed: {dns_error or 'no IPv4 address'}")
 
         return {"scan_type": self.name, "target": target_value,
                 "preflight_checks": {"reachable": reachable},
@@ -226,9 +263,9 @@ class PentestScanner(BaseScanner):
         return out
 
     @staticmethod
-    def _check_cookie_flags(url: str, resp: requests.Response) -> List[Dict[str, Any]]:
+    def _check_cookie_flags(url: str, resp: httpx.Response) -> List[Dict[str, Any]]:
         out = []
-        for cookie in resp.cookies:
+        for cookie in resp.cookies.jar:
             issues = []
             if not cookie.secure:
                 issues.append("missing Secure flag")
@@ -242,13 +279,13 @@ class PentestScanner(BaseScanner):
         return out
 
     @staticmethod
-    def _check_https_enforcement(url: str, session: requests.Session) -> List[Dict[str, Any]]:
+    async def _check_https_enforcement(url: str, client: httpx.AsyncClient) -> List[Dict[str, Any]]:
         if not url.startswith("https://"):
             return []
         http_url = url.replace("https://", "http://", 1)
         try:
-            resp = session.get(http_url, timeout=REQ_TIMEOUT, allow_redirects=False)
-        except requests.RequestException:
+            resp = await client.get(http_url, follow_redirects=False)
+        except _REQUEST_ERRORS:
             return []
         if resp.status_code in (301, 302, 307, 308) and \
                 resp.headers.get("Location", "").startswith("https://"):
@@ -260,10 +297,10 @@ class PentestScanner(BaseScanner):
         return []
 
     @staticmethod
-    def _check_dangerous_methods(url: str, session: requests.Session) -> List[Dict[str, Any]]:
+    async def _check_dangerous_methods(url: str, client: httpx.AsyncClient) -> List[Dict[str, Any]]:
         try:
-            resp = session.options(url, timeout=REQ_TIMEOUT, allow_redirects=False)
-        except requests.RequestException:
+            resp = await client.options(url, follow_redirects=False)
+        except _REQUEST_ERRORS:
             return []
         allow = resp.headers.get("Allow") or resp.headers.get("Access-Control-Allow-Methods") or ""
         risky = {m.strip().upper() for m in allow.split(",")}.intersection(DANGEROUS_METHODS)
@@ -274,13 +311,13 @@ class PentestScanner(BaseScanner):
         return []
 
     @staticmethod
-    def _check_cors_misconfiguration(url: str, session: requests.Session) -> List[Dict[str, Any]]:
+    async def _check_cors_misconfiguration(url: str, client: httpx.AsyncClient) -> List[Dict[str, Any]]:
         probe_origin = "https://evil.secoraa-test.com"
         try:
-            resp = session.options(url,
+            resp = await client.options(url,
                 headers={"Origin": probe_origin, "Access-Control-Request-Method": "GET"},
-                timeout=REQ_TIMEOUT, allow_redirects=False)
-        except requests.RequestException:
+                follow_redirects=False)
+        except _REQUEST_ERRORS:
             return []
         acao = resp.headers.get("Access-Control-Allow-Origin", "")
         acac = resp.headers.get("Access-Control-Allow-Credentials", "").lower()
@@ -301,87 +338,92 @@ class PentestScanner(BaseScanner):
         return []
 
     @staticmethod
-    def _probe_sensitive_paths(url: str, session: requests.Session,
-                               exclusions: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    async def _probe_sensitive_paths(url: str, client: httpx.AsyncClient,
+                                     exclusions: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         skip = {str(p).strip() for p in ((exclusions or {}).get("paths") or []) if str(p).strip()}
         high_risk = {"/.env", "/.git/HEAD", "/.git/config", "/.aws/credentials",
                      "/actuator/env", "/WEB-INF/web.xml"}
-        out = []
         base = url.rstrip("/")
-        for path in SENSITIVE_PATHS:
-            if path in skip:
-                continue
+        paths = [p for p in SENSITIVE_PATHS if p not in skip]
+
+        async def _probe(path: str) -> Optional[Dict[str, Any]]:
             try:
-                resp = session.get(base + path, timeout=REQ_TIMEOUT, allow_redirects=False)
-            except requests.RequestException:
-                continue
+                resp = await client.get(base + path, follow_redirects=False)
+            except _REQUEST_ERRORS:
+                return None
             if resp.status_code == 200 and len(resp.content) > 10:
-                out.append({
+                return {
                     "title": f"Sensitive path exposed: {path}",
                     "severity": "HIGH" if path in high_risk else "MEDIUM",
                     "description": f"{base + path} returned 200 with {len(resp.content)} bytes.",
                     "owasp_category": "A05:2021 - Security Misconfiguration",
-                })
-        return out
+                }
+            return None
+
+        results = await asyncio.gather(*(_probe(p) for p in paths))
+        return [r for r in results if r]
 
     # ── Active check methods ──────────────────────────────────────────────
 
     @staticmethod
-    def _check_sqli(url: str, session: requests.Session) -> List[Dict[str, Any]]:
+    async def _check_sqli(url: str, client: httpx.AsyncClient) -> List[Dict[str, Any]]:
         """Error-based SQL injection detection on query parameters."""
         parsed = urlparse(url)
         params = parse_qs(parsed.query, keep_blank_values=True)
         # If no query params, probe common ones
         probe_params = list(params.keys())[:3] if params else ["id", "q", "search", "page"]
+        probes = [
+            (param, payload)
+            for param in probe_params
+            for payload in _SQLI_PAYLOADS[:2]  # 2 payloads per param keeps it fast
+        ]
+
+        async def _probe(param: str, payload: str) -> Optional[str]:
+            try:
+                resp = await client.get(_inject_param(url, param, payload), follow_redirects=False)
+                body = _resp_text(resp).lower()
+            except _REQUEST_ERRORS:
+                return None
+            return next((sig for sig in _SQLI_ERRORS if sig in body), None)
+
+        sigs = await asyncio.gather(*(_probe(param, payload) for param, payload in probes))
 
         out: List[Dict[str, Any]] = []
         seen: set = set()
-
-        for param in probe_params:
-            for payload in _SQLI_PAYLOADS[:2]:  # 2 payloads per param keeps it fast
-                test_url = _inject_param(url, param, payload)
-                try:
-                    resp = session.get(test_url, timeout=REQ_TIMEOUT, allow_redirects=False)
-                    body = _resp_text(resp).lower()
-                except requests.RequestException:
-                    continue
-                for sig in _SQLI_ERRORS:
-                    if sig in body and param not in seen:
-                        seen.add(param)
-                        out.append({
-                            "title": f"Possible SQL Injection: parameter '{param}'",
-                            "severity": "HIGH",
-                            "description": (
-                                f"Sending payload {payload!r} to parameter '{param}' triggered "
-                                f"a database error signature ({sig!r}) at {url}. "
-                                "Manual verification recommended."
-                            ),
-                            "endpoint": url,
-                            "owasp_category": "A03:2021 - Injection",
-                        })
-                        break
+        for (param, payload), sig in zip(probes, sigs):
+            if sig and param not in seen:
+                seen.add(param)
+                out.append({
+                    "title": f"Possible SQL Injection: parameter '{param}'",
+                    "severity": "HIGH",
+                    "description": (
+                        f"Sending payload {payload!r} to parameter '{param}' triggered "
+                        f"a database error signature ({sig!r}) at {url}. "
+                        "Manual verification recommended."
+                    ),
+                    "endpoint": url,
+                    "owasp_category": "A03:2021 - Injection",
+                })
         return out
 
     @staticmethod
-    def _check_xss(url: str, session: requests.Session) -> List[Dict[str, Any]]:
+    async def _check_xss(url: str, client: httpx.AsyncClient) -> List[Dict[str, Any]]:
         """Reflected XSS detection on query parameters."""
         parsed = urlparse(url)
         params = parse_qs(parsed.query, keep_blank_values=True)
         probe_params = list(params.keys())[:3] if params else ["q", "search", "s", "query"]
 
-        out: List[Dict[str, Any]] = []
-        for param in probe_params:
-            test_url = _inject_param(url, param, _XSS_PAYLOAD)
+        async def _probe(param: str) -> Optional[Dict[str, Any]]:
             try:
-                resp = session.get(test_url, timeout=REQ_TIMEOUT, allow_redirects=False)
+                resp = await client.get(_inject_param(url, param, _XSS_PAYLOAD), follow_redirects=False)
                 body = _resp_text(resp)
-            except requests.RequestException:
-                continue
+            except _REQUEST_ERRORS:
+                return None
             # Marker reflected AND angle brackets not HTML-encoded
             if _XSS_MARKER in body and "<script>" in body.lower():
                 ct = resp.headers.get("Content-Type", "")
                 if "html" in ct.lower() or not ct:
-                    out.append({
+                    return {
                         "title": f"Reflected XSS: parameter '{param}'",
                         "severity": "HIGH",
                         "description": (
@@ -391,55 +433,67 @@ class PentestScanner(BaseScanner):
                         ),
                         "endpoint": url,
                         "owasp_category": "A03:2021 - Cross-Site Scripting (XSS)",
-                    })
-        return out
+                    }
+            return None
+
+        results = await asyncio.gather(*(_probe(p) for p in probe_params))
+        return [r for r in results if r]
 
     @staticmethod
-    def _check_open_redirect(url: str, session: requests.Session) -> List[Dict[str, Any]]:
+    async def _check_open_redirect(url: str, client: httpx.AsyncClient) -> List[Dict[str, Any]]:
         """Detect open redirect via common query parameter names."""
-        out: List[Dict[str, Any]] = []
-        parsed = urlparse(url)
-        for param in _REDIRECT_PARAMS[:6]:
-            test_url = _inject_param(url, param, _REDIRECT_PROBE)
+        params = _REDIRECT_PARAMS[:6]
+
+        async def _probe(param: str) -> bool:
             try:
-                resp = session.get(test_url, timeout=REQ_TIMEOUT, allow_redirects=False)
-            except requests.RequestException:
-                continue
-            if resp.status_code in (301, 302, 303, 307, 308):
-                location = resp.headers.get("Location", "")
-                if "evil.secoraa-probe.com" in location:
-                    out.append({
-                        "title": f"Open Redirect via '{param}' parameter",
-                        "severity": "MEDIUM",
-                        "description": (
-                            f"Parameter '{param}' at {url} redirects to an arbitrary external URL. "
-                            "Attackers can use this for phishing."
-                        ),
-                        "endpoint": url,
-                        "owasp_category": "A01:2021 - Broken Access Control",
-                    })
-                    break  # one confirmed redirect is enough
-        return out
+                resp = await client.get(_inject_param(url, param, _REDIRECT_PROBE), follow_redirects=False)
+            except _REQUEST_ERRORS:
+                return False
+            return (
+                resp.status_code in (301, 302, 303, 307, 308)
+                and "evil.secoraa-probe.com" in resp.headers.get("Location", "")
+            )
+
+        hits = await asyncio.gather(*(_probe(p) for p in params))
+        for param, hit in zip(params, hits):
+            if hit:
+                # one confirmed redirect is enough
+                return [{
+                    "title": f"Open Redirect via '{param}' parameter",
+                    "severity": "MEDIUM",
+                    "description": (
+                        f"Parameter '{param}' at {url} redirects to an arbitrary external URL. "
+                        "Attackers can use this for phishing."
+                    ),
+                    "endpoint": url,
+                    "owasp_category": "A01:2021 - Broken Access Control",
+                }]
+        return []
 
     @staticmethod
-    def _check_path_traversal(url: str, session: requests.Session) -> List[Dict[str, Any]]:
+    async def _check_path_traversal(url: str, client: httpx.AsyncClient) -> List[Dict[str, Any]]:
         """Detect path traversal by looking for /etc/passwd content in response."""
         base = url.rstrip("/")
-        for payload in _TRAVERSAL_PAYLOADS:
-            probe_url = base + payload
+        probe_urls = [base + payload for payload in _TRAVERSAL_PAYLOADS]
+
+        async def _probe(probe_url: str) -> bool:
             try:
-                resp = session.get(probe_url, timeout=REQ_TIMEOUT, allow_redirects=False)
-                if resp.status_code == 200 and _TRAVERSAL_UNIX_SIG in _resp_text(resp):
-                    return [{
-                        "title": "Path Traversal — /etc/passwd readable",
-                        "severity": "CRITICAL",
-                        "description": (
-                            f"{probe_url} returned the contents of /etc/passwd. "
-                            "An attacker can read arbitrary files on the server."
-                        ),
-                        "endpoint": probe_url,
-                        "owasp_category": "A01:2021 - Broken Access Control",
-                    }]
-            except requests.RequestException:
-                continue
+                resp = await client.get(probe_url, follow_redirects=False)
+            except _REQUEST_ERRORS:
+                return False
+            return resp.status_code == 200 and _TRAVERSAL_UNIX_SIG in _resp_text(resp)
+
+        hits = await asyncio.gather(*(_probe(u) for u in probe_urls))
+        for probe_url, hit in zip(probe_urls, hits):
+            if hit:
+                return [{
+                    "title": "Path Traversal — /etc/passwd readable",
+                    "severity": "CRITICAL",
+                    "description": (
+                        f"{probe_url} returned the contents of /etc/passwd. "
+                        "An attacker can read arbitrary files on the server."
+                    ),
+                    "endpoint": probe_url,
+                    "owasp_category": "A01:2021 - Broken Access Control",
+                }]
         return []
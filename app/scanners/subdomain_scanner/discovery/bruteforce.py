@@ -1,6 +1,10 @@
 from __future__ import annotations
 
-from typing import List
+import logging
+import os
+from typing import Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
 
 COMMON_WORDS = [
     # ── Web / App tier ────────────────────────────────────────────────────
@@ -126,3 +130,36 @@ def bruteforce_subdomains(domain: str) -> List[str]:
     Generate possible subdomains using wordlist.
     """
     return [f"{word}.{domain}" for word in COMMON_WORDS]
+
+
+def iter_wordlist(path: str) -> Iterator[str]:
+    """
+    Lazily yield labels from a wordlist file (one per line, '#' comments allowed).
+    The file is streamed, so 100k+ entry lists never sit in memory.
+    """
+    try:
+        with open(path, "r", encoding="utf-8", errors="ignore") as fh:
+            for line in fh:
+                word = line.strip().lower().strip(".")
+                if word and not word.startswith("#"):
+                    yield word
+    except OSError as exc:
+        logger.warning("Wordlist %s unavailable: %s", path, exc)
+
+
+def configured_wordlists() -> List[str]:
+    """Extra wordlist paths from SUBDOMAIN_WORDLISTS (comma-separated)."""
+    raw = os.getenv("SUBDOMAIN_WORDLISTS", "")
+    return [p.strip() for p in raw.split(",") if p.strip()]
+
+
+def iter_bruteforce_subdomains(domain: str, wordlists: Optional[Iterable[str]] = None) -> Iterator[str]:
+    """
+    Streaming counterpart of `bruteforce_subdomains`: built-in words first, then
+    every configured wordlist. Not deduplicated — see discovery.candidates.
+    """
+    for word in COMMON_WORDS:
+        yield f"{word}.{domain}"
+    for path in (configured_wordlists() if wordlists is None else wordlists):
+        for word in iter_wordlist(path):
+            yield f"{word}.{domain}"
@@ -0,0 +1,164 @@
+"""
+Streaming subdomain candidate pipeline.
+
+Candidates are produced lazily — passive hits first, then permutations seeded
+from them, then the built-in words and any configured wordlists — and
+de-duplicated with a fixed-size Bloom filter, so memory stays flat regardless
+of wordlist size and the resolver can start on the first name immediately.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import math
+import os
+import re
+from typing import Iterable, Iterator, Optional, Set
+
+from app.scanners.subdomain_scanner.discovery.bruteforce import iter_bruteforce_subdomains
+
+logger = logging.getLogger(__name__)
+
+# Words combined with labels seen in passive results (dev-api, api-staging, ...).
+PERMUTATION_WORDS = [
+    "dev", "test", "qa", "uat", "stage", "staging", "stg", "prod",
+    "preprod", "demo", "sandbox", "beta", "internal", "int", "old", "new",
+    "v1", "v2", "api", "admin", "backup",
+]
+
+_LABEL_DIGITS = re.compile(r"^(.*?)(\d+)$")
+
+
+def _bloom_capacity() -> int:
+    try:
+        return max(10_000, int(os.getenv("SUBDOMAIN_DEDUPE_CAPACITY", "2000000")))
+    except ValueError:
+        return 2_000_000
+
+
+class BloomFilter:
+    """
+    Minimal Bloom filter (bytearray + double hashing over one blake2b digest).
+
+    Sized for ``capacity`` items at ``error_rate`` false positives; a false
+    positive only drops a generated candidate, never a passive hit (those are
+    tracked exactly by `stream_candidates`).
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 1e-4):
+        self.bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+        self._array = bytearray((self.bits + 7) // 8)
+
+    def _positions(self, item: str) -> Iterator[int]:
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.bits
+
+    def add(self, item: str) -> bool:
+        """Add ``item``; returns True if it was (probably) already present."""
+        present = True
+        for pos in self._positions(item):
+            byte, bit = divmod(pos, 8)
+            if not self._array[byte] & (1 << bit):
+                present = False
+                self._array[byte] |= 1 << bit
+        return present
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._array[p // 8] & (1 << (p % 8)) for p in self._positions(item))
+
+
+def _permutation_budget() -> int:
+    try:
+        return max(0, int(os.getenv("SUBDOMAIN_PERMUTATION_BUDGET", "50000")))
+    except ValueError:
+        return 50_000
+
+
+def iter_permutations(seeds: Iterable[str], domain: str) -> Iterator[str]:
+    """
+    Alteration rules seeded from known subdomains: numeric increment/decrement
+    (``api2`` -> ``api1``, ``api3``), then word prefix/suffix on the first label
+    (``dev-api``, ``api-dev``) and word as a new level (``dev.api``).
+
+    Rule-major rather than seed-major, so a budget cut (see `stream_candidates`)
+    still covers every seed with the likeliest alterations.
+    """
+    suffix = "." + domain.lower()
+    parsed = []
+    for seed in seeds:
+        seed = seed.lower()
+        if not seed.endswith(suffix) or not seed[: -len(suffix)]:
+            continue
+        prefix = seed[: -len(suffix)]
+        first, _, rest = prefix.partition(".")
+        parsed.append((prefix, first, f".{rest}{suffix}" if rest else suffix))
+
+    for prefix, first, tail in parsed:
+        m = _LABEL_DIGITS.match(first)
+        if m:
+            stem, num = m.group(1), int(m.group(2))
+            for n in (num - 1, num + 1):
+                if n >= 0:
+                    yield f"{stem}{n}{tail}"
+        else:
+            for n in (1, 2):
+                yield f"{first}{n}{tail}"
+
+    for word in PERMUTATION_WORDS:
+        for prefix, first, tail in parsed:
+            if word == first:
+                continue
+            yield f"{word}-{first}{tail}"
+            yield f"{first}-{word}{tail}"
+            yield f"{word}.{prefix}{suffix}"
+
+
+def stream_candidates(
+    domain: str,
+    passive: Iterable[str],
+    wordlists: Optional[Iterable[str]] = None,
+    capacity: Optional[int] = None,
+    permutation_budget: Optional[int] = None,
+) -> Iterator[str]:
+    """
+    Yield each unique candidate once: passive hits, their permutations (at most
+    ``permutation_budget``, default SUBDOMAIN_PERMUTATION_BUDGET), then built-in
+    words and wordlists (SUBDOMAIN_WORDLISTS unless ``wordlists``).
+    """
+    domain = domain.lower()
+    seeds: Set[str] = set()
+    seen = BloomFilter(capacity or _bloom_capacity())
+    emitted = 0
+
+    for name in passive:
+        name = (name or "").strip().lower()
+        if name and name not in seeds:
+            seeds.add(name)
+            seen.add(name)
+            emitted += 1
+            yield name
+
+    budget = _permutation_budget() if permutation_budget is None else permutation_budget
+    permutations = 0
+    if budget:
+        for name in iter_permutations(sorted(seeds), domain):
+            if name in seeds or seen.add(name):
+                continue
+            permutations += 1
+            yield name
+            if permutations >= budget:
+                logger.info("Permutation budget (%d) reached for %s", budget, domain)
+                break
+    emitted += permutations
+
+    for name in iter_bruteforce_subdomains(domain, wordlists):
+        if name in seeds or seen.add(name):
+            continue
+        emitted += 1
+        yield name
+
+    logger.info("Candidate stream for %s emitted %d unique names", domain, emitted)
@@ -2,13 +2,13 @@
 
 from typing import Dict
 
-from app.scanners.subdomain_scanner.discovery.bruteforce import bruteforce_subdomains
+from app.scanners.subdomain_scanner.discovery.candidates import stream_candidates
 from app.scanners.subdomain_scanner.discovery.passive import fetch_all_passive
-from app.scanners.subdomain_scanner.validation.dns_check import validate_dns
-from app.scanners.subdomain_scanner.validation.http_probe import probe_http
+from app.scanners.subdomain_scanner.validation.dns_check import iter_resolved
+from app.scanners.subdomain_scanner.validation.http_probe import probe_hosts
 
-from app.scanners.subdomain_scanner.vulnerabilities.exposure import check_exposure
-from app.scanners.subdomain_scanner.vulnerabilities.misconfig import check_misconfiguration
+from app.scanners.subdomain_scanner.vulnerabilities.exposure import SENSITIVE_PATHS, exposure_from_probes
+from app.scanners.subdomain_scanner.vulnerabilities.misconfig import misconfiguration_from_probes
 from app.scanners.subdomain_scanner.vulnerabilities.takeover import check_takeover
 
 from app.scanners.subdomain_scanner.scoring.severity import (
@@ -22,20 +22,16 @@ def run_subdomain_scan(domain: str) -> Dict:
     Full subdomain scan pipeline
     """
 
-    # 1. Discovery
-    brute = set(bruteforce_subdomains(domain))
+    # 1. Discovery + 2. DNS validation (candidates streamed into the resolver)
     passive = fetch_all_passive(domain)
-
-    discovered = list(brute.union(passive))
-
-    # 2. DNS validation
-    resolved = validate_dns(discovered)
+    resolved = list(iter_resolved(stream_candidates(domain, passive), domain=domain))
 
     # 3. HTTP probing
-    http_status = probe_http(resolved)
+    probes = probe_hosts(resolved, SENSITIVE_PATHS)
+    http_status = [probes[s].status for s in resolved]
 
-    exposure = check_exposure(resolved)
-    misconfig = check_misconfiguration(resolved)
+    exposure = exposure_from_probes(probes)
+    misconfig = misconfiguration_from_probes(probes)
     takeover = check_takeover(resolved)
 
     return {
@@ -4,9 +4,9 @@ from typing import List, Optional
 
 from app.scanners.subdomain_scanner.discovery.bruteforce import bruteforce_subdomains
 from app.scanners.subdomain_scanner.validation.dns_check import validate_dns
-from app.scanners.subdomain_scanner.validation.http_probe import probe_http
-from app.scanners.subdomain_scanner.vulnerabilities.exposure import check_exposure
-from app.scanners.subdomain_scanner.vulnerabilities.misconfig import check_misconfiguration
+from app.scanners.subdomain_scanner.validation.http_probe import probe_hosts
+from app.scanners.subdomain_scanner.vulnerabilities.exposure import SENSITIVE_PATHS, exposure_from_probes
+from app.scanners.subdomain_scanner.vulnerabilities.misconfig import misconfiguration_from_probes
 from app.scanners.subdomain_scanner.vulnerabilities.takeover import check_takeover
 
 
@@ -17,11 +17,12 @@ def run_subdomain_scan(domain: str, subdomains: Optional[List[str]] = None) -> d
 
     discovered = list(subdomains) if subdomains else bruteforce_subdomains(domain)
     resolved = validate_dns(discovered)
-    status_list = probe_http(resolved)
-    http_status = {resolved[i]: status_list[i] for i in range(min(len(resolved), len(status_list)))}
+    # One bounded-concurrency HTTP stage feeds status, misconfig and exposure analyzers
+    probes = probe_hosts(resolved, SENSITIVE_PATHS)
+    http_status = {sub: probe.status for sub, probe in probes.items()}
 
-    exposure = check_exposure(resolved)
-    misconfig = check_misconfiguration(resolved)
+    exposure = exposure_from_probes(probes)
+    misconfig = misconfiguration_from_probes(probes)
     takeover = check_takeover(resolved)
 
     results = {}
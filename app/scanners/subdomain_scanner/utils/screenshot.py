@@ -1,19 +1,218 @@
 # app/scanners/subdomain_scanner/utils/screenshot.py
+"""
+Pooled screenshot service.
 
-from playwright.sync_api import sync_playwright
+One Chromium process stays up for the whole batch; captures borrow a
+browser context (with its reusable page) from a fixed-size pool, so
+parallelism is bounded by SCREENSHOT_CONCURRENCY instead of launching a
+browser per URL. Byte-identical renders (parked pages, default server pages)
+are stored once and later hits point at the first capture.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
 import os
+import re
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional
+
+try:
+    from playwright.async_api import async_playwright  # type: ignore
+except Exception:  # pragma: no cover
+    async_playwright = None
+
+from app.storage.minio_client import upload_bytes_to_minio
+
+logger = logging.getLogger(__name__)
+
+
+def _env_int(name: str, default: int, lower: int, upper: int) -> int:
+    try:
+        return max(lower, min(upper, int(os.getenv(name, str(default)))))
+    except ValueError:
+        return default
+
+
+SCREENSHOT_CONCURRENCY = _env_int("SCREENSHOT_CONCURRENCY", 4, 1, 32)
+SCREENSHOT_TIMEOUT_MS = _env_int("SCREENSHOT_TIMEOUT_MS", 10000, 1000, 120000)
+VIEWPORT = {"width": 1280, "height": 800}
+
+
+@dataclass
+class ScreenshotResult:
+    url: str
+    object_name: Optional[str] = None
+    sha256: Optional[str] = None
+    duplicate_of: Optional[str] = None
+    error: Optional[str] = None
+
+
+def _safe_object_name(url: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", url.replace("://", "_")).strip("_")[:200] + ".png"
+
+
+class ScreenshotService:
+    """
+    Persistent browser with a pool of contexts/pages. Use as an async context
+    manager; `capture` is safe to call concurrently.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = SCREENSHOT_CONCURRENCY,
+        timeout_ms: int = SCREENSHOT_TIMEOUT_MS,
+        prefix: str = "screenshots",
+        store: Callable[..., object] = upload_bytes_to_minio,
+    ):
+        self.concurrency = max(1, concurrency)
+        self.timeout_ms = timeout_ms
+        self.prefix = prefix.rstrip("/")
+        self._store = store
+        self._playwright = None
+        self._browser = None
+        self._pool: Optional[asyncio.Queue] = None
+        self._by_hash: Dict[str, str] = {}  # sha256 -> object name, once stored
+        self._storing: Dict[str, asyncio.Event] = {}  # sha256 -> upload in flight
+
+    async def __aenter__(self) -> "ScreenshotService":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        if async_playwright is None:
+            raise RuntimeError(
+                "Screenshot dependency missing. Install `playwright` and run `playwright install chromium`."
+            )
+        self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch()
+        self._pool = asyncio.Queue()
+        for _ in range(self.concurrency):
+            await self._pool.put(await self._new_slot())
+
+    async def close(self) -> None:
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def _new_slot(self):
+        context = await self._browser.new_context(viewport=VIEWPORT, ignore_https_errors=True)
+        page = await context.new_page()
+        page.set_default_timeout(self.timeout_ms)
+        return context, page
+
+    async def capture(self, url: str) -> ScreenshotResult:
+        result = ScreenshotResult(url=url)
+        # None marks a slot whose replacement failed; it is retried on next use
+        slot = await self._pool.get()
+        try:
+            if slot is None:
+                slot = await self._new_slot()
+            context, page = slot
+            await page.goto(url, timeout=self.timeout_ms, wait_until="load")
+            png = await page.screenshot(timeout=self.timeout_ms)
+        except Exception as e:
+            result.error = str(e)
+            if slot is not None:
+                # A page stuck mid-navigation would poison later captures: replace the slot.
+                try:
+                    await slot[0].close()
+                except Exception:
+                    pass
+                try:
+                    slot = await self._new_slot()
+                except Exception as slot_err:
+                    logger.warning("Screenshot slot could not be recreated: %s", slot_err)
+                    slot = None
+            return result
+        finally:
+            await self._pool.put(slot)
+
+        # The page is done with; storing happens outside the slot.
+        digest = hashlib.sha256(png).hexdigest()
+        result.sha256 = digest
+        while digest in self._storing:
+            # The same render is being uploaded by another capture: reuse it if that succeeds
+            await self._storing[digest].wait()
+        first = self._by_hash.get(digest)
+        if first is not None:
+            result.object_name = first
+            result.duplicate_of = first
+            return result
+
+        object_name = f"{self.prefix}/{_safe_object_name(url)}"
+        self._storing[digest] = asyncio.Event()
+        try:
+            stored = await asyncio.to_thread(self._store, png, object_name, "image/png")
+            # upload_bytes_to_minio returns ("", "") when storage isn't configured
+            if isinstance(stored, tuple) and not any(stored):
+                result.error = "Screenshot not stored: object storage is not configured"
+            else:
+                self._by_hash[digest] = object_name
+                result.object_name = object_name
+        except Exception as e:
+            result.error = f"Screenshot upload failed: {e}"
+        finally:
+            self._storing.pop(digest).set()
+        return result
+
+    async def capture_many(self, urls: List[str]) -> List[ScreenshotResult]:
+        return list(await asyncio.gather(*(self.capture(u) for u in dict.fromkeys(urls))))
+
+
+async def capture_screenshots_async(urls: List[str], prefix: str = "screenshots") -> List[ScreenshotResult]:
+    async with ScreenshotService(prefix=prefix) as service:
+        return await service.capture_many(urls)
+
+
+def capture_scan_screenshots(scan_id: str, subdomains: List[str]) -> Dict:
+    """
+    Screenshot each subdomain's HTTPS root into MinIO under
+    ``screenshots/<scan_id>/`` and write an ``index.json`` next to them.
+    """
+    prefix = f"screenshots/{scan_id}"
+    results = asyncio.run(capture_screenshots_async([f"https://{s}" for s in subdomains], prefix=prefix))
+    index = {
+        "scan_id": scan_id,
+        "captured": sum(1 for r in results if r.object_name and not r.duplicate_of),
+        "duplicates": sum(1 for r in results if r.duplicate_of),
+        "failed": sum(1 for r in results if r.error),
+        "results": [asdict(r) for r in results],
+    }
+    upload_bytes_to_minio(
+        json.dumps(index, indent=2).encode("utf-8"),
+        f"{prefix}/index.json",
+        content_type="application/json",
+    )
+    logger.info(
+        "Screenshots for scan %s: %d stored, %d duplicates, %d failed",
+        scan_id, index["captured"], index["duplicates"], index["failed"],
+    )
+    return index
 
 
 def capture_screenshot(url: str, output_dir="screenshots"):
+    """Single capture to a local file (kept for ad-hoc use)."""
     os.makedirs(output_dir, exist_ok=True)
-    filename = url.replace("://", "_").replace("/", "_") + ".png"
-    path = os.path.join(output_dir, filename)
+    path = os.path.join(output_dir, _safe_object_name(url))
+
+    def _write(data: bytes, _object_name: str, _content_type: str) -> None:
+        with open(path, "wb") as f:
+            f.write(data)
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch()
-        page = browser.new_page()
-        page.goto(url, timeout=10000)
-        page.screenshot(path=path)
-        browser.close()
+    async def _run():
+        async with ScreenshotService(concurrency=1, store=_write) as service:
+            return await service.capture(url)
 
+    result = asyncio.run(_run())
+    if result.error:
+        raise RuntimeError(result.error)
     return path
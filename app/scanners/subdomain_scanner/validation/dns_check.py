@@ -1,7 +1,12 @@
 from __future__ import annotations
 
 import logging
-from typing import List
+import os
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import partial
+from itertools import islice
+from typing import FrozenSet, Iterable, Iterator, List, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -13,15 +18,89 @@ except Exception:  # pragma: no cover
 RECORD_TYPES = ("A", "AAAA", "CNAME")
 
 
-def _resolves(subdomain: str) -> bool:
-    """Check if a subdomain resolves via A, AAAA, or CNAME records."""
+def _resolve_concurrency() -> int:
+    try:
+        return max(1, min(500, int(os.getenv("DNS_RESOLVE_CONCURRENCY", "100"))))
+    except ValueError:
+        return 100
+
+
+def _answers(subdomain: str) -> FrozenSet[str]:
+    """Records of the first of A, AAAA, CNAME that resolves (empty if none does)."""
     for rtype in RECORD_TYPES:
         try:
-            dns.resolver.resolve(subdomain, rtype)  # type: ignore[attr-defined]
-            return True
+            answer = dns.resolver.resolve(subdomain, rtype)  # type: ignore[attr-defined]
         except Exception:
             continue
-    return False
+        return frozenset(f"{rtype}:{rdata.to_text()}" for rdata in answer)
+    return frozenset()
+
+
+def _resolves(subdomain: str) -> bool:
+    """Check if a subdomain resolves via A, AAAA, or CNAME records."""
+    return bool(_answers(subdomain))
+
+
+def wildcard_answers(domain: str, probes: int = 2) -> FrozenSet[str]:
+    """
+    Records that random, surely nonexistent labels under ``domain`` resolve to
+    — non-empty when the zone has a wildcard (``*.domain``) record.
+    """
+    records: FrozenSet[str] = frozenset()
+    for _ in range(probes):
+        records |= _answers(f"{uuid.uuid4().hex[:16]}.{domain}")
+    return records
+
+
+def _resolves_past_wildcard(subdomain: str, wildcard: FrozenSet[str]) -> bool:
+    """Resolves, and not only to the zone's wildcard records."""
+    records = _answers(subdomain)
+    return bool(records) and not records <= wildcard
+
+
+def iter_resolved(
+    candidates: Iterable[str], concurrency: int = 0, domain: Optional[str] = None,
+) -> Iterator[str]:
+    """
+    Resolve a (possibly unbounded) candidate stream concurrently and yield each
+    name that resolves as soon as its lookup finishes. Only ``concurrency``
+    lookups are in flight at once, so the input is consumed lazily.
+
+    With ``domain``, names answered only by that zone's wildcard record are
+    dropped as they resolve.
+    """
+    if dns is None:
+        logger.warning("dnspython not installed — skipping DNS validation")
+        yield from candidates
+        return
+
+    check = _resolves
+    wildcard = wildcard_answers(domain) if domain else frozenset()
+    if wildcard:
+        logger.info("Wildcard DNS on %s (%s) — dropping names that only match it", domain, ", ".join(sorted(wildcard)))
+        check = partial(_resolves_past_wildcard, wildcard=wildcard)
+
+    workers = concurrency or _resolve_concurrency()
+    source = iter(candidates)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dns-resolve") as pool:
+        pending = {pool.submit(check, name): name for name in islice(source, workers)}
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    name = pending.pop(fut)
+                    try:
+                        ok = fut.result()
+                    except Exception:
+                        ok = False
+                    if ok:
+                        yield name
+                for name in islice(source, len(done)):
+                    pending[pool.submit(check, name)] = name
+        finally:
+            # Consumer stopped early (e.g. scan terminated): drop queued lookups.
+            for fut in pending:
+                fut.cancel()
 
 
 def validate_dns(subdomains: List[str]) -> List[str]:
@@ -34,10 +113,8 @@ def validate_dns(subdomains: List[str]) -> List[str]:
         logger.warning("dnspython not installed — skipping DNS validation")
         return list(subdomains)
 
-    valid = []
-    for subdomain in subdomains:
-        if _resolves(subdomain):
-            valid.append(subdomain)
+    resolved = set(iter_resolved(subdomains))
+    valid = [s for s in subdomains if s in resolved]
 
     logger.info("DNS validation: %d / %d subdomains resolved", len(valid), len(subdomains))
     return valid
@@ -1,35 +1,109 @@
+"""
+HTTP probe stage for the subdomain pipeline.
+
+Each host's root is fetched once (HTTPS, falling back to HTTP) under a shared
+concurrency bound; the status/header analyzers consume that single response
+and the exposure analyzer gets a concurrent path-probe sub-stage against the
+base URL that answered.
+"""
+from __future__ import annotations
+
 import asyncio
-from typing import List, Optional
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Mapping, Optional
 
 try:
     import aiohttp  # type: ignore
+    from multidict import CIMultiDict  # type: ignore
 except Exception:  # pragma: no cover
     aiohttp = None
+    CIMultiDict = dict  # type: ignore
+
+PROBE_TIMEOUT_SECONDS = 5
+HTTP_PROBE_CONCURRENCY = max(1, int(os.getenv("SUBDOMAIN_HTTP_CONCURRENCY", "50")))
+
+
+@dataclass
+class HostProbe:
+    """Result of probing one subdomain's root page (and optional paths)."""
+
+    base_url: Optional[str] = None
+    status: Optional[int] = None
+    headers: Mapping[str, str] = field(default_factory=CIMultiDict)
+    path_status: Dict[str, Optional[int]] = field(default_factory=dict)
+
+    @property
+    def reachable(self) -> bool:
+        return self.status is not None
+
 
+async def _fetch(session, semaphore: asyncio.Semaphore, url: str):
+    """GET ``url`` and return (status, headers) without reading the body; None on error."""
+    async with semaphore:
+        try:
+            async with session.get(url) as r:
+                return int(r.status), CIMultiDict(r.headers)
+        except Exception:
+            return None
 
-async def _probe_one(session, url: str) -> Optional[int]:
-    try:
-        async with session.get(url, timeout=5) as r:
-            return int(r.status)
-    except Exception:
-        return None
 
+async def _probe_host(
+    session,
+    semaphore: asyncio.Semaphore,
+    subdomain: str,
+    paths: List[str],
+) -> HostProbe:
+    probe = HostProbe()
+    for scheme in ("https", "http"):
+        base_url = f"{scheme}://{subdomain}"
+        got = await _fetch(session, semaphore, base_url)
+        if got is not None:
+            probe.base_url = base_url
+            probe.status, probe.headers = got
+            break
 
-async def _probe_all_async(subdomains: List[str]) -> List[Optional[int]]:
-    if aiohttp is None:
-        return [None for _ in subdomains]
-    async with aiohttp.ClientSession() as session:
-        tasks = [_probe_one(session, f"https://{s}") for s in subdomains]
-        return await asyncio.gather(*tasks)
+    if probe.base_url and paths:
+        results = await asyncio.gather(
+            *(_fetch(session, semaphore, probe.base_url + p) for p in paths)
+        )
+        probe.path_status = {
+            p: (res[0] if res is not None else None) for p, res in zip(paths, results)
+        }
+    return probe
+
+
+async def probe_hosts_async(
+    subdomains: List[str],
+    paths: Iterable[str] = (),
+    concurrency: int = HTTP_PROBE_CONCURRENCY,
+) -> Dict[str, HostProbe]:
+    if aiohttp is None or not subdomains:
+        return {s: HostProbe() for s in subdomains}
+    path_list = list(paths)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    timeout = aiohttp.ClientTimeout(total=PROBE_TIMEOUT_SECONDS)
+    connector = aiohttp.TCPConnector(limit=max(1, concurrency))
+    async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+        probes = await asyncio.gather(
+            *(_probe_host(session, semaphore, s, path_list) for s in subdomains)
+        )
+    return dict(zip(subdomains, probes))
+
+
+def probe_hosts(subdomains: List[str], paths: Iterable[str] = ()) -> Dict[str, HostProbe]:
+    """
+    Sync entry point: probe every subdomain's root once, plus ``paths`` on the
+    base URL that answered. Returns {subdomain: HostProbe}.
+    """
+    if not subdomains:
+        return {}
+    return asyncio.run(probe_hosts_async(list(subdomains), paths))
 
 
 def probe_http(subdomains: List[str]) -> List[Optional[int]]:
     """
-    Sync wrapper expected by `run_subdomain_scan`.
     Returns a list of HTTP status codes aligned with input `subdomains`.
     """
-    if not subdomains:
-        return []
-    if aiohttp is None:
-        return [None for _ in subdomains]
-    return asyncio.run(_probe_all_async(subdomains))
+    probes = probe_hosts(subdomains)
+    return [probes[s].status if s in probes else None for s in subdomains]
@@ -1,7 +1,8 @@
 # app/scanners/subdomain_scanner/vulnerabilities/exposure.py
 
-import requests
-from typing import Dict, List
+from typing import Dict, List, Mapping, Optional
+
+from app.scanners.subdomain_scanner.validation.http_probe import HostProbe, probe_hosts
 
 SENSITIVE_PATHS = [
     "/.env",
@@ -13,30 +14,25 @@ SENSITIVE_PATHS = [
     "/backup",
 ]
 
+EXPOSED_STATUSES = (200, 401, 403)
 
-def check_exposure(subdomains: List[str]) -> Dict[str, List[str]]:
-    """
-    Detect exposed sensitive endpoints
-    """
-    findings = {}
-
-    for subdomain in subdomains:
-        exposed = []
-
-        for scheme in ("https", "http"):
-            base_url = f"{scheme}://{subdomain}"
 
-            for path in SENSITIVE_PATHS:
-                try:
-                    url = base_url + path
-                    response = requests.get(url, timeout=5)
+def analyze_exposure(path_status: Mapping[str, Optional[int]]) -> List[str]:
+    """Paths from a probe sub-stage whose status indicates the endpoint exists."""
+    return [p for p in SENSITIVE_PATHS if path_status.get(p) in EXPOSED_STATUSES]
 
-                    if response.status_code in (200, 401, 403):
-                        exposed.append(path)
-                except Exception:
-                    continue
 
+def exposure_from_probes(probes: Mapping[str, HostProbe]) -> Dict[str, List[str]]:
+    findings = {}
+    for subdomain, probe in probes.items():
+        exposed = analyze_exposure(probe.path_status)
         if exposed:
             findings[subdomain] = exposed
-
     return findings
+
+
+def check_exposure(subdomains: List[str]) -> Dict[str, List[str]]:
+    """
+    Detect exposed sensitive endpoints
+    """
+    return exposure_from_probes(probe_hosts(subdomains, SENSITIVE_PATHS))
@@ -1,7 +1,8 @@
 # app/scanners/subdomain_scanner/vulnerabilities/misconfig.py
 
-import requests
-from typing import Dict, List
+from typing import Dict, List, Mapping, Optional
+
+from app.scanners.subdomain_scanner.validation.http_probe import HostProbe, probe_hosts
 from app.scanners.subdomain_scanner.vulnerabilities.cve_mapper import map_cves
 
 SECURITY_HEADERS = [
@@ -13,32 +14,35 @@ SECURITY_HEADERS = [
 ]
 
 
-def check_misconfiguration(subdomains: List[str]) -> Dict[str, Dict]:
+def analyze_misconfiguration(headers: Mapping[str, str]) -> Optional[Dict]:
     """
-    Detect common HTTP security misconfigurations
+    Missing security headers + server CVE mapping for one root response
+    (``headers`` must be case-insensitive). None when nothing is missing.
     """
+    missing_headers = [h for h in SECURITY_HEADERS if h not in headers]
+    if not missing_headers:
+        return None
+    server = headers.get("Server", "Unknown")
+    return {
+        "missing_headers": missing_headers,
+        "server": server,
+        "cves": map_cves(server),
+    }
+
+
+def misconfiguration_from_probes(probes: Mapping[str, HostProbe]) -> Dict[str, Dict]:
     results = {}
+    for subdomain, probe in probes.items():
+        if not probe.reachable:
+            continue
+        finding = analyze_misconfiguration(probe.headers)
+        if finding:
+            results[subdomain] = finding
+    return results
 
-    for subdomain in subdomains:
-        for scheme in ("https", "http"):
-            url = f"{scheme}://{subdomain}"
-            try:
-                response = requests.get(url, timeout=5)
-
-                missing_headers = [
-                    h for h in SECURITY_HEADERS if h not in response.headers
-                ]
-
-                server = response.headers.get("Server", "Unknown")
-
-                if missing_headers:
-                    results[subdomain] = {
-                        "missing_headers": missing_headers,
-                        "server": server,
-                        "cves": map_cves(server),
-                    }
-                break
-            except Exception:
-                continue
 
-    return results
+def check_misconfiguration(subdomains: List[str]) -> Dict[str, Dict]:
+    """
+    Detect common HTTP security misconfigurations
+    """
+    return misconfiguration_from_probes(probe_hosts(subdomains))
@@ -0,0 +1,263 @@
+"""
+Shared TLS assessment cache.
+
+Many subdomains terminate on the same load-balancer IP and certificate, so
+the expensive part of a TLS check — protocol/cipher enumeration — is run once
+per (IP, port, certificate fingerprint) and reused across scans and scanner
+families (vulnerability_scanner, network_scanner, web_scanner):
+
+  - endpoint entries, keyed by (IP, port, SNI): what that handshake presented
+    (certificate fingerprint) plus per-kind results such as negotiated cipher
+  - assessment entries, keyed by (IP, port, fingerprint): enumeration results
+  - certificate entries, keyed by fingerprint: the parsed certificate
+
+Entries live in Redis (shared by API and Celery workers) with a TTL of
+TLS_CACHE_TTL_SECONDS (default one day); without Redis an in-process dict is
+used. Concurrent misses for the same key are coalesced in-process.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import socket
+import ssl
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "secoraa:tls:"
+
+_memory: Dict[str, Tuple[float, Any]] = {}
+_memory_lock = threading.Lock()
+# Striped locks coalesce concurrent misses without a lock object per key.
+_key_locks = [threading.Lock() for _ in range(64)]
+
+_redis_client = None
+_redis_failed = False
+
+
+def _ttl_seconds() -> int:
+    try:
+        return max(60, int(os.getenv("TLS_CACHE_TTL_SECONDS", "86400")))
+    except ValueError:
+        return 86400
+
+
+def _redis():
+    """Lazily connect to Redis; returns None (and stops retrying) if unavailable."""
+    global _redis_client, _redis_failed
+    if _redis_client is not None or _redis_failed:
+        return _redis_client
+    try:
+        import redis
+
+        client = redis.Redis.from_url(
+            os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+            socket_connect_timeout=2,
+            socket_timeout=5,
+        )
+        client.ping()
+        _redis_client = client
+    except Exception as e:
+        logger.info("TLS cache falling back to in-process memory: %s", e)
+        _redis_failed = True
+    return _redis_client
+
+
+def _get(key: str) -> Optional[Any]:
+    client = _redis()
+    if client is not None:
+        try:
+            raw = client.get(_KEY_PREFIX + key)
+            return json.loads(raw) if raw is not None else None
+        except Exception as e:
+            logger.debug("TLS cache read failed for %s: %s", key, e)
+            return None
+    with _memory_lock:
+        entry = _memory.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires < time.time():
+            _memory.pop(key, None)
+            return None
+        return value
+
+
+def _set(key: str, value: Any, ttl: Optional[int] = None) -> None:
+    ttl = ttl or _ttl_seconds()
+    client = _redis()
+    if client is not None:
+        try:
+            client.set(_KEY_PREFIX + key, json.dumps(value, default=str), ex=ttl)
+        except Exception as e:
+            logger.debug("TLS cache write failed for %s: %s", key, e)
+        return
+    with _memory_lock:
+        _memory[key] = (time.time() + ttl, value)
+
+
+def _key_lock(key: str) -> threading.Lock:
+    return _key_locks[hash(key) % len(_key_locks)]
+
+
+def cached(key: str, compute: Callable[[], Any], ttl: Optional[int] = None) -> Any:
+    """Return the cached value for ``key`` or compute, store and return it (single-flight)."""
+    value = _get(key)
+    if value is not None:
+        return value
+    with _key_lock(key):
+        value = _get(key)
+        if value is not None:
+            return value
+        value = compute()
+        if value is not None:
+            _set(key, value, ttl)
+        return value
+
+
+def clear_memory_cache() -> None:
+    with _memory_lock:
+        _memory.clear()
+
+
+def resolve_ip(host: str) -> str:
+    """First IPv4/IPv6 address for ``host`` (the host itself if it is an IP)."""
+    try:
+        return socket.getaddrinfo(host, None, type=socket.SOCK_STREAM)[0][4][0]
+    except (socket.gaierror, IndexError, OSError):
+        return host
+
+
+def endpoint_key(kind: str, ip: str, port: int, sni: Optional[str]) -> str:
+    return f"endpoint:{kind}:{ip}:{port}:{(sni or '').lower()}"
+
+
+def cached_endpoint(
+    kind: str,
+    ip: str,
+    port: int,
+    sni: Optional[str],
+    compute: Callable[[], Any],
+) -> Any:
+    """Per-(IP, port, SNI) memo for a named kind of TLS result."""
+    return cached(endpoint_key(kind, ip, port, sni), compute)
+
+
+def _parse_der_certificate(der: bytes) -> Dict[str, Any]:
+    info: Dict[str, Any] = {}
+    try:
+        from cryptography import x509
+        from cryptography.x509 import DNSName, SubjectAlternativeName
+        from cryptography.x509.oid import NameOID
+    except ImportError:
+        return info
+    try:
+        leaf = x509.load_der_x509_certificate(der)
+        cn = leaf.subject.get_attributes_for_oid(NameOID.COMMON_NAME)
+        info = {
+            "issuer": leaf.issuer.rfc4514_string(),
+            "subject": leaf.subject.rfc4514_string(),
+            "common_name": cn[0].value if cn else "",
+            "not_before": str(leaf.not_valid_before_utc),
+            "not_after": str(leaf.not_valid_after_utc),
+            "sans": [],
+        }
+        try:
+            san_ext = leaf.extensions.get_extension_for_class(SubjectAlternativeName)
+            info["sans"] = [str(san) for san in san_ext.value.get_values_for_type(DNSName)]
+        except Exception:
+            pass
+    except Exception as e:
+        logger.debug("Certificate parse failed: %s", e)
+    return info
+
+
+def _handshake(ip: str, port: int, sni: Optional[str], timeout: float) -> Optional[Dict[str, Any]]:
+    ctx = ssl.create_default_context()
+    ctx.check_hostname = False
+    ctx.verify_mode = ssl.CERT_NONE
+    try:
+        with socket.create_connection((ip, port), timeout=timeout) as sock:
+            with ctx.wrap_socket(sock, server_hostname=sni or None) as ssock:
+                der = ssock.getpeercert(binary_form=True)
+                cipher = ssock.cipher()
+                return {
+                    "fingerprint": hashlib.sha256(der).hexdigest() if der else None,
+                    "der_hex": der.hex() if der else None,
+                    "tls_version": ssock.version(),
+                    "cipher": list(cipher) if cipher else None,
+                }
+    except Exception as e:
+        logger.debug("TLS handshake to %s:%s (sni=%s) failed: %s", ip, port, sni, e)
+        return None
+
+
+def get_handshake(
+    host: str,
+    port: int = 443,
+    sni: Optional[str] = None,
+    timeout: float = 5.0,
+    gate: Optional[threading.Semaphore] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    One cached default handshake per (IP, port, SNI): certificate fingerprint,
+    negotiated version and cipher. ``sni`` defaults to ``host``.
+
+    ``gate`` (a caller's connection cap) is acquired around the handshake
+    only, inside the per-key lock — callers must not already hold it, or a
+    miss computing under the same striped lock can wait on them forever.
+    """
+    ip = resolve_ip(host)
+    sni = host if sni is None else sni
+
+    def _compute():
+        with gate or nullcontext():
+            return _handshake(ip, port, sni, timeout)
+
+    hs = cached_endpoint("handshake", ip, port, sni, _compute)
+    if hs is not None:
+        hs = dict(hs, ip=ip, port=port, sni=sni)
+    return hs
+
+
+def get_certificate(host: str, port: int = 443, sni: Optional[str] = None, timeout: float = 5.0) -> Optional[Dict[str, Any]]:
+    """Parsed leaf certificate presented at (host, port, SNI), memoized by fingerprint."""
+    hs = get_handshake(host, port, sni, timeout)
+    if not hs or not hs.get("fingerprint"):
+        return None
+    fp = hs["fingerprint"]
+    der = bytes.fromhex(hs["der_hex"])
+    info = cached(f"cert:{fp}", lambda: _parse_der_certificate(der) or {"parsed": False})
+    return dict(info, fingerprint=fp)
+
+
+def cached_assessment(
+    kind: str,
+    host: str,
+    port: int,
+    compute: Callable[[str], Any],
+    sni: Optional[str] = None,
+    timeout: float = 5.0,
+    gate: Optional[threading.Semaphore] = None,
+) -> Any:
+    """
+    Run ``compute(ip)`` (e.g. a protocol/cipher enumeration) once per
+    (IP, port, certificate fingerprint) for ``kind``. Subdomains served by the
+    same endpoint and certificate share the result. Falls back to an
+    (IP, port, SNI) key when no certificate could be read. ``gate`` caps the
+    fingerprinting handshake as in `get_handshake`.
+    """
+    hs = get_handshake(host, port, sni, timeout, gate)
+    ip = hs["ip"] if hs else resolve_ip(host)
+    fp = hs.get("fingerprint") if hs else None
+    if fp:
+        key = f"assessment:{kind}:{ip}:{port}:{fp}"
+    else:
+        key = endpoint_key(f"assessment:{kind}", ip, port, host if sni is None else sni)
+    return cached(key, lambda: compute(ip))
@@ -1,14 +1,56 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 
 import httpx
 
+from app.scanners import tls_cache
 from app.scanners.vulnerability_scanner.base import BasePlugin, ScanConfig
 
 logger = logging.getLogger(__name__)
 
 
+def _enumerate_protocols(hostname: str, ip: str, port: int = 443) -> dict | None:
+    """sslyze protocol enumeration against one endpoint (raises ImportError without sslyze)."""
+    from sslyze import (
+        Scanner, ServerNetworkLocation, ServerScanRequest,
+        ScanCommand,
+    )
+
+    location = ServerNetworkLocation(hostname, port, ip_address=ip)
+    proto_map = {
+        ScanCommand.SSL_2_0_CIPHER_SUITES: "SSLv2",
+        ScanCommand.SSL_3_0_CIPHER_SUITES: "SSLv3",
+        ScanCommand.TLS_1_0_CIPHER_SUITES: "TLSv1.0",
+        ScanCommand.TLS_1_1_CIPHER_SUITES: "TLSv1.1",
+        ScanCommand.TLS_1_2_CIPHER_SUITES: "TLSv1.2",
+        ScanCommand.TLS_1_3_CIPHER_SUITES: "TLSv1.3",
+    }
+    request = ServerScanRequest(server_location=location, scan_commands=set(proto_map))
+
+    scanner = Scanner()
+    scanner.queue_scans([request])
+    result = None
+    for scan_result in scanner.get_results():
+        result = scan_result
+        break
+
+    if result is None or result.scan_result is None:
+        # Not cached (None): a transient failure shouldn't stick for a day.
+        return None
+
+    supported = []
+    for cmd, label in proto_map.items():
+        try:
+            r = result.scan_result.get_scan_command_result(cmd)
+            if r and r.accepted_cipher_suites:
+                supported.append(label)
+        except Exception:
+            pass
+    return {"supported_protocols": supported}
+
+
 class TLSCheckPlugin(BasePlugin):
     name = "httpsCertificateVersion"
     is_invasive = False
@@ -22,83 +64,34 @@ class TLSCheckPlugin(BasePlugin):
     ) -> dict | None:
         try:
             logger.info(f"[TLS] Checking TLS/SSL for {config.asset_value}:443")
-            from sslyze import (
-                Scanner, ServerNetworkLocation, ServerScanRequest,
-                ScanCommand,
-            )
-
             hostname = config.asset_value
-            location = ServerNetworkLocation(hostname, 443)
-            request = ServerScanRequest(
-                server_location=location,
-                scan_commands={
-                    ScanCommand.SSL_2_0_CIPHER_SUITES,
-                    ScanCommand.SSL_3_0_CIPHER_SUITES,
-                    ScanCommand.TLS_1_0_CIPHER_SUITES,
-                    ScanCommand.TLS_1_1_CIPHER_SUITES,
-                    ScanCommand.TLS_1_2_CIPHER_SUITES,
-                    ScanCommand.TLS_1_3_CIPHER_SUITES,
-                    ScanCommand.CERTIFICATE_INFO,
-                },
+            # Enumeration runs once per (IP, port, certificate) per cache TTL and
+            # is shared with every other subdomain behind the same endpoint.
+            assessment = await asyncio.to_thread(
+                tls_cache.cached_assessment,
+                "sslyze_protocols", hostname, 443,
+                lambda ip: _enumerate_protocols(hostname, ip),
             )
-
-            scanner = Scanner()
-            scanner.queue_scans([request])
-            result = None
-            for scan_result in scanner.get_results():
-                result = scan_result
-                break
-
-            if result is None:
+            if assessment is None:
                 logger.info(f"[TLS] No result from sslyze scanner")
                 return None
 
-            # ── Parse supported protocols ──────────────────────────────
-            supported = []
-            proto_map = {
-                ScanCommand.SSL_2_0_CIPHER_SUITES: "SSLv2",
-                ScanCommand.SSL_3_0_CIPHER_SUITES: "SSLv3",
-                ScanCommand.TLS_1_0_CIPHER_SUITES: "TLSv1.0",
-                ScanCommand.TLS_1_1_CIPHER_SUITES: "TLSv1.1",
-                ScanCommand.TLS_1_2_CIPHER_SUITES: "TLSv1.2",
-                ScanCommand.TLS_1_3_CIPHER_SUITES: "TLSv1.3",
-            }
-            for cmd, label in proto_map.items():
-                try:
-                    r = result.scan_result.get_scan_command_result(cmd)
-                    if r and r.accepted_cipher_suites:
-                        supported.append(label)
-                except Exception:
-                    pass
-
+            supported = list(assessment.get("supported_protocols") or [])
             logger.info(f"[TLS] Supported protocols: {supported or 'none'}")
 
-            # ── Parse certificate ──────────────────────────────────────
+            # ── Certificate (memoized by fingerprint) ──────────────────
             cert_info = {}
-            try:
-                cert_result = result.scan_result.certificate_info
-                if cert_result:
-                    chain = cert_result.certificate_deployments[0]
-                    leaf = chain.verified_certificate_chain[0]
-                    from cryptography.x509 import SubjectAlternativeName, DNSName
-                    cert_info = {
-                        "issuer": leaf.issuer.rfc4514_string(),
-                        "subject": leaf.subject.rfc4514_string(),
-                        "not_after": str(leaf.not_valid_after_utc),
-                        "sans": [],
-                    }
-                    try:
-                        san_ext = leaf.extensions.get_extension_for_class(SubjectAlternativeName)
-                        cert_info["sans"] = [
-                            str(san) for san in san_ext.value.get_values_for_type(DNSName)
-                        ]
-                    except Exception:
-                        pass
-                    logger.info(f"[TLS] Certificate: issuer={cert_info.get('issuer')}, "
-                                f"expires={cert_info.get('not_after')}, "
-                                f"SANs={len(cert_info.get('sans', []))}")
-            except Exception as e:
-                logger.debug(f"[TLS] Cert parse error: {e}")
+            cert = await asyncio.to_thread(tls_cache.get_certificate, hostname, 443)
+            if cert and cert.get("issuer"):
+                cert_info = {
+                    "issuer": cert.get("issuer"),
+                    "subject": cert.get("subject"),
+                    "not_after": cert.get("not_after"),
+                    "sans": cert.get("sans", []),
+                }
+                logger.info(f"[TLS] Certificate: issuer={cert_info.get('issuer')}, "
+                            f"expires={cert_info.get('not_after')}, "
+                            f"SANs={len(cert_info.get('sans', []))}")
 
             proto_text = ", ".join(supported) if supported else "None detected"
             desc = (
@@ -134,61 +127,34 @@ class WildcardTLSPlugin(BasePlugin):
     ) -> dict | None:
         try:
             logger.info(f"[WILDCARD-TLS] Checking for wildcard certificate on {config.asset_value}:443")
-            from sslyze import Scanner, ServerNetworkLocation, ServerScanRequest, ScanCommand
-
             hostname = config.asset_value
-            location = ServerNetworkLocation(hostname, 443)
-            request = ServerScanRequest(
-                server_location=location,
-                scan_commands={ScanCommand.CERTIFICATE_INFO},
-            )
+            # Certificate comes from the shared TLS cache (memoized by fingerprint),
+            # so no separate sslyze CERTIFICATE_INFO scan is needed.
+            cert = await asyncio.to_thread(tls_cache.get_certificate, hostname, 443)
+            if not cert or cert.get("parsed") is False:
+                return None
 
-            scanner = Scanner()
-            scanner.queue_scans([request])
-            for scan_result in scanner.get_results():
-                try:
-                    cert_result = scan_result.scan_result.certificate_info
-                    chain = cert_result.certificate_deployments[0]
-                    leaf = chain.verified_certificate_chain[0]
-
-                    # Check CN for wildcard
-                    from cryptography.x509.oid import NameOID
-                    cn = leaf.subject.get_attributes_for_oid(NameOID.COMMON_NAME)
-                    cn_value = cn[0].value if cn else ""
-
-                    # Check SANs for wildcard
-                    wildcards = []
-                    if cn_value.startswith("*"):
-                        wildcards.append(f"CN: {cn_value}")
-
-                    try:
-                        from cryptography.x509 import SubjectAlternativeName, DNSName
-                        sans = leaf.extensions.get_extension_for_class(SubjectAlternativeName)
-                        for san in sans.value.get_values_for_type(DNSName):
-                            if san.startswith("*"):
-                                wildcards.append(f"SAN: {san}")
-                    except Exception:
-                        pass
-
-                    if wildcards:
-                        logger.info(f"[WILDCARD-TLS] ✗ Wildcard certificate detected: {wildcards}")
-                        return self._result(
-                            affected_urls=[f"https://{hostname}"],
-                            description=(
-                                f"Wildcard TLS certificate detected on port 443. "
-                                f"Wildcard entries: {', '.join(wildcards)}"
-                            ),
-                            extra={"wildcards": wildcards},
-                        )
-                    else:
-                        logger.info(f"[WILDCARD-TLS] ✓ No wildcard certificate")
-                except Exception as e:
-                    logger.debug(f"[WILDCARD-TLS] Parse error: {e}")
+            cn_value = cert.get("common_name") or ""
+            wildcards = []
+            if cn_value.startswith("*"):
+                wildcards.append(f"CN: {cn_value}")
+            for san in cert.get("sans", []):
+                if san.startswith("*"):
+                    wildcards.append(f"SAN: {san}")
+
+            if wildcards:
+                logger.info(f"[WILDCARD-TLS] ✗ Wildcard certificate detected: {wildcards}")
+                return self._result(
+                    affected_urls=[f"https://{hostname}"],
+                    description=(
+                        f"Wildcard TLS certificate detected on port 443. "
+                        f"Wildcard entries: {', '.join(wildcards)}"
+                    ),
+                    extra={"wildcards": wildcards},
+                )
+            logger.info(f"[WILDCARD-TLS] ✓ No wildcard certificate")
             return None
 
-        except ImportError:
-            logger.warning(f"[WILDCARD-TLS] sslyze not installed — skipping")
-            return None
         except Exception as e:
             logger.warning(f"[WILDCARD-TLS] Check failed: {type(e).__name__}: {e}")
             return None
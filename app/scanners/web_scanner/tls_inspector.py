@@ -1,25 +1,25 @@
 from typing import Dict, Any
-import socket
-import ssl
+
+from app.scanners import tls_cache
 
 
 def inspect_tls(domain: str, timeout: int) -> Dict[str, Any]:
-    result: Dict[str, Any] = {}
-    context = ssl.create_default_context()
-    context.check_hostname = False
-    context.verify_mode = ssl.CERT_NONE
+    # Handshake and certificate come from the shared TLS cache (one handshake
+    # per IP/port/SNI per TTL, certificate parsed once per fingerprint).
+    handshake = tls_cache.get_handshake(domain, 443, timeout=timeout)
+    if handshake is None:
+        raise ConnectionError(f"TLS handshake with {domain}:443 failed")
+    cert = tls_cache.get_certificate(domain, 443, timeout=timeout) or {}
 
-    with socket.create_connection((domain, 443), timeout=timeout) as sock:
-        with context.wrap_socket(sock, server_hostname=domain) as ssock:
-            cert = ssock.getpeercert()
-            result["tls_version"] = ssock.version()
-            result["cipher"] = ssock.cipher()
-            result["issuer"] = cert.get("issuer", [])
-            result["subject"] = cert.get("subject", [])
-            result["notAfter"] = cert.get("notAfter", "")
-            result["notBefore"] = cert.get("notBefore", "")
-            result["subjectAltName"] = cert.get("subjectAltName", [])
-            result["is_wildcard"] = any(
-                isinstance(entry, tuple) and entry[1].startswith("*.") for entry in cert.get("subjectAltName", [])
-            )
+    sans = cert.get("sans", [])
+    result: Dict[str, Any] = {}
+    result["tls_version"] = handshake.get("tls_version")
+    result["cipher"] = tuple(handshake["cipher"]) if handshake.get("cipher") else None
+    result["issuer"] = cert.get("issuer", [])
+    result["subject"] = cert.get("subject", [])
+    result["notAfter"] = cert.get("not_after", "")
+    result["notBefore"] = cert.get("not_before", "")
+    result["subjectAltName"] = [("DNS", name) for name in sans]
+    result["is_wildcard"] = any(name.startswith("*.") for name in sans)
+    result["fingerprint"] = handshake.get("fingerprint")
     return result
@@ -13,6 +13,7 @@ class GenericScanPayload(BaseModel):
     asset_uuid: Optional[str] = None
     is_invasive: Optional[bool] = False
     is_extensive_scan: Optional[bool] = False
+    screenshots: Optional[bool] = False
 
 
 class CreateScanRequest(BaseModel):
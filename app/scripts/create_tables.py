@@ -326,6 +326,48 @@ def migrate_pentest_credentials():
         print(f"✅ Re-encrypted {updated} pentest credential record(s) to enc:v1:")
 
 
+def add_performance_indexes():
+    """Indexes backing the scheduled-scan dispatcher's due/in-flight queries."""
+    inspector = inspect(engine)
+    if not inspector.has_table("scheduled_scans"):
+        return
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_scheduled_scans_status_scheduled_for "
+            "ON scheduled_scans (status, scheduled_for);"
+        ))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_scheduled_scans_triggered_scan_id "
+            "ON scheduled_scans (triggered_scan_id);"
+        ))
+
+
+def add_bulk_upsert_indexes():
+    """
+    Unique indexes that let the bulk subdomain inserts use ON CONFLICT DO NOTHING
+    to skip rows written concurrently. Skipped (not fatal) while legacy duplicate
+    rows still exist — the inserts then rely on their pre-filter alone.
+    """
+    inspector = inspect(engine)
+    statements = []
+    if inspector.has_table("subdomains"):
+        statements.append(
+            "CREATE UNIQUE INDEX IF NOT EXISTS ux_subdomains_domain_id_subdomain_name "
+            "ON subdomains (domain_id, subdomain_name);"
+        )
+    if inspector.has_table("scan_results"):
+        statements.append(
+            "CREATE UNIQUE INDEX IF NOT EXISTS ux_scan_results_scan_id_subdomain "
+            "ON scan_results (scan_id, subdomain);"
+        )
+    for stmt in statements:
+        try:
+            with engine.begin() as conn:
+                conn.execute(text(stmt))
+        except Exception as exc:
+            print(f"⚠️  Skipping unique index (duplicate rows present?): {exc}")
+
+
 def run_migrations():
     print("🚀 Running database migrations...")
     try:
@@ -333,6 +375,8 @@ def run_migrations():
         add_missing_columns()
         add_pentest_columns()
         migrate_pentest_credentials()
+        add_performance_indexes()
+        add_bulk_upsert_indexes()
     except Exception as exc:
         print(f"❌ Migration failed: {exc}")
         raise
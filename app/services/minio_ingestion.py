@@ -1,7 +1,6 @@
 import json
 import logging
 from sqlalchemy import Select
-from sqlalchemy.exc import IntegrityError
 from app.storage.minio_client import get_minio_client
 
 logger = logging.getLogger(__name__)
@@ -72,64 +71,15 @@ def ingest_from_minio(bucket: str, object_name: str, db):
     else:
         logger.info(f"Found existing domain: {domain_name}")
 
-    # 2️⃣ Insert subdomains (skip duplicates due to unique constraint)
-    created_count = 0
-    skipped_count = 0
-    
-    for subdomain_name in subdomains:
-        if not subdomain_name or not subdomain_name.strip():
-            continue
-            
-        # Check if subdomain already exists
-        stmt = Select(Subdomain).filter(
-            Subdomain.domain_id == domain.id,
-            Subdomain.subdomain_name == subdomain_name
-        )
-        existing = db.execute(stmt).scalars().first()
-        
-        if existing:
-            skipped_count += 1
-            continue
-        
-        # Create new subdomain
-        subdomain = Subdomain(
-            domain_id=domain.id,
-            subdomain_name=subdomain_name,
-            discovery_source="auto_discovered",
-            created_by="pratik",
-            updated_by="pratik"
-        )
-        db.add(subdomain)
-        created_count += 1
+    # 2️⃣ Insert subdomains in bulk (ON CONFLICT DO NOTHING covers races with the scan pipeline)
+    from app.database.bulk import bulk_upsert_subdomains
 
     try:
+        created_count, skipped_count = bulk_upsert_subdomains(db, domain.id, subdomains, "pratik")
         db.commit()
-    except IntegrityError as e:
+    except Exception:
         db.rollback()
-        logger.warning(
-            f"IntegrityError committing subdomains for {domain_name} "
-            f"(race condition with scan pipeline): {e}"
-        )
-        for subdomain_name in subdomains:
-            if not subdomain_name or not subdomain_name.strip():
-                continue
-            stmt = Select(Subdomain).filter(
-                Subdomain.domain_id == domain.id,
-                Subdomain.subdomain_name == subdomain_name
-            )
-            if db.execute(stmt).scalars().first():
-                continue
-            try:
-                db.add(Subdomain(
-                    domain_id=domain.id,
-                    subdomain_name=subdomain_name,
-                    discovery_source="auto_discovered",
-                    created_by="pratik",
-                    updated_by="pratik"
-                ))
-                db.commit()
-            except IntegrityError:
-                db.rollback()
+        raise
 
     logger.info(
         f"Domain {domain_name}: Created {created_count} subdomains, "
@@ -13,9 +13,51 @@ except ImportError:
     pass
 
 from celery import Celery
+from kombu import Exchange, Queue
 
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 
+# One queue per scanner family so each can be given its own worker pool:
+#   celery -A app.worker.celery_app worker -Q scans.pentest -c 2
+# Values are the default worker concurrency for that queue, overridable with
+# CELERY_CONCURRENCY_<QUEUE> (dots replaced by underscores, upper-cased),
+# e.g. CELERY_CONCURRENCY_SCANS_PENTEST=4.
+SCAN_QUEUES = {
+    "scans.api": 4,
+    "scans.discovery": 2,      # dd + subdomain
+    "scans.network": 4,
+    "scans.vulnerability": 4,
+    "scans.pentest": 2,
+    "scans.screenshots": 1,    # each worker keeps one browser with a page pool
+}
+
+# scan_type (SCANNERS key) -> queue
+SCAN_TYPE_QUEUES = {
+    "api": "scans.api",
+    "dd": "scans.discovery",
+    "subdomain": "scans.discovery",
+    "network": "scans.network",
+    "vulnerability": "scans.vulnerability",
+    "pentest": "scans.pentest",
+}
+
+# Redis transport priorities: 0 is served first, 9 last.
+PRIORITY_INTERACTIVE = 2
+PRIORITY_SCHEDULED = 6
+
+
+def queue_for_scan_type(scan_type: str) -> str:
+    return SCAN_TYPE_QUEUES.get(str(scan_type or "").lower(), "celery")
+
+
+def queue_concurrency(queue: str) -> int:
+    env_key = "CELERY_CONCURRENCY_" + queue.replace(".", "_").upper()
+    try:
+        return max(1, int(os.getenv(env_key, str(SCAN_QUEUES.get(queue, 2)))))
+    except ValueError:
+        return SCAN_QUEUES.get(queue, 2)
+
+
 celery_app = Celery(
     "secoraa",
     broker=REDIS_URL,
@@ -30,10 +72,33 @@ celery_app.conf.update(
     enable_utc=True,
     task_track_started=True,
     task_acks_late=True,
+    # Requeue instead of dropping when the worker process is killed mid-task,
+    # so the task resumes from its checkpoint on another worker.
+    task_reject_on_worker_lost=True,
     worker_prefetch_multiplier=1,
     # Long-running scans — don't kill them
     task_soft_time_limit=1800,  # 30 min soft limit
     task_time_limit=3600,       # 60 min hard limit
+    # A worker started without -Q consumes every queue listed here.
+    task_queues=[
+        Queue(name, Exchange(name), routing_key=name)
+        for name in ["celery", *SCAN_QUEUES]
+    ],
+    task_default_queue="celery",
+    task_routes={
+        "app.worker.tasks.run_api_scan_task": {"queue": "scans.api"},
+        "app.worker.tasks.run_pentest_task": {"queue": "scans.pentest"},
+        "app.worker.tasks.capture_screenshots_task": {"queue": "scans.screenshots"},
+    },
+    task_default_priority=5,
+    broker_transport_options={
+        "queue_order_strategy": "priority",
+        "priority_steps": list(range(10)),
+        "sep": ":",
+        # Must exceed the longest hard time limit (pentest runs), otherwise
+        # Redis re-delivers long-running (unacked) scans to a second worker.
+        "visibility_timeout": 4 * 3600,
+    },
 )
 
 # Auto-discover tasks from app.worker.tasks
@@ -0,0 +1,103 @@
+"""
+Scan checkpoints — small per-scan key/value records that let a redelivered
+Celery task pick up where the previous attempt stopped.
+
+Stored as a Redis hash (``secoraa:checkpoint:<scan_id>``) so any worker can
+resume a scan started by another one. When Redis is unreachable (thread mode,
+local dev) an in-process dict is used instead.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "secoraa:checkpoint:"
+
+_memory: Dict[str, Dict[str, Any]] = {}
+_memory_lock = threading.Lock()
+
+_redis_client = None
+_redis_failed = False
+
+
+def _ttl_seconds() -> int:
+    try:
+        return max(60, int(os.getenv("SCAN_CHECKPOINT_TTL_SECONDS", "86400")))
+    except ValueError:
+        return 86400
+
+
+def _redis():
+    """Lazily connect to Redis; returns None (and stops retrying) if unavailable."""
+    global _redis_client, _redis_failed
+    if _redis_client is not None or _redis_failed:
+        return _redis_client
+    try:
+        import redis
+
+        client = redis.Redis.from_url(
+            os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+            socket_connect_timeout=2,
+            socket_timeout=5,
+        )
+        client.ping()
+        _redis_client = client
+    except Exception as e:
+        logger.info("Checkpoint store falling back to in-process memory: %s", e)
+        _redis_failed = True
+    return _redis_client
+
+
+def load_checkpoint(scan_id: str) -> Dict[str, Any]:
+    """Return every stage recorded for ``scan_id`` ({} if none)."""
+    client = _redis()
+    if client is not None:
+        try:
+            raw = client.hgetall(_KEY_PREFIX + str(scan_id))
+            return {
+                (k.decode() if isinstance(k, bytes) else k): json.loads(v)
+                for k, v in raw.items()
+            }
+        except Exception as e:
+            logger.warning("Failed to load checkpoint for scan %s: %s", scan_id, e)
+            return {}
+    with _memory_lock:
+        return dict(_memory.get(str(scan_id), {}))
+
+
+def get_checkpoint(scan_id: str, stage: str) -> Optional[Any]:
+    return load_checkpoint(scan_id).get(stage)
+
+
+def save_checkpoint(scan_id: str, stage: str, value: Any) -> None:
+    """Record ``value`` (JSON-serialisable) as the result of ``stage``."""
+    client = _redis()
+    if client is not None:
+        key = _KEY_PREFIX + str(scan_id)
+        try:
+            pipe = client.pipeline()
+            pipe.hset(key, stage, json.dumps(value, default=str))
+            pipe.expire(key, _ttl_seconds())
+            pipe.execute()
+        except Exception as e:
+            logger.warning("Failed to save checkpoint %s for scan %s: %s", stage, scan_id, e)
+        return
+    with _memory_lock:
+        _memory.setdefault(str(scan_id), {})[stage] = value
+
+
+def clear_checkpoint(scan_id: str) -> None:
+    client = _redis()
+    if client is not None:
+        try:
+            client.delete(_KEY_PREFIX + str(scan_id))
+        except Exception as e:
+            logger.warning("Failed to clear checkpoint for scan %s: %s", scan_id, e)
+        return
+    with _memory_lock:
+        _memory.pop(str(scan_id), None)
@@ -0,0 +1,121 @@
+"""
+Single entry point for starting background scan work.
+
+SCAN_EXECUTION_MODE controls where scans run:
+  - "thread" (default): daemon thread inside the API process (legacy behaviour)
+  - "celery": enqueue on the per-scanner Celery queue; falls back to a thread
+              when the broker is unreachable so scans are never silently lost
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from app.worker.celery_app import PRIORITY_INTERACTIVE, PRIORITY_SCHEDULED, queue_for_scan_type
+
+logger = logging.getLogger(__name__)
+
+
+def _execution_mode() -> str:
+    return os.getenv("SCAN_EXECUTION_MODE", "thread").strip().lower()
+
+
+def celery_available() -> bool:
+    """Check if Celery + Redis broker is reachable."""
+    try:
+        from app.worker.celery_app import celery_app
+        conn = celery_app.connection()
+        conn.connect()
+        conn.close()
+        return True
+    except Exception:
+        return False
+
+
+def use_celery() -> bool:
+    """True when scans should be enqueued on Celery rather than run in-process."""
+    if _execution_mode() != "celery":
+        return False
+    if celery_available():
+        return True
+    logger.warning("SCAN_EXECUTION_MODE=celery but broker is unreachable; running scan in-process")
+    return False
+
+
+def _start_thread(target: Callable[..., None], args: tuple) -> None:
+    thread = threading.Thread(target=target, args=args, daemon=True)
+    thread.start()
+
+
+def dispatch_scan(
+    scan_id: str,
+    scan_name: str,
+    scan_type: str,
+    payload_dict: dict,
+    created_by: str,
+    priority: int = PRIORITY_INTERACTIVE,
+) -> str:
+    """Start a SCANNERS-registry scan. Returns "celery" or "thread"."""
+    if use_celery():
+        from app.worker.tasks import run_scan_task
+
+        run_scan_task.apply_async(
+            args=(scan_id, scan_name, scan_type, payload_dict, created_by),
+            queue=queue_for_scan_type(scan_type),
+            priority=priority,
+        )
+        logger.info("Queued %s scan %s on %s", scan_type, scan_id, queue_for_scan_type(scan_type))
+        return "celery"
+
+    from app.api.scans import process_scan_background
+
+    _start_thread(process_scan_background, (scan_id, scan_name, scan_type, payload_dict, created_by))
+    return "thread"
+
+
+def dispatch_pentest(
+    pentest_id: str,
+    scan_id: str,
+    assets: List[Dict[str, Any]],
+    notifications: Optional[Dict[str, Any]],
+    flow_cfg: Optional[Dict[str, Any]],
+    priority: int = PRIORITY_INTERACTIVE,
+) -> str:
+    """Start a pentest run. Returns "celery" or "thread"."""
+    if use_celery():
+        from app.worker.tasks import run_pentest_task
+
+        run_pentest_task.apply_async(
+            args=(pentest_id, scan_id, assets, notifications, flow_cfg),
+            priority=priority,
+        )
+        logger.info("Queued pentest %s (scan %s) on scans.pentest", pentest_id, scan_id)
+        return "celery"
+
+    from app.api.pentests import _run_pentest_background
+
+    _start_thread(_run_pentest_background, (pentest_id, scan_id, assets, notifications, flow_cfg))
+    return "thread"
+
+
+def dispatch_screenshots(scan_id: str, subdomains: List[str], priority: int = PRIORITY_SCHEDULED) -> str:
+    """Queue screenshot capture for a finished scan. Returns "celery" or "thread"."""
+    if use_celery():
+        from app.worker.tasks import capture_screenshots_task
+
+        capture_screenshots_task.apply_async(args=(scan_id, subdomains), priority=priority)
+        logger.info("Queued %d screenshots for scan %s on scans.screenshots", len(subdomains), scan_id)
+        return "celery"
+
+    from app.scanners.subdomain_scanner.utils.screenshot import capture_scan_screenshots
+
+    def _capture(sid: str, subs: List[str]) -> None:
+        try:
+            capture_scan_screenshots(sid, subs)
+        except Exception as e:
+            logger.warning("Screenshot capture for scan %s failed: %s", sid, e)
+
+    _start_thread(_capture, (scan_id, subdomains))
+    return "thread"
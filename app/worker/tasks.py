@@ -3,15 +3,26 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import os
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from celery.exceptions import SoftTimeLimitExceeded
+
 from app.worker.celery_app import celery_app
 
 logger = logging.getLogger(__name__)
 
 
+def _api_scan_max_resumes() -> int:
+    """How often an API scan that hit the soft time limit is requeued to resume from its checkpoint."""
+    try:
+        return max(0, min(20, int(os.getenv("API_SCAN_MAX_RESUMES", "5"))))
+    except ValueError:
+        return 5
+
+
 def _get_db_session():
     """Create a standalone DB session for the Celery worker."""
     from app.database.session import SessionLocal
@@ -32,21 +43,34 @@ def run_api_scan_task(
     auth_config: Optional[Dict[str, Any]] = None,
     secondary_auth_config: Optional[Dict[str, Any]] = None,
     scan_mode: str = "active",
+    incremental: bool = False,
 ):
     """
     Celery task that runs the API APT scan in a worker process.
     This runs asynchronously — the API endpoint returns immediately.
+
+    Progress is checkpointed per endpoint, so a redelivered task resumes
+    where the last attempt stopped. A scan that hits the soft time limit is
+    requeued (up to API_SCAN_MAX_RESUMES times) to continue from there.
     """
+    if _scan_already_finished(scan_id):
+        logger.info("API scan %s already finished — skipping redelivered task", scan_id)
+        return {"scan_id": scan_id, "status": "SKIPPED"}
+
     db = _get_db_session()
 
     try:
         from app.scanners.api_scanner.main import run_api_scan
+        from app.scanners.api_scanner.engine.incremental import load_baseline_report
+        from app.worker.checkpoints import clear_checkpoint
         from app.database.models import ApiScanReport, Scan
         from app.storage.file_storage import save_scan_result
         from app.storage.minio_client import MINIO_BUCKET, upload_file_to_minio
 
         logger.info("Celery worker starting API scan '%s' (id=%s)", scan_name, scan_id)
 
+        baseline = load_baseline_report(db, asset_url, scan_mode) if incremental else None
+
         # Run the async scan in a new event loop
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
@@ -63,6 +87,7 @@ def run_api_scan_task(
                     scan_mode=scan_mode,
                     db=db,
                     scan_id=scan_id,
+                    baseline_report=baseline,
                 )
             )
         finally:
@@ -108,6 +133,7 @@ def run_api_scan_task(
             scan.current_phase = "COMPLETED"
             scan.findings_count = report.get("total_findings", 0)
             db.commit()
+        clear_checkpoint(scan_id)
 
         logger.info(
             "API scan '%s' completed — %d findings",
@@ -115,20 +141,116 @@ def run_api_scan_task(
         )
         return {"scan_id": scan_id, "status": "COMPLETED", "total_findings": report.get("total_findings", 0)}
 
+    except SoftTimeLimitExceeded as e:
+        max_resumes = _api_scan_max_resumes()
+        if self.request.retries < max_resumes:
+            logger.warning(
+                "API scan '%s' hit the soft time limit — requeued to resume from its checkpoint (%d/%d)",
+                scan_name, self.request.retries + 1, max_resumes,
+            )
+            raise self.retry(exc=e, countdown=5, max_retries=max_resumes)
+        logger.error("API scan '%s' hit the soft time limit %d times — giving up", scan_name, max_resumes + 1)
+        _mark_api_scan_failed(db, scan_id)
+        raise
     except Exception as e:
         logger.error("API scan '%s' failed in Celery worker: %s", scan_name, e)
+        _mark_api_scan_failed(db, scan_id)
+        raise
+    finally:
+        db.close()
+
+
+def _mark_api_scan_failed(db, scan_id: str) -> None:
+    try:
+        from app.database.models import Scan
+        scan = db.query(Scan).filter(Scan.id == scan_id).first()
+        if scan:
+            scan.status = "FAILED"
+            scan.current_phase = "FAILED"
+            db.commit()
+    except Exception:
         try:
-            from app.database.models import Scan
-            scan = db.query(Scan).filter(Scan.id == scan_id).first()
-            if scan:
-                scan.status = "FAILED"
-                scan.current_phase = "FAILED"
-                db.commit()
+            db.rollback()
         except Exception:
-            try:
-                db.rollback()
-            except Exception:
-                pass
-        raise
+            pass
+
+
+_TERMINAL_SCAN_STATUSES = {"COMPLETED", "FAILED", "TERMINATED", "CANCELLED"}
+
+
+def _scan_already_finished(scan_id: str) -> bool:
+    """True if a redelivered task targets a scan that already reached a final state."""
+    db = _get_db_session()
+    try:
+        from app.database.models import Scan
+        scan = db.query(Scan).filter(Scan.id == scan_id).first()
+        return bool(scan) and str(scan.status or "").upper() in _TERMINAL_SCAN_STATUSES
     finally:
         db.close()
+
+
+@celery_app.task(bind=True, name="app.worker.tasks.run_scan_task")
+def run_scan_task(
+    self,
+    scan_id: str,
+    scan_name: str,
+    scan_type: str,
+    payload_dict: Dict[str, Any],
+    created_by: str,
+):
+    """
+    Celery task for every SCANNERS-registry scan type (dd, subdomain, network,
+    vulnerability). Routed to the scanner family's queue by the dispatcher.
+    Stage results are checkpointed, so a redelivered task resumes mid-scan.
+    """
+    if _scan_already_finished(scan_id):
+        logger.info("Scan %s already finished — skipping redelivered task", scan_id)
+        return {"scan_id": scan_id, "status": "SKIPPED"}
+
+    from app.api.scans import process_scan_background
+
+    logger.info(
+        "Celery worker starting %s scan '%s' (id=%s, attempt=%s)",
+        scan_type, scan_name, scan_id, self.request.retries + 1,
+    )
+    process_scan_background(scan_id, scan_name, scan_type, payload_dict, created_by)
+    return {"scan_id": scan_id, "scan_type": scan_type}
+
+
+@celery_app.task(
+    bind=True,
+    name="app.worker.tasks.run_pentest_task",
+    soft_time_limit=3 * 3600,
+    time_limit=3 * 3600 + 300,
+)
+def run_pentest_task(
+    self,
+    pentest_id: str,
+    scan_id: str,
+    assets: List[Dict[str, Any]],
+    notifications: Optional[Dict[str, Any]] = None,
+    flow_cfg: Optional[Dict[str, Any]] = None,
+):
+    """
+    Celery task for an automated pentest run. Completed targets are
+    checkpointed, so a redelivered task only scans the remaining ones.
+    """
+    if _scan_already_finished(scan_id):
+        logger.info("Pentest scan %s already finished — skipping redelivered task", scan_id)
+        return {"scan_id": scan_id, "status": "SKIPPED"}
+
+    from app.api.pentests import _run_pentest_background
+
+    logger.info("Celery worker starting pentest %s (scan=%s, targets=%d)", pentest_id, scan_id, len(assets or []))
+    _run_pentest_background(pentest_id, scan_id, assets, notifications, flow_cfg)
+    return {"pentest_id": pentest_id, "scan_id": scan_id}
+
+
+@celery_app.task(bind=True, name="app.worker.tasks.capture_screenshots_task")
+def capture_screenshots_task(self, scan_id: str, subdomains: List[str]):
+    """Screenshot a scan's subdomains into MinIO off the scan/request path."""
+    from app.scanners.subdomain_scanner.utils.screenshot import capture_scan_screenshots
+
+    logger.info("Celery worker capturing %d screenshots for scan %s", len(subdomains or []), scan_id)
+    index = capture_scan_screenshots(scan_id, subdomains or [])
+    return {"scan_id": scan_id, "captured": index["captured"], "failed": index["failed"]}
@@ -93,6 +93,17 @@ def _load_spec_file(path: str) -> Dict[str, Any]:
     return json.loads(content)
 
 
+def _load_state_file(path: str) -> Optional[Dict[str, Any]]:
+    """Previous report kept for incremental scans (a raw report or this CLI's JSON output)."""
+    p = Path(path)
+    if not p.is_file():
+        return None
+    data = json.loads(p.read_text(encoding="utf-8"))
+    if isinstance(data, dict) and isinstance(data.get("scan"), dict):
+        data = data["scan"]
+    return data if isinstance(data, dict) else None
+
+
 def _build_auth_config(token: Optional[str], auth_type: str) -> Optional[Dict[str, Any]]:
     """Build an auth_config dict from CLI args/env vars."""
     if not token:
@@ -360,6 +371,16 @@ def _cmd_api(args: argparse.Namespace) -> int:
     if auth_config:
         print(f"[secoraa] Auth: {auth_config.get('type')}", file=sys.stderr)
 
+    # Incremental: only endpoints added/changed since the report in the state file
+    state_file = _resolve(getattr(args, "state_file", None), "SCAN_STATE_FILE", cfg, ["scan", "state_file"])
+    baseline_report = None
+    if state_file:
+        try:
+            baseline_report = _load_state_file(state_file)
+        except Exception as exc:
+            print(f"[secoraa] Ignoring unreadable state file '{state_file}': {exc}", file=sys.stderr)
+        print(f"[secoraa] State file: {state_file} ({'incremental' if baseline_report else 'full scan'})", file=sys.stderr)
+
     # Import here so the CLI doesn't pull heavy deps unless the user runs a scan
     try:
         from app.scanners.api_scanner.main import run_api_scan
@@ -378,6 +399,7 @@ def _cmd_api(args: argparse.Namespace) -> int:
                 scan_mode=scan_mode,
                 db=None,
                 scan_id=None,
+                baseline_report=baseline_report,
             )
         )
     except Exception as exc:
@@ -385,6 +407,12 @@ def _cmd_api(args: argparse.Namespace) -> int:
         print(f"error: scan failed: {exc}", file=sys.stderr)
         return EXIT_ERROR
 
+    if state_file:
+        try:
+            Path(state_file).write_text(json.dumps(report, default=str), encoding="utf-8")
+        except OSError as exc:
+            print(f"[secoraa] Could not update state file '{state_file}': {exc}", file=sys.stderr)
+
     findings = report.get("findings") or []
     threshold = _resolve(args.severity_threshold, "SEVERITY_THRESHOLD", cfg, ["gate", "severity_threshold"], "HIGH") or "HIGH"
     # ignore_rules: CLI (comma string) > env (comma string) > .secoraa.yml (list)
@@ -545,6 +573,12 @@ def _build_parser() -> argparse.ArgumentParser:
     api.add_argument("--sync-url", help="Secoraa platform URL to sync results (env: SECORAA_URL)", default=None)
     api.add_argument("--sync-token", help="Secoraa API key for sync (env: SECORAA_API_KEY)", default=None)
     api.add_argument("--pr-comment", help="Post scan summary as PR comment (env: PR_COMMENT)", default=None)
+    api.add_argument(
+        "--state-file",
+        help="Report of the previous scan; only endpoints added/changed since are scanned, and it is "
+             "updated afterwards. Missing file = full scan (env: SCAN_STATE_FILE)",
+        default=None,
+    )
     api.set_defaults(func=_cmd_api)
 
     # --- subdomain subcommand ---
@@ -353,6 +353,10 @@ export const downloadReportPdf = async (reportId) => {
 // Subdomain APIs
 // ==========================================
 
+// Subdomain scan jobs are polled every 2s for at most 30 minutes
+const SUBDOMAIN_POLL_INTERVAL_MS = 2000;
+const SUBDOMAIN_POLL_MAX_ATTEMPTS = 900;
+
 export const runSubdomainScan = async (domain, subdomains = null, exportJson = false, exportPdf = false) => {
   try {
     const response = await apiClient.post('/scan/subdomain/run', {
@@ -361,7 +365,30 @@ export const runSubdomainScan = async (domain, subdomains = null, exportJson = f
       export_json: Boolean(exportJson),
       export_pdf: Boolean(exportPdf),
     });
-    return response.data;
+    // The scan runs as a background job; poll until it finishes or we give up.
+    const jobId = response.data?.job_id;
+    if (!jobId) {
+      throw new Error('Scan was not queued');
+    }
+    for (let attempt = 0; attempt < SUBDOMAIN_POLL_MAX_ATTEMPTS; attempt += 1) {
+      await new Promise((resolve) => setTimeout(resolve, SUBDOMAIN_POLL_INTERVAL_MS));
+      let job;
+      try {
+        ({ data: job } = await apiClient.get(`/scan/subdomain/jobs/${jobId}`));
+      } catch (error) {
+        if (error.response?.status === 404) {
+          throw new Error('Scan job not found — it may have expired or the server restarted');
+        }
+        throw error;
+      }
+      if (job.status === 'completed') {
+        return { status: 'completed', data: job.data, exports: job.exports };
+      }
+      if (job.status === 'failed') {
+        throw new Error(job.error || 'Scan failed');
+      }
+    }
+    throw new Error('Scan is still running — timed out waiting for the result');
   } catch (error) {
     if (error.response) {
       throw new Error(error.response.data?.detail || `Scan failed: ${error.response.status} ${error.response.statusText}`);
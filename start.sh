@@ -59,13 +59,19 @@ cd "$ROOT"
 BACKEND_PID=$!
 ok "Backend started  →  http://localhost:8000  (log: .logs/backend.log)"
 
-# ── 3. Celery Worker ─────────────────────────
-step "Starting Celery worker…"
+# ── 3. Celery Workers ────────────────────────
+# One worker per scan queue so each scanner family gets its own pool
+# (concurrency from CELERY_CONCURRENCY_<QUEUE>, see app/worker/celery_app.py).
+step "Starting Celery workers…"
 cd "$ROOT"
-"$VENV/celery" -A app.worker.celery_app worker --loglevel=info \
+"$VENV/celery" -A app.worker.celery_app worker --loglevel=info -Q celery -n default@%h \
   > "$LOG_DIR/celery.log" 2>&1 &
-CELERY_PID=$!
-ok "Celery worker started  (log: .logs/celery.log)"
+for QUEUE in scans.api scans.discovery scans.network scans.vulnerability scans.pentest scans.screenshots; do
+  CONCURRENCY=$("$VENV/python" -c "from app.worker.celery_app import queue_concurrency; print(queue_concurrency('$QUEUE'))")
+  "$VENV/celery" -A app.worker.celery_app worker --loglevel=info -Q "$QUEUE" -c "$CONCURRENCY" -n "$QUEUE@%h" \
+    >> "$LOG_DIR/celery.log" 2>&1 &
+done
+ok "Celery workers started  (log: .logs/celery.log)"
 
 # ── 4. Frontend (React / webpack-dev-server) ─
 step "Starting Frontend (React)…"
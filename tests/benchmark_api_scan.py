@@ -0,0 +1,231 @@
+"""
+Throughput benchmark for the API APT scanner.
+
+Starts the intentionally vulnerable test API (tests/vulnerable_api.py) with
+extra synthetic routes and optional injected latency, then runs
+``run_api_scan`` end to end against:
+
+  * ``vulnerable`` — the planted-vulnerability endpoints used by the e2e test,
+    to check detection parity between commits;
+  * ``synthetic-<N>`` — generated OpenAPI specs of N endpoints, to measure
+    how scan time and request volume scale.
+
+Each scenario runs in a fresh process so peak RSS is its own. Results are
+printed (or written with ``--output``) as JSON, to diff between commits:
+
+    python -m tests.benchmark_api_scan --sizes 10,100 --latency-ms 20 --output bench.json
+
+Not collected by pytest; the 1000-endpoint scenario takes a while.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import platform
+import resource
+import subprocess
+import sys
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from tests.test_e2e_scan import ENDPOINTS as VULNERABLE_ENDPOINTS
+
+BENCH_HOST = "127.0.0.1"
+BENCH_PORT = 9877
+DEFAULT_SIZES = (10, 100, 1000)
+
+
+# ── Target server ────────────────────────────────────────────────────────
+
+def _run_bench_server(host: str, port: int, latency_ms: int):
+    """Run the vulnerable API plus synthetic routes, delaying every response."""
+    import uvicorn
+    from fastapi import Query, Request
+    from fastapi.responses import JSONResponse
+
+    from tests.vulnerable_api import app
+
+    @app.middleware("http")
+    async def injected_latency(request: Request, call_next):
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+        return await call_next(request)
+
+    @app.get("/bench/{resource}/items")
+    async def list_items(resource: str, q: str = Query(default=""), page: int = Query(default=1)):
+        return {"resource": resource, "page": page, "items": [{"id": 1, "name": "first"}]}
+
+    @app.get("/bench/{resource}/items/{item_id}")
+    async def get_item(resource: str, item_id: int):
+        return {"resource": resource, "id": item_id, "name": f"item-{item_id}"}
+
+    @app.post("/bench/{resource}/items")
+    async def create_item(resource: str, request: Request):
+        try:
+            body = await request.json()
+        except ValueError:
+            return JSONResponse(status_code=400, content={"error": "invalid JSON"})
+        return {"resource": resource, "created": isinstance(body, dict)}
+
+    uvicorn.run(app, host=host, port=port, log_level="error")
+
+
+def _wait_until_ready(base_url: str, proc: multiprocessing.Process) -> None:
+    for _ in range(60):
+        try:
+            if requests.get(f"{base_url}/users", timeout=1).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        if not proc.is_alive():
+            break
+        time.sleep(0.5)
+    raise RuntimeError(f"benchmark target did not start on {base_url}")
+
+
+# ── Scenarios ────────────────────────────────────────────────────────────
+
+def synthetic_openapi_spec(size: int) -> Dict[str, Any]:
+    """OpenAPI 3 spec of ``size`` operations over the synthetic /bench routes."""
+    paths: Dict[str, Dict[str, Any]] = {}
+    for i in range(size):
+        resource = f"r{i // 3}"
+        kind = i % 3
+        if kind == 0:
+            paths.setdefault(f"/bench/{resource}/items", {})["get"] = {
+                "parameters": [
+                    {"name": "q", "in": "query", "schema": {"type": "string"}},
+                    {"name": "page", "in": "query", "schema": {"type": "integer"}},
+                ],
+                "responses": {"200": {"description": "OK"}},
+            }
+        elif kind == 1:
+            paths.setdefault(f"/bench/{resource}/items/{{item_id}}", {})["get"] = {
+                "parameters": [
+                    {"name": "item_id", "in": "path", "required": True, "schema": {"type": "integer"}},
+                ],
+                "responses": {"200": {"description": "OK"}},
+            }
+        else:
+            paths.setdefault(f"/bench/{resource}/items", {})["post"] = {
+                "requestBody": {
+                    "content": {
+                        "application/json": {
+                            "schema": {
+                                "type": "object",
+                                "properties": {"name": {"type": "string"}, "note": {"type": "string"}},
+                            },
+                        },
+                    },
+                },
+                "responses": {"200": {"description": "OK"}},
+            }
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": f"Synthetic benchmark API ({size} endpoints)", "version": "1.0"},
+        "servers": [{"url": f"http://{BENCH_HOST}:{BENCH_PORT}"}],
+        "paths": paths,
+    }
+
+
+def _run_scenario(name: str, base_url: str, size: Optional[int]) -> Dict[str, Any]:
+    """Scan one scenario in this (fresh) process and return its measurements."""
+    from app.scanners.api_scanner.main import run_api_scan
+
+    scan_kwargs: Dict[str, Any] = {"scan_name": f"benchmark {name}", "asset_url": base_url, "scan_mode": "active"}
+    if size is None:
+        scan_kwargs["endpoints"] = VULNERABLE_ENDPOINTS
+    else:
+        scan_kwargs["openapi_spec"] = synthetic_openapi_spec(size)
+
+    started = time.perf_counter()
+    report = asyncio.run(run_api_scan(**scan_kwargs))
+    wall = time.perf_counter() - started
+
+    findings = report.get("findings", [])
+    # Requests that really went out (coalesced duplicates excluded), attributed
+    # to checks by the scan's own check_scope instrumentation
+    diagnostics = report.get("diagnostics", {})
+    total_sent = diagnostics.get("requests_total", 0)
+    sent = {check: stats["requests"] for check, stats in diagnostics.get("checks", {}).items() if stats["requests"]}
+    return {
+        "scenario": name,
+        "endpoints": len(VULNERABLE_ENDPOINTS) if size is None else size,
+        "wall_seconds": round(wall, 3),
+        "requests_sent": total_sent,
+        "requests_per_second": round(total_sent / wall, 1) if wall else 0.0,
+        "requests_by_check": dict(sorted(sent.items())),
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "findings": len(findings),
+        "findings_by_title": dict(sorted(Counter(f.get("title", "") for f in findings).items())),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(sizes: List[int], latency_ms: int = 0, include_vulnerable: bool = True) -> Dict[str, Any]:
+    base_url = f"http://{BENCH_HOST}:{BENCH_PORT}"
+    ctx = multiprocessing.get_context("spawn")
+    server = ctx.Process(target=_run_bench_server, args=(BENCH_HOST, BENCH_PORT, latency_ms), daemon=True)
+    server.start()
+    try:
+        _wait_until_ready(base_url, server)
+
+        scenarios = [("vulnerable", None)] if include_vulnerable else []
+        scenarios += [(f"synthetic-{size}", size) for size in sizes]
+
+        results = []
+        for name, size in scenarios:
+            with ctx.Pool(1, maxtasksperchild=1) as pool:
+                results.append(pool.apply(_run_scenario, (name, base_url, size)))
+            print(
+                f"{name}: {results[-1]['wall_seconds']}s, {results[-1]['requests_sent']} requests, "
+                f"{results[-1]['findings']} findings",
+                file=sys.stderr,
+            )
+    finally:
+        server.terminate()
+        server.join(timeout=5)
+
+    return {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "latency_ms": latency_ms,
+        "scenarios": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated synthetic spec sizes (endpoints), e.g. 10,100,1000")
+    parser.add_argument("--latency-ms", type=int, default=0, help="latency injected into every target response")
+    parser.add_argument("--skip-vulnerable", action="store_true", help="skip the detection-parity scenario")
+    parser.add_argument("--output", help="write the JSON results here instead of stdout")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    results = run_benchmark(sizes, args.latency_ms, include_vulnerable=not args.skip_vulnerable)
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,8 @@ import responses
 from unittest.mock import MagicMock
 from requests import Response
 
-from app.scanners.api_scanner.tests import reset_finding_counters
+from app.scanners.api_scanner.tests import make_finding, reset_finding_counters
+from app.worker import checkpoints
 
 
 BASE_URL = "https://test-api.example.com/api/v1"
@@ -25,6 +26,26 @@ def base_url():
     return BASE_URL
 
 
+@pytest.fixture
+def memory_checkpoints(monkeypatch):
+    """Scan checkpoint store on its empty in-process fallback (no Redis)."""
+    monkeypatch.setattr(checkpoints, "_redis_client", None)
+    monkeypatch.setattr(checkpoints, "_redis_failed", True)
+    monkeypatch.setattr(checkpoints, "_memory", {})
+    return checkpoints
+
+
+@pytest.fixture
+def make_api_finding():
+    """Factory for a minimal scanner finding: make_api_finding(title, endpoint)."""
+    def _make(title, endpoint):
+        return make_finding(
+            owasp_category="API1:2023", title=title, cvss_vector="CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:N/A:N",
+            endpoint=endpoint, description="", evidence={}, impact="", remediation="",
+        )
+    return _make
+
+
 @pytest.fixture
 def auth_headers():
     return {"api_key": "test-key-123"}
@@ -0,0 +1,118 @@
+"""Tests for checkpointed API scans — per-endpoint progress is saved and a rerun resumes from it."""
+from unittest.mock import patch
+
+import pytest
+from celery.exceptions import SoftTimeLimitExceeded
+
+from app.scanners.api_scanner import main
+from app.worker import checkpoints
+
+ENDPOINTS = [{"method": "GET", "path": "/a"}, {"method": "GET", "path": "/b"}, {"method": "GET", "path": "/c"}]
+TIMING_NAME = "SQL Injection (Time-based)"
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("memory_checkpoints")
+class TestCheckpointedScan:
+    @pytest.fixture(autouse=True)
+    def _target(self, base_url, make_api_finding):
+        self.base_url = base_url
+        self.finding = make_api_finding
+
+    async def _scan(self, scan_id="scan-1", asset_url=None, checkpoint_key=None, abort_on=None):
+        asset_url = asset_url or self.base_url
+        calls = {"global": 0, "checks": [], "timing": []}
+
+        async def headers(*args, **kwargs):
+            calls["global"] += 1
+            return [self.finding("Missing Security Headers", f"GET {asset_url}")]
+
+        async def no_findings(*args, **kwargs):
+            return []
+
+        async def sqli(endpoint, *args):
+            label = f"GET {endpoint['path']}"
+            calls["checks"].append(label)
+            if label == abort_on:
+                raise SoftTimeLimitExceeded()
+            # /b is vulnerable; the others queue the time-based follow-up
+            return [self.finding("SQL Injection", label)] if endpoint["path"] == "/b" else []
+
+        async def sqli_time(endpoint, *args):
+            calls["timing"].append(f"GET {endpoint['path']}")
+            if f"timing {endpoint['path']}" == abort_on:
+                raise SoftTimeLimitExceeded()
+            return []
+
+        with patch.object(main, "PER_ENDPOINT_CHECKS", [("SQL Injection", sqli)]), \
+                patch.object(main, "TIMING_CHECKS", {"SQL Injection": (TIMING_NAME, sqli_time)}), \
+                patch.object(main, "_TIMING_CHECK_FNS", {TIMING_NAME: sqli_time}), \
+                patch.object(main, "run_headers_tests", headers), \
+                patch.object(main, "run_cors_tests", no_findings), \
+                patch.object(main, "run_rate_limit_tests", no_findings), \
+                patch.object(main, "run_admin_path_tests", no_findings), \
+                patch.object(main, "run_version_discovery_tests", no_findings):
+            report = await main.run_api_scan(
+                scan_name="checkpointed", asset_url=asset_url, endpoints=ENDPOINTS, scan_id=scan_id,
+                checkpoint_key=checkpoint_key,
+            )
+        return report, calls
+
+    async def test_progress_is_checkpointed(self):
+        await self._scan()
+
+        state = checkpoints.load_checkpoint("scan-1")
+        assert [f["title"] for f in state["api:global"]] == ["Missing Security Headers"]
+        assert state["api:endpoint:GET /a"] == {"findings": [], "timing": [TIMING_NAME]}
+        assert [f["title"] for f in state["api:endpoint:GET /b"]["findings"]] == ["SQL Injection"]
+        assert state[f"api:timing:{TIMING_NAME}:GET /c"] == []
+
+    async def test_rerun_resumes_from_checkpoint(self):
+        restored = self.finding("SQL Injection", "GET /b")
+        checkpoints.save_checkpoint("scan-1", "api:global", [])
+        checkpoints.save_checkpoint("scan-1", "api:endpoint:GET /a", {"findings": [], "timing": [TIMING_NAME]})
+        checkpoints.save_checkpoint("scan-1", "api:endpoint:GET /b", {"findings": [restored], "timing": []})
+
+        report, calls = await self._scan()
+
+        assert calls["global"] == 0
+        assert calls["checks"] == ["GET /c"]
+        # /a's follow-up never finished in the earlier attempt, so it runs again
+        assert sorted(calls["timing"]) == ["GET /a", "GET /c"]
+        assert [f["finding_id"] for f in report["findings"]] == [restored["finding_id"]]
+
+    async def test_restored_findings_keep_their_ids(self):
+        headers = self.finding("Missing Security Headers", f"GET {self.base_url}")
+        checkpoints.save_checkpoint("scan-1", "api:global", [headers])
+        checkpoints.save_checkpoint("scan-1", "api:endpoint:GET /a", {"findings": [], "timing": []})
+
+        report, _ = await self._scan()
+
+        ids = [f["finding_id"] for f in report["findings"]]
+        assert len(ids) == len(set(ids)) == 2
+
+    async def test_no_checkpoint_without_scan_id(self):
+        await self._scan(scan_id=None)
+        assert checkpoints._memory == {}
+
+    async def test_runs_sharing_a_scan_id_use_their_own_checkpoint(self):
+        """Pentest targets run one API scan each under the same scan_id."""
+        first, _ = await self._scan(asset_url="https://one.test", checkpoint_key="scan-1:api:one")
+        second, calls = await self._scan(asset_url="https://two.test", checkpoint_key="scan-1:api:two")
+
+        assert calls["global"] == 1
+        assert calls["checks"] == ["GET /a", "GET /b", "GET /c"]
+        assert "GET https://two.test" in {f["endpoint"] for f in second["findings"]}
+        assert "GET https://one.test" not in {f["endpoint"] for f in second["findings"]}
+        assert set(checkpoints._memory) == {"scan-1:api:one", "scan-1:api:two"}
+
+    @pytest.mark.parametrize("abort_on, unfinished", [
+        ("GET /b", "api:endpoint:GET /b"),
+        ("timing /a", f"api:timing:{TIMING_NAME}:GET /a"),
+    ])
+    async def test_soft_time_limit_aborts_instead_of_counting_as_a_failed_check(self, abort_on, unfinished):
+        with pytest.raises(SoftTimeLimitExceeded):
+            await self._scan(abort_on=abort_on)
+
+        # The interrupted check isn't checkpointed as done, so the retry reruns it
+        assert unfinished not in checkpoints.load_checkpoint("scan-1")
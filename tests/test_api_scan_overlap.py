@@ -0,0 +1,46 @@
+"""Tests for run_api_scan scheduling — global checks overlap endpoint scanning."""
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from app.scanners.api_scanner import main
+
+
+@pytest.mark.asyncio
+class TestGlobalCheckOverlap:
+    async def test_endpoints_scanned_while_global_checks_run(self, base_url, make_api_finding):
+        endpoint_ran = asyncio.Event()
+        in_flight = {"now": 0, "peak": 0}
+
+        async def headers(*args, **kwargs):
+            # Only finishes once endpoint scanning is under way
+            await asyncio.wait_for(endpoint_ran.wait(), timeout=2)
+            in_flight["peak_during_global"] = in_flight["peak"]
+            return [make_api_finding("Missing Security Headers", f"GET {base_url}")]
+
+        async def no_findings(*args, **kwargs):
+            return []
+
+        async def endpoint_check(endpoint, *args):
+            in_flight["now"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+            endpoint_ran.set()
+            await asyncio.sleep(0.01)
+            in_flight["now"] -= 1
+            return [make_api_finding("Verbose Errors", f"GET {endpoint['path']}")]
+
+        endpoints = [{"method": "GET", "path": f"/e{i}"} for i in range(main.MAX_CONCURRENT_ENDPOINTS)]
+        with patch.object(main, "PER_ENDPOINT_CHECKS", [("Information Disclosure", endpoint_check)]), \
+                patch.object(main, "run_headers_tests", headers), \
+                patch.object(main, "run_cors_tests", no_findings), \
+                patch.object(main, "run_rate_limit_tests", no_findings), \
+                patch.object(main, "run_admin_path_tests", no_findings), \
+                patch.object(main, "run_version_discovery_tests", no_findings):
+            report = await main.run_api_scan(scan_name="overlap", asset_url=base_url, endpoints=endpoints)
+
+        titles = [f["title"] for f in report["findings"]]
+        assert titles.count("Missing Security Headers") == 1
+        assert titles.count("Verbose Errors") == len(endpoints)
+        # The global checks hold one endpoint slot while they run
+        assert 1 <= in_flight["peak_during_global"] <= main.MAX_CONCURRENT_ENDPOINTS - 1
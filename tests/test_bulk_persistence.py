@@ -0,0 +1,124 @@
+"""Tests for the chunked bulk inserts of discovered subdomains and scan results."""
+import uuid
+
+import pytest
+from sqlalchemy import ARRAY, create_engine, event
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+
+from app.database import bulk
+from app.database.models import ScanResult, Subdomain
+
+
+@compiles(ARRAY, "sqlite")
+def _array_as_text(type_, compiler, **kw):
+    return "TEXT"
+
+
+@pytest.fixture
+def inserts():
+    """Number of INSERT statements sent, so chunking is observable."""
+    return []
+
+
+@pytest.fixture
+def db(inserts):
+    # SQLite understands ON CONFLICT DO NOTHING ... RETURNING as well; the
+    # unique indexes are the ones create_tables.add_bulk_upsert_indexes adds
+    engine = create_engine("sqlite://")
+    ScanResult.__table__.create(engine)
+    Subdomain.__table__.create(engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE UNIQUE INDEX ux_scan_results_scan_id_subdomain ON scan_results (scan_id, subdomain)"
+        )
+        conn.exec_driver_sql(
+            "CREATE UNIQUE INDEX ux_subdomains_domain_id_subdomain_name ON subdomains (domain_id, subdomain_name)"
+        )
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("INSERT"):
+            inserts.append(statement)
+
+    with Session(engine) as session:
+        yield session
+
+
+def _names(count, start=0):
+    return [f"host{i}.example.com" for i in range(start, start + count)]
+
+
+class TestBulkInsertScanResults:
+    def test_inserts_in_chunks(self, db, inserts):
+        scan_id = uuid.uuid4()
+
+        assert bulk.bulk_insert_scan_results(db, scan_id, "example.com", _names(4500)) == (4500, 0)
+
+        assert len(inserts) == 3  # 2000 + 2000 + 500
+        assert db.query(ScanResult).filter(ScanResult.scan_id == scan_id).count() == 4500
+
+    def test_duplicates_within_and_across_batches(self, db, inserts):
+        scan_id = uuid.uuid4()
+        first = _names(3) + [" host0.example.com ", "host1.example.com", "", None]
+
+        assert bulk.bulk_insert_scan_results(db, scan_id, "example.com", first) == (3, 0)
+        assert bulk.bulk_insert_scan_results(db, scan_id, "example.com", _names(5)) == (2, 3)
+        # Same names under another scan are new rows
+        assert bulk.bulk_insert_scan_results(db, uuid.uuid4(), "example.com", _names(2)) == (2, 0)
+
+        rows = db.query(ScanResult.subdomain).filter(ScanResult.scan_id == scan_id).all()
+        assert sorted(name for (name,) in rows) == _names(5)
+
+    def test_nothing_to_insert(self, db, inserts):
+        assert bulk.bulk_insert_scan_results(db, uuid.uuid4(), "example.com", ["", "  "]) == (0, 0)
+        assert inserts == []
+
+
+class TestBulkUpsertSubdomains:
+    def test_inserts_in_chunks(self, db, inserts):
+        domain_id = uuid.uuid4()
+
+        assert bulk.bulk_upsert_subdomains(db, domain_id, _names(2001), "alice") == (2001, 0)
+
+        assert len(inserts) == 2
+        row = db.query(Subdomain).filter(Subdomain.subdomain_name == "host0.example.com").one()
+        assert (row.discovery_source, row.created_by, row.updated_by) == ("auto_discovered", "alice", "alice")
+
+    def test_duplicates_within_and_across_batches(self, db, inserts):
+        domain_id = uuid.uuid4()
+
+        assert bulk.bulk_upsert_subdomains(db, domain_id, _names(3) + _names(2), "alice") == (3, 0)
+        assert bulk.bulk_upsert_subdomains(db, domain_id, _names(4), "bob", "minio") == (1, 3)
+        assert bulk.bulk_upsert_subdomains(db, uuid.uuid4(), _names(1), "bob") == (1, 0)
+
+        assert db.query(Subdomain).filter(Subdomain.domain_id == domain_id).count() == 4
+        added = db.query(Subdomain).filter(Subdomain.subdomain_name == "host3.example.com").one()
+        assert (added.discovery_source, added.created_by) == ("minio", "bob")
+
+    def test_only_existing_names_send_no_insert(self, db, inserts):
+        domain_id = uuid.uuid4()
+        bulk.bulk_upsert_subdomains(db, domain_id, _names(3), "alice")
+        inserts.clear()
+
+        assert bulk.bulk_upsert_subdomains(db, domain_id, _names(3), "alice") == (0, 3)
+        assert inserts == []
+
+    def test_rows_inserted_by_a_concurrent_writer_count_as_existing(self, db, monkeypatch):
+        domain_id = uuid.uuid4()
+        real_execute = db.execute
+        raced = []
+
+        def execute(stmt, *args, **kwargs):
+            # Another writer commits host1 between the existence lookup and the insert
+            if stmt.is_insert and not raced:
+                raced.append(True)
+                real_execute(Subdomain.__table__.insert().values(
+                    id=uuid.uuid4(), domain_id=domain_id, subdomain_name="host1.example.com",
+                ))
+            return real_execute(stmt, *args, **kwargs)
+
+        monkeypatch.setattr(db, "execute", execute)
+
+        assert bulk.bulk_upsert_subdomains(db, domain_id, _names(3), "alice") == (2, 1)
+        assert db.query(Subdomain).filter(Subdomain.domain_id == domain_id).count() == 3
@@ -0,0 +1,29 @@
+"""Tests for the scan checkpoint store (in-process fallback)."""
+from __future__ import annotations
+
+import pytest
+
+from app.worker import checkpoints
+
+pytestmark = pytest.mark.usefixtures("memory_checkpoints")
+
+
+class TestCheckpoints:
+    def test_empty_checkpoint(self):
+        assert checkpoints.load_checkpoint("scan-1") == {}
+        assert checkpoints.get_checkpoint("scan-1", "passive") is None
+
+    def test_save_and_load(self):
+        checkpoints.save_checkpoint("scan-1", "passive", ["a.example.com"])
+        checkpoints.save_checkpoint("scan-1", "resolved", [])
+        state = checkpoints.load_checkpoint("scan-1")
+        assert state == {"passive": ["a.example.com"], "resolved": []}
+
+    def test_scans_are_isolated(self):
+        checkpoints.save_checkpoint("scan-1", "output", {"x": 1})
+        assert checkpoints.load_checkpoint("scan-2") == {}
+
+    def test_clear(self):
+        checkpoints.save_checkpoint("scan-1", "output", {"x": 1})
+        checkpoints.clear_checkpoint("scan-1")
+        assert checkpoints.load_checkpoint("scan-1") == {}
@@ -0,0 +1,158 @@
+"""Tests for incremental API scans — endpoint fingerprints, baseline diffing and carry-forward."""
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.scanners.api_scanner import main
+from app.scanners.api_scanner.engine.incremental import (
+    endpoint_fingerprint,
+    incremental_state,
+    load_baseline_report,
+    plan_incremental,
+)
+
+BASE_URL = "https://api.test"
+
+USERS = {"method": "GET", "path": "/users", "parameters": [{"name": "page", "in": "query", "type": "integer"}]}
+ORDERS = {"method": "POST", "path": "/orders", "body": {"item": "test", "qty": 1}, "auth_required": True}
+
+
+def _finding(title, endpoint):
+    return {"title": title, "endpoint": endpoint, "severity": "HIGH"}
+
+
+def _baseline(endpoints, findings, endpoint_findings=None, **overrides):
+    state = incremental_state(endpoints, endpoint_findings if endpoint_findings is not None else findings,
+                              BASE_URL, "active")
+    state.update(overrides)
+    return {"findings": findings, "incremental": state}
+
+
+class TestEndpointFingerprint:
+    def test_ignores_sample_values_and_parameter_order(self):
+        reordered = {**USERS, "parameters": list(reversed(USERS["parameters"] + [{"name": "q", "in": "query"}]))}
+        extended = {**USERS, "parameters": USERS["parameters"] + [{"name": "q", "in": "query"}]}
+
+        assert endpoint_fingerprint(reordered) == endpoint_fingerprint(extended)
+        assert endpoint_fingerprint({**ORDERS, "body": {"item": "other", "qty": 7}}) == endpoint_fingerprint(ORDERS)
+
+    @pytest.mark.parametrize("change", [
+        {"body": {"item": "test", "qty": "1"}},
+        {"body": {"item": "test"}},
+        {"auth_required": False},
+        {"method": "PUT"},
+        {"parameters": [{"name": "id", "in": "query", "required": True}]},
+    ])
+    def test_schema_changes_change_fingerprint(self, change):
+        assert endpoint_fingerprint({**ORDERS, **change}) != endpoint_fingerprint(ORDERS)
+
+
+class TestPlanIncremental:
+    def test_classifies_endpoints_and_carries_endpoint_findings(self):
+        search = {"method": "GET", "path": "/search"}
+        findings = [
+            _finding("SQL Injection", "GET /users"),
+            _finding("Mass Assignment", "POST /orders"),
+            _finding("Missing Security Headers", "GET /users"),  # global check, not carried
+            _finding("BOLA", "GET /legacy"),
+        ]
+        baseline = _baseline(
+            [USERS, ORDERS, {"method": "GET", "path": "/legacy"}],
+            findings,
+            endpoint_findings=[findings[0], findings[1], findings[3]],
+        )
+        changed_orders = {**ORDERS, "body": {"item": "test", "qty": 1, "coupon": "x"}}
+
+        plan = plan_incremental([USERS, changed_orders, search], baseline, BASE_URL, "active")
+
+        assert plan.added == ["GET /search"]
+        assert plan.changed == ["POST /orders"]
+        assert plan.unchanged == ["GET /users"]
+        assert plan.removed == ["GET /legacy"]
+        assert plan.to_scan == [changed_orders, search]
+        assert plan.carried_findings == [{**findings[0], "carried_forward": True}]
+
+    @pytest.mark.parametrize("baseline", [
+        {},
+        {"findings": []},
+        _baseline([USERS], [], base_url="https://other.test"),
+        _baseline([USERS], [], scan_mode="passive"),
+        _baseline([USERS], [], fingerprint_version=0),
+        _baseline([USERS], [], mode="partial"),
+    ])
+    def test_unusable_baseline_means_full_scan(self, baseline):
+        assert plan_incremental([USERS], baseline, BASE_URL, "active") is None
+
+    def test_load_baseline_skips_cancelled_reports(self):
+        complete = _baseline([USERS], [])
+        partial = _baseline([USERS, ORDERS], [], mode="partial")
+        db = MagicMock()
+        db.query.return_value.filter.return_value.order_by.return_value.limit.return_value.all.return_value = [
+            (json.dumps(partial),), (json.dumps(complete),),
+        ]
+
+        assert load_baseline_report(db, BASE_URL, "active") == complete
+
+
+@pytest.mark.asyncio
+class TestIncrementalScan:
+    async def _scan(self, endpoints, baseline=None, cancel_after_batches=None):
+        scanned = []
+        batches = []
+
+        def is_cancelled(db, scan_id):
+            batches.append(True)
+            return cancel_after_batches is not None and len(batches) > cancel_after_batches
+
+        async def fake_scan_single_endpoint(ep, *args, **kwargs):
+            scanned.append(f"{ep['method']} {ep['path']}")
+            return [_finding("SQL Injection", f"{ep['method']} {ep['path']}")]
+
+        async def no_findings(*args, **kwargs):
+            return []
+
+        with patch.object(main, "_scan_single_endpoint", fake_scan_single_endpoint), \
+                patch.object(main, "_is_cancelled", is_cancelled), \
+                patch.object(main, "MAX_CONCURRENT_ENDPOINTS", 1), \
+                patch.object(main, "run_headers_tests", no_findings), \
+                patch.object(main, "run_cors_tests", no_findings), \
+                patch.object(main, "run_rate_limit_tests", no_findings), \
+                patch.object(main, "run_admin_path_tests", no_findings), \
+                patch.object(main, "run_version_discovery_tests", no_findings):
+            report = await main.run_api_scan(
+                scan_name="incremental", asset_url=BASE_URL, endpoints=endpoints, baseline_report=baseline,
+            )
+        return report, scanned
+
+    async def test_second_scan_only_scans_changed_endpoints(self):
+        first, scanned = await self._scan([USERS, ORDERS])
+        assert scanned == ["GET /users", "POST /orders"]
+        assert first["incremental"]["mode"] == "full"
+
+        changed_orders = {**ORDERS, "body": {"item": "test"}}
+        second, scanned = await self._scan([USERS, changed_orders], baseline=first)
+
+        assert scanned == ["POST /orders"]
+        assert second["total_endpoints"] == 2
+        by_endpoint = {f["endpoint"]: f for f in second["findings"]}
+        assert by_endpoint["GET /users"]["carried_forward"] is True
+        assert "carried_forward" not in by_endpoint["POST /orders"]
+        assert second["incremental"]["unchanged"] == 1
+        assert second["incremental"]["changed"] == 1
+
+        # The carried finding stays carryable for the scan after that
+        third, scanned = await self._scan([USERS, changed_orders], baseline=second)
+        assert scanned == []
+        assert {f["endpoint"] for f in third["findings"]} == {"GET /users", "POST /orders"}
+
+    async def test_cancelled_scan_is_not_a_baseline(self):
+        partial, scanned = await self._scan([USERS, ORDERS], cancel_after_batches=1)
+        assert scanned == ["GET /users"]
+        assert partial["incremental"]["mode"] == "partial"
+
+        # POST /orders was never scanned, so the next run must not skip it
+        assert plan_incremental([USERS, ORDERS], partial, BASE_URL, "active") is None
+        second, scanned = await self._scan([USERS, ORDERS], baseline=partial)
+        assert scanned == ["GET /users", "POST /orders"]
+        assert second["incremental"]["mode"] == "full"
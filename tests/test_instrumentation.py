@@ -0,0 +1,104 @@
+"""Tests for scan instrumentation — check/phase attribution and Prometheus export."""
+import asyncio
+
+import pytest
+import requests
+import responses
+from unittest.mock import patch
+
+from app.scanners.api_scanner.engine.request_executor import execute_request
+from app.scanners.instrumentation import (
+    check_scope,
+    collect_metrics,
+    enter_phase,
+    record_request,
+    render_prometheus,
+)
+
+
+class TestScanMetrics:
+    def test_hooks_are_noops_without_collector(self):
+        with check_scope("SQL Injection", "GET /users"):
+            record_request(0.1, bytes_received=10)
+        enter_phase("GLOBAL_CHECKS")
+
+    def test_latency_percentiles_and_totals(self):
+        with collect_metrics() as metrics:
+            with check_scope("SSRF", "GET /fetch"):
+                for ms in range(1, 101):
+                    record_request(ms / 1000, bytes_received=100)
+            record_request(None, failed=True, timeouts=3, retries=2)
+
+        summary = metrics.summary()
+
+        ssrf = summary["checks"]["SSRF"]
+        assert ssrf["requests"] == 100
+        assert ssrf["bytes_received"] == 10000
+        assert ssrf["latency_p50_ms"] == 50.0
+        assert ssrf["latency_p95_ms"] == 95.0
+        assert summary["checks"]["other"]["failed_requests"] == 1
+        assert summary["checks"]["other"]["timeouts"] == 3
+        assert summary["endpoint_requests"] == {"GET /fetch": 100}
+        assert summary["requests_total"] == 101
+
+    def test_phases_are_sequential(self):
+        with collect_metrics() as metrics:
+            enter_phase("GLOBAL_CHECKS")
+            enter_phase("ENDPOINT_SCANNING")
+
+        assert set(metrics.summary()["phases"]) == {"GLOBAL_CHECKS", "ENDPOINT_SCANNING"}
+
+
+@pytest.mark.asyncio
+class TestRequestAttribution:
+    @responses.activate
+    async def test_requests_attributed_to_concurrent_checks(self):
+        responses.add(responses.GET, "https://api.test/a", body="x" * 10)
+        responses.add(responses.GET, "https://api.test/b", body="y" * 20)
+
+        async def check(url, times):
+            for _ in range(times):
+                await execute_request("GET", url)
+
+        async def scoped(name, url, times):
+            with check_scope(name, f"GET {url}"):
+                await check(url, times)
+
+        with collect_metrics() as metrics:
+            await asyncio.gather(scoped("A", "https://api.test/a", 2), scoped("B", "https://api.test/b", 3))
+
+        checks = metrics.summary()["checks"]
+        assert (checks["A"]["requests"], checks["A"]["bytes_received"], checks["A"]["runs"]) == (2, 20, 1)
+        assert (checks["B"]["requests"], checks["B"]["bytes_received"], checks["B"]["runs"]) == (3, 60, 1)
+
+    async def test_retries_and_timeouts_counted(self):
+        def _timeout(**kwargs):
+            raise requests.exceptions.Timeout("slow")
+
+        with collect_metrics() as metrics, check_scope("XXE"):
+            with patch("requests.request", side_effect=_timeout), \
+                    patch("app.scanners.api_scanner.engine.request_executor.RETRY_BACKOFF", 0):
+                resp, _ = await execute_request("GET", "https://api.test/slow")
+
+        assert resp is None
+        xxe = metrics.summary()["checks"]["XXE"]
+        assert (xxe["requests"], xxe["retries"], xxe["timeouts"], xxe["failed_requests"]) == (1, 2, 3, 1)
+
+
+class TestRenderPrometheus:
+    def test_text_format(self):
+        with collect_metrics() as metrics:
+            enter_phase("GLOBAL_CHECKS")
+            with check_scope('Admin "path"', "GET /"):
+                record_request(0.2, bytes_received=5)
+
+        text = render_prometheus(metrics.summary(), {"scanner": "api", "scan_id": "s1"})
+
+        assert "# TYPE secoraa_scan_check_requests_total counter" in text
+        assert 'secoraa_scan_check_requests_total{scanner="api",scan_id="s1",check="Admin \\"path\\""} 1' in text
+        assert 'secoraa_scan_check_latency_seconds{scanner="api",scan_id="s1",check="Admin \\"path\\"",quantile="0.95"} 0.2' in text
+        assert 'phase="GLOBAL_CHECKS"' in text
+        assert text.endswith("\n")
+
+    def test_empty_diagnostics(self):
+        assert render_prometheus({}) == ""
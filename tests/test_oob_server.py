@@ -0,0 +1,131 @@
+"""Tests for OOB interaction indexing, push delivery and the adaptive wait."""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.scanners.api_scanner.engine.oob_server import (
+    OOBCallbackServer,
+    OOBInteraction,
+    OOBTracker,
+)
+
+
+def _interaction(token):
+    return OOBInteraction(token=token, scan_id="", test_type="ssrf", endpoint="", payload="")
+
+
+def _tracker(server, scan_id="scan1234-abcd"):
+    return OOBTracker(scan_id, oob_base_url="http://oob.test", callback_server=server)
+
+
+class TestInteractionIndex:
+    def test_lookup_by_prefix_and_token(self):
+        server = OOBCallbackServer()
+        for token in ("aaaa1111-ssrf-000001", "aaaa1111-xxe-000002", "bbbb2222-ssrf-000003"):
+            server.record(_interaction(token))
+
+        assert len(server.get_interactions("aaaa1111")) == 2
+        assert [i.token for i in server.get_interactions("aaaa1111-xxe-000002")] == ["aaaa1111-xxe-000002"]
+        assert server.get_interactions("cccc3333") == []
+        assert len(server.get_interactions()) == 3
+
+    def test_clear_one_prefix(self):
+        server = OOBCallbackServer()
+        server.record(_interaction("aaaa1111-ssrf-000001"))
+        server.record(_interaction("bbbb2222-ssrf-000002"))
+
+        server.clear("aaaa1111")
+
+        assert [i.token for i in server.get_interactions()] == ["bbbb2222-ssrf-000002"]
+
+
+@pytest.mark.asyncio
+class TestTrackerPush:
+    async def test_pushed_interactions_are_enriched(self):
+        server = OOBCallbackServer()
+        tracker = _tracker(server)
+        token = tracker.generate_token("xxe", "POST /upload", "XXE OOB")
+        server.record(_interaction(token))
+        server.record(_interaction("scan1234-ssrf-unknown"))  # not a token we sent
+
+        found = await tracker.wait_for_interactions(grace=0)
+
+        assert [(i.token, i.endpoint, i.test_type) for i in found] == [(token, "POST /upload", "xxe")]
+
+    async def test_no_wait_once_grace_after_last_token_passed(self):
+        server = OOBCallbackServer()
+        tracker = _tracker(server)
+        tracker.generate_token("ssrf", "GET /fetch", "SSRF OOB")
+
+        started = time.monotonic()
+        assert await tracker.wait_for_interactions(grace=0) == []
+        assert time.monotonic() - started < 0.1
+
+    async def test_waits_for_late_callback_and_returns_when_all_answered(self):
+        server = OOBCallbackServer()
+        tracker = _tracker(server)
+        token = tracker.generate_token("cmdi", "POST /ping", "CmdI OOB")
+        asyncio.get_running_loop().call_later(0.05, server.record, _interaction(token))
+
+        started = time.monotonic()
+        found = await tracker.wait_for_interactions(grace=5)
+
+        assert [i.token for i in found] == [token]
+        assert time.monotonic() - started < 1
+
+    async def test_callback_recorded_on_another_thread_wakes_the_tracker(self):
+        # The listener may run on a different thread/loop than the scan
+        server = OOBCallbackServer()
+        tracker = _tracker(server)
+        token = tracker.generate_token("ssrf", "GET /fetch", "SSRF OOB")
+        timer = threading.Timer(0.05, server.record, args=(_interaction(token),))
+        timer.start()
+
+        started = time.monotonic()
+        found = await tracker.wait_for_interactions(grace=5)
+        timer.join()
+
+        assert [i.token for i in found] == [token]
+        assert time.monotonic() - started < 1
+
+    async def test_stream_yields_callbacks_as_they_arrive(self):
+        server = OOBCallbackServer()
+        tracker = _tracker(server)
+        first = tracker.generate_token("ssrf", "GET /fetch", "SSRF OOB")
+        second = tracker.generate_token("xxe", "POST /upload", "XXE OOB")
+        stream = tracker.stream_interactions()
+
+        server.record(_interaction("scan1234-ssrf-unknown"))  # skipped
+        server.record(_interaction(first))
+        assert (await asyncio.wait_for(stream.__anext__(), 1)).endpoint == "GET /fetch"
+
+        threading.Thread(target=server.record, args=(_interaction(second),)).start()
+        assert (await asyncio.wait_for(stream.__anext__(), 1)).test_type == "xxe"
+        await stream.aclose()
+
+    async def test_tracker_without_scan_id_receives_pushed_callbacks(self):
+        server = OOBCallbackServer()
+        tracker = OOBTracker(None, oob_base_url="http://oob.test", callback_server=server)
+        other = OOBTracker(None, oob_base_url="http://oob.test", callback_server=server)
+        token = tracker.generate_token("sqli", "GET /search", "SQLi OOB")
+        server.record(_interaction(token))
+
+        found = await tracker.wait_for_interactions(grace=0)
+
+        assert [i.token for i in found] == [token]
+        assert found[0].scan_id == "no-id"
+        # Concurrent id-less scans don't share a prefix (or each other's callbacks)
+        assert "-" not in tracker._prefix and tracker._prefix != other._prefix
+        assert await other.wait_for_interactions(grace=0) == []
+
+    async def test_close_unsubscribes_and_drops_scan_interactions(self):
+        server = OOBCallbackServer()
+        tracker = _tracker(server)
+        server.record(_interaction(tracker.generate_token("ssrf", "GET /", "SSRF OOB")))
+
+        tracker.close()
+
+        assert server.get_interactions("scan1234") == []
+        assert not server._subscribers
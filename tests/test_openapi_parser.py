@@ -0,0 +1,134 @@
+"""Tests for openapi_parser — $ref resolution, composed schemas and the parse cache."""
+import json
+from unittest.mock import patch
+
+import pytest
+
+from app.scanners.api_scanner.parser import openapi_parser
+from app.scanners.api_scanner.parser.openapi_parser import clear_parse_cache, parse_openapi
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    clear_parse_cache()
+    yield
+    clear_parse_cache()
+
+
+def _spec(schema, components=None, parameters=None):
+    return {
+        "openapi": "3.0.0",
+        "paths": {
+            "/items": {
+                "post": {
+                    "parameters": parameters or [],
+                    "requestBody": {"content": {"application/json": {"schema": schema}}},
+                },
+            },
+        },
+        "components": components or {},
+    }
+
+
+class TestRefResolution:
+    def test_chained_and_nested_refs(self):
+        spec = _spec(
+            {"$ref": "#/components/schemas/Alias"},
+            {
+                "schemas": {
+                    "Alias": {"$ref": "#/components/schemas/Item"},
+                    "Item": {
+                        "type": "object",
+                        "properties": {
+                            "count": {"$ref": "#/components/schemas/Count"},
+                            "owner": {"$ref": "#/components/schemas/Owner"},
+                        },
+                    },
+                    "Count": {"type": "integer"},
+                    "Owner": {"type": "object", "properties": {"name": {"type": "string"}}},
+                },
+            },
+        )
+
+        body = parse_openapi(spec)[0]["body"]
+
+        assert body == {"count": 1, "owner": {"name": "test"}}
+
+    def test_recursive_schema_terminates(self):
+        spec = _spec(
+            {"$ref": "#/components/schemas/Node"},
+            {
+                "schemas": {
+                    "Node": {
+                        "type": "object",
+                        "properties": {"value": {"type": "integer"}, "next": {"$ref": "#/components/schemas/Node"}},
+                    },
+                    "Loop": {"$ref": "#/components/schemas/Loop"},
+                },
+            },
+        )
+        spec["paths"]["/items"]["post"]["parameters"] = [{"$ref": "#/components/schemas/Loop"}]
+
+        endpoint = parse_openapi(spec)[0]
+
+        assert endpoint["body"] == {"value": 1, "next": {"value": 1, "next": {}}}
+        assert endpoint["parameters"][0]["name"] == ""
+
+    def test_all_of_merges_and_one_of_takes_first_variant(self):
+        spec = _spec(
+            {
+                "allOf": [
+                    {"$ref": "#/components/schemas/Base"},
+                    {"properties": {"extra": {"type": "boolean"}}},
+                    {"oneOf": [{"properties": {"card": {"type": "string"}}}, {"properties": {"iban": {"type": "string"}}}]},
+                ],
+            },
+            {"schemas": {"Base": {"type": "object", "properties": {"id": {"type": "integer"}}}}},
+        )
+
+        assert parse_openapi(spec)[0]["body"] == {"id": 1, "extra": True, "card": "test"}
+
+    def test_nullable_any_of_type(self):
+        spec = _spec({"properties": {"limit": {"anyOf": [{"type": "integer"}, {"type": "null"}]}}})
+        assert parse_openapi(spec)[0]["body"] == {"limit": 1}
+
+    def test_json_pointer_escapes_and_referenced_parameters(self):
+        spec = _spec(
+            {"properties": {"q": {"type": "string"}}},
+            {"parameters": {"a/b": {"name": "page", "in": "query", "schema": {"type": "integer"}}}},
+            parameters=[{"$ref": "#/components/parameters/a~1b"}],
+        )
+
+        assert parse_openapi(spec)[0]["parameters"] == [
+            {"name": "page", "in": "query", "type": "integer", "required": False},
+        ]
+
+    def test_shared_samples_are_independent(self):
+        spec = _spec({"$ref": "#/components/schemas/Item"},
+                     {"schemas": {"Item": {"properties": {"owner": {"properties": {"name": {"type": "string"}}}}}}})
+        spec["paths"]["/other"] = spec["paths"]["/items"]
+
+        first, second = parse_openapi(spec)
+        first["body"]["owner"]["name"] = "changed"
+
+        assert second["body"]["owner"]["name"] == "test"
+
+
+class TestParseCache:
+    def test_unchanged_spec_is_not_parsed_again(self):
+        raw = json.dumps(_spec({"properties": {"name": {"type": "string"}}}))
+
+        with patch.object(openapi_parser, "_parse_openapi", wraps=openapi_parser._parse_openapi) as parse:
+            first = parse_openapi(raw)
+            second = parse_openapi(raw)
+            parse_openapi(raw.replace("name", "title"))
+
+        assert first == second
+        assert parse.call_count == 2
+
+    def test_cached_result_is_a_fresh_copy(self):
+        spec = _spec({"properties": {"name": {"type": "string"}}})
+
+        parse_openapi(spec)[0]["body"]["name"] = "mutated"
+
+        assert parse_openapi(spec)[0]["body"] == {"name": "test"}
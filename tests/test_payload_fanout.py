@@ -0,0 +1,105 @@
+"""Tests for the concurrent, early-exit payload fan-out used by injection checks."""
+import asyncio
+import re
+
+import pytest
+import responses
+
+from app.scanners.api_scanner.engine.payload_fanout import endpoint_probe_limit, first_confirmed
+from app.scanners.api_scanner.tests.sqli_tests import run_sqli_tests
+
+
+@pytest.mark.asyncio
+class TestFirstConfirmed:
+    async def test_runs_probes_concurrently_under_limit(self):
+        state = {"active": 0, "peak": 0}
+
+        async def attempt(i):
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            await asyncio.sleep(0.02)
+            state["active"] -= 1
+            return None
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        assert await first_confirmed(range(12), attempt, limit=4) is None
+        elapsed = loop.time() - started
+
+        assert state["peak"] == 4
+        assert elapsed < 12 * 0.02 / 2
+
+    async def test_cancels_outstanding_probes_after_hit(self):
+        started, cancelled = [], []
+
+        async def attempt(i):
+            started.append(i)
+            try:
+                await asyncio.sleep(0 if i == 1 else 1)
+            except asyncio.CancelledError:
+                cancelled.append(i)
+                raise
+            return f"hit-{i}" if i == 1 else None
+
+        result = await first_confirmed(iter(range(100)), attempt, limit=3)
+
+        assert result == "hit-1"
+        assert started == [0, 1, 2]
+        assert sorted(cancelled) == [0, 2]
+
+    async def test_simultaneous_hits_prefer_probe_order(self):
+        async def attempt(i):
+            await asyncio.sleep(0)
+            return i if i in (2, 3) else None
+
+        assert await first_confirmed(range(5), attempt, limit=5) == 2
+
+    async def test_probe_error_propagates(self):
+        async def attempt(i):
+            if i == 0:
+                raise RuntimeError("boom")
+            await asyncio.sleep(1)
+
+        with pytest.raises(RuntimeError):
+            await first_confirmed(range(3), attempt, limit=3)
+
+    async def test_fan_outs_of_one_endpoint_share_its_limit(self):
+        state = {"active": 0, "peak": 0}
+
+        async def attempt(i):
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            await asyncio.sleep(0.01)
+            state["active"] -= 1
+            return None
+
+        # e.g. sqli, ssti, cmdi and one fan-out per SSRF target, all at once
+        with endpoint_probe_limit(5):
+            await asyncio.gather(*(first_confirmed(range(10), attempt, limit=4) for _ in range(6)))
+
+        assert state["peak"] == 5
+
+
+@pytest.mark.asyncio
+class TestSqliFanOut:
+    @responses.activate
+    async def test_stops_after_first_sql_error(self, base_url, auth_headers):
+        def _reply(request):
+            if "UNION" in request.url:
+                return 500, {}, "You have an error in your SQL syntax"
+            return 200, {}, "[]"
+
+        responses.add_callback(responses.GET, re.compile(r".*/items.*"), callback=_reply)
+        endpoint = {
+            "method": "GET",
+            "path": "/items",
+            "parameters": [{"name": "q", "in": "query"}, {"name": "sort", "in": "query"}],
+        }
+
+        findings = await run_sqli_tests(endpoint, base_url, auth_headers, {})
+
+        assert len(findings) == 1
+        assert "Error-based" in findings[0]["title"]
+        assert "param: q" in findings[0]["title"]
+        # Far fewer than the full 2 params x payloads x encodings product.
+        assert len(responses.calls) < 60
@@ -0,0 +1,124 @@
+"""Tests for the async PentestScanner probe engine."""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from app.scanners.pentest_scanner import PentestScanner
+
+
+TARGET = "93.184.216.34"  # public IP literal — resolves without DNS
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    path = request.url.path
+    params = dict(request.url.params)
+    if request.method == "OPTIONS":
+        return httpx.Response(200, headers={"Allow": "GET, TRACE"})
+    if request.url.scheme == "http":
+        return httpx.Response(301, headers={"Location": f"https://{TARGET}/"})
+    if path == "/.env":
+        return httpx.Response(200, text="DB_PASSWORD=hunter2\n")
+    if params.get("id") == "'":
+        return httpx.Response(500, text="You have an error in your SQL syntax")
+    if params.get("next"):
+        return httpx.Response(302, headers={"Location": params["next"]})
+    if path == "/":
+        return httpx.Response(200, text="ok", headers={"Server": "nginx/1.18.0"})
+    return httpx.Response(404)
+
+
+@pytest.mark.asyncio
+class TestPentestScanner:
+    async def test_probe_families_on_shared_client(self):
+        result = await PentestScanner().run_async(
+            {"target_type": "IP", "target_value": TARGET},
+            transport=httpx.MockTransport(_handler),
+        )
+        titles = [f["title"] for f in result["findings"]]
+        assert result["preflight_checks"]["reachable"] is True
+        assert "Server version disclosed" in titles
+        assert "Dangerous HTTP methods enabled: TRACE" in titles
+        assert "Sensitive path exposed: /.env" in titles
+        assert "Possible SQL Injection: parameter 'id'" in titles
+        assert "Open Redirect via 'next' parameter" in titles
+        assert "HTTP not redirected to HTTPS" not in titles
+        assert "Host resolves to public IP" in titles
+
+    async def test_unreachable_target(self):
+        def _down(request):
+            raise httpx.ConnectError("refused", request=request)
+
+        result = await PentestScanner().run_async(
+            {"target_type": "IP", "target_value": TARGET},
+            transport=httpx.MockTransport(_down),
+        )
+        assert result["preflight_checks"]["reachable"] is False
+        assert any("unreachable" in e for e in result["messages"]["errors"])
+
+    async def test_private_target_blocked(self):
+        result = await PentestScanner().run_async({"target_type": "IP", "target_value": "127.0.0.1"})
+        assert result["findings"] == []
+        assert result["messages"]["errors"] == ["Target resolves to a private/internal address"]
+
+    async def test_excluded_host_skipped(self):
+        result = await PentestScanner().run_async({
+            "target_type": "IP",
+            "target_value": TARGET,
+            "exclusions": {"hosts": [TARGET]},
+        })
+        assert result["messages"]["skipped"] == ["host_excluded_by_rules"]
+
+
+class _SlowHandler(BaseHTTPRequestHandler):
+    requests_seen = 0
+    lock = threading.Lock()
+
+    def _reply(self):
+        with _SlowHandler.lock:
+            _SlowHandler.requests_seen += 1
+        time.sleep(0.1)
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(b"ok")
+
+    do_GET = do_POST = do_PUT = do_DELETE = do_OPTIONS = do_HEAD = do_TRACE = do_TRACK = _reply
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.mark.asyncio
+class TestConnectionPool:
+    async def test_probes_queue_for_a_connection_instead_of_timing_out(self, monkeypatch):
+        """Through a real pool far smaller than the probe count, no probe is dropped."""
+        from app.scanners.pentest_scanner import scanner
+
+        monkeypatch.setattr(scanner, "_ssrf_blocked", lambda host, addresses: False)
+        monkeypatch.setattr(scanner, "MAX_CONNECTIONS", 2)
+        # Queueing for a connection takes well over this
+        monkeypatch.setattr(scanner, "REQ_TIMEOUT", 1)
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _SlowHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        target = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            expected = []
+            await PentestScanner().run_async(
+                {"target_type": "URL", "target_value": target},
+                transport=httpx.MockTransport(lambda request: expected.append(request) or httpx.Response(200, text="ok")),
+            )
+
+            _SlowHandler.requests_seen = 0
+            result = await PentestScanner().run_async({"target_type": "URL", "target_value": target})
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert len(expected) > 2 * scanner.MAX_CONNECTIONS * 5
+        assert result["preflight_checks"]["reachable"] is True
+        assert _SlowHandler.requests_seen == len(expected)
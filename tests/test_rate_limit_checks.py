@@ -1,8 +1,12 @@
 """Tests for rate_limit_tests — rate limiting detection."""
 import re
+import threading
+import time
+
 import pytest
 import responses
 
+from app.scanners.api_scanner.engine.request_executor import request_coalescing
 from app.scanners.api_scanner.tests import reset_finding_counters
 from app.scanners.api_scanner.tests.rate_limit_tests import run_rate_limit_tests, RAPID_REQUEST_COUNT
 
@@ -94,3 +98,27 @@ class TestRateLimitChecks:
         findings = await run_rate_limit_tests(BASE, {}, {}, [])
         # Should still run without error
         assert isinstance(findings, list)
+
+    @responses.activate
+    async def test_rapid_requests_sent_as_concurrent_burst(self):
+        """The probe fires all requests at once, none merged by scan-wide coalescing."""
+        lock = threading.Lock()
+        state = {"in_flight": 0, "peak": 0}
+
+        def _slow(request):
+            with lock:
+                state["in_flight"] += 1
+                state["peak"] = max(state["peak"], state["in_flight"])
+            time.sleep(0.05)
+            with lock:
+                state["in_flight"] -= 1
+            return 200, {}, "{}"
+
+        responses.add_callback(responses.GET, f"{BASE}/items", callback=_slow)
+        responses.add(responses.POST, ANY_POST, status=404)
+
+        with request_coalescing():
+            await run_rate_limit_tests(BASE, {}, {}, [{"method": "GET", "path": "/items"}])
+
+        assert sum(1 for call in responses.calls if call.request.method == "GET") == RAPID_REQUEST_COUNT
+        assert state["peak"] > 1
@@ -1,9 +1,13 @@
 """Tests for request_executor — async HTTP execution with evidence."""
+import asyncio
+import time
+
 import pytest
 import responses
 from unittest.mock import patch
 
-from app.scanners.api_scanner.engine.request_executor import execute_request
+from app.scanners.api_scanner.engine import request_executor
+from app.scanners.api_scanner.engine.request_executor import execute_request, request_coalescing
 
 
 @pytest.mark.asyncio
@@ -82,3 +86,92 @@ class TestExecuteRequest:
         assert resp is not None
         assert resp.status_code == 404
         assert evidence["response"]["status_code"] == 404
+
+    @responses.activate
+    async def test_body_read_is_capped(self, monkeypatch):
+        monkeypatch.setattr(request_executor, "MAX_BODY_BYTES", 1024)
+        responses.add(responses.GET, "https://api.test/export", body="x" * 10_000, status=200)
+        resp, evidence = await execute_request("GET", "https://api.test/export")
+        assert resp.truncated is True
+        assert len(resp.content) == 1024
+        assert resp.text == "x" * 1024
+        assert evidence["response"]["body_capped"] is True
+
+    @responses.activate
+    async def test_small_body_not_truncated(self):
+        responses.add(responses.GET, "https://api.test/items", json={"items": [1, 2]}, status=200)
+        resp, evidence = await execute_request("GET", "https://api.test/items")
+        assert resp.truncated is False
+        assert resp.json() == {"items": [1, 2]}
+        assert "body_capped" not in evidence["response"]
+
+
+def _slow_ok(request):
+    time.sleep(0.05)  # keep the first call in flight while the duplicates arrive
+    return 200, {}, '{"ok": true}'
+
+
+@pytest.mark.asyncio
+class TestRequestCoalescing:
+    @responses.activate
+    async def test_identical_inflight_gets_share_one_call(self):
+        responses.add_callback(responses.GET, "https://api.test/me", callback=_slow_ok)
+
+        with request_coalescing() as coalescer:
+            results = await asyncio.gather(*(
+                execute_request("GET", "https://api.test/me", headers={"X-API-Key": "k"}) for _ in range(4)
+            ))
+
+        assert len(responses.calls) == 1
+        assert coalescer.sent == 1 and coalescer.merged == 3
+        assert all(resp.status_code == 200 for resp, _ in results)
+        assert all(ev["request"]["url"] == "https://api.test/me" for _, ev in results)
+
+    @responses.activate
+    async def test_different_headers_and_mutating_methods_not_merged(self):
+        responses.add_callback(responses.GET, "https://api.test/me", callback=_slow_ok)
+        responses.add_callback(responses.POST, "https://api.test/me", callback=_slow_ok)
+
+        with request_coalescing():
+            await asyncio.gather(
+                execute_request("GET", "https://api.test/me"),
+                execute_request("GET", "https://api.test/me", headers={"Authorization": "Bearer a"}),
+                execute_request("POST", "https://api.test/me", body={"a": 1}),
+                execute_request("POST", "https://api.test/me", body={"a": 1}),
+            )
+
+        assert len(responses.calls) == 4
+
+    @responses.activate
+    async def test_coalescing_can_be_opted_out(self):
+        responses.add_callback(responses.GET, "https://api.test/me", callback=_slow_ok)
+
+        with request_coalescing() as coalescer:
+            await asyncio.gather(*(execute_request("GET", "https://api.test/me", coalesce=False) for _ in range(3)))
+
+        assert len(responses.calls) == 3
+        assert coalescer.sent == coalescer.merged == 0
+
+    @responses.activate
+    async def test_cancelled_caller_does_not_cancel_shared_call(self):
+        responses.add_callback(responses.GET, "https://api.test/me", callback=_slow_ok)
+
+        with request_coalescing():
+            first = asyncio.ensure_future(execute_request("GET", "https://api.test/me"))
+            await asyncio.sleep(0)
+            second = asyncio.ensure_future(execute_request("GET", "https://api.test/me"))
+            await asyncio.sleep(0)
+            first.cancel()
+            resp, _ = await second
+
+        assert resp is not None and resp.status_code == 200
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    async def test_no_coalescing_outside_scan_scope(self):
+        responses.add_callback(responses.GET, "https://api.test/me", callback=_slow_ok)
+
+        await asyncio.gather(*(execute_request("GET", "https://api.test/me") for _ in range(2)))
+
+        assert len(responses.calls) == 2
+
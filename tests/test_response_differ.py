@@ -8,6 +8,9 @@ from app.scanners.api_scanner.engine.response_differ import (
     compare_responses,
     responses_are_same,
     has_new_content,
+    find_keyword,
+    fingerprint,
+    response_signature,
     _body_hash,
     _normalize_body,
     _compute_body_length_ratio,
@@ -224,6 +227,13 @@ class TestNormalizeBody:
         text = "error: access denied for user admin"
         assert _normalize_body(text) == text
 
+    def test_dynamic_field_replaced_whole(self):
+        text = '{"id": "550e8400-e29b-41d4-a716-446655440000", "name": "bob"}'
+        assert _normalize_body(text) == '{"id": "<DYNAMIC>", "name": "bob"}'
+
+    def test_no_double_space_where_token_was_removed(self):
+        assert _normalize_body("at 2025-03-22T14:30:00Z  done") == "at done"
+
 
 class TestBodyHashNormalization:
     def test_normalize_on_by_default(self):
@@ -270,3 +280,50 @@ class TestNormalizationInCompareResponses:
         r1 = _resp(200, body1)
         r2 = _resp(200, body2)
         assert responses_are_same(r1, r2) is True
+
+
+class TestFindKeyword:
+    def test_case_insensitive_match_returns_keyword(self):
+        assert find_keyword("Warning: MySQL server error", ("sql syntax", "mysql")) == "mysql"
+
+    def test_earliest_occurrence_wins(self):
+        assert find_keyword("ORA-00933 ... PostgreSQL", ("postgresql", "ora-")) == "ora-"
+
+    def test_no_match_or_empty(self):
+        assert find_keyword("all good", ("mysql",)) is None
+        assert find_keyword(None, ("mysql",)) is None
+        assert find_keyword("mysql", ()) is None
+
+    def test_keywords_are_literal(self):
+        assert find_keyword("a.b", ("a*b",)) is None
+        assert find_keyword("uses $where clause", ("$where",)) == "$where"
+
+
+
+class TestFingerprint:
+    def test_computed_once_per_response(self):
+        r1 = _resp(200, json_data={"id": 1, "name": "a"})
+        r2 = _resp(200, json_data={"id": 2, "name": "b"})
+
+        for _ in range(3):
+            compare_responses(r1, r2)
+            responses_are_same(r1, r2)
+
+        assert fingerprint(r1) is fingerprint(r1)
+        assert r1.json.call_count == 1
+        assert r2.json.call_count == 1
+
+    def test_fields(self):
+        fp = fingerprint(_resp(404, json_data={"error": "nope"}))
+        assert fp.status == 404
+        assert fp.length == len('{"error": "nope"}')
+        assert fp.json_keys == frozenset({"error"})
+
+    def test_non_object_body_is_not_parsed(self):
+        r = _resp(200, "[1, 2]")
+        assert fingerprint(r).json_keys is None
+        r.json.assert_not_called()
+
+    def test_signature(self):
+        assert response_signature(None) == "none"
+        assert response_signature(_resp(200, "ok")) == f"200:{_body_hash('ok')}"
@@ -0,0 +1,64 @@
+"""Tests for how the schedule dispatcher starts scheduled API scans."""
+import json
+import uuid
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.api import scans
+from app.database.models import ScheduledScan
+from app.worker import tasks
+from app.worker.celery_app import PRIORITY_SCHEDULED
+
+ENDPOINTS = [{"method": "GET", "path": "/users"}]
+
+
+@pytest.fixture
+def db():
+    session = MagicMock()
+    session.refresh.side_effect = lambda row: setattr(row, "id", row.id or uuid.uuid4())
+    return session
+
+
+@pytest.fixture
+def sched():
+    return ScheduledScan(
+        scan_name="nightly-api",
+        scan_type="api",
+        status="TRIGGERING",
+        created_by="alice",
+        payload_json=json.dumps({"asset_url": "https://api.test", "endpoints": ENDPOINTS}),
+    )
+
+
+def test_scheduled_api_scan_is_queued_when_celery_is_used(db, sched, monkeypatch):
+    queued = MagicMock()
+    monkeypatch.setattr(scans, "use_celery", lambda: True)
+    monkeypatch.setattr(tasks.run_api_scan_task, "apply_async", queued)
+    monkeypatch.setattr(scans, "_run_api_scan_and_persist", MagicMock(side_effect=AssertionError("ran inline")))
+
+    scans._trigger_schedule(db, sched)
+
+    assert sched.status == "IN_PROGRESS" and sched.error is None
+    queued.assert_called_once()
+    kwargs = queued.call_args.kwargs
+    assert kwargs["priority"] == PRIORITY_SCHEDULED
+    assert kwargs["kwargs"] == {
+        "scan_id": str(sched.triggered_scan_id),
+        "scan_name": "nightly-api",
+        "asset_url": "https://api.test",
+        "endpoints": ENDPOINTS,
+    }
+
+
+def test_scheduled_api_scan_runs_inline_without_celery(db, sched, monkeypatch):
+    ran = MagicMock()
+    monkeypatch.setattr(scans, "use_celery", lambda: False)
+    monkeypatch.setattr(scans, "_run_api_scan_and_persist", ran)
+
+    scans._trigger_schedule(db, sched)
+
+    assert sched.status == "COMPLETED"
+    scan, asset_url, endpoints = ran.call_args.args[1:]
+    assert scan.id == sched.triggered_scan_id
+    assert (asset_url, endpoints) == ("https://api.test", ENDPOINTS)
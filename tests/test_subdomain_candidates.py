@@ -0,0 +1,109 @@
+"""Tests for the streaming subdomain candidate pipeline."""
+import itertools
+
+from app.scanners.subdomain_scanner.discovery.bruteforce import COMMON_WORDS
+from app.scanners.subdomain_scanner.discovery.candidates import (
+    BloomFilter,
+    iter_permutations,
+    stream_candidates,
+)
+from app.scanners.subdomain_scanner.validation import dns_check
+
+
+class TestCandidateStream:
+    def test_passive_first_then_unique_generated_names(self, tmp_path):
+        wordlist = tmp_path / "words.txt"
+        wordlist.write_text("# comment\nwww\nzeta\nZETA\n\nomega\n")
+
+        names = list(stream_candidates("example.com", ["API.example.com", "api.example.com"], [str(wordlist)]))
+
+        assert names[0] == "api.example.com"
+        assert len(names) == len(set(names))
+        assert "dev-api.example.com" in names
+        assert "api1.example.com" in names
+        assert "zeta.example.com" in names and "omega.example.com" in names
+        assert names.index("zeta.example.com") > names.index(f"{COMMON_WORDS[-1]}.example.com")
+
+    def test_stream_is_lazy_over_large_wordlist(self, tmp_path):
+        wordlist = tmp_path / "big.txt"
+        wordlist.write_text("\n".join(f"w{i}" for i in range(200_000)))
+
+        stream = stream_candidates("example.com", [], [str(wordlist)], capacity=300_000)
+        first = list(itertools.islice(stream, 5))
+
+        assert first == [f"{w}.example.com" for w in COMMON_WORDS[:5]]
+
+    def test_numeric_permutations(self):
+        perms = set(iter_permutations(["node2.eu.example.com"], "example.com"))
+
+        assert {"node1.eu.example.com", "node3.eu.example.com", "staging.node2.eu.example.com"} <= perms
+        assert "node2-dev.eu.example.com" in perms
+
+    def test_permutations_stop_at_budget(self, monkeypatch):
+        passive = [f"host{i}.example.com" for i in range(500)]
+        words = [f"{w}.example.com" for w in COMMON_WORDS]
+
+        names = list(stream_candidates("example.com", passive, [], permutation_budget=100))
+        generated = [n for n in names[500:] if n not in words]
+        assert len(generated) == 100
+        # Rule-major order: a cut still gives every seed its likeliest alterations
+        names = list(stream_candidates("example.com", ["web.example.com", "api.example.com"], [], permutation_budget=6))
+        assert names[2:8] == [
+            "api1.example.com", "api2.example.com", "web1.example.com", "web2.example.com",
+            "dev-api.example.com", "api-dev.example.com",
+        ]
+
+        monkeypatch.setenv("SUBDOMAIN_PERMUTATION_BUDGET", "0")
+        assert list(stream_candidates("example.com", ["api.example.com"], []))[1:] == [w for w in words if w != "api.example.com"]
+
+    def test_bloom_filter_membership(self):
+        bloom = BloomFilter(capacity=1000)
+
+        assert bloom.add("a.example.com") is False
+        assert bloom.add("a.example.com") is True
+        assert "a.example.com" in bloom
+        assert "b.example.com" not in bloom
+
+
+class TestStreamingResolver:
+    def test_yields_resolved_names_and_consumes_lazily(self, monkeypatch):
+        monkeypatch.setattr(dns_check, "_resolves", lambda name: name.startswith("ok"))
+        pulled = []
+
+        def source():
+            for i in range(10_000):
+                name = f"{'ok' if i % 2 else 'no'}{i}.example.com"
+                pulled.append(name)
+                yield name
+
+        stream = dns_check.iter_resolved(source(), concurrency=4)
+        first = next(stream)
+        stream.close()
+
+        assert first.startswith("ok")
+        assert len(pulled) < 100
+
+    def test_drops_wildcard_matches_while_resolving(self, monkeypatch):
+        wildcard = frozenset({"A:203.0.113.10"})
+
+        def answers(name):
+            if name in ("api.example.com", "shared.example.com"):
+                return frozenset({"A:198.51.100.7"}) | (wildcard if name == "shared.example.com" else frozenset())
+            return wildcard  # *.example.com
+
+        monkeypatch.setattr(dns_check, "_answers", answers)
+        names = ["api.example.com", "nope.example.com", "shared.example.com", "dev.example.com"]
+
+        assert list(dns_check.iter_resolved(names, concurrency=1, domain="example.com")) == [
+            "api.example.com",
+            "shared.example.com",
+        ]
+        assert len(list(dns_check.iter_resolved(names, concurrency=1))) == 4
+
+    def test_validate_dns_keeps_input_order(self, monkeypatch):
+        monkeypatch.setattr(dns_check, "_resolves", lambda name: name != "b.example.com")
+
+        assert dns_check.validate_dns(["c.example.com", "b.example.com", "a.example.com"]) == [
+            "c.example.com",
+            "a.example.com",
+        ]
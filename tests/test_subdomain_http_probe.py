@@ -0,0 +1,66 @@
+"""Tests for the unified subdomain HTTP probe stage."""
+import pytest
+from aiohttp import web
+
+from app.scanners.subdomain_scanner.validation.http_probe import probe_hosts_async
+from app.scanners.subdomain_scanner.vulnerabilities.exposure import (
+    SENSITIVE_PATHS,
+    exposure_from_probes,
+)
+from app.scanners.subdomain_scanner.vulnerabilities.misconfig import misconfiguration_from_probes
+
+
+@pytest.fixture
+async def plain_http_host():
+    """Local plain-HTTP server; the HTTPS attempt fails and must fall back."""
+    hits = []
+
+    async def handler(request):
+        hits.append(request.path)
+        if request.path == "/":
+            return web.Response(text="ok", headers={"Server": "Apache/2.4.49", "X-Frame-Options": "DENY"})
+        if request.path == "/.env":
+            return web.Response(text="SECRET=1")
+        if request.path == "/admin":
+            return web.Response(status=401)
+        return web.Response(status=404)
+
+    app = web.Application()
+    app.router.add_route("GET", "/{tail:.*}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield f"127.0.0.1:{port}", hits
+    await runner.cleanup()
+
+
+@pytest.mark.asyncio
+class TestHttpProbeStage:
+    async def test_root_fetched_once_with_http_fallback(self, plain_http_host):
+        host, hits = plain_http_host
+        probes = await probe_hosts_async([host], SENSITIVE_PATHS, concurrency=4)
+
+        probe = probes[host]
+        assert probe.base_url == f"http://{host}"
+        assert probe.status == 200
+        assert hits.count("/") == 1
+        assert sorted(p for p in hits if p != "/") == sorted(SENSITIVE_PATHS)
+
+    async def test_analyzers_share_probe_results(self, plain_http_host):
+        host, _hits = plain_http_host
+        probes = await probe_hosts_async([host], SENSITIVE_PATHS, concurrency=4)
+
+        assert exposure_from_probes(probes) == {host: ["/.env", "/admin"]}
+        misconfig = misconfiguration_from_probes(probes)[host]
+        assert "X-Frame-Options" not in misconfig["missing_headers"]
+        assert "Content-Security-Policy" in misconfig["missing_headers"]
+        assert misconfig["cves"] == ["CVE-2021-41773", "CVE-2021-42013"]
+
+    async def test_unreachable_host_skips_path_probes(self):
+        probes = await probe_hosts_async(["127.0.0.1:1"], SENSITIVE_PATHS, concurrency=4)
+
+        assert probes["127.0.0.1:1"].status is None
+        assert probes["127.0.0.1:1"].path_status == {}
+        assert misconfiguration_from_probes(probes) == {}
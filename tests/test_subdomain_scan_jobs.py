@@ -0,0 +1,94 @@
+"""Tests for the submit-and-poll subdomain scan job runner."""
+import time
+from pathlib import Path
+
+from app.endpoints import subdomain_scan
+from app.endpoints.request_body import SubdomainScanRequest
+
+
+def _register(job_id: str) -> None:
+    subdomain_scan._jobs[job_id] = {
+        "job_id": job_id, "owner": "alice", "status": "queued",
+        "stage": None, "data": None, "exports": {}, "error": None, "finished_at": None,
+    }
+
+
+class TestSubdomainScanJobs:
+    def test_export_stages_run_after_scan(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(subdomain_scan, "run_subdomain_scan", lambda d, s: {"domain": d})
+        monkeypatch.setattr(subdomain_scan, "upload_bytes_to_minio", lambda *a, **kw: ("", ""))
+
+        def _broken_pdf(report, path):
+            raise RuntimeError("fpdf2 missing")
+
+        monkeypatch.setattr(subdomain_scan, "export_pdf", _broken_pdf)
+        monkeypatch.chdir(tmp_path)
+        _register("job-1")
+
+        subdomain_scan._run_job(
+            "job-1",
+            SubdomainScanRequest(domain="example.com", export_json=True, export_pdf=True),
+        )
+
+        job = subdomain_scan._jobs["job-1"]
+        assert job["status"] == "completed"
+        assert job["data"] == {"domain": "example.com"}
+        assert job["exports"]["pdf"] == {"error": "fpdf2 missing"}
+        # No object storage: the export is kept in the job's temp dir, not the CWD
+        path = Path(job["exports"]["json"]["path"])
+        assert path.exists() and path.parent == Path(job["workdir"])
+        assert list(tmp_path.iterdir()) == []
+
+        job["finished_at"] = time.time() - subdomain_scan.SUBDOMAIN_JOB_TTL_SECONDS - 1
+        subdomain_scan._prune_jobs()
+
+        assert "job-1" not in subdomain_scan._jobs
+        assert not path.parent.exists()
+
+    def test_uploaded_exports_leave_no_local_files(self, monkeypatch):
+        uploaded = {}
+
+        def _upload(data, object_name, content_type):
+            uploaded[object_name] = content_type
+            return "bucket", object_name
+
+        monkeypatch.setattr(subdomain_scan, "run_subdomain_scan", lambda d, s: {"domain": d})
+        monkeypatch.setattr(subdomain_scan, "upload_bytes_to_minio", _upload)
+        written = []
+        real_export_json = subdomain_scan.export_json
+
+        def _export_json(report, path):
+            written.append(Path(path))
+            return real_export_json(report, path=path)
+
+        monkeypatch.setattr(subdomain_scan, "export_json", _export_json)
+        _register("job-4")
+
+        subdomain_scan._run_job("job-4", SubdomainScanRequest(domain="example.com", export_json=True))
+
+        job = subdomain_scan._jobs.pop("job-4")
+        assert job["exports"]["json"] == {"object_name": "subdomain_scans/job-4/subdomain_scan_job-4.json"}
+        assert uploaded == {"subdomain_scans/job-4/subdomain_scan_job-4.json": "application/json"}
+        assert "workdir" not in job
+        assert not written[0].parent.exists()
+
+    def test_scan_failure_marks_job_failed(self, monkeypatch):
+        def _boom(domain, subdomains):
+            raise ValueError("dns down")
+
+        monkeypatch.setattr(subdomain_scan, "run_subdomain_scan", _boom)
+        _register("job-2")
+
+        subdomain_scan._run_job("job-2", SubdomainScanRequest(domain="example.com"))
+
+        job = subdomain_scan._jobs.pop("job-2")
+        assert job["status"] == "failed"
+        assert "dns down" in job["error"]
+
+    def test_finished_jobs_are_pruned_after_ttl(self):
+        _register("job-3")
+        subdomain_scan._jobs["job-3"]["finished_at"] = time.time() - subdomain_scan.SUBDOMAIN_JOB_TTL_SECONDS - 1
+
+        subdomain_scan._prune_jobs()
+
+        assert "job-3" not in subdomain_scan._jobs
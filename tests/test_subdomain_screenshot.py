@@ -0,0 +1,164 @@
+"""Tests for the pooled screenshot service, against a fake Playwright browser."""
+import pytest
+
+from app.scanners.subdomain_scanner.utils import screenshot
+from app.scanners.subdomain_scanner.utils.screenshot import ScreenshotService
+
+PARKED = b"parked-domain-png"
+
+
+class FakePage:
+    def __init__(self, browser):
+        self.browser = browser
+
+    def set_default_timeout(self, timeout):
+        pass
+
+    async def goto(self, url, timeout=None, wait_until=None):
+        if "broken" in url:
+            raise TimeoutError(f"navigation to {url} timed out")
+        self.url = url
+
+    async def screenshot(self, timeout=None):
+        return self.browser.renders.get(self.url, PARKED)
+
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+        self.closed = False
+
+    async def new_page(self):
+        return FakePage(self.browser)
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.renders = {}
+        self.contexts = []
+        self.fail_new_context = False
+
+    async def new_context(self, **kwargs):
+        if self.fail_new_context:
+            raise RuntimeError("browser crashed")
+        context = FakeContext(self)
+        self.contexts.append(context)
+        return context
+
+    async def close(self):
+        pass
+
+
+class FakePlaywright:
+    def __init__(self, browser):
+        self.chromium = self
+        self.browser = browser
+
+    async def launch(self):
+        return self.browser
+
+    async def start(self):
+        return self
+
+    async def stop(self):
+        pass
+
+
+@pytest.fixture
+def browser(monkeypatch):
+    fake = FakeBrowser()
+    monkeypatch.setattr(screenshot, "async_playwright", lambda: FakePlaywright(fake))
+    return fake
+
+
+@pytest.fixture
+def stored():
+    return []
+
+
+@pytest.fixture
+def service(stored):
+    return ScreenshotService(concurrency=2, prefix="shots", store=lambda data, name, ctype: stored.append(name))
+
+
+def _pooled(service):
+    return [slot for slot in service._pool._queue]
+
+
+@pytest.mark.asyncio
+class TestScreenshotService:
+    async def test_identical_renders_are_stored_once(self, browser, service, stored):
+        browser.renders["https://a.example.com"] = b"site-a"
+
+        async with service:
+            results = await service.capture_many([
+                "https://a.example.com", "https://parked1.example.com",
+                "https://parked2.example.com", "https://a.example.com",
+            ])
+
+        assert [r.url for r in results] == [
+            "https://a.example.com", "https://parked1.example.com", "https://parked2.example.com",
+        ]
+        assert len(stored) == 2
+        assert sum(1 for r in results if r.duplicate_of) == 1
+        duplicate = next(r for r in results if r.duplicate_of)
+        assert duplicate.object_name == duplicate.duplicate_of in stored
+
+    async def test_failed_capture_replaces_its_slot(self, browser, service):
+        async with service:
+            result = await service.capture("https://broken.example.com")
+
+            assert "timed out" in result.error
+            pooled = _pooled(service)
+            assert len(pooled) == 2
+            assert all(not context.closed for context, _ in pooled)
+            assert sum(1 for c in browser.contexts if c.closed) == 1
+
+    async def test_dead_slot_is_not_reused_when_it_cannot_be_recreated(self, browser, service):
+        async with service:
+            browser.fail_new_context = True
+            await service.capture("https://broken.example.com")
+
+            pooled = _pooled(service)
+            assert len(pooled) == 2 and None in pooled
+            assert all(not slot[0].closed for slot in pooled if slot is not None)
+
+            # Still failing: the capture errors out without wedging the pool
+            await service.capture("https://ok.example.com")
+            await service.capture("https://ok.example.com")
+            assert len(_pooled(service)) == 2
+
+            browser.fail_new_context = False
+            results = [await service.capture(f"https://ok{i}.example.com") for i in range(3)]
+
+            assert all(r.error is None for r in results)
+            assert None not in _pooled(service)
+
+    async def test_failed_upload_keeps_the_slot_and_is_not_a_dedupe_target(self, browser):
+        uploads = []
+
+        def flaky_store(data, name, content_type):
+            uploads.append(name)
+            if len(uploads) == 1:
+                raise ConnectionError("minio unreachable")
+
+        async with ScreenshotService(concurrency=1, prefix="shots", store=flaky_store) as service:
+            failed = await service.capture("https://parked1.example.com")
+            retried = await service.capture("https://parked2.example.com")
+
+        assert "minio unreachable" in failed.error and failed.object_name is None
+        # Same render again: uploaded afresh rather than pointing at the missing object
+        assert retried.error is None and retried.duplicate_of is None
+        assert retried.object_name == uploads[1] == "shots/https_parked2.example.com.png"
+        assert len(browser.contexts) == 1 and not browser.contexts[0].closed
+
+    async def test_unconfigured_storage_reports_nothing_stored(self, browser):
+        async with ScreenshotService(concurrency=1, store=lambda *args: ("", "")) as service:
+            result = await service.capture("https://a.example.com")
+
+        assert result.object_name is None
+        assert "not configured" in result.error
+        assert service._by_hash == {}
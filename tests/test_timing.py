@@ -0,0 +1,120 @@
+"""Tests for the statistical time-based injection engine and timing lane."""
+import asyncio
+import re
+from datetime import timedelta
+
+import pytest
+from unittest.mock import MagicMock
+from requests import Response
+
+from app.scanners.api_scanner.engine.timing import (
+    LatencyBaseline,
+    TimingLane,
+    confirm_delay,
+    measure_baseline,
+)
+
+
+def _resp(latency):
+    r = MagicMock(spec=Response)
+    r.status_code = 200
+    r.text = "[]"
+    r.elapsed = timedelta(seconds=latency)
+    return r
+
+
+class _Server:
+    """Fake endpoint: ``latency(value)`` decides how long each request "took"."""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.sent = []
+
+    async def send(self, value, timeout):
+        self.sent.append(value)
+        return _resp(self.latency(value)), {"value": value}
+
+
+BASELINE = LatencyBaseline([0.10, 0.12, 0.09, 0.11, 0.10])
+
+
+def _sleeps(value):
+    match = re.search(r"SLEEP\((\d+)\)", value)
+    return 0.1 + (int(match.group(1)) if match else 0)
+
+
+@pytest.mark.asyncio
+class TestConfirmDelay:
+    async def test_confirms_delay_that_scales(self):
+        server = _Server(_sleeps)
+
+        result = await confirm_delay(server.send, "' OR SLEEP({delay})--", BASELINE)
+
+        assert result is not None
+        assert server.sent == ["' OR SLEEP(2)--", "' OR SLEEP(5)--"]
+        low, high = result.confidence_interval
+        assert low < 5.0 < high
+        assert result.confidence == "HIGH"
+        assert result.evidence["timing"]["long_delay"] == 5
+
+    async def test_unsuspicious_payload_costs_one_request(self):
+        server = _Server(lambda value: 0.1)
+
+        assert await confirm_delay(server.send, "' OR SLEEP({delay})--", BASELINE) is None
+        assert len(server.sent) == 1
+
+    async def test_jitter_spike_that_does_not_scale_is_rejected(self):
+        # One slow response regardless of the requested delay (GC pause, cold cache...)
+        server = _Server(lambda value: 3.0)
+
+        assert await confirm_delay(server.send, "' OR SLEEP({delay})--", BASELINE) is None
+        assert len(server.sent) == 2
+
+    async def test_noisy_baseline_raises_the_bar(self):
+        noisy = LatencyBaseline([0.1, 2.5, 0.2, 3.0, 0.1])
+        server = _Server(lambda value: 2.9 if "SLEEP" in value else 0.1)
+
+        assert await confirm_delay(server.send, "' OR SLEEP({delay})--", noisy) is None
+
+    async def test_measure_baseline_samples_sequentially(self):
+        latencies = iter([0.1, 0.2, 0.3])
+
+        async def send():
+            return _resp(next(latencies)), {}
+
+        baseline = await measure_baseline(send, samples=3)
+
+        assert baseline.samples == [0.1, 0.2, 0.3]
+        assert baseline.mean == pytest.approx(0.2)
+        assert baseline.margin > baseline.stdev
+
+
+@pytest.mark.asyncio
+class TestTimingLane:
+    async def test_bounded_concurrency_and_drain(self):
+        state = {"active": 0, "peak": 0}
+
+        async def check(i):
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            await asyncio.sleep(0.01)
+            state["active"] -= 1
+            return [{"title": f"finding-{i}"}] if i % 2 else []
+
+        lane = TimingLane(concurrency=2)
+        for i in range(6):
+            lane.submit("timing", f"GET /{i}", lambda i=i: check(i))
+
+        findings = await lane.drain()
+
+        assert state["peak"] == 2
+        assert sorted(f["title"] for f in findings) == ["finding-1", "finding-3", "finding-5"]
+
+    async def test_failing_check_does_not_break_drain(self):
+        async def boom():
+            raise RuntimeError("down")
+
+        lane = TimingLane()
+        lane.submit("timing", "GET /", boom)
+
+        assert await lane.drain() == []
@@ -0,0 +1,90 @@
+"""Tests for concurrent protocol probing in the network tls_audit plugin."""
+import threading
+import time
+
+import pytest
+
+from app.scanners import tls_cache
+from app.scanners.network_scanner.plugins import tls_audit
+
+
+@pytest.fixture(autouse=True)
+def memory_tls_cache(monkeypatch):
+    monkeypatch.setattr(tls_cache, "_redis_client", None)
+    monkeypatch.setattr(tls_cache, "_redis_failed", True)
+    monkeypatch.setattr(tls_cache, "_handshake", lambda ip, port, sni, timeout: None)
+    tls_cache.clear_memory_cache()
+    yield
+    tls_cache.clear_memory_cache()
+
+
+@pytest.fixture
+def slow_handshakes(monkeypatch):
+    """Every probe takes 50ms; records peak concurrent connections."""
+    state = {"active": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def _enter():
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.05)
+        with lock:
+            state["active"] -= 1
+
+    def fake_accepts(target_ip, port, timeout, version):
+        _enter()
+        return version is tls_audit._OLD_PROTOCOLS[1][1]  # only TLSv1 accepted
+
+    def fake_connect(target_ip, port, timeout, server_name=None):
+        _enter()
+        raise ConnectionRefusedError
+
+    monkeypatch.setattr(tls_audit, "_accepts_protocol", fake_accepts)
+    monkeypatch.setattr(tls_audit, "_connect_tls", fake_connect)
+    return state
+
+
+class TestTLSAuditConcurrency:
+    def test_ports_and_protocols_probed_in_parallel(self, slow_handshakes, monkeypatch):
+        monkeypatch.setenv("TLS_AUDIT_MAX_CONNECTIONS", "32")
+        ports = [{"port": p} for p in (443, 8443, 993, 995)]
+
+        started = time.monotonic()
+        findings = tls_audit.run("192.0.2.10", ports, timeout=1.0)
+        elapsed = time.monotonic() - started
+
+        # 4 ports x (1 cert + 3 protocol) handshakes of 50ms; serial would be ~0.8s
+        assert elapsed < 0.4
+        assert sorted(f.port for f in findings) == [443, 993, 995, 8443]
+        assert all("TLSv1 " in f.title for f in findings)
+
+    def test_connection_cap_is_respected(self, slow_handshakes, monkeypatch):
+        monkeypatch.setenv("TLS_AUDIT_MAX_CONNECTIONS", "2")
+
+        tls_audit.run("192.0.2.11", [{"port": 443}, {"port": 8443}], timeout=1.0)
+
+        assert slow_handshakes["peak"] <= 2
+
+    def test_non_tls_ports_skipped(self, slow_handshakes):
+        assert tls_audit.run("192.0.2.12", [{"port": 22}, {"port": 80}], timeout=1.0) == []
+        assert slow_handshakes["peak"] == 0
+
+    def test_shared_cache_lock_and_connection_cap_do_not_deadlock(self, slow_handshakes, monkeypatch):
+        # All cache keys share one striped lock and only one connection is allowed,
+        # so two ports contend for both at once
+        monkeypatch.setenv("TLS_AUDIT_MAX_CONNECTIONS", "1")
+        monkeypatch.setattr(tls_cache, "_key_locks", [threading.Lock()])
+        monkeypatch.setattr(tls_cache, "_handshake", lambda ip, port, sni, timeout: time.sleep(0.05))
+        result = []
+
+        worker = threading.Thread(
+            target=lambda: result.append(tls_audit.run("192.0.2.13", [{"port": 443}, {"port": 8443}], timeout=1.0)),
+            daemon=True,
+        )
+        worker.start()
+        worker.join(timeout=5)
+
+        assert not worker.is_alive(), "tls_audit deadlocked on the cache lock vs connection cap"
+        assert sorted(f.port for f in result[0]) == [443, 8443]
+        assert slow_handshakes["peak"] <= 1
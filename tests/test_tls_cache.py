@@ -0,0 +1,65 @@
+"""Tests for the shared TLS assessment cache (in-process backend)."""
+import threading
+import time
+
+import pytest
+
+from app.scanners import tls_cache
+
+
+@pytest.fixture(autouse=True)
+def memory_backend(monkeypatch):
+    monkeypatch.setattr(tls_cache, "_redis_client", None)
+    monkeypatch.setattr(tls_cache, "_redis_failed", True)
+    tls_cache.clear_memory_cache()
+    yield
+    tls_cache.clear_memory_cache()
+
+
+def _fake_handshakes(monkeypatch, fingerprints):
+    """host -> certificate fingerprint, all behind one load-balancer IP."""
+    monkeypatch.setattr(tls_cache, "resolve_ip", lambda host: "10.0.0.1")
+    monkeypatch.setattr(
+        tls_cache, "_handshake",
+        lambda ip, port, sni, timeout: {"fingerprint": fingerprints[sni], "der_hex": "00"},
+    )
+
+
+class TestTLSCache:
+    def test_enumeration_shared_across_hosts_with_same_certificate(self, monkeypatch):
+        _fake_handshakes(monkeypatch, {"a.example.com": "fp1", "b.example.com": "fp1", "c.example.com": "fp2"})
+        runs = []
+
+        def enumerate_(ip):
+            runs.append(ip)
+            return {"supported_protocols": ["TLSv1.2"]}
+
+        for host in ("a.example.com", "b.example.com", "c.example.com", "a.example.com"):
+            result = tls_cache.cached_assessment("sslyze", host, 443, enumerate_)
+            assert result == {"supported_protocols": ["TLSv1.2"]}
+
+        assert runs == ["10.0.0.1", "10.0.0.1"]  # once for fp1, once for fp2
+
+    def test_concurrent_misses_are_coalesced(self):
+        calls = []
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.05)
+            return ["TLSv1"]
+
+        threads = [threading.Thread(target=tls_cache.cached, args=("k", slow)) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(calls) == 1
+
+    def test_entries_expire_and_failures_are_not_cached(self):
+        assert tls_cache.cached("gone", lambda: None) is None
+        assert tls_cache.cached("gone", lambda: "later") == "later"
+
+        tls_cache.cached("short", lambda: "v1", ttl=60)
+        tls_cache._memory["short"] = (time.time() - 1, "v1")
+        assert tls_cache.cached("short", lambda: "v2") == "v2"
@@ -0,0 +1,81 @@
+"""Tests for response-equivalence pruning of encoded payload variants."""
+import pytest
+from unittest.mock import MagicMock
+from requests import Response
+
+from app.scanners.api_scanner.engine.payload_encoder import encode_for_context
+from app.scanners.api_scanner.engine.variant_scheduler import VariantScheduler
+from app.scanners.api_scanner.tests.sqli_tests import ERROR_PAYLOADS
+
+
+def _resp(status=200, text=""):
+    r = MagicMock(spec=Response)
+    r.status_code = status
+    r.text = text
+    return r
+
+
+class _Server:
+    """Fake parameter sink: ``reply(value)`` -> (status, body)."""
+
+    def __init__(self, reply):
+        self.reply = reply
+        self.sent = []
+
+    async def send(self, value):
+        self.sent.append(value)
+        status, text = self.reply(value)
+        return _resp(status, text), {"value": value}
+
+
+@pytest.mark.asyncio
+class TestVariantScheduler:
+    async def test_skips_variants_when_raw_matches_benign(self):
+        server = _Server(lambda value: (200, '{"items": []}'))
+        sched = VariantScheduler(server.send, "query", max_variants=3)
+        await sched.observe_benign("1")
+
+        assert await sched.probe("' OR '1'='1", lambda r: None) is None
+        assert server.sent == ["1", "' OR '1'='1"]
+        assert sched.pruned == 2
+
+    async def test_escalates_to_encoding_that_triggers(self):
+        def reply(value):
+            if value.startswith("%27"):
+                return 500, "You have an error in your SQL syntax"
+            if "'" in value:
+                return 403, "blocked"
+            return 200, "[]"
+
+        server = _Server(reply)
+        sched = VariantScheduler(server.send, "query", max_variants=3)
+        await sched.observe_benign("1")
+
+        hit = await sched.probe("' OR 1=1 --", lambda r: "sql syntax" in r.text.lower() or None)
+
+        assert hit is not None
+        assert hit.enc_desc == "url-encoded"
+        assert hit.evidence == {"value": hit.encoded}
+
+    async def test_redundant_family_is_pruned(self):
+        # The WAF answers every quote-bearing value the same way, however encoded.
+        server = _Server(lambda value: (200, "[]") if value == "1" else (403, "blocked"))
+        sched = VariantScheduler(server.send, "query", max_variants=3)
+        await sched.observe_benign("1")
+
+        for payload in ("'", "' --", "' OR 'a'='a", "' #"):
+            await sched.probe(payload, lambda r: None)
+
+        # Two redundant answers per family, then only raw payloads are sent.
+        assert server.sent[-2:] == ["' OR 'a'='a", "' #"]
+
+    async def test_request_volume_cut_on_sanitizing_parameter(self):
+        server = _Server(lambda value: (200, '{"results": 0}'))
+        sched = VariantScheduler(server.send, "query", max_variants=3)
+        await sched.observe_benign("1")
+
+        for payload in ERROR_PAYLOADS:
+            await sched.probe(payload, lambda r: None)
+
+        full = sum(len(encode_for_context(p, "query", max_variants=3)) for p in ERROR_PAYLOADS)
+        assert len(server.sent) * 2.5 < full